@@ -6,6 +6,7 @@ from agents.prompts.table_selection import TABLE_SELECTION_PROMPT
 from agents.prompts.schema_fetcher import SCHEMA_FETCHER_PROMPT
 from agents.prompts.sql_generation import SQL_GENERATION_PROMPT
 from agents.prompts.answer_formatting import ANSWER_FORMATTING_PROMPT
+from agents.prompts.fast_mode import FAST_SQL_PROMPT, FAST_SQL_USER_TEMPLATE, FAST_ANSWER_TEMPLATE
 
 __all__ = [
     'INTENT_UNDERSTANDING_PROMPT',
@@ -13,4 +14,7 @@ __all__ = [
     'SCHEMA_FETCHER_PROMPT',
     'SQL_GENERATION_PROMPT',
     'ANSWER_FORMATTING_PROMPT',
+    'FAST_SQL_PROMPT',
+    'FAST_SQL_USER_TEMPLATE',
+    'FAST_ANSWER_TEMPLATE',
 ]
@@ -33,6 +33,9 @@ async def chat(request: ChatRequest):
     3. Searches for relevant tables
     4. Generates and executes SQL
     5. Returns a formatted answer
+
+    Repeated (or near-duplicate) questions of the same company and team are
+    answered from the answer cache without running the agents.
     """
     try:
         # Fetch DB settings from metadata database
@@ -54,6 +57,7 @@ async def chat(request: ChatRequest):
             db_database=db_settings["db_database"],
             db_username=db_settings["db_username"],
             db_password=db_settings["db_password"],
+            mode=request.mode,
         )
         
         # Process question
@@ -63,6 +67,7 @@ async def chat(request: ChatRequest):
             success=result["success"],
             answer=result["answer"],
             error=result["error"],
+            cache=result["cache"],
         )
         
     except HTTPException:
@@ -2,7 +2,7 @@
 """Pydantic schemas for API request/response models."""
 
 from pydantic import BaseModel, Field
-from typing import Optional
+from typing import Literal, Optional
 
 
 class ChatRequest(BaseModel):
@@ -10,6 +10,9 @@ class ChatRequest(BaseModel):
     company_id: str = Field(..., description="Company unique identifier")
     team_name: str = Field(..., description="User's team for RBAC")
     user_question: str = Field(..., description="Natural language question")
+    mode: Optional[Literal["crew", "fast"]] = Field(
+        None, description="Pipeline: 'crew' (five agents) or 'fast' (single pass). Default: COPILOT_DEFAULT_MODE"
+    )
 
     class Config:
         json_schema_extra = {
@@ -26,6 +29,7 @@ class ChatResponse(BaseModel):
     success: bool = Field(..., description="Whether the request succeeded")
     answer: Optional[str] = Field(None, description="The formatted answer")
     error: Optional[str] = Field(None, description="Error message if failed")
+    cache: Optional[str] = Field(None, description="Answer cache tier that served the answer (exact / semantic)")
 
 
 class HealthResponse(BaseModel):
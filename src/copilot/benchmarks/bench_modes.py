@@ -0,0 +1,179 @@
+"""
+Latency and accuracy benchmark of the copilot pipeline modes.
+
+Runs a fixed question set (benchmarks/questions.json by default) through the
+"crew" (five CrewAI agents) and "fast" (single pass) pipelines against a real
+company: its source database from the metadata DB, the configured LLM and
+the vector DB. Answer and plan caches are disabled so every run does the
+full work.
+
+For every question it records the wall time, whether the generated SQL
+executed, and its execution accuracy: the generated SQL's rows are compared
+with the rows of the question's expected_sql (column names and row order are
+ignored, numbers are compared rounded to 2 decimals). Questions without
+expected_sql only report whether both modes returned the same rows.
+
+Usage:
+    python -m benchmarks.bench_modes --company-id <uuid> --team Sales
+    python -m benchmarks.bench_modes --company-id <uuid> --team Sales --modes fast --repeat 3
+    python -m benchmarks.bench_modes --company-id <uuid> --team Sales --questions my_questions.json --output modes.json
+"""
+
+import argparse
+import contextlib
+import json
+import logging
+import os
+import statistics
+import sys
+import time
+from decimal import Decimal
+from unittest import mock
+
+# Add parent directory to path
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.dirname(current_dir)
+if parent_dir not in sys.path:
+    sys.path.insert(0, parent_dir)
+
+from repositories.metadata_db import MetadataRepository
+from services import answer_cache, plan_cache
+from services.chat_service import PIPELINE_MODES
+from services.sql_executor import execute_sql_query
+
+DEFAULT_QUESTIONS = os.path.join(current_dir, "questions.json")
+
+
+def _normalize_rows(result) -> list | None:
+    """Rows of an execute_sql_query result as sorted tuples of comparable values."""
+    if result == "No data found.":
+        return []
+    if not isinstance(result, list):
+        return None
+
+    def value(v):
+        if isinstance(v, (int, float, Decimal)) and not isinstance(v, bool):
+            return round(float(v), 2)
+        return str(v).strip() if v is not None else None
+
+    return sorted((tuple(value(v) for v in row.values()) for row in result), key=repr)
+
+
+def run_benchmark(args) -> dict:
+    """Run every question through every mode args.repeat times and return the report."""
+    db_settings = MetadataRepository.get_source_db_settings(args.company_id)
+    if not db_settings:
+        raise SystemExit(f"No database configuration found for company_id: {args.company_id}")
+
+    with open(args.questions) as f:
+        questions = json.load(f)
+
+    def execute(sql_query: str) -> dict:
+        return execute_sql_query(sql_query=sql_query, **db_settings)
+
+    expected = {}
+    for item in questions:
+        if item.get("expected_sql"):
+            result = execute(item["expected_sql"])
+            if not result["success"]:
+                raise SystemExit(f"expected_sql of '{item['question']}' failed: {result['error']}")
+            expected[item["question"]] = _normalize_rows(result["result"])
+
+    report = {"config": vars(args), "modes": {}, "questions": []}
+    rows_by_mode = {}
+
+    with mock.patch.object(answer_cache, "ANSWER_CACHE_ENABLED", False), \
+            mock.patch.object(plan_cache, "PLAN_CACHE_ENABLED", False):
+        for mode in args.modes:
+            service = PIPELINE_MODES[mode](company_id=args.company_id, team_name=args.team, **db_settings)
+            results = []
+            for item in questions:
+                question = item["question"]
+                for attempt in range(args.repeat):
+                    started = time.perf_counter()
+                    try:
+                        output = service.run_detailed(question)
+                        error = None
+                    except Exception as e:
+                        output, error = {"sql_query": None, "sql_success": False, "answer": None}, str(e)
+                    seconds = time.perf_counter() - started
+
+                    rows = None
+                    if output["sql_success"]:
+                        rows = _normalize_rows(execute(output["sql_query"])["result"])
+                    correct = (rows is not None and rows == expected[question]) if question in expected else None
+                    rows_by_mode.setdefault(question, {}).setdefault(mode, rows)
+                    results.append({
+                        "mode": mode,
+                        "question": question,
+                        "attempt": attempt + 1,
+                        "seconds": round(seconds, 3),
+                        "sql_success": output["sql_success"],
+                        "correct": correct,
+                        "sql_query": output["sql_query"],
+                        "answer": output["answer"],
+                        "error": error,
+                    })
+                    print(f"[{mode}] {seconds:6.1f}s {'ok ' if correct else 'BAD' if correct is False else '-  '} {question}",
+                          file=sys.stderr)
+
+            latencies = [r["seconds"] for r in results]
+            graded = [r["correct"] for r in results if r["correct"] is not None]
+            report["modes"][mode] = {
+                "runs": len(results),
+                "mean_seconds": round(statistics.mean(latencies), 3),
+                "p50_seconds": round(statistics.median(latencies), 3),
+                "max_seconds": round(max(latencies), 3),
+                "sql_success_rate": round(sum(r["sql_success"] for r in results) / len(results), 3),
+                "accuracy": round(sum(graded) / len(graded), 3) if graded else None,
+            }
+            report["questions"].extend(results)
+
+    if len(args.modes) > 1:
+        comparable = [modes for modes in rows_by_mode.values() if all(modes.get(m) is not None for m in args.modes)]
+        report["agreement"] = round(
+            sum(len({repr(modes[m]) for m in args.modes}) == 1 for modes in comparable) / len(comparable), 3
+        ) if comparable else None
+    return report
+
+
+def print_report(report: dict):
+    print(f"\n{'mode':<8}{'runs':>6}{'mean s':>9}{'p50 s':>9}{'max s':>9}{'sql ok':>9}{'accuracy':>10}")
+    for mode, stats in report["modes"].items():
+        accuracy = f"{stats['accuracy']:.0%}" if stats["accuracy"] is not None else "-"
+        print(
+            f"{mode:<8}{stats['runs']:>6}{stats['mean_seconds']:>9.2f}{stats['p50_seconds']:>9.2f}"
+            f"{stats['max_seconds']:>9.2f}{stats['sql_success_rate']:>9.0%}{accuracy:>10}"
+        )
+    if report.get("agreement") is not None:
+        print(f"\nModes returned the same rows for {report['agreement']:.0%} of the questions")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Latency and accuracy benchmark of the copilot pipeline modes")
+    parser.add_argument("--company-id", required=True, help="Company whose source DB and tables are queried")
+    parser.add_argument("--team", required=True, help="Team name used for RBAC")
+    parser.add_argument("--questions", default=DEFAULT_QUESTIONS,
+                        help="JSON list of {question, expected_sql (optional)}")
+    parser.add_argument("--modes", nargs="+", choices=list(PIPELINE_MODES), default=list(PIPELINE_MODES))
+    parser.add_argument("--repeat", type=int, default=1, help="Runs per question and mode")
+    parser.add_argument("--output", help="Write the JSON report to this file")
+    parser.add_argument("--verbose", action="store_true", help="Show agent output and logs")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO if args.verbose else logging.ERROR)
+    if args.verbose:
+        report = run_benchmark(args)
+    else:
+        with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+            report = run_benchmark(args)
+
+    print_report(report)
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2, default=str)
+        print(f"\nReport written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -29,3 +29,98 @@ VECTOR_DB_PORT = int(os.getenv("VECTOR_DB_PORT", "6543"))
 # Embedding Model
 # =============================================================================
 EMBEDDING_MODEL_NAME = "BAAI/bge-small-en-v1.5"
+
+# Shared embedding server (src/embedding_server). When empty, the model is
+# loaded in-process instead.
+EMBEDDING_SERVICE_URL = os.getenv("EMBEDDING_SERVICE_URL", "")
+EMBEDDING_SERVICE_TIMEOUT = float(os.getenv("EMBEDDING_SERVICE_TIMEOUT", "10"))
+
+# pgvector search tuning, applied per query with SET LOCAL. Higher values raise
+# recall of the per-company HNSW / IVFFlat indexes at some latency cost.
+VECTOR_SEARCH_EF_SEARCH = int(os.getenv("VECTOR_SEARCH_EF_SEARCH", "100"))
+VECTOR_SEARCH_IVFFLAT_PROBES = int(os.getenv("VECTOR_SEARCH_IVFFLAT_PROBES", "10"))
+# Searches filtered to a subset of the company's tables (RBAC / team) would
+# lose matches if the filter ran after an ANN scan. With pgvector >= 0.8 set
+# this to "relaxed_order" or "strict_order" to scan the index iteratively;
+# with "off" (default) filtered searches use an exact scan.
+VECTOR_SEARCH_ITERATIVE_SCAN = os.getenv("VECTOR_SEARCH_ITERATIVE_SCAN", "off").lower()
+
+
+# =============================================================================
+# Answer Cache (Redis)
+# =============================================================================
+ANSWER_CACHE_ENABLED = os.getenv("ANSWER_CACHE_ENABLED", "true").lower() == "true"
+ANSWER_CACHE_REDIS_URL = os.getenv(
+    "ANSWER_CACHE_REDIS_URL", os.getenv("CELERY_BROKER_URL", "redis://localhost:6379/0")
+)
+ANSWER_CACHE_TTL_SECONDS = int(os.getenv("ANSWER_CACHE_TTL_SECONDS", "3600"))
+
+# Answers to relative-date questions ("revenue this month") change with the
+# date, so entries only match within the same bucket: "hour", "day" or "month".
+ANSWER_CACHE_DATE_BUCKET = os.getenv("ANSWER_CACHE_DATE_BUCKET", "day")
+
+# Semantic tier (off by default): cosine similarity needed to reuse the answer
+# of a differently worded question, and the number of questions kept per
+# company / team / bucket. Questions that differ in ordering, comparison or
+# negation words ("top" / "bottom", "shipped" / "not shipped") never match,
+# but near-identical wording can still mean a different query.
+ANSWER_CACHE_SEMANTIC_ENABLED = os.getenv("ANSWER_CACHE_SEMANTIC_ENABLED", "false").lower() == "true"
+ANSWER_CACHE_SEMANTIC_THRESHOLD = float(os.getenv("ANSWER_CACHE_SEMANTIC_THRESHOLD", "0.93"))
+ANSWER_CACHE_SEMANTIC_MAX_ENTRIES = int(os.getenv("ANSWER_CACHE_SEMANTIC_MAX_ENTRIES", "500"))
+
+# How long the company's ingestion version (which invalidates its answers
+# when ingestion re-runs) is reused before it is read from the metadata DB again.
+ANSWER_CACHE_VERSION_CHECK_SECONDS = int(os.getenv("ANSWER_CACHE_VERSION_CHECK_SECONDS", "30"))
+
+# Plan cache: SQL generated for an intent / query_key (and the questions that
+# led to it) is reused and re-executed for fresh data, skipping the table
+# selection, schema and SQL generation agents. Shares the answer cache Redis.
+PLAN_CACHE_ENABLED = os.getenv("PLAN_CACHE_ENABLED", "true").lower() == "true"
+PLAN_CACHE_TTL_SECONDS = int(os.getenv("PLAN_CACHE_TTL_SECONDS", "86400"))
+
+
+# =============================================================================
+# Pipeline Mode
+# =============================================================================
+# "crew": five sequential CrewAI agents. "fast": RBAC, vector search and
+# schemas in code, one LLM call for the SQL and one for the answer.
+# Requests can override it with their "mode" field.
+COPILOT_DEFAULT_MODE = os.getenv("COPILOT_DEFAULT_MODE", "crew")
+
+# Fast mode: tables from the vector search passed to the SQL call, and
+# result rows passed to the answer formatting call.
+FAST_MODE_MAX_TABLES = int(os.getenv("FAST_MODE_MAX_TABLES", "8"))
+FAST_MODE_MAX_RESULT_ROWS = int(os.getenv("FAST_MODE_MAX_RESULT_ROWS", "100"))
+
+
+# =============================================================================
+# Database Connection Pools
+# =============================================================================
+# One pooled SQLAlchemy engine per distinct connection (each tenant's source
+# DB, the metadata / vector DB), shared by all tools, repositories and the
+# SQL executor. Connections are checked with a ping before use.
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "5"))
+DB_POOL_MAX_OVERFLOW = int(os.getenv("DB_POOL_MAX_OVERFLOW", "5"))
+DB_POOL_TIMEOUT_SECONDS = int(os.getenv("DB_POOL_TIMEOUT_SECONDS", "30"))
+DB_POOL_RECYCLE_SECONDS = int(os.getenv("DB_POOL_RECYCLE_SECONDS", "1800"))
+
+# Engines unused for this long are disposed (closing their connections); at
+# most DB_ENGINE_MAX_ENGINES are kept, least recently used first out.
+DB_ENGINE_IDLE_SECONDS = int(os.getenv("DB_ENGINE_IDLE_SECONDS", "600"))
+DB_ENGINE_MAX_ENGINES = int(os.getenv("DB_ENGINE_MAX_ENGINES", "50"))
+
+
+# =============================================================================
+# Source Schema Cache
+# =============================================================================
+# In-process cache of source table columns, shared by the schema tools and
+# SourceDBRepository. Entries younger than SCHEMA_CACHE_TTL_SECONDS are used
+# without a query; older ones are revalidated against sys.tables.modify_date
+# in the same single query that fetches missing tables.
+SCHEMA_CACHE_ENABLED = os.getenv("SCHEMA_CACHE_ENABLED", "true").lower() == "true"
+SCHEMA_CACHE_TTL_SECONDS = int(os.getenv("SCHEMA_CACHE_TTL_SECONDS", "300"))
+SCHEMA_CACHE_MAX_TABLES = int(os.getenv("SCHEMA_CACHE_MAX_TABLES", "5000"))
+
+# How long the company's ingestion version (a change drops all of its cached
+# schemas) is reused before it is read from the metadata DB again.
+SCHEMA_CACHE_VERSION_CHECK_SECONDS = int(os.getenv("SCHEMA_CACHE_VERSION_CHECK_SECONDS", "30"))
@@ -7,7 +7,7 @@ FastAPI application entry point with Celery task queue support.
 import os
 import time
 import logging
-from typing import Optional, Any
+from typing import Literal, Optional, Any
 
 from dotenv import load_dotenv
 from fastapi import FastAPI, HTTPException
@@ -44,6 +44,9 @@ class AsyncChatRequest(BaseModel):
     company_id: str = Field(..., description="Company unique identifier")
     team_name: str = Field(..., description="User's team for RBAC")
     user_question: str = Field(..., description="Natural language question")
+    mode: Optional[Literal["crew", "fast"]] = Field(
+        None, description="Pipeline: 'crew' (five agents) or 'fast' (single pass). Default: COPILOT_DEFAULT_MODE"
+    )
 
     model_config = {
         "json_schema_extra": {
@@ -108,7 +111,8 @@ async def submit_chat_task(request: AsyncChatRequest):
         task = process_chat_task.delay(
             company_id=request.company_id,
             team_name=request.team_name,
-            user_question=request.user_question
+            user_question=request.user_question,
+            mode=request.mode
         )
         logger.info(f"[{task_id_log}] Task submitted to Celery. Task ID: {task.id}")
         
@@ -19,7 +19,8 @@ def process_chat_task(
     self,
     company_id: str,
     team_name: str,
-    user_question: str
+    user_question: str,
+    mode: str = None
 ) -> dict:
     """
     Celery task for processing chat requests.
@@ -34,9 +35,10 @@ def process_chat_task(
         company_id: Company unique identifier
         team_name: User's team for RBAC
         user_question: Natural language question
+        mode: "crew" or "fast" pipeline (default: COPILOT_DEFAULT_MODE)
         
     Returns:
-        dict with 'success', 'answer', and 'error' keys
+        dict with 'success', 'answer', 'error' and 'cache' keys
     """
     try:
         # === STAGE 1: Fetch DB Settings ===
@@ -62,6 +64,7 @@ def process_chat_task(
             db_database=db_settings["db_database"],
             db_username=db_settings["db_username"],
             db_password=db_settings["db_password"],
+            mode=mode,
         )
         
         logger.info("✅ STAGE 2 COMPLETE. Chat service created.")
@@ -77,7 +80,8 @@ def process_chat_task(
             return {
                 "success": True,
                 "answer": result["answer"],
-                "error": None
+                "error": None,
+                "cache": result["cache"]
             }
         else:
             logger.error(f"❌ PIPELINE HALTED: {result['error']}")
@@ -2,9 +2,12 @@
 """Repositories package."""
 
 from repositories.metadata_db import MetadataRepository
+from repositories.schema_cache import SchemaCache, get_schema_cache
 from repositories.source_db import SourceDBRepository
 
 __all__ = [
     'MetadataRepository',
+    'SchemaCache',
+    'get_schema_cache',
     'SourceDBRepository',
 ]
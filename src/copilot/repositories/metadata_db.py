@@ -2,31 +2,21 @@
 """Metadata database repository - handles Vector DB operations."""
 
 import logging
-import psycopg2
-from config.settings import (
-    VECTOR_DB_HOST,
-    VECTOR_DB_NAME,
-    VECTOR_DB_USER,
-    VECTOR_DB_PASSWORD,
-    VECTOR_DB_PORT,
-)
+from utils.engine_registry import get_metadata_engine
 
 logger = logging.getLogger(__name__)
 
+# PostgreSQL "undefined_table" (ingestion_completions is created by the first ingestion run)
+UNDEFINED_TABLE = "42P01"
+
 
 class MetadataRepository:
     """Repository for metadata database operations."""
     
     @staticmethod
     def _get_connection():
-        """Create a new database connection."""
-        return psycopg2.connect(
-            host=VECTOR_DB_HOST,
-            database=VECTOR_DB_NAME,
-            user=VECTOR_DB_USER,
-            password=VECTOR_DB_PASSWORD,
-            port=VECTOR_DB_PORT
-        )
+        """Borrow a pooled database connection (close() returns it to the pool)."""
+        return get_metadata_engine().raw_connection()
     
     @staticmethod
     def get_source_db_settings(company_id: str) -> dict | None:
@@ -74,6 +64,53 @@ class MetadataRepository:
                 cur.close()
                 conn.close()
 
+    @staticmethod
+    def get_ingestion_version(company_id: str) -> str | None:
+        """
+        Version token that changes whenever an ingestion run of the company
+        completes (the pipeline's marker in ingestion_completions, written
+        whatever the team assignment outcome) or its source connection is
+        replaced.
+
+        Args:
+            company_id: The company's unique identifier
+
+        Returns:
+            Version string, or None if it could not be read
+        """
+        conn = None
+        try:
+            conn = MetadataRepository._get_connection()
+            cur = conn.cursor()
+
+            query = """
+                SELECT
+                    (SELECT run_id || '@' || completed_at FROM ingestion_completions WHERE company_id = %s),
+                    (SELECT MAX(created_at) FROM source_connections WHERE company_id = %s);
+            """
+
+            try:
+                cur.execute(query, (company_id, company_id))
+                completed, connected_at = cur.fetchone()
+            except Exception as e:
+                if getattr(e, "pgcode", None) != UNDEFINED_TABLE:
+                    raise
+                # No ingestion run recorded a completion yet
+                conn.rollback()
+                cur.execute("SELECT MAX(created_at) FROM source_connections WHERE company_id = %s;", (company_id,))
+                completed, connected_at = None, cur.fetchone()[0]
+
+            return f"{completed or '-'}|{connected_at.isoformat() if connected_at else '-'}"
+
+        except Exception as e:
+            logger.error(f"Error fetching ingestion version: {e}")
+            return None
+
+        finally:
+            if conn:
+                cur.close()
+                conn.close()
+
     @staticmethod
     def get_company_tables(company_id: str) -> list[str]:
         """
@@ -0,0 +1,119 @@
+# repositories/schema_cache.py
+"""In-process LRU + TTL cache of source table columns."""
+
+import logging
+import threading
+import time
+from collections import OrderedDict
+
+from config.settings import (
+    SCHEMA_CACHE_ENABLED,
+    SCHEMA_CACHE_TTL_SECONDS,
+    SCHEMA_CACHE_MAX_TABLES,
+    SCHEMA_CACHE_VERSION_CHECK_SECONDS,
+)
+from repositories.metadata_db import MetadataRepository
+
+logger = logging.getLogger(__name__)
+
+
+class SchemaCache:
+    """
+    Columns of source tables per tenant (company + source database).
+
+    Each entry keeps the table's sys.tables.modify_date. Entries validated
+    less than SCHEMA_CACHE_TTL_SECONDS ago are fresh; older entries are
+    revalidated by the caller against modify_date and refreshed with put().
+    At most SCHEMA_CACHE_MAX_TABLES entries are kept (least recently used
+    first out), and a change of the company's ingestion version drops all of
+    its entries.
+    """
+
+    def __init__(self):
+        self._entries: OrderedDict[tuple, dict] = OrderedDict()
+        self._versions = {}
+        self._lock = threading.Lock()
+
+    def check_version(self, company_id: str):
+        """Drop the company's entries if it was re-ingested (checked every SCHEMA_CACHE_VERSION_CHECK_SECONDS)."""
+        now = time.monotonic()
+        with self._lock:
+            cached = self._versions.get(company_id)
+        if cached and now - cached[0] < SCHEMA_CACHE_VERSION_CHECK_SECONDS:
+            return
+
+        version = MetadataRepository.get_ingestion_version(company_id)
+        if version is None:
+            return
+        with self._lock:
+            self._versions[company_id] = (now, version)
+        if cached and cached[1] != version:
+            removed = self.invalidate(company_id)
+            logger.info(f"Company {company_id} was re-ingested, dropped {removed} cached table schemas")
+
+    def get(self, tenant: tuple, table_name: str) -> dict | None:
+        """
+        Cached entry of a table.
+
+        Args:
+            tenant: (company_id, db_server, db_database)
+            table_name: Lowercased 'schema.table'
+
+        Returns:
+            {'columns', 'modify_date', 'validated_at'} or None
+        """
+        key = (tenant, table_name)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            return entry
+
+    @staticmethod
+    def is_fresh(entry: dict) -> bool:
+        """Whether an entry can be used without revalidating it."""
+        return time.monotonic() - entry["validated_at"] < SCHEMA_CACHE_TTL_SECONDS
+
+    def put(self, tenant: tuple, table_name: str, columns: list[dict], modify_date: str):
+        """Store (or revalidate) a table's columns."""
+        key = (tenant, table_name)
+        with self._lock:
+            self._entries[key] = {
+                "columns": columns,
+                "modify_date": modify_date,
+                "validated_at": time.monotonic(),
+            }
+            self._entries.move_to_end(key)
+            while len(self._entries) > SCHEMA_CACHE_MAX_TABLES:
+                self._entries.popitem(last=False)
+
+    def discard(self, tenant: tuple, table_name: str):
+        """Remove a table that no longer exists."""
+        with self._lock:
+            self._entries.pop((tenant, table_name), None)
+
+    def invalidate(self, company_id: str = None) -> int:
+        """Drop the entries of a company (or all). Returns the number removed."""
+        with self._lock:
+            keys = [key for key in self._entries if company_id is None or key[0][0] == company_id]
+            for key in keys:
+                del self._entries[key]
+        return len(keys)
+
+
+# Global schema cache instance (singleton)
+_schema_cache = None
+_schema_cache_lock = threading.Lock()
+
+
+def get_schema_cache() -> SchemaCache | None:
+    """Returns the shared SchemaCache, or None when SCHEMA_CACHE_ENABLED is off."""
+    global _schema_cache
+
+    if not SCHEMA_CACHE_ENABLED:
+        return None
+    if _schema_cache is None:
+        with _schema_cache_lock:
+            if _schema_cache is None:
+                _schema_cache = SchemaCache()
+    return _schema_cache
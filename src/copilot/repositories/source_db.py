@@ -1,16 +1,22 @@
 # repositories/source_db.py
 """Source database repository - handles client database operations."""
 
-import pyodbc
+import logging
 import pandas as pd
-from sqlalchemy import create_engine, text
-from urllib.parse import quote_plus
+from sqlalchemy import text
+from repositories.schema_cache import get_schema_cache
+from utils.engine_registry import build_source_connection_string, get_odbc_driver, get_source_engine
+
+logger = logging.getLogger(__name__)
+
+# Tables per schema query (3 parameters each, SQL Server allows 2100)
+MAX_TABLES_PER_QUERY = 500
 
 
 class SourceDBRepository:
     """Repository for source (client) database operations."""
     
-    def __init__(self, db_server: str, db_database: str, db_username: str, db_password: str):
+    def __init__(self, db_server: str, db_database: str, db_username: str, db_password: str, company_id: str = ""):
         """
         Initialize with connection parameters.
         
@@ -19,39 +25,25 @@ class SourceDBRepository:
             db_database: Database name
             db_username: Database username
             db_password: Database password
+            company_id: Owning company; re-ingesting it invalidates cached schemas
         """
         self.db_server = db_server
         self.db_database = db_database
         self.db_username = db_username
         self.db_password = db_password
+        self.company_id = company_id
     
     def _get_odbc_driver(self) -> str:
         """Get the best available ODBC driver."""
-        drivers = [d for d in pyodbc.drivers() if "ODBC Driver" in d and "SQL Server" in d]
-        if not drivers:
-            raise Exception("No SQL Server ODBC driver installed!")
-        return drivers[-1]
+        return get_odbc_driver()
     
     def _get_connection_string(self) -> str:
         """Build ODBC connection string."""
-        driver = self._get_odbc_driver()
-        return (
-            f"DRIVER={{{driver}}};"
-            f"SERVER={self.db_server};"
-            f"DATABASE={self.db_database};"
-            f"UID={self.db_username};"
-            f"PWD={self.db_password};"
-            "Encrypt=yes;"
-            "TrustServerCertificate=no;"
-            "Connection Timeout=30;"
-        )
+        return build_source_connection_string(self.db_server, self.db_database, self.db_username, self.db_password)
     
     def _get_engine(self):
-        """Create SQLAlchemy engine."""
-        odbc_connect = self._get_connection_string()
-        encoded = quote_plus(odbc_connect)
-        conn_str = f"mssql+pyodbc:///?odbc_connect={encoded}"
-        return create_engine(conn_str, fast_executemany=True)
+        """Get the shared, pooled SQLAlchemy engine for this source DB."""
+        return get_source_engine(self.db_server, self.db_database, self.db_username, self.db_password)
     
     def get_table_columns(self, schema: str, table: str) -> list[dict]:
         """
@@ -64,27 +56,117 @@ class SourceDBRepository:
         Returns:
             List of dicts with 'name' and 'type' keys
         """
-        try:
-            engine = self._get_engine()
+        table_name = f"{schema}.{table}"
+        return self.get_tables_columns([table_name]).get(table_name, [])
+
+    def get_tables_columns(self, table_names: list[str]) -> dict[str, list[dict]]:
+        """
+        Get column information for several tables in at most one query.
+        
+        Tables cached within SCHEMA_CACHE_TTL_SECONDS need no query; the
+        others are fetched, or revalidated against sys.tables.modify_date,
+        together.
+        
+        Args:
+            table_names: Full table names ('schema.table')
             
-            query = text("""
-                SELECT c.name AS COLUMN_NAME, t.name AS DATA_TYPE
-                FROM sys.columns c
-                JOIN sys.types t ON c.user_type_id = t.user_type_id
-                JOIN sys.tables tb ON c.object_id = tb.object_id
-                JOIN sys.schemas s ON tb.schema_id = s.schema_id
-                WHERE s.name = :schema AND tb.name = :table
-                ORDER BY c.column_id
-            """)
+        Returns:
+            Dict of table name -> list of dicts with 'name' and 'type' keys
+            (empty list for unknown tables), or {} on error
+        """
+        try:
+            cache = get_schema_cache()
+            tenant = (self.company_id, self.db_server.lower(), self.db_database.lower())
+            if cache and self.company_id:
+                cache.check_version(self.company_id)
+
+            columns_by_key = {}
+            pending = {}
+            for table_name in table_names:
+                key = table_name.lower()
+                if "." not in table_name or key in columns_by_key or key in pending:
+                    continue
+                entry = cache.get(tenant, key) if cache else None
+                if entry and cache.is_fresh(entry):
+                    columns_by_key[key] = entry["columns"]
+                else:
+                    pending[key] = (table_name, entry)
 
-            with engine.connect() as conn:
-                rows = conn.execute(query, {"schema": schema, "table": table}).fetchall()
+            pending_keys = list(pending)
+            for start in range(0, len(pending_keys), MAX_TABLES_PER_QUERY):
+                batch = {key: pending[key] for key in pending_keys[start:start + MAX_TABLES_PER_QUERY]}
+                fetched = self._fetch_columns(batch)
+                for key, (_, entry) in batch.items():
+                    if key not in fetched:
+                        columns_by_key[key] = []
+                        if cache and entry:
+                            cache.discard(tenant, key)
+                        continue
+                    modify_date, columns = fetched[key]
+                    if columns is None:
+                        columns = entry["columns"]
+                    columns_by_key[key] = columns
+                    if cache:
+                        cache.put(tenant, key, columns, modify_date)
 
-            return [{"name": row[0], "type": row[1]} for row in rows]
+            logger.info(
+                f"Schema lookup for {len(table_names)} table(s): "
+                f"{len(columns_by_key) - len(pending)} cached, {len(pending)} queried"
+            )
+            return {table_name: columns_by_key.get(table_name.lower(), []) for table_name in table_names}
 
         except Exception as e:
             print(f"Error fetching columns: {e}")
-            return []
+            return {}
+
+    def _fetch_columns(self, tables: dict[str, tuple]) -> dict[str, tuple[str, list[dict] | None]]:
+        """
+        One sys.columns query for several tables.
+        
+        Args:
+            tables: Lowercased 'schema.table' -> (requested name, cached entry or None)
+            
+        Returns:
+            Lowercased 'schema.table' -> (modify_date, columns) for every
+            existing table; columns is None when modify_date still matches
+            the cached entry
+        """
+        values = []
+        params = {}
+        for i, (table_name, entry) in enumerate(tables.values()):
+            schema, table = table_name.split(".", 1)
+            values.append(f"(:schema{i}, :table{i}, :modified{i})")
+            params.update({
+                f"schema{i}": schema,
+                f"table{i}": table,
+                f"modified{i}": entry["modify_date"] if entry else "",
+            })
+
+        # Columns are only returned for tables whose modify_date changed
+        query = text(f"""
+            SELECT s.name AS SCHEMA_NAME, tb.name AS TABLE_NAME,
+                   CONVERT(varchar(23), tb.modify_date, 126) AS MODIFY_DATE,
+                   c.name AS COLUMN_NAME, t.name AS DATA_TYPE
+            FROM (VALUES {", ".join(values)}) AS req(schema_name, table_name, modify_date)
+            JOIN sys.schemas s ON s.name = req.schema_name
+            JOIN sys.tables tb ON tb.schema_id = s.schema_id AND tb.name = req.table_name
+            LEFT JOIN sys.columns c
+                ON c.object_id = tb.object_id
+                AND CONVERT(varchar(23), tb.modify_date, 126) <> req.modify_date
+            LEFT JOIN sys.types t ON c.user_type_id = t.user_type_id
+            ORDER BY s.name, tb.name, c.column_id
+        """)
+
+        with self._get_engine().connect() as conn:
+            rows = conn.execute(query, params).fetchall()
+
+        fetched = {}
+        for schema_name, table_name, modify_date, column_name, data_type in rows:
+            key = f"{schema_name}.{table_name}".lower()
+            _, columns = fetched.setdefault(key, (modify_date, [] if column_name is not None else None))
+            if column_name is not None:
+                columns.append({"name": column_name, "type": data_type})
+        return fetched
     
     def execute_query(self, sql: str) -> pd.DataFrame | str:
         """
@@ -97,11 +179,8 @@ class SourceDBRepository:
             DataFrame with results, or error message string
         """
         try:
-            odbc_connect = self._get_connection_string()
-            connection_string = f"mssql+pyodbc:///?odbc_connect={odbc_connect.replace(';', '%3B')}"
-            engine = create_engine(connection_string)
-            
-            df = pd.read_sql(sql, engine)
+            with self._get_engine().connect() as conn:
+                df = pd.read_sql(sql, conn)
             return df
 
         except Exception as e:
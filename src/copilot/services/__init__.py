@@ -2,10 +2,18 @@
 """Services package."""
 
 from services.crew_service import CrewService
+from services.fast_pipeline_service import FastPipelineService
 from services.chat_service import ChatService, create_chat_service
+from services.answer_cache import AnswerCache, get_answer_cache
+from services.plan_cache import PlanCache, get_plan_cache
 
 __all__ = [
     'CrewService',
+    'FastPipelineService',
     'ChatService',
     'create_chat_service',
+    'AnswerCache',
+    'get_answer_cache',
+    'PlanCache',
+    'get_plan_cache',
 ]
@@ -0,0 +1,275 @@
+"""Two-tier answer cache (exact question match, then semantic match) in Redis."""
+
+import hashlib
+import json
+import logging
+import re
+import threading
+import time
+from datetime import datetime
+
+import numpy as np
+import redis
+
+from config.settings import (
+    ANSWER_CACHE_ENABLED,
+    ANSWER_CACHE_REDIS_URL,
+    ANSWER_CACHE_TTL_SECONDS,
+    ANSWER_CACHE_DATE_BUCKET,
+    ANSWER_CACHE_SEMANTIC_ENABLED,
+    ANSWER_CACHE_SEMANTIC_THRESHOLD,
+    ANSWER_CACHE_SEMANTIC_MAX_ENTRIES,
+    ANSWER_CACHE_VERSION_CHECK_SECONDS,
+)
+from repositories.metadata_db import MetadataRepository
+from utils.embeddings import get_embedding_model
+
+logger = logging.getLogger(__name__)
+
+DATE_BUCKET_FORMATS = {
+    "hour": "%Y-%m-%dT%H",
+    "day": "%Y-%m-%d",
+    "month": "%Y-%m",
+}
+
+
+def normalize_question(question: str) -> str:
+    """Lowercase, collapse whitespace and drop surrounding punctuation."""
+    return re.sub(r"\s+", " ", question.lower()).strip(" \t?!.,;:")
+
+
+# Words that flip a query's ordering, comparison or filter while barely moving
+# its embedding ("top 5" vs "bottom 5", "shipped" vs "not shipped")
+GUARD_WORDS = frozenset({
+    "top", "bottom", "highest", "lowest", "most", "least", "best", "worst",
+    "largest", "smallest", "biggest", "max", "maximum", "min", "minimum",
+    "first", "last", "earliest", "latest", "oldest", "newest",
+    "ascending", "descending", "asc", "desc", "increase", "decrease",
+    "more", "less", "fewer", "greater", "above", "below", "over", "under",
+    "before", "after", "not", "no", "never", "without", "except", "excluding",
+    "unpaid", "unshipped", "inactive", "cancelled", "canceled",
+})
+
+
+def _numbers(question: str) -> set[str]:
+    """Numbers in a question (years, top-N, amounts)."""
+    return set(re.findall(r"\d+(?:\.\d+)?", question))
+
+
+def _guard_words(question: str) -> set[str]:
+    """Ordering, comparison and negation words in a question ("n't" counts as "not")."""
+    words = re.findall(r"[a-z]+n't|[a-z]+", question)
+    return {"not" if word.endswith("n't") else word for word in words} & GUARD_WORDS
+
+
+def key_digest(*parts: str) -> str:
+    """Stable short hash of key parts."""
+    return hashlib.sha1("\x1f".join(parts).encode("utf-8")).hexdigest()
+
+
+class TenantScopedCache:
+    """
+    Base for Redis caches scoped per company, team and date bucket.
+
+    Keys embed the company's ingestion version, so re-running ingestion
+    (or replacing the source connection) invalidates every entry of the
+    company at once; stale entries simply expire. Subclasses set key_prefix.
+    """
+
+    key_prefix = "copilot:cache"
+
+    def __init__(self, redis_client: redis.Redis = None):
+        """
+        Args:
+            redis_client: Optional Redis client (default: ANSWER_CACHE_REDIS_URL)
+        """
+        self.redis = redis_client or redis.Redis.from_url(ANSWER_CACHE_REDIS_URL, decode_responses=True)
+        self._versions = {}
+        self._versions_lock = threading.Lock()
+
+    def _version(self, company_id: str) -> str | None:
+        """Company ingestion version, re-read every ANSWER_CACHE_VERSION_CHECK_SECONDS."""
+        now = time.monotonic()
+        with self._versions_lock:
+            cached = self._versions.get(company_id)
+        if cached and now - cached[0] < ANSWER_CACHE_VERSION_CHECK_SECONDS:
+            return cached[1]
+
+        version = MetadataRepository.get_ingestion_version(company_id)
+        if version is not None:
+            with self._versions_lock:
+                self._versions[company_id] = (now, version)
+        return version
+
+    def _scope(self, company_id: str, team_name: str, variant: str = None) -> str | None:
+        """
+        Key prefix shared by a company / team / date bucket, or None without a version.
+
+        Args:
+            variant: Optional extra partition of the scope (e.g. the pipeline mode)
+        """
+        version = self._version(company_id)
+        if version is None:
+            return None
+        bucket = datetime.now().strftime(DATE_BUCKET_FORMATS.get(ANSWER_CACHE_DATE_BUCKET, "%Y-%m-%d"))
+        parts = [version, team_name.strip().lower(), bucket] + ([variant] if variant else [])
+        return f"{self.key_prefix}:{company_id}:{key_digest(*parts)}"
+
+    def invalidate(self, company_id: str) -> int:
+        """Delete every cached entry of a company. Returns the number of keys removed."""
+        with self._versions_lock:
+            self._versions.pop(company_id, None)
+        keys = list(self.redis.scan_iter(match=f"{self.key_prefix}:{company_id}:*", count=500))
+        return self.redis.delete(*keys) if keys else 0
+
+
+class AnswerCache(TenantScopedCache):
+    """
+    Caches final answers per company, team, date bucket and pipeline mode
+    (answers of the "fast" and "crew" pipelines are kept apart).
+
+    Tier 1 (exact): keyed on the normalized question.
+    Tier 2 (semantic, off unless ANSWER_CACHE_SEMANTIC_ENABLED): the question
+    embedding is compared with the cached questions of the same company /
+    team / date bucket; the closest one above ANSWER_CACHE_SEMANTIC_THRESHOLD
+    is reused if both questions contain the same numbers ("revenue in 2014"
+    never matches "revenue in 2015") and the same ordering, comparison and
+    negation words ("top 5" never matches "bottom 5").
+
+    Entries expire after ANSWER_CACHE_TTL_SECONDS and are invalidated by
+    re-ingestion (see TenantScopedCache). Redis errors only disable
+    caching for the call.
+    """
+
+    key_prefix = "copilot:answers"
+
+    def __init__(self, redis_client: redis.Redis = None, embedding_model=None):
+        """
+        Args:
+            redis_client: Optional Redis client (default: ANSWER_CACHE_REDIS_URL)
+            embedding_model: Optional encoder for the semantic tier (default: shared model)
+        """
+        super().__init__(redis_client)
+        self._embedding_model = embedding_model
+
+    def _embed(self, question: str) -> np.ndarray | None:
+        model = self._embedding_model or get_embedding_model()
+        if model is None:
+            return None
+        return np.asarray(model.encode(question, normalize_embeddings=True), dtype=np.float32)
+
+    def get(self, company_id: str, team_name: str, question: str, mode: str = None) -> dict | None:
+        """
+        Look up a cached answer.
+
+        Args:
+            mode: Pipeline mode ("crew" / "fast") that must have produced the answer
+
+        Returns:
+            The cached entry ({'question', 'answer', 'sql_query', 'cached_at'})
+            plus 'tier' ("exact" or "semantic") and 'similarity', or None
+        """
+        if not ANSWER_CACHE_ENABLED:
+            return None
+        try:
+            scope = self._scope(company_id, team_name, mode)
+            if scope is None:
+                return None
+            normalized = normalize_question(question)
+
+            payload = self.redis.get(f"{scope}:exact:{key_digest(normalized)}")
+            if payload:
+                return {**json.loads(payload), "tier": "exact", "similarity": 1.0}
+
+            if ANSWER_CACHE_SEMANTIC_ENABLED:
+                return self._get_semantic(scope, normalized)
+        except Exception as e:
+            logger.warning(f"Answer cache lookup failed: {e}")
+        return None
+
+    def _get_semantic(self, scope: str, normalized: str) -> dict | None:
+        entries = self.redis.hgetall(f"{scope}:semantic")
+        if not entries:
+            return None
+        embedding = self._embed(normalized)
+        if embedding is None:
+            return None
+
+        numbers = _numbers(normalized)
+        guard_words = _guard_words(normalized)
+        expired_before = time.time() - ANSWER_CACHE_TTL_SECONDS
+        best, best_similarity = None, ANSWER_CACHE_SEMANTIC_THRESHOLD
+        for payload in entries.values():
+            entry = json.loads(payload)
+            if (
+                entry["cached_at"] < expired_before
+                or _numbers(entry["question"]) != numbers
+                or _guard_words(entry["question"]) != guard_words
+            ):
+                continue
+            similarity = float(np.dot(embedding, np.asarray(entry["embedding"], dtype=np.float32)))
+            if similarity >= best_similarity:
+                best, best_similarity = entry, similarity
+
+        if best is None:
+            return None
+        best.pop("embedding")
+        logger.info(f"Semantic answer cache hit ({best_similarity:.3f}): '{normalized}' ~ '{best['question']}'")
+        return {**best, "tier": "semantic", "similarity": round(best_similarity, 4)}
+
+    def set(
+        self,
+        company_id: str,
+        team_name: str,
+        question: str,
+        answer: str,
+        sql_query: str = None,
+        mode: str = None,
+    ):
+        """Cache the answer of a successfully answered question (produced by pipeline `mode`)."""
+        if not ANSWER_CACHE_ENABLED:
+            return
+        try:
+            scope = self._scope(company_id, team_name, mode)
+            if scope is None:
+                return
+            normalized = normalize_question(question)
+            entry = {"question": normalized, "answer": answer, "sql_query": sql_query, "cached_at": time.time()}
+            self.redis.set(f"{scope}:exact:{key_digest(normalized)}", json.dumps(entry), ex=ANSWER_CACHE_TTL_SECONDS)
+
+            if ANSWER_CACHE_SEMANTIC_ENABLED:
+                embedding = self._embed(normalized)
+                if embedding is not None:
+                    self._add_semantic(scope, normalized, {**entry, "embedding": [round(float(x), 5) for x in embedding]})
+        except Exception as e:
+            logger.warning(f"Answer cache write failed: {e}")
+
+    def _add_semantic(self, scope: str, normalized: str, entry: dict):
+        key = f"{scope}:semantic"
+        if self.redis.hlen(key) >= ANSWER_CACHE_SEMANTIC_MAX_ENTRIES:
+            # Full: drop the oldest questions to make room
+            entries = {field: json.loads(payload)["cached_at"] for field, payload in self.redis.hgetall(key).items()}
+            oldest = sorted(entries, key=entries.get)[:max(1, len(entries) - ANSWER_CACHE_SEMANTIC_MAX_ENTRIES + 1)]
+            self.redis.hdel(key, *oldest)
+        pipe = self.redis.pipeline()
+        pipe.hset(key, key_digest(normalized), json.dumps(entry))
+        pipe.expire(key, ANSWER_CACHE_TTL_SECONDS)
+        pipe.execute()
+
+
+# Global answer cache instance (singleton)
+_answer_cache = None
+_answer_cache_lock = threading.Lock()
+
+
+def get_answer_cache() -> AnswerCache | None:
+    """Returns the shared AnswerCache, or None when ANSWER_CACHE_ENABLED is off."""
+    global _answer_cache
+
+    if not ANSWER_CACHE_ENABLED:
+        return None
+    if _answer_cache is None:
+        with _answer_cache_lock:
+            if _answer_cache is None:
+                _answer_cache = AnswerCache()
+    return _answer_cache
@@ -2,10 +2,19 @@
 """High-level chat service for the API."""
 
 import logging
+from config.settings import COPILOT_DEFAULT_MODE
+from services.answer_cache import AnswerCache, get_answer_cache
 from services.crew_service import CrewService
+from services.fast_pipeline_service import FastPipelineService
 
 logger = logging.getLogger(__name__)
 
+# Pipeline implementations selectable per request ("mode")
+PIPELINE_MODES = {
+    "crew": CrewService,
+    "fast": FastPipelineService,
+}
+
 
 class ChatService:
     """Service for handling chat requests."""
@@ -18,35 +27,85 @@ class ChatService:
         db_database: str,
         db_username: str,
         db_password: str,
+        answer_cache: AnswerCache | None = None,
+        mode: str | None = None,
     ):
-        """Initialize with connection parameters."""
-        self.crew_service = CrewService(
-            company_id=company_id,
-            team_name=team_name,
-            db_server=db_server,
-            db_database=db_database,
-            db_username=db_username,
-            db_password=db_password,
-        )
+        """
+        Initialize with connection parameters.
+
+        Args:
+            answer_cache: Cache of previous answers (default: the shared cache,
+                None when ANSWER_CACHE_ENABLED is off)
+            mode: "crew" or "fast" (default: COPILOT_DEFAULT_MODE)
+
+        Raises:
+            ValueError: If mode is unknown
+        """
+        self.mode = mode or COPILOT_DEFAULT_MODE
+        if self.mode not in PIPELINE_MODES:
+            raise ValueError(f"Unknown pipeline mode '{self.mode}'. Choose from: {', '.join(PIPELINE_MODES)}")
+        self.company_id = company_id
+        self.team_name = team_name
+        self.answer_cache = answer_cache or get_answer_cache()
+        self._connection = {
+            "db_server": db_server,
+            "db_database": db_database,
+            "db_username": db_username,
+            "db_password": db_password,
+        }
+        self._crew_service = None
+
+    @property
+    def crew_service(self):
+        """Pipeline of the selected mode, built on first use (a cache hit never needs its LLM and tools)."""
+        if self._crew_service is None:
+            self._crew_service = PIPELINE_MODES[self.mode](
+                company_id=self.company_id,
+                team_name=self.team_name,
+                **self._connection,
+            )
+        return self._crew_service
 
     def process_question(self, question: str) -> dict:
         """
         Process a user question and return the response.
+
+        Answers are served from the answer cache when the same (or a near
+        duplicate) question was answered for the company and team, in the
+        same mode, before; only answers whose SQL executed successfully are
+        cached.
         
         Args:
             question: The natural language question
             
         Returns:
-            dict with 'answer' key containing the response
+            dict with 'answer' key containing the response and 'cache'
+            ("exact" / "semantic" on a cache hit, otherwise None)
         """
         try:
-            logger.info(f"Processing question: {question}")
-            answer = self.crew_service.run(question)
+            logger.info(f"Processing question ({self.mode} mode): {question}")
+            if self.answer_cache:
+                cached = self.answer_cache.get(self.company_id, self.team_name, question, mode=self.mode)
+                if cached:
+                    logger.info(f"Answer served from the {cached['tier']} answer cache")
+                    return {
+                        "success": True,
+                        "answer": cached["answer"],
+                        "error": None,
+                        "cache": cached["tier"],
+                    }
+
+            result = self.crew_service.run_detailed(question)
+            if self.answer_cache and result["sql_success"]:
+                self.answer_cache.set(
+                    self.company_id, self.team_name, question, result["answer"], result["sql_query"], mode=self.mode
+                )
             logger.info("Question processed successfully")
             return {
                 "success": True,
-                "answer": answer,
+                "answer": result["answer"],
                 "error": None,
+                "cache": None,
             }
         except Exception as e:
             logger.error(f"Error processing question: {e}")
@@ -54,6 +113,7 @@ class ChatService:
                 "success": False,
                 "answer": None,
                 "error": str(e),
+                "cache": None,
             }
 
 
@@ -64,6 +124,7 @@ def create_chat_service(
     db_database: str,
     db_username: str,
     db_password: str,
+    mode: str | None = None,
 ) -> ChatService:
     """Factory function to create a ChatService."""
     return ChatService(
@@ -73,4 +134,5 @@ def create_chat_service(
         db_database=db_database,
         db_username=db_username,
         db_password=db_password,
+        mode=mode,
     )
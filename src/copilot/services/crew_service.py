@@ -1,6 +1,7 @@
 # services/crew_service.py
 """CrewAI Crew orchestration service."""
 
+import logging
 import os
 from crewai import Crew, Process
 from config.database import get_llm
@@ -11,6 +12,10 @@ from tools.rbac_tool import GetAllowedTablesTool
 from tools.vector_search_tool import VectorDBTableSearchTool
 from tools.schema_tool import GetAvailableColumnsTool, GetMultipleTablesSchemasTool
 from services.sql_executor import execute_sql_query
+from services.plan_cache import PlanCache, get_plan_cache
+from tasks.schemas import IntentOutput
+
+logger = logging.getLogger(__name__)
 
 
 class CrewService:
@@ -24,14 +29,22 @@ class CrewService:
         db_database: str,
         db_username: str,
         db_password: str,
+        plan_cache: PlanCache | None = None,
     ):
-        """Initialize service with connection parameters."""
+        """
+        Initialize service with connection parameters.
+
+        Args:
+            plan_cache: Cache of validated SQL plans (default: the shared cache,
+                None when PLAN_CACHE_ENABLED is off)
+        """
         self.company_id = company_id
         self.team_name = team_name
         self.db_server = db_server
         self.db_database = db_database
         self.db_username = db_username
         self.db_password = db_password
+        self.plan_cache = plan_cache or get_plan_cache()
         
         # Initialize LLM
         self.llm = get_llm()
@@ -95,6 +108,17 @@ class CrewService:
 
     def run(self, user_question: str) -> str:
         """Run the crew pipeline with direct SQL execution between tasks."""
+        return self.run_detailed(user_question)["answer"]
+
+    def run_detailed(self, user_question: str) -> dict:
+        """
+        Run the crew pipeline and report how the answer was produced.
+
+        Returns:
+            dict with 'answer', 'sql_query', 'sql_success' (whether the SQL
+            executed without error) and 'plan_cache' ("question" / "intent"
+            when the SQL came from the plan cache, otherwise None)
+        """
         from crewai import Task
         from tasks.schemas import FinalAnswerOutput
         
@@ -116,32 +140,14 @@ class CrewService:
             date_context=date_context,
         )
         
-        # Run first 4 tasks (Intent -> Table Selection -> Schema -> SQL Generation)
-        crew_part1 = Crew(
-            agents=agents[:4],  # First 4 agents
-            tasks=tasks[:4],    # First 4 tasks
-            process=Process.sequential,
-            verbose=True,
-        )
-        
-        part1_result = crew_part1.kickoff()
-        
-        # Extract SQL query from Task 4 output
-        if hasattr(part1_result, 'pydantic') and hasattr(part1_result.pydantic, 'sql_query'):
-            sql_query = part1_result.pydantic.sql_query
-        elif hasattr(part1_result, 'raw'):
-            sql_query = part1_result.raw
+        if self.plan_cache is None:
+            # Run first 4 tasks (Intent -> Table Selection -> Schema -> SQL Generation)
+            sql_query = self._generate_sql(agents, tasks)
+            # Execute SQL directly (no agent involved)
+            sql_result = self._execute_sql(sql_query)
+            plan_tier = None
         else:
-            sql_query = str(part1_result)
-        
-        # Execute SQL directly (no agent involved)
-        sql_result = execute_sql_query(
-            sql_query=sql_query,
-            db_server=self.db_server,
-            db_database=self.db_database,
-            db_username=self.db_username,
-            db_password=self.db_password,
-        )
+            sql_query, sql_result, plan_tier = self._run_with_plan_cache(user_question, agents, tasks)
         
         # Create a new standalone Answer Formatting task with SQL results embedded
         answer_task = Task(
@@ -210,8 +216,104 @@ Return ONLY the formatted answer text, nothing else.
         
         # Extract answer - try multiple approaches
         if hasattr(final_result, 'raw') and final_result.raw:
-            return str(final_result.raw).strip()
+            answer = str(final_result.raw).strip()
         elif hasattr(final_result, 'pydantic'):
-            return str(final_result.pydantic).strip()
+            answer = str(final_result.pydantic).strip()
+        else:
+            answer = str(final_result).strip()
+
+        return {
+            "answer": answer,
+            "sql_query": sql_query,
+            "sql_success": sql_result["success"],
+            "plan_cache": plan_tier,
+        }
+
+    def _generate_sql(self, agents: list, tasks: list, start: int = 0) -> str:
+        """Run tasks[start:4] (up to SQL Generation) as one crew and return the SQL."""
+        crew_part1 = Crew(
+            agents=agents[start:4],
+            tasks=tasks[start:4],
+            process=Process.sequential,
+            verbose=True,
+        )
+        
+        part1_result = crew_part1.kickoff()
+        
+        # Extract SQL query from Task 4 output
+        if hasattr(part1_result, 'pydantic') and hasattr(part1_result.pydantic, 'sql_query'):
+            return part1_result.pydantic.sql_query
+        elif hasattr(part1_result, 'raw'):
+            return part1_result.raw
         else:
-            return str(final_result).strip()
+            return str(part1_result)
+
+    def _execute_sql(self, sql_query: str) -> dict:
+        """Execute SQL directly against the source database (no agent involved)."""
+        return execute_sql_query(
+            sql_query=sql_query,
+            db_server=self.db_server,
+            db_database=self.db_database,
+            db_username=self.db_username,
+            db_password=self.db_password,
+        )
+
+    @staticmethod
+    def _intent_output(intent_task) -> IntentOutput | None:
+        """Structured output of the (executed) Intent Understanding task, if it parsed."""
+        output = getattr(intent_task, "output", None)
+        intent = getattr(output, "pydantic", None)
+        return intent if isinstance(intent, IntentOutput) and intent.sql_intent and intent.query_key else None
+
+    def _run_with_plan_cache(self, user_question: str, agents: list, tasks: list) -> tuple[str, dict, str | None]:
+        """
+        Get and execute the SQL for a question, reusing a cached plan when possible.
+
+        1. A plan validated for this exact question skips all four agents.
+        2. Otherwise only the Intent agent runs; a plan validated for its
+           sql_intent / query_key (and a question with the same numbers and
+           ordering / negation words) skips table selection, schema and SQL
+           generation.
+        3. Otherwise the remaining agents generate the SQL as usual.
+
+        Cached SQL is always executed again for fresh data. A success promotes
+        the plan; a failure evicts it and the SQL is regenerated.
+
+        Returns:
+            (sql_query, sql_result, plan_tier) where plan_tier is "question",
+            "intent" or None when the SQL was generated
+        """
+        cache = self.plan_cache
+        intent_ran = False
+        plan = cache.get_by_question(self.company_id, self.team_name, user_question)
+        plan_tier = "question" if plan else None
+
+        if plan is None:
+            Crew(agents=agents[:1], tasks=tasks[:1], process=Process.sequential, verbose=True).kickoff()
+            intent_ran = True
+            intent = self._intent_output(tasks[0])
+            if intent:
+                plan = cache.get_by_intent(
+                    self.company_id, self.team_name, user_question, intent.sql_intent, intent.query_key
+                )
+                plan_tier = "intent" if plan else None
+
+        if plan:
+            logger.info(f"Plan cache hit ({plan_tier}): reusing SQL validated {plan['successes']} time(s)")
+            sql_result = self._execute_sql(plan["sql_query"])
+            if sql_result["success"]:
+                cache.promote(
+                    self.company_id, self.team_name, user_question,
+                    plan["sql_intent"], plan["query_key"], plan["sql_query"]
+                )
+                return plan["sql_query"], sql_result, plan_tier
+            logger.warning(f"Cached plan failed, evicting and regenerating SQL: {sql_result['error']}")
+            cache.evict(self.company_id, self.team_name, user_question, plan["sql_intent"], plan["query_key"])
+
+        # The Intent task output is reused by the later tasks when it already ran
+        sql_query = self._generate_sql(agents, tasks, start=1 if intent_ran else 0)
+        sql_result = self._execute_sql(sql_query)
+        intent = self._intent_output(tasks[0])
+        if sql_result["success"] and intent:
+            cache.promote(self.company_id, self.team_name, user_question, intent.sql_intent, intent.query_key, sql_query)
+        return sql_query, sql_result, None
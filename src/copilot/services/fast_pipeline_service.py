@@ -0,0 +1,144 @@
+"""Single-pass ("fast mode") NL-to-SQL pipeline."""
+
+import json
+import logging
+import re
+
+from agents.prompts import (
+    ANSWER_FORMATTING_PROMPT,
+    FAST_ANSWER_TEMPLATE,
+    FAST_SQL_PROMPT,
+    FAST_SQL_USER_TEMPLATE,
+)
+from config.settings import FAST_MODE_MAX_TABLES, FAST_MODE_MAX_RESULT_ROWS
+from services.crew_service import CrewService
+from tasks.schemas import FastSQLPlanOutput
+from utils.date_helpers import get_date_context
+
+logger = logging.getLogger(__name__)
+
+
+class FastPipelineService(CrewService):
+    """
+    Alternative to the five-agent crew with the same inputs and outputs.
+
+    Table selection and schema fetching run in code (RBAC query, vector
+    search on the question, one batched schema call); the LLM is called
+    twice: once for a structured {sql_intent, query_key, sql_query} plan
+    and once to format the answer. Tools, SQL execution and the plan
+    cache are shared with CrewService.
+    """
+
+    def run_detailed(self, user_question: str) -> dict:
+        """
+        Answer a question in a single pass.
+
+        Returns:
+            dict with 'answer', 'sql_query', 'sql_success' and 'plan_cache'
+            (same shape as CrewService.run_detailed)
+        """
+        plan_tier = None
+        plan = self.plan_cache.get_by_question(self.company_id, self.team_name, user_question) if self.plan_cache else None
+        if plan:
+            plan_tier = "question"
+            logger.info(f"Plan cache hit (question): reusing SQL validated {plan['successes']} time(s)")
+            sql_result = self._execute_sql(plan["sql_query"])
+            if not sql_result["success"]:
+                logger.warning(f"Cached plan failed, evicting and regenerating SQL: {sql_result['error']}")
+                self.plan_cache.evict(self.company_id, self.team_name, user_question, plan["sql_intent"], plan["query_key"])
+                plan, plan_tier = None, None
+
+        if plan is None:
+            tables = self._select_tables(user_question)
+            if not tables:
+                return {
+                    "answer": f"I couldn't retrieve that information: no tables are available for team '{self.team_name}'.",
+                    "sql_query": None,
+                    "sql_success": False,
+                    "plan_cache": None,
+                }
+            plan = self._generate_plan(user_question, self._fetch_schemas(tables))
+            sql_result = self._execute_sql(plan.sql_query)
+            if sql_result["success"] and self.plan_cache and plan.sql_intent and plan.query_key:
+                self.plan_cache.promote(
+                    self.company_id, self.team_name, user_question, plan.sql_intent, plan.query_key, plan.sql_query
+                )
+            plan = plan.model_dump()
+        elif self.plan_cache:
+            self.plan_cache.promote(
+                self.company_id, self.team_name, user_question, plan["sql_intent"], plan["query_key"], plan["sql_query"]
+            )
+
+        return {
+            "answer": self._format_answer(user_question, plan["sql_query"], sql_result),
+            "sql_query": plan["sql_query"],
+            "sql_success": sql_result["success"],
+            "plan_cache": plan_tier,
+        }
+
+    def _select_tables(self, user_question: str) -> list[str]:
+        """RBAC-allowed tables ranked by vector search (keyword boosting included)."""
+        allowed = json.loads(self.rbac_tool._run(team_name=self.team_name))
+        allowed_tables = allowed.get("allowed_tables") or []
+        if not allowed_tables:
+            logger.warning(f"No allowed tables for team {self.team_name}: {allowed.get('error', 'none assigned')}")
+            return []
+
+        ranked = json.loads(self.vector_search_tool._run(query_key=user_question, allowed_tables=allowed_tables))
+        return ranked[:FAST_MODE_MAX_TABLES]
+
+    def _fetch_schemas(self, tables: list[str]) -> dict:
+        """Columns of all selected tables in one tool call."""
+        schemas = json.loads(self.schema_multi_tool._run(table_names=tables))
+        return {table: columns for table, columns in schemas.items() if columns}
+
+    def _generate_plan(self, user_question: str, table_schemas: dict) -> FastSQLPlanOutput:
+        """One LLM call returning the SQL intent, query key and query."""
+        response = self.llm.call([
+            {"role": "system", "content": FAST_SQL_PROMPT},
+            {
+                "role": "user",
+                "content": FAST_SQL_USER_TEMPLATE.format(
+                    user_question=user_question,
+                    date_context=get_date_context(),
+                    table_schemas=json.dumps(table_schemas, indent=2),
+                ),
+            },
+        ])
+        return self._parse_plan(str(response))
+
+    @staticmethod
+    def _parse_plan(response: str) -> FastSQLPlanOutput:
+        """Parse the JSON plan; a response that is not JSON is taken as the SQL itself."""
+        text = response.strip()
+        match = re.search(r'```(?:json)?\s*([\s\S]*?)```', text, re.IGNORECASE)
+        if match:
+            text = match.group(1).strip()
+        try:
+            return FastSQLPlanOutput.model_validate_json(text)
+        except ValueError:
+            logger.warning("Fast mode SQL response was not a JSON plan; using it as the query")
+            return FastSQLPlanOutput(sql_query=response)
+
+    def _format_answer(self, user_question: str, sql_query: str, sql_result: dict) -> str:
+        """One LLM call turning the SQL results into the final answer."""
+        if sql_result["success"]:
+            rows = sql_result["result"]
+            if isinstance(rows, list) and len(rows) > FAST_MODE_MAX_RESULT_ROWS:
+                rows = rows[:FAST_MODE_MAX_RESULT_ROWS] + [f"... {len(rows) - FAST_MODE_MAX_RESULT_ROWS} more rows"]
+            query_results = rows
+        else:
+            query_results = f"Error: {sql_result['error']}"
+
+        response = self.llm.call([
+            {"role": "system", "content": ANSWER_FORMATTING_PROMPT},
+            {
+                "role": "user",
+                "content": FAST_ANSWER_TEMPLATE.format(
+                    user_question=user_question,
+                    sql_query=sql_query,
+                    query_results=query_results,
+                ),
+            },
+        ])
+        return str(response).strip()
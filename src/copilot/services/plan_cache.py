@@ -0,0 +1,161 @@
+"""Cache of validated NL-to-SQL plans (generated SQL per intent and query key)."""
+
+import json
+import logging
+import threading
+import time
+
+from config.settings import PLAN_CACHE_ENABLED, PLAN_CACHE_TTL_SECONDS
+from services.answer_cache import TenantScopedCache, _guard_words, _numbers, key_digest, normalize_question
+
+logger = logging.getLogger(__name__)
+
+
+class PlanCache(TenantScopedCache):
+    """
+    Caches the SQL produced by the intent -> tables -> schema -> SQL agents.
+
+    Plans are keyed by the intent agent's sql_intent and query_key, so
+    paraphrases with the same intent share one plan, provided they contain
+    the same numbers and ordering / negation words as the question the plan
+    was validated for (the intent text may leave out "top 10" or "2014",
+    which the SQL still hard-codes). The questions that led to a plan are
+    kept as aliases, so a repeated question skips the agents entirely. A plan is only stored once its SQL executed successfully;
+    every further success refreshes its TTL (promotion) and a failed
+    execution removes it (eviction).
+
+    Entries are scoped like the answer cache (company, team, date bucket,
+    ingestion version) and expire after PLAN_CACHE_TTL_SECONDS without a
+    successful execution. Redis errors only disable caching for the call.
+    """
+
+    key_prefix = "copilot:plans"
+
+    def _plan_key(self, scope: str, sql_intent: str, query_key: str) -> str:
+        return f"{scope}:plan:{key_digest(normalize_question(sql_intent), normalize_question(query_key))}"
+
+    def _alias_key(self, scope: str, question: str) -> str:
+        return f"{scope}:alias:{key_digest(normalize_question(question))}"
+
+    def get_by_question(self, company_id: str, team_name: str, question: str) -> dict | None:
+        """
+        Plan previously validated for this question.
+
+        Returns:
+            {'question', 'sql_query', 'sql_intent', 'query_key', 'successes', 'created_at',
+             'last_success_at'} or None
+        """
+        if not PLAN_CACHE_ENABLED:
+            return None
+        try:
+            scope = self._scope(company_id, team_name)
+            if scope is None:
+                return None
+            plan_key = self.redis.get(self._alias_key(scope, question))
+            payload = self.redis.get(plan_key) if plan_key else None
+            return json.loads(payload) if payload else None
+        except Exception as e:
+            logger.warning(f"Plan cache lookup failed: {e}")
+            return None
+
+    def get_by_intent(
+        self,
+        company_id: str,
+        team_name: str,
+        question: str,
+        sql_intent: str,
+        query_key: str,
+    ) -> dict | None:
+        """
+        Plan previously validated for this intent and query key, or None.
+
+        The plan is only returned if `question` has the same numbers and guard
+        words (top / bottom, not, before / after, ...) as its originating question.
+        """
+        if not PLAN_CACHE_ENABLED:
+            return None
+        try:
+            scope = self._scope(company_id, team_name)
+            if scope is None:
+                return None
+            payload = self.redis.get(self._plan_key(scope, sql_intent, query_key))
+            plan = json.loads(payload) if payload else None
+            if plan is None or "question" not in plan:
+                return None
+            normalized = normalize_question(question)
+            if _numbers(plan["question"]) != _numbers(normalized) or _guard_words(plan["question"]) != _guard_words(normalized):
+                logger.info("Plan cache: intent matches but numbers / ordering words differ, not reusing SQL")
+                return None
+            return plan
+        except Exception as e:
+            logger.warning(f"Plan cache lookup failed: {e}")
+            return None
+
+    def promote(
+        self,
+        company_id: str,
+        team_name: str,
+        question: str,
+        sql_intent: str,
+        query_key: str,
+        sql_query: str,
+    ):
+        """Record a successful execution of a plan (stores it on first success)."""
+        if not PLAN_CACHE_ENABLED:
+            return
+        try:
+            scope = self._scope(company_id, team_name)
+            if scope is None:
+                return
+            plan_key = self._plan_key(scope, sql_intent, query_key)
+            payload = self.redis.get(plan_key)
+            plan = json.loads(payload) if payload else {}
+            now = time.time()
+            if plan.get("sql_query") != sql_query or "question" not in plan:
+                plan = {
+                    "question": normalize_question(question),
+                    "sql_query": sql_query,
+                    "sql_intent": sql_intent,
+                    "query_key": query_key,
+                    "successes": 0,
+                    "created_at": now,
+                }
+            plan["successes"] += 1
+            plan["last_success_at"] = now
+
+            pipe = self.redis.pipeline()
+            pipe.set(plan_key, json.dumps(plan), ex=PLAN_CACHE_TTL_SECONDS)
+            pipe.set(self._alias_key(scope, question), plan_key, ex=PLAN_CACHE_TTL_SECONDS)
+            pipe.execute()
+        except Exception as e:
+            logger.warning(f"Plan cache write failed: {e}")
+
+    def evict(self, company_id: str, team_name: str, question: str, sql_intent: str, query_key: str):
+        """Remove a plan whose SQL failed, together with the question's alias."""
+        if not PLAN_CACHE_ENABLED:
+            return
+        try:
+            scope = self._scope(company_id, team_name)
+            if scope is None:
+                return
+            self.redis.delete(self._plan_key(scope, sql_intent, query_key), self._alias_key(scope, question))
+        except Exception as e:
+            logger.warning(f"Plan cache eviction failed: {e}")
+
+
+# Global plan cache instance (singleton)
+_plan_cache = None
+_plan_cache_lock = threading.Lock()
+
+
+def get_plan_cache() -> PlanCache | None:
+    """Returns the shared PlanCache, or None when PLAN_CACHE_ENABLED is off."""
+    global _plan_cache
+
+    if not PLAN_CACHE_ENABLED:
+        return None
+    if _plan_cache is None:
+        with _plan_cache_lock:
+            if _plan_cache is None:
+                _plan_cache = PlanCache()
+    return _plan_cache
@@ -2,11 +2,11 @@
 """Direct SQL execution without CrewAI agent."""
 
 import logging
-import pyodbc
 import pandas as pd
 from typing import Optional, Dict
 import time
 import re
+from utils.engine_registry import get_source_engine
 
 logger = logging.getLogger(__name__)
 
@@ -58,33 +58,22 @@ def execute_sql_query(
                     "error": f"Security Error: Forbidden keyword '{keyword}' detected."
                 }
         
-        # Build connection string
-        drivers = [d for d in pyodbc.drivers() if "ODBC Driver" in d and "SQL Server" in d]
-        if not drivers:
+        # Shared pooled engine for this source DB (connections are pinged before use)
+        try:
+            engine = get_source_engine(db_server, db_database, db_username, db_password)
+        except Exception as e:
             return {
                 "success": False,
                 "result": None,
-                "error": "No SQL Server ODBC driver installed!"
+                "error": str(e)
             }
         
-        driver = drivers[-1]
-        conn_string = (
-            f"DRIVER={{{driver}}};"
-            f"SERVER={db_server},1433;"
-            f"DATABASE={db_database};"
-            f"UID={db_username};"
-            f"PWD={db_password};"
-            f"LoginTimeout=30"
-        )
-        
         # Execute with retries
         for attempt in range(max_retries):
-            cnxn = None
             try:
                 logger.info(f"Executing SQL (attempt {attempt + 1}/{max_retries}): {sql_query}")
-                cnxn = pyodbc.connect(conn_string)
-                df = pd.read_sql(sql_query, cnxn)
-                cnxn.close()
+                with engine.connect() as cnxn:
+                    df = pd.read_sql(sql_query, cnxn)
                 
                 if df.empty:
                     return {
@@ -104,9 +93,6 @@ def execute_sql_query(
                 }
                 
             except Exception as e:
-                if cnxn:
-                    cnxn.close()
-                
                 logger.error(f"❌ Attempt {attempt + 1}/{max_retries} failed: {str(e)}")
                 
                 if attempt < max_retries - 1:
@@ -8,6 +8,7 @@ from tasks.schemas import (
     SQLQueryOutput,
     SQLResultOutput,
     FinalAnswerOutput,
+    FastSQLPlanOutput,
 )
 from tasks.definitions import (
     create_intent_understanding_task,
@@ -26,6 +27,7 @@ __all__ = [
     'SQLQueryOutput',
     'SQLResultOutput',
     'FinalAnswerOutput',
+    'FastSQLPlanOutput',
     # Task factories
     'create_intent_understanding_task',
     'create_table_selection_task',
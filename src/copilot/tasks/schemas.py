@@ -36,3 +36,10 @@ class SQLResultOutput(BaseModel):
 class FinalAnswerOutput(BaseModel):
     """Output from Answer Formatting Agent."""
     formatted_answer: str = Field(description="User-friendly formatted answer")
+
+
+class FastSQLPlanOutput(BaseModel):
+    """Output of the single fast-mode SQL generation call."""
+    sql_intent: str = Field(default="", description="Clear SQL intent description")
+    query_key: str = Field(default="", description="Main metric / entity word")
+    sql_query: str = Field(description="Generated SQL query")
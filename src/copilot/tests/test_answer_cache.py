@@ -0,0 +1,168 @@
+"""
+Tests for the two-tier answer cache and its invalidation token
+"""
+import fakeredis
+import numpy as np
+import pytest
+
+from repositories.metadata_db import MetadataRepository
+from services import answer_cache, chat_service
+from services.answer_cache import AnswerCache, _guard_words
+from services.chat_service import ChatService
+
+
+class ConstantEmbedding:
+    """Every question gets the same vector: only the semantic guards can tell them apart."""
+
+    def encode(self, text, normalize_embeddings=True):
+        return np.ones(4, dtype=np.float32) / 2
+
+
+@pytest.fixture
+def version(monkeypatch):
+    current = {"value": "run1@2026-01-01|-"}
+    monkeypatch.setattr(MetadataRepository, "get_ingestion_version", staticmethod(lambda company_id: current["value"]))
+    monkeypatch.setattr(answer_cache, "ANSWER_CACHE_VERSION_CHECK_SECONDS", 0)
+    return current
+
+
+@pytest.fixture
+def cache(version):
+    return AnswerCache(fakeredis.FakeRedis(decode_responses=True), embedding_model=ConstantEmbedding())
+
+
+@pytest.fixture
+def semantic(monkeypatch):
+    monkeypatch.setattr(answer_cache, "ANSWER_CACHE_SEMANTIC_ENABLED", True)
+
+
+class TestExactTier:
+    """Exact matches on the normalized question"""
+
+    def test_hit_ignores_case_and_punctuation(self, cache):
+        cache.set("c1", "Sales", "Total revenue in 2014?", "42", "SELECT 42")
+        hit = cache.get("c1", "sales", "  total REVENUE in 2014 ")
+        assert hit["answer"] == "42" and hit["tier"] == "exact"
+
+    def test_semantic_tier_off_by_default(self, cache):
+        cache.set("c1", "Sales", "total revenue in 2014", "42")
+        assert cache.get("c1", "Sales", "revenue total for 2014") is None
+
+    def test_new_ingestion_version_invalidates(self, cache, version):
+        cache.set("c1", "Sales", "total revenue", "42")
+        version["value"] = "run2@2026-01-02|-"
+        assert cache.get("c1", "Sales", "total revenue") is None
+
+
+class TestSemanticTier:
+    """Similar questions only match with the same numbers and guard words"""
+
+    def test_paraphrase_hits(self, cache, semantic):
+        cache.set("c1", "Sales", "top 5 products by revenue", "A, B, C, D, E")
+        hit = cache.get("c1", "Sales", "show the top 5 products by revenue")
+        assert hit["tier"] == "semantic"
+
+    @pytest.mark.parametrize("cached, asked", [
+        ("top 5 products by revenue", "bottom 5 products by revenue"),
+        ("orders shipped in 2014", "orders not shipped in 2014"),
+        ("customers who ordered", "customers who haven't ordered"),
+        ("revenue in 2014", "revenue in 2015"),
+    ])
+    def test_opposite_questions_miss(self, cache, semantic, cached, asked):
+        cache.set("c1", "Sales", cached, "cached answer")
+        assert cache.get("c1", "Sales", asked) is None
+
+    def test_guard_words(self):
+        assert _guard_words("customers who haven't ordered") == {"not"}
+        assert _guard_words("top 5 products without returns") == {"top", "without"}
+
+
+class FakeCursor:
+    def __init__(self, fail_first: bool):
+        self.fail_first = fail_first
+        self.queries = []
+
+    def execute(self, query, params):
+        self.queries.append(query)
+        if self.fail_first and len(self.queries) == 1:
+            error = Exception("relation \"ingestion_completions\" does not exist")
+            error.pgcode = "42P01"
+            raise error
+
+    def fetchone(self):
+        if len(self.queries) == 1:
+            return ("run1@2026-01-01 10:00:00+00", None)
+        return (None,)
+
+    def close(self):
+        pass
+
+
+class FakeConnection:
+    def __init__(self, cursor):
+        self._cursor = cursor
+
+    def cursor(self):
+        return self._cursor
+
+    def rollback(self):
+        pass
+
+    def close(self):
+        pass
+
+
+class TestIngestionVersion:
+    """The token comes from the pipeline's completion marker"""
+
+    def test_reads_completion_marker(self, monkeypatch):
+        cursor = FakeCursor(fail_first=False)
+        monkeypatch.setattr(MetadataRepository, "_get_connection", staticmethod(lambda: FakeConnection(cursor)))
+        assert MetadataRepository.get_ingestion_version("c1") == "run1@2026-01-01 10:00:00+00|-"
+        assert "ingestion_completions" in cursor.queries[0]
+
+    def test_missing_completion_table(self, monkeypatch):
+        cursor = FakeCursor(fail_first=True)
+        monkeypatch.setattr(MetadataRepository, "_get_connection", staticmethod(lambda: FakeConnection(cursor)))
+        assert MetadataRepository.get_ingestion_version("c1") == "-|-"
+
+
+class FakePipeline:
+    """Stands in for CrewService / FastPipelineService; records every pipeline built."""
+
+    mode = None
+    built = []
+
+    def __init__(self, **connection):
+        self.built.append(connection["company_id"])
+
+    def run_detailed(self, question):
+        return {"answer": f"{self.mode} answer", "sql_query": "SELECT 1", "sql_success": True}
+
+
+@pytest.fixture
+def pipelines(monkeypatch):
+    FakePipeline.built = []
+    monkeypatch.setattr(chat_service, "PIPELINE_MODES", {
+        mode: type(f"Fake{mode.title()}Pipeline", (FakePipeline,), {"mode": mode}) for mode in ("crew", "fast")
+    })
+    return FakePipeline.built
+
+
+def _chat(cache, mode):
+    return ChatService("c1", "Sales", "srv", "db", "user", "password", answer_cache=cache, mode=mode)
+
+
+class TestChatService:
+    """Cache hits skip building the pipeline; modes do not share answers"""
+
+    def test_cache_hit_does_not_build_pipeline(self, cache, pipelines):
+        assert _chat(cache, "crew").process_question("total revenue")["cache"] is None
+        assert pipelines == ["c1"]
+        assert _chat(cache, "crew").process_question("total revenue")["cache"] == "exact"
+        assert pipelines == ["c1"]
+
+    def test_modes_have_separate_answers(self, cache, pipelines):
+        _chat(cache, "fast").process_question("total revenue")
+        result = _chat(cache, "crew").process_question("total revenue")
+        assert result["cache"] is None and result["answer"] == "crew answer"
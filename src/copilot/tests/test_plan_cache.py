@@ -0,0 +1,97 @@
+"""
+Tests for the cache of validated SQL plans
+"""
+import fakeredis
+import pytest
+
+from repositories.metadata_db import MetadataRepository
+from services import answer_cache, plan_cache
+from services.plan_cache import PlanCache
+
+
+class UnavailableRedis:
+    """Every command fails as if Redis were down."""
+
+    def __getattr__(self, name):
+        def fail(*args, **kwargs):
+            raise ConnectionError("redis unavailable")
+        return fail
+
+
+@pytest.fixture
+def version(monkeypatch):
+    current = {"value": "run1@2026-01-01|-"}
+    monkeypatch.setattr(MetadataRepository, "get_ingestion_version", staticmethod(lambda company_id: current["value"]))
+    monkeypatch.setattr(answer_cache, "ANSWER_CACHE_VERSION_CHECK_SECONDS", 0)
+    monkeypatch.setattr(plan_cache, "PLAN_CACHE_ENABLED", True)
+    return current
+
+
+@pytest.fixture
+def cache(version):
+    return PlanCache(fakeredis.FakeRedis(decode_responses=True))
+
+
+def _promote(cache, question="Total revenue in 2014?", sql="SELECT SUM(total) FROM dbo.Orders"):
+    cache.promote("c1", "Sales", question, "revenue_total", "year=2014", sql)
+
+
+class TestPlanCache:
+    """Plans are stored on success, shared by intent, evicted on failure"""
+
+    def test_repeated_question_hits_alias(self, cache):
+        _promote(cache)
+        plan = cache.get_by_question("c1", "sales", "total revenue in 2014")
+        assert plan["sql_query"] == "SELECT SUM(total) FROM dbo.Orders" and plan["successes"] == 1
+
+    def test_paraphrase_shares_plan_by_intent(self, cache):
+        _promote(cache)
+        assert cache.get_by_question("c1", "Sales", "how much did we sell in 2014") is None
+        assert cache.get_by_intent("c1", "Sales", "how much did we sell in 2014", "revenue_total", "year=2014")["sql_query"].startswith("SELECT")
+
+    @pytest.mark.parametrize("validated, asked", [
+        ("top 5 products by revenue", "top 10 products by revenue"),
+        ("top 5 products by revenue", "bottom 5 products by revenue"),
+        ("orders in 2013", "orders in 2014"),
+        ("orders shipped last year", "orders not shipped last year"),
+    ])
+    def test_intent_hit_requires_same_numbers_and_guard_words(self, cache, validated, asked):
+        # The intent text leaves out the value the SQL hard-codes
+        cache.promote("c1", "Sales", validated, "ranked_list", "products", "SELECT ...")
+        assert cache.get_by_intent("c1", "Sales", validated, "ranked_list", "products") is not None
+        assert cache.get_by_intent("c1", "Sales", asked, "ranked_list", "products") is None
+
+    def test_successes_counted_until_sql_changes(self, cache):
+        _promote(cache)
+        _promote(cache, question="revenue 2014")
+        assert cache.get_by_intent("c1", "Sales", "revenue in 2014", "revenue_total", "year=2014")["successes"] == 2
+        _promote(cache, sql="SELECT SUM(amount) FROM dbo.Orders")
+        assert cache.get_by_intent("c1", "Sales", "revenue in 2014", "revenue_total", "year=2014")["successes"] == 1
+
+    def test_failure_evicts_plan_and_alias(self, cache):
+        _promote(cache)
+        cache.evict("c1", "Sales", "Total revenue in 2014?", "revenue_total", "year=2014")
+        assert cache.get_by_question("c1", "Sales", "Total revenue in 2014?") is None
+        assert cache.get_by_intent("c1", "Sales", "revenue in 2014", "revenue_total", "year=2014") is None
+
+    def test_scoped_by_team_and_ingestion_version(self, cache, version):
+        _promote(cache)
+        assert cache.get_by_question("c1", "HR", "Total revenue in 2014?") is None
+        version["value"] = "run2@2026-01-02|-"
+        assert cache.get_by_question("c1", "Sales", "Total revenue in 2014?") is None
+
+    def test_entries_expire(self, cache, monkeypatch):
+        monkeypatch.setattr(plan_cache, "PLAN_CACHE_TTL_SECONDS", 60)
+        _promote(cache)
+        assert all(0 < cache.redis.ttl(key) <= 60 for key in cache.redis.keys("copilot:plans:*"))
+
+    def test_disabled(self, cache, monkeypatch):
+        monkeypatch.setattr(plan_cache, "PLAN_CACHE_ENABLED", False)
+        _promote(cache)
+        assert cache.redis.keys("*") == []
+        assert plan_cache.get_plan_cache() is None
+
+    def test_redis_errors_are_misses(self, version):
+        cache = PlanCache(UnavailableRedis())
+        _promote(cache)
+        assert cache.get_by_question("c1", "Sales", "Total revenue in 2014?") is None
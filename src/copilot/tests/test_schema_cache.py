@@ -0,0 +1,145 @@
+"""
+Tests for batched source schema lookups and the schema cache
+"""
+from types import SimpleNamespace
+
+import pytest
+
+from repositories import schema_cache, source_db
+from repositories.metadata_db import MetadataRepository
+from repositories.schema_cache import SchemaCache
+from repositories.source_db import SourceDBRepository
+
+
+class FakeCatalog:
+    """
+    Answers the sys.columns query like SQL Server: one row per column of the
+    requested tables whose modify_date differs from the one sent, a single
+    row without column for unchanged tables, nothing for missing ones.
+    """
+
+    def __init__(self, tables):
+        self.tables = tables
+        self.queries = []
+
+    def connect(self):
+        return self
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        pass
+
+    def execute(self, query, params):
+        self.queries.append(params)
+        rows = []
+        for i in range(len(params) // 3):
+            requested = (params[f"schema{i}"].lower(), params[f"table{i}"].lower())
+            for (schema, table), (modify_date, columns) in self.tables.items():
+                if (schema.lower(), table.lower()) != requested:
+                    continue
+                if modify_date == params[f"modified{i}"]:
+                    rows.append((schema, table, modify_date, None, None))
+                else:
+                    rows.extend((schema, table, modify_date, column, "int") for column in columns)
+        return SimpleNamespace(fetchall=lambda: rows)
+
+
+@pytest.fixture
+def version(monkeypatch):
+    current = {"value": "run1"}
+    monkeypatch.setattr(MetadataRepository, "get_ingestion_version", staticmethod(lambda company_id: current["value"]))
+    monkeypatch.setattr(schema_cache, "SCHEMA_CACHE_VERSION_CHECK_SECONDS", 0)
+    monkeypatch.setattr(schema_cache, "SCHEMA_CACHE_TTL_SECONDS", 300)
+    return current
+
+
+@pytest.fixture
+def catalog():
+    return FakeCatalog({
+        ("Sales", "Customer"): ("2024-01-01T00:00:00", ["CustomerID", "TerritoryID"]),
+        ("Person", "Person"): ("2024-01-02T00:00:00", ["BusinessEntityID", "FirstName"]),
+    })
+
+
+@pytest.fixture
+def repo(monkeypatch, version, catalog):
+    cache = SchemaCache()
+    monkeypatch.setattr(source_db, "get_schema_cache", lambda: cache)
+    repo = SourceDBRepository("srv", "db", "user", "password", company_id="c1")
+    monkeypatch.setattr(repo, "_get_engine", lambda: catalog)
+    return repo
+
+
+def _names(columns):
+    return [column["name"] for column in columns]
+
+
+class TestGetTablesColumns:
+    """Several tables per query; unchanged tables are revalidated, not refetched"""
+
+    def test_one_query_for_all_tables(self, repo, catalog):
+        result = repo.get_tables_columns(["Sales.Customer", "Person.Person", "dbo.Missing", "no_schema"])
+        assert _names(result["Sales.Customer"]) == ["CustomerID", "TerritoryID"]
+        assert _names(result["Person.Person"]) == ["BusinessEntityID", "FirstName"]
+        assert result["dbo.Missing"] == [] and result["no_schema"] == []
+        assert len(catalog.queries) == 1
+
+    def test_original_case_sent_to_server(self, repo, catalog):
+        repo.get_tables_columns(["Sales.Customer"])
+        assert catalog.queries[0]["schema0"] == "Sales" and catalog.queries[0]["table0"] == "Customer"
+
+    def test_batches_of_max_tables_per_query(self, repo, catalog, monkeypatch):
+        monkeypatch.setattr(source_db, "MAX_TABLES_PER_QUERY", 1)
+        repo.get_tables_columns(["Sales.Customer", "Person.Person"])
+        assert len(catalog.queries) == 2
+
+    def test_fresh_entries_need_no_query(self, repo, catalog):
+        repo.get_tables_columns(["Sales.Customer"])
+        result = repo.get_tables_columns(["sales.customer"])
+        assert _names(result["sales.customer"]) == ["CustomerID", "TerritoryID"]
+        assert len(catalog.queries) == 1
+
+    def test_stale_entries_revalidated_by_modify_date(self, repo, catalog, monkeypatch):
+        repo.get_tables_columns(["Sales.Customer", "Person.Person"])
+        monkeypatch.setattr(schema_cache, "SCHEMA_CACHE_TTL_SECONDS", 0)
+        catalog.tables[("Sales", "Customer")] = ("2024-02-01T00:00:00", ["CustomerID", "TerritoryID", "StoreID"])
+
+        result = repo.get_tables_columns(["Sales.Customer", "Person.Person"])
+        assert catalog.queries[-1]["modified1"] == "2024-01-02T00:00:00"
+        assert _names(result["Sales.Customer"]) == ["CustomerID", "TerritoryID", "StoreID"]
+        assert _names(result["Person.Person"]) == ["BusinessEntityID", "FirstName"]
+
+    def test_dropped_table_discarded(self, repo, catalog, monkeypatch):
+        repo.get_tables_columns(["Sales.Customer"])
+        monkeypatch.setattr(schema_cache, "SCHEMA_CACHE_TTL_SECONDS", 0)
+        del catalog.tables[("Sales", "Customer")]
+        assert repo.get_tables_columns(["Sales.Customer"]) == {"Sales.Customer": []}
+
+    def test_new_ingestion_version_refetches(self, repo, catalog, version):
+        repo.get_tables_columns(["Sales.Customer"])
+        version["value"] = "run2"
+        repo.get_tables_columns(["Sales.Customer"])
+        assert len(catalog.queries) == 2 and catalog.queries[-1]["modified0"] == ""
+
+
+class TestSchemaCache:
+    """LRU bound and per-company invalidation"""
+
+    def test_least_recently_used_evicted(self, monkeypatch):
+        monkeypatch.setattr(schema_cache, "SCHEMA_CACHE_MAX_TABLES", 2)
+        cache = SchemaCache()
+        tenant = ("c1", "srv", "db")
+        cache.put(tenant, "dbo.a", [], "d")
+        cache.put(tenant, "dbo.b", [], "d")
+        cache.get(tenant, "dbo.a")
+        cache.put(tenant, "dbo.c", [], "d")
+        assert cache.get(tenant, "dbo.b") is None and cache.get(tenant, "dbo.a") is not None
+
+    def test_invalidate_one_company(self):
+        cache = SchemaCache()
+        cache.put(("c1", "srv", "db"), "dbo.a", [], "d")
+        cache.put(("c2", "srv", "db"), "dbo.a", [], "d")
+        assert cache.invalidate("c1") == 1
+        assert cache.get(("c2", "srv", "db"), "dbo.a") is not None
@@ -0,0 +1,93 @@
+"""
+Tests for RBAC-filtered vector search on indexed companies
+"""
+import json
+
+import numpy as np
+import pytest
+
+from config import settings
+from tools import vector_search_tool
+from tools.vector_search_tool import VectorDBTableSearchTool
+
+EF_SEARCH = 100
+
+
+class FakeVectorCursor:
+    """
+    client_schema_vectors of one company with an HNSW index: unless index
+    scans are disabled or iterative, the WHERE filter only sees the
+    ef_search nearest rows, as in pgvector.
+    """
+
+    def __init__(self, embeddings):
+        self.embeddings = embeddings
+        self.settings = {}
+
+    def execute(self, query, params=None):
+        if query.startswith("SET LOCAL"):
+            name, value = query[len("SET LOCAL "):].split(" = ")
+            self.settings[name] = params[0] if params else value
+            return
+        company_id, allowed, query_embedding = params
+        query_vector = np.array(json.loads(query_embedding))
+        ranked = sorted(self.embeddings, key=lambda name: np.linalg.norm(self.embeddings[name] - query_vector))
+        if self.settings.get("enable_indexscan") != "off" and self.settings.get("hnsw.iterative_scan", "off") == "off":
+            ranked = ranked[:int(self.settings["hnsw.ef_search"])]
+        self.rows = [(name,) for name in ranked if name in allowed][:12]
+
+    def fetchall(self):
+        return self.rows
+
+
+class FakeRawConnection:
+    def __init__(self, cursor):
+        self._cursor = cursor
+
+    def cursor(self):
+        return self._cursor
+
+    def close(self):
+        pass
+
+
+class FixedEmbedding:
+    def encode(self, text, normalize_embeddings=True):
+        return np.zeros(2)
+
+
+@pytest.fixture
+def cursor(monkeypatch):
+    # 1000 tables; dbo.T{i} lies at distance i from every query
+    cursor = FakeVectorCursor({f"dbo.T{i}": np.array([float(i), 0.0]) for i in range(1000)})
+    engine = type("Engine", (), {"raw_connection": lambda self: FakeRawConnection(cursor)})()
+    monkeypatch.setattr(VectorDBTableSearchTool, "get_metadata_engine", lambda self: engine)
+    monkeypatch.setattr(vector_search_tool, "get_embedding_model", lambda: FixedEmbedding())
+    monkeypatch.setattr(settings, "VECTOR_SEARCH_EF_SEARCH", EF_SEARCH)
+    return cursor
+
+
+def _search(query_key, allowed_tables):
+    tool = VectorDBTableSearchTool(company_id="c1", metadata_url="postgresql://localhost/test")
+    return json.loads(tool._run(query_key, allowed_tables))
+
+
+class TestFilteredVectorSearch:
+    """Allowed tables far from the query are still the closest allowed ones"""
+
+    ALLOWED = [f"dbo.T{i}" for i in range(900, 920)]
+
+    def test_exact_scan_when_filtered(self, cursor, monkeypatch):
+        monkeypatch.setattr(settings, "VECTOR_SEARCH_ITERATIVE_SCAN", "off")
+        assert _search("misc", self.ALLOWED) == self.ALLOWED[:12]
+        assert cursor.settings["enable_indexscan"] == "off"
+
+    def test_iterative_scan_when_configured(self, cursor, monkeypatch):
+        monkeypatch.setattr(settings, "VECTOR_SEARCH_ITERATIVE_SCAN", "relaxed_order")
+        assert _search("misc", self.ALLOWED) == self.ALLOWED[:12]
+        assert "enable_indexscan" not in cursor.settings
+
+    def test_unfiltered_ann_would_miss_them(self, cursor):
+        cursor.execute("SET LOCAL hnsw.ef_search = %s", (EF_SEARCH,))
+        cursor.execute("SELECT", ("c1", tuple(self.ALLOWED), "[0, 0]"))
+        assert cursor.fetchall() == []
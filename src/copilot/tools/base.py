@@ -4,8 +4,9 @@
 import os
 from pydantic import Field
 from crewai.tools import BaseTool
-from sqlalchemy import create_engine
 from config.database import get_vector_db_url
+from repositories.source_db import SourceDBRepository
+from utils.engine_registry import get_metadata_engine, get_source_engine
 
 
 class BaseSQLTool(BaseTool):
@@ -38,10 +39,45 @@ class BaseSQLTool(BaseTool):
             "port": VECTOR_DB_PORT
         }
 
+    def apply_vector_search_settings(self, cur, filtered: bool = False) -> None:
+        """
+        Set pgvector ANN search parameters for the current transaction.
+
+        Args:
+            cur: Cursor of the search transaction
+            filtered: The query only keeps some of the company's tables
+                (e.g. RBAC allowed_tables); the index is then scanned
+                iteratively (VECTOR_SEARCH_ITERATIVE_SCAN) or not used at all
+        """
+        from config.settings import (
+            VECTOR_SEARCH_EF_SEARCH,
+            VECTOR_SEARCH_IVFFLAT_PROBES,
+            VECTOR_SEARCH_ITERATIVE_SCAN,
+        )
+        cur.execute("SET LOCAL hnsw.ef_search = %s", (VECTOR_SEARCH_EF_SEARCH,))
+        cur.execute("SET LOCAL ivfflat.probes = %s", (VECTOR_SEARCH_IVFFLAT_PROBES,))
+        if not filtered:
+            return
+        if VECTOR_SEARCH_ITERATIVE_SCAN in ("relaxed_order", "strict_order"):
+            cur.execute("SET LOCAL hnsw.iterative_scan = %s", (VECTOR_SEARCH_ITERATIVE_SCAN,))
+            cur.execute("SET LOCAL ivfflat.iterative_scan = relaxed_order")
+        else:
+            cur.execute("SET LOCAL enable_indexscan = off")
+
     def get_metadata_engine(self):
-        """Get SQLAlchemy engine for metadata database."""
+        """Get the shared, pooled SQLAlchemy engine for the metadata database."""
         try:
-            return create_engine(self.metadata_url)
+            return get_metadata_engine(self.metadata_url)
         except Exception as e:
             print(f"Cannot connect to Metadata DB: {e}")
             return None
+
+    def get_source_engine(self):
+        """Get the shared, pooled SQLAlchemy engine for the source database."""
+        return get_source_engine(self.db_server, self.db_database, self.db_username, self.db_password)
+
+    def get_source_repository(self) -> SourceDBRepository:
+        """Source DB repository for this tool's company (shares the schema cache)."""
+        return SourceDBRepository(
+            self.db_server, self.db_database, self.db_username, self.db_password, company_id=self.company_id
+        )
@@ -3,11 +3,8 @@
 
 import json
 import traceback
-import pyodbc
 from typing import List
 from pydantic import BaseModel, Field
-from sqlalchemy import create_engine, text
-from urllib.parse import quote_plus
 from tools.base import BaseSQLTool
 
 
@@ -28,24 +25,6 @@ class GetAvailableColumnsTool(BaseSQLTool):
     description: str = "Fetch columns and types for a table from Source DB."
     args_schema: type[BaseModel] = GetTableSchemaInput
 
-    def _get_sql_connection_string(self) -> str:
-        """Build ODBC connection string for SQL Server."""
-        drivers = [d for d in pyodbc.drivers() if "ODBC Driver" in d and "SQL Server" in d]
-        if not drivers:
-            raise Exception("No SQL Server ODBC driver installed!")
-        
-        driver = drivers[-1]
-        return (
-            f"DRIVER={{{driver}}};"
-            f"SERVER={self.db_server};"
-            f"DATABASE={self.db_database};"
-            f"UID={self.db_username};"
-            f"PWD={self.db_password};"
-            "Encrypt=yes;"
-            "TrustServerCertificate=no;"
-            "Connection Timeout=30;"
-        )
-
     def _run(self, table_name: str) -> str:
         """Execute the tool."""
         try:
@@ -53,28 +32,7 @@ class GetAvailableColumnsTool(BaseSQLTool):
                 return json.dumps([])
 
             schema, table = table_name.split(".", 1)
-
-            # Build connection
-            odbc_connect = self._get_sql_connection_string()
-            encoded = quote_plus(odbc_connect)
-            conn_str = f"mssql+pyodbc:///?odbc_connect={encoded}"
-            engine = create_engine(conn_str, fast_executemany=True)
-
-            # Query columns
-            query = text("""
-                SELECT c.name AS COLUMN_NAME, t.name AS DATA_TYPE
-                FROM sys.columns c
-                JOIN sys.types t ON c.user_type_id = t.user_type_id
-                JOIN sys.tables tb ON c.object_id = tb.object_id
-                JOIN sys.schemas s ON tb.schema_id = s.schema_id
-                WHERE s.name = :schema AND tb.name = :table
-                ORDER BY c.column_id
-            """)
-
-            with engine.connect() as conn:
-                rows = conn.execute(query, {"schema": schema, "table": table}).fetchall()
-
-            columns = [{"name": row[0], "type": row[1]} for row in rows]
+            columns = self.get_source_repository().get_table_columns(schema, table)
             return json.dumps(columns, indent=2)
 
         except Exception as e:
@@ -89,62 +47,13 @@ class GetMultipleTablesSchemasTool(BaseSQLTool):
     description: str = "Fetch columns and types for MULTIPLE tables at once from Source DB. Much faster than calling get_available_columns multiple times."
     args_schema: type[BaseModel] = GetMultipleTablesSchemasInput
 
-    def _get_sql_connection_string(self) -> str:
-        """Build ODBC connection string for SQL Server."""
-        drivers = [d for d in pyodbc.drivers() if "ODBC Driver" in d and "SQL Server" in d]
-        if not drivers:
-            raise Exception("No SQL Server ODBC driver installed!")
-        
-        driver = drivers[-1]
-        return (
-            f"DRIVER={{{driver}}};"
-            f"SERVER={self.db_server};"
-            f"DATABASE={self.db_database};"
-            f"UID={self.db_username};"
-            f"PWD={self.db_password};"
-            "Encrypt=yes;"
-            "TrustServerCertificate=no;"
-            "Connection Timeout=30;"
-        )
-
     def _run(self, table_names: List[str]) -> str:
-        """Execute the tool for multiple tables."""
+        """Execute the tool for multiple tables (one query, cached schemas skipped)."""
         try:
             if not table_names:
                 return json.dumps({})
 
-            # Build connection
-            odbc_connect = self._get_sql_connection_string()
-            encoded = quote_plus(odbc_connect)
-            conn_str = f"mssql+pyodbc:///?odbc_connect={encoded}"
-            engine = create_engine(conn_str, fast_executemany=True)
-
-            result = {}
-
-            for table_name in table_names:
-                if "." not in table_name:
-                    result[table_name] = []
-                    continue
-
-                schema, table = table_name.split(".", 1)
-
-                # Query columns
-                query = text("""
-                    SELECT c.name AS COLUMN_NAME, t.name AS DATA_TYPE
-                    FROM sys.columns c
-                    JOIN sys.types t ON c.user_type_id = t.user_type_id
-                    JOIN sys.tables tb ON c.object_id = tb.object_id
-                    JOIN sys.schemas s ON tb.schema_id = s.schema_id
-                    WHERE s.name = :schema AND tb.name = :table
-                    ORDER BY c.column_id
-                """)
-
-                with engine.connect() as conn:
-                    rows = conn.execute(query, {"schema": schema, "table": table}).fetchall()
-
-                columns = [{"name": row[0], "type": row[1]} for row in rows]
-                result[table_name] = columns
-
+            result = self.get_source_repository().get_tables_columns(table_names)
             return json.dumps(result, indent=2)
 
         except Exception as e:
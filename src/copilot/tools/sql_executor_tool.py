@@ -3,10 +3,8 @@
 
 import logging
 import traceback
-import pyodbc
 import pandas as pd
 from pydantic import BaseModel, Field
-from sqlalchemy import create_engine
 from tools.base import BaseSQLTool
 
 logger = logging.getLogger(__name__)
@@ -31,24 +29,6 @@ class ExecuteSQLQueryTool(BaseSQLTool):
     description: str = "Executes ONLY safe SQL SELECT queries on Source DB."
     args_schema: type[BaseModel] = SQLInput
 
-    def _get_sql_connection_string(self) -> str:
-        """Build ODBC connection string for SQL Server."""
-        drivers = [d for d in pyodbc.drivers() if "ODBC Driver" in d and "SQL Server" in d]
-        if not drivers:
-            raise Exception("No SQL Server ODBC driver installed!")
-        
-        driver = drivers[-1]
-        return (
-            f"DRIVER={{{driver}}};"
-            f"SERVER={self.db_server};"
-            f"DATABASE={self.db_database};"
-            f"UID={self.db_username};"
-            f"PWD={self.db_password};"
-            "Encrypt=yes;"
-            "TrustServerCertificate=no;"
-            "Connection Timeout=30;"
-        )
-
     def _run(self, raw_sql_query: str) -> str:
         """Execute the tool."""
         # Security check
@@ -62,13 +42,9 @@ class ExecuteSQLQueryTool(BaseSQLTool):
                 return f"Security Error: Forbidden keyword '{keyword}' detected."
 
         try:
-            # Build connection
-            odbc_connect = self._get_sql_connection_string()
-            connection_string = f"mssql+pyodbc:///?odbc_connect={odbc_connect.replace(';', '%3B')}"
-            engine = create_engine(connection_string)
-            
-            # Execute query
-            df = pd.read_sql(raw_sql_query, engine)
+            # Execute query on a pooled connection
+            with self.get_source_engine().connect() as conn:
+                df = pd.read_sql(raw_sql_query, conn)
             
             if df.empty:
                 return "No data found."
@@ -4,7 +4,6 @@
 import json
 import logging
 import traceback
-import psycopg2
 from pydantic import BaseModel, Field
 from typing import List
 from tools.base import BaseSQLTool
@@ -49,8 +48,8 @@ class VectorDBTableSearchTool(BaseSQLTool):
             query_embedding = embedding_model.encode(query_key, normalize_embeddings=True)
             query_embedding_str = '[' + ','.join(map(str, query_embedding)) + ']'
 
-            # Connect to vector DB
-            conn = psycopg2.connect(**self.get_vector_db_params())
+            # Borrow a pooled vector DB connection (close() returns it to the pool)
+            conn = self.get_metadata_engine().raw_connection()
             cur = conn.cursor()
 
             if not allowed_tables:
@@ -61,7 +60,8 @@ class VectorDBTableSearchTool(BaseSQLTool):
             if len(tables_tuple) == 1:
                 tables_tuple = (tables_tuple[0],)
 
-            # Semantic search
+            # Semantic search (only allowed tables: the ANN scan must not drop them)
+            self.apply_vector_search_settings(cur, filtered=True)
             search_query = """
                 SELECT table_name
                 FROM client_schema_vectors
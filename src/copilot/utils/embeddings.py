@@ -2,30 +2,67 @@
 """Embedding model loader and utilities."""
 
 import logging
-from sentence_transformers import SentenceTransformer
-from config.settings import EMBEDDING_MODEL_NAME
+import threading
+import numpy as np
+import requests
+from config.settings import EMBEDDING_MODEL_NAME, EMBEDDING_SERVICE_URL, EMBEDDING_SERVICE_TIMEOUT
 
 logger = logging.getLogger(__name__)
 
 # Global embedding model instance (singleton)
 _embedding_model = None
+_embedding_model_lock = threading.Lock()
 
 
-def get_embedding_model() -> SentenceTransformer | None:
+class RemoteEmbeddingModel:
+    """
+    Client for the shared embedding server with the same encode() call
+    shape as SentenceTransformer, so callers do not care which one they get.
+    """
+
+    def __init__(self, base_url: str, timeout: float):
+        self.embed_url = base_url.rstrip("/") + "/embed"
+        self.timeout = timeout
+        self.session = requests.Session()
+
+    def encode(self, sentences: str | list[str], normalize_embeddings: bool = True) -> np.ndarray:
+        """Embed one text (returns a 1-D array) or a list of texts (returns a 2-D array)."""
+        texts = [sentences] if isinstance(sentences, str) else list(sentences)
+        response = self.session.post(
+            self.embed_url,
+            json={"texts": texts, "normalize": normalize_embeddings},
+            timeout=self.timeout
+        )
+        response.raise_for_status()
+        embeddings = np.asarray(response.json()["embeddings"], dtype=np.float32)
+        return embeddings[0] if isinstance(sentences, str) else embeddings
+
+
+def get_embedding_model():
     """
     Returns a singleton instance of the embedding model.
-    Lazy loading - only loads when first called.
+
+    A RemoteEmbeddingModel when EMBEDDING_SERVICE_URL is set, otherwise a
+    SentenceTransformer loaded in-process on first call.
     """
     global _embedding_model
     
     if _embedding_model is None:
-        try:
-            logger.info(f"Loading embedding model: {EMBEDDING_MODEL_NAME}")
-            _embedding_model = SentenceTransformer(EMBEDDING_MODEL_NAME)
-            logger.info("Embedding model loaded successfully")
-        except Exception as e:
-            logger.error(f"Failed to load embedding model: {e}")
-            return None
+        with _embedding_model_lock:
+            if _embedding_model is None:
+                try:
+                    if EMBEDDING_SERVICE_URL:
+                        logger.info(f"Using embedding server at {EMBEDDING_SERVICE_URL}")
+                        _embedding_model = RemoteEmbeddingModel(EMBEDDING_SERVICE_URL, EMBEDDING_SERVICE_TIMEOUT)
+                    else:
+                        from sentence_transformers import SentenceTransformer
+
+                        logger.info(f"Loading embedding model: {EMBEDDING_MODEL_NAME}")
+                        _embedding_model = SentenceTransformer(EMBEDDING_MODEL_NAME)
+                        logger.info("Embedding model loaded successfully")
+                except Exception as e:
+                    logger.error(f"Failed to load embedding model: {e}")
+                    return None
     
     return _embedding_model
 
@@ -0,0 +1,134 @@
+"""Shared, pooled SQLAlchemy engines for the source and metadata databases."""
+
+import logging
+import threading
+import time
+from collections import OrderedDict
+from functools import lru_cache
+from urllib.parse import quote_plus
+
+from sqlalchemy import create_engine
+from sqlalchemy.engine import Engine
+
+from config.database import get_vector_db_url
+from config.settings import (
+    DB_POOL_SIZE,
+    DB_POOL_MAX_OVERFLOW,
+    DB_POOL_TIMEOUT_SECONDS,
+    DB_POOL_RECYCLE_SECONDS,
+    DB_ENGINE_IDLE_SECONDS,
+    DB_ENGINE_MAX_ENGINES,
+)
+
+logger = logging.getLogger(__name__)
+
+
+@lru_cache(maxsize=1)
+def get_odbc_driver() -> str:
+    """Best installed SQL Server ODBC driver (looked up once per process)."""
+    # Imported here so metadata-only callers do not need the ODBC driver manager
+    import pyodbc
+
+    drivers = [d for d in pyodbc.drivers() if "ODBC Driver" in d and "SQL Server" in d]
+    if not drivers:
+        raise Exception("No SQL Server ODBC driver installed!")
+    return drivers[-1]
+
+
+def build_source_connection_string(db_server: str, db_database: str, db_username: str, db_password: str) -> str:
+    """ODBC connection string for a tenant's SQL Server source database."""
+    return (
+        f"DRIVER={{{get_odbc_driver()}}};"
+        f"SERVER={db_server};"
+        f"DATABASE={db_database};"
+        f"UID={db_username};"
+        f"PWD={db_password};"
+        "Encrypt=yes;"
+        "TrustServerCertificate=no;"
+        "Connection Timeout=30;"
+    )
+
+
+class EngineRegistry:
+    """
+    Keeps one pooled engine per connection URL.
+
+    Engines use pool_pre_ping (stale connections are replaced transparently)
+    and pool_recycle. Engines idle for DB_ENGINE_IDLE_SECONDS are disposed,
+    and at most DB_ENGINE_MAX_ENGINES are kept (least recently used first out).
+    """
+
+    def __init__(self):
+        self._engines: OrderedDict[str, tuple[Engine, float]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, url: str, label: str, **engine_kwargs) -> Engine:
+        """
+        Engine for a connection URL, created on first use.
+
+        Args:
+            url: SQLAlchemy URL (the registry key)
+            label: Name for logs (the URL may contain a password)
+            **engine_kwargs: Extra create_engine arguments for a new engine
+        """
+        now = time.monotonic()
+        with self._lock:
+            stale = self._evict_idle(now)
+            entry = self._engines.pop(url, None)
+            if entry is None:
+                logger.info(f"Creating pooled engine for {label}")
+                engine = create_engine(
+                    url,
+                    pool_pre_ping=True,
+                    pool_size=DB_POOL_SIZE,
+                    max_overflow=DB_POOL_MAX_OVERFLOW,
+                    pool_timeout=DB_POOL_TIMEOUT_SECONDS,
+                    pool_recycle=DB_POOL_RECYCLE_SECONDS,
+                    **engine_kwargs,
+                )
+            else:
+                engine = entry[0]
+            self._engines[url] = (engine, now)
+            while len(self._engines) > DB_ENGINE_MAX_ENGINES:
+                stale.append(self._engines.popitem(last=False)[1][0])
+
+        for old in stale:
+            old.dispose()
+        return engine
+
+    def _evict_idle(self, now: float) -> list[Engine]:
+        """Remove engines idle longer than DB_ENGINE_IDLE_SECONDS (caller holds the lock)."""
+        idle = [url for url, (_, last_used) in self._engines.items() if now - last_used > DB_ENGINE_IDLE_SECONDS]
+        return [self._engines.pop(url)[0] for url in idle]
+
+    def dispose_all(self):
+        """Close every pooled connection (e.g. on shutdown)."""
+        with self._lock:
+            engines = [engine for engine, _ in self._engines.values()]
+            self._engines.clear()
+        for engine in engines:
+            engine.dispose()
+
+
+# Global registry instance (singleton)
+_registry = EngineRegistry()
+
+
+def get_engine_registry() -> EngineRegistry:
+    """Returns the process-wide EngineRegistry."""
+    return _registry
+
+
+def get_source_engine(db_server: str, db_database: str, db_username: str, db_password: str) -> Engine:
+    """Pooled engine for a tenant's SQL Server source database."""
+    odbc_connect = build_source_connection_string(db_server, db_database, db_username, db_password)
+    return _registry.get(
+        f"mssql+pyodbc:///?odbc_connect={quote_plus(odbc_connect)}",
+        label=f"source DB {db_server}/{db_database}",
+        fast_executemany=True,
+    )
+
+
+def get_metadata_engine(url: str = None) -> Engine:
+    """Pooled engine for the metadata / vector database (default: VECTOR_DB_* settings)."""
+    return _registry.get(url or get_vector_db_url(), label="metadata DB")
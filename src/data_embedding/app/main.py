@@ -5,7 +5,7 @@ import logging
 from fastapi import FastAPI
 from dotenv import load_dotenv
 
-from app.routes import pipeline_routes
+from app.routes import join_graph_routes, pipeline_routes, progress_routes
 
 # Load environment variables
 load_dotenv()
@@ -27,6 +27,8 @@ app = FastAPI(
 
 # Include routers
 app.include_router(pipeline_routes.router, tags=["Pipeline"])
+app.include_router(join_graph_routes.router, tags=["Join Graph"])
+app.include_router(progress_routes.router, tags=["Pipeline"])
 
 
 @app.on_event("startup")
@@ -2,12 +2,15 @@
 Pydantic models for API request/response schemas
 """
 from pydantic import BaseModel
-from typing import Optional, Any
+from typing import Optional, Any, Dict, List
 
 
 class PipelineRequest(BaseModel):
     """Request model for starting the ingestion pipeline"""
     company_id: str
+    full_refresh: bool = False
+    # Task id of a failed run; its completed stages are reused instead of redone
+    resume_run_id: Optional[str] = None
 
 
 class TaskSubmitResponse(BaseModel):
@@ -16,6 +19,8 @@ class TaskSubmitResponse(BaseModel):
     status: str
     message: str
     company_id: str
+    # True when the request was merged into a run already queued or running for the company
+    coalesced: bool = False
 
 
 class TaskStatusResponse(BaseModel):
@@ -23,3 +28,55 @@ class TaskStatusResponse(BaseModel):
     task_id: str
     status: str
     result: Optional[Any] = None
+    # Per-step timing/throughput while the pipeline is running
+    stages: Optional[List[dict]] = None
+    # While waiting for a scheduler slot: queue_position, queue_depth, running,
+    # estimated_wait_seconds and estimated_start (ISO 8601, UTC)
+    queue: Optional[dict] = None
+
+
+class JoinGraphSummaryResponse(BaseModel):
+    """Response model for a company's join graph"""
+    company_id: str
+    tables: int
+    edges: int
+    components: int
+    largest_component: int
+    isolated_tables: int
+    max_hops: int
+    # Longest stored join path (lower than max_hops when path rows were capped)
+    path_hops: Optional[int] = None
+    built_at: Optional[str] = None
+    # Table lists per connected component (largest first), when requested
+    component_tables: Optional[List[List[str]]] = None
+
+
+class JoinPathResponse(BaseModel):
+    """Response model for the shortest join path between two tables"""
+    from_table: str
+    to_table: str
+    joinable: bool
+    hops: Optional[int] = None
+    # Edges in join order: {"from_table", "to_table", "columns": [[from_column, to_column], ...]}
+    path: Optional[List[dict]] = None
+
+
+class JoinableTablesResponse(BaseModel):
+    """Response model for the tables reachable from one table"""
+    table: str
+    max_hops: int
+    # {table: number of joins}
+    joinable: Dict[str, int]
+
+
+class ConnectTablesRequest(BaseModel):
+    """Request model for connecting a set of tables with joins"""
+    tables: List[str]
+    max_hops: Optional[int] = None
+
+
+class ConnectTablesResponse(BaseModel):
+    """Response model for the joins connecting a set of tables"""
+    tables: List[str]
+    joins: List[dict]
+    unreachable: List[str]
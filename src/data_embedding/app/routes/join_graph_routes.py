@@ -0,0 +1,144 @@
+"""
+API routes for the company join graph (foreign key joinability lookups)
+"""
+import logging
+import threading
+import time
+from fastapi import APIRouter, HTTPException, Query
+
+from app.models import (
+    ConnectTablesRequest,
+    ConnectTablesResponse,
+    JoinableTablesResponse,
+    JoinGraphSummaryResponse,
+    JoinPathResponse,
+)
+from config import settings
+from core.join_graph import JoinGraph
+from core.repositories.join_graph_repository import JoinGraphRepository
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(prefix="/join-graph")
+
+# {company_id: (loaded_at, JoinGraph)}; graphs change only when a run re-scans the company
+_graphs = {}
+_graphs_lock = threading.Lock()
+
+
+def get_company_graph(company_id: str) -> JoinGraph:
+    """
+    Load a company's join graph, kept in memory for JOIN_GRAPH_CACHE_SECONDS.
+
+    Raises:
+        HTTPException: 404 if no graph was built for the company yet
+    """
+    now = time.monotonic()
+    with _graphs_lock:
+        cached = _graphs.get(company_id)
+    if cached and now - cached[0] < settings.JOIN_GRAPH_CACHE_SECONDS:
+        return cached[1]
+
+    graph = JoinGraphRepository().load_graph(company_id)
+    if graph is None:
+        raise HTTPException(status_code=404, detail=f"No join graph for company {company_id}. Run the pipeline first.")
+    with _graphs_lock:
+        _graphs[company_id] = (now, graph)
+    return graph
+
+
+def _require_table(graph: JoinGraph, table: str):
+    if table not in graph.adjacency:
+        raise HTTPException(status_code=404, detail=f"Unknown table '{table}'")
+
+
+@router.get("/{company_id}", response_model=JoinGraphSummaryResponse)
+def get_join_graph(company_id: str, include_components: bool = False):
+    """
+    Summary of a company's join graph.
+
+    Args:
+        company_id: Company UUID
+        include_components: Also return the tables of every connected component
+    """
+    summary = JoinGraphRepository().get_summary(company_id)
+    if summary is None:
+        raise HTTPException(status_code=404, detail=f"No join graph for company {company_id}. Run the pipeline first.")
+
+    return JoinGraphSummaryResponse(
+        company_id=company_id,
+        tables=summary["tables"],
+        edges=summary["edges"],
+        components=summary["components"],
+        largest_component=summary["largest_component"],
+        isolated_tables=summary["isolated_tables"],
+        max_hops=summary["max_hops"],
+        path_hops=summary.get("path_hops", summary["max_hops"]),
+        built_at=summary["built_at"],
+        component_tables=get_company_graph(company_id).components if include_components else None
+    )
+
+
+@router.get("/{company_id}/path", response_model=JoinPathResponse)
+def get_join_path(
+    company_id: str,
+    from_table: str,
+    to_table: str,
+    max_hops: int = Query(None, ge=0, le=10)
+):
+    """
+    Shortest join path between two tables ("Schema.Table" names).
+
+    Pairs within the stored path length are one indexed row read; a larger
+    max_hops searches the in-memory graph.
+    """
+    graph = get_company_graph(company_id)
+    _require_table(graph, from_table)
+    _require_table(graph, to_table)
+    max_hops = graph.max_hops if max_hops is None else max_hops
+
+    if max_hops <= graph.path_hops:
+        path = JoinGraphRepository().get_path(company_id, from_table, to_table)
+        if path is not None and len(path) > max_hops:
+            path = None
+    else:
+        path = graph.shortest_path(from_table, to_table, max_hops)
+    return JoinPathResponse(
+        from_table=from_table,
+        to_table=to_table,
+        joinable=path is not None,
+        hops=len(path) if path is not None else None,
+        path=path
+    )
+
+
+@router.get("/{company_id}/joinable", response_model=JoinableTablesResponse)
+def get_joinable_tables(company_id: str, table: str, max_hops: int = Query(None, ge=1, le=10)):
+    """
+    Tables joinable with a table within max_hops joins (default: JOIN_GRAPH_MAX_HOPS).
+
+    Read from the stored paths; a max_hops above the stored path length
+    searches the in-memory graph.
+    """
+    graph = get_company_graph(company_id)
+    _require_table(graph, table)
+    max_hops = graph.max_hops if max_hops is None else max_hops
+
+    if max_hops <= graph.path_hops:
+        joinable = JoinGraphRepository().get_joinable(company_id, table, max_hops)
+    else:
+        joinable = graph.joinable_tables(table, max_hops)
+    return JoinableTablesResponse(table=table, max_hops=max_hops, joinable=joinable)
+
+
+@router.post("/{company_id}/connect", response_model=ConnectTablesResponse)
+def connect_tables(company_id: str, request: ConnectTablesRequest):
+    """
+    Joins needed to query a set of tables together, including any
+    intermediate tables. Tables that cannot be joined are listed as unreachable.
+    Paths are searched in memory from the requested tables only.
+    """
+    if not request.tables:
+        raise HTTPException(status_code=400, detail="tables is required")
+    graph = get_company_graph(company_id)
+    return ConnectTablesResponse(**graph.connect(request.tables, request.max_hops))
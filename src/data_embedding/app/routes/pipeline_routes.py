@@ -3,10 +3,12 @@ API routes for the ingestion pipeline
 """
 import logging
 import time
+import uuid
 from fastapi import APIRouter, HTTPException
 from celery.result import AsyncResult
 
 from app.models import PipelineRequest, TaskSubmitResponse, TaskStatusResponse
+from core.scheduler import RunConflictError, get_scheduler
 from tasks.celery_app import celery_app
 from tasks.pipeline_tasks import run_ingestion_pipeline_task
 
@@ -20,12 +22,19 @@ async def start_pipeline(request: PipelineRequest):
     """
     Submits the ingestion task to the Celery queue with company_id.
     This endpoint returns immediately.
+
+    If a run for the company with the same full_refresh and resume_run_id is
+    already queued or running, no new task is created; its task_id is
+    returned with coalesced=True. A run in flight with other options is a
+    409 conflict (retry once it has finished).
     
     Args:
-        request: PipelineRequest containing company_id
+        request: PipelineRequest containing company_id, optional full_refresh flag
+            and optional resume_run_id (task id of a failed run to resume)
     
     Returns:
-        TaskSubmitResponse with task_id and status
+        TaskSubmitResponse with task_id and status (follow the run with
+        /task-status/{task_id} or stream it from /task-events/{task_id})
     """
     company_id = request.company_id
     task_id_log = f"task_{int(time.time())}"
@@ -35,18 +44,64 @@ async def start_pipeline(request: PipelineRequest):
         raise HTTPException(status_code=400, detail="company_id is required")
     
     try:
-        # Send the task to the Redis queue with company_id parameter
-        task = run_ingestion_pipeline_task.delay(company_id)
-        
-        logger.info(f"[{task_id_log}] Task submitted to Celery. Task ID: {task.id}")
+        def enqueue(task_id: str):
+            # Send the task to the Redis queue with company_id parameter
+            run_ingestion_pipeline_task.apply_async(
+                args=[company_id],
+                kwargs={"full_refresh": request.full_refresh, "resume_run_id": request.resume_run_id},
+                task_id=task_id
+            )
+
+        scheduler = get_scheduler()
+        if scheduler is None:
+            task_id = str(uuid.uuid4())
+            enqueue(task_id)
+            coalesced = False
+        else:
+            existing = scheduler.active_task_for(company_id)
+            if existing and AsyncResult(existing, app=celery_app).ready():
+                # Finished without releasing its marker (e.g. the worker was killed)
+                scheduler.forget(company_id, existing)
+            try:
+                task_id, coalesced = scheduler.submit(
+                    company_id,
+                    enqueue,
+                    str(uuid.uuid4()),
+                    request={"full_refresh": request.full_refresh, "resume_run_id": request.resume_run_id}
+                )
+            except RunConflictError as e:
+                logger.info(f"[{task_id_log}] {e}")
+                raise HTTPException(
+                    status_code=409,
+                    detail={
+                        "message": "An ingestion run with different options is already queued or running "
+                                   "for this company; retry when it has finished.",
+                        "task_id": e.task_id,
+                        "running_request": e.request,
+                    }
+                )
+
+        if coalesced:
+            logger.info(f"[{task_id_log}] Run already in flight for company {company_id}. Task ID: {task_id}")
+            return TaskSubmitResponse(
+                task_id=task_id,
+                status=AsyncResult(task_id, app=celery_app).status,
+                message="An ingestion run for this company is already queued or running; returning its task.",
+                company_id=company_id,
+                coalesced=True
+            )
+
+        logger.info(f"[{task_id_log}] Task submitted to Celery. Task ID: {task_id}")
 
         return TaskSubmitResponse(
-            task_id=task.id,
+            task_id=task_id,
             status="PENDING",
             message="Ingestion task has been submitted.",
             company_id=company_id
         )
 
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"[{task_id_log}] Failed to submit task to Celery: {e}", exc_info=True)
         raise HTTPException(status_code=500, detail=f"Failed to submit task: {e}")
@@ -61,7 +116,8 @@ async def get_task_status(task_id: str):
         task_id: The Celery task ID
     
     Returns:
-        TaskStatusResponse with current task status and result
+        TaskStatusResponse with current task status and result (plus queue
+        position and estimated start while the run waits for a slot)
     """
     try:
         task_result = AsyncResult(task_id, app=celery_app)
@@ -81,10 +137,19 @@ async def get_task_status(task_id: str):
             else:
                 response_data["result"] = str(error_info)
         else:
-            # Task is PENDING or PROGRESS
-            if task_result.info:
+            # Task is PENDING, RETRY (waiting for a slot or retrying) or PROGRESS
+            scheduler = get_scheduler()
+            queue = scheduler.queue_info(task_id) if scheduler else None
+            if queue:
+                response_data["queue"] = queue
+                response_data["result"] = (
+                    f"Queued: position {queue['queue_position']} of {queue['queue_depth']}, "
+                    f"estimated start {queue['estimated_start']}"
+                )
+            elif task_result.info:
                 if isinstance(task_result.info, dict):
                     response_data["result"] = task_result.info.get('status', 'Running...')
+                    response_data["stages"] = task_result.info.get('stages')
                 else:
                     response_data["result"] = str(task_result.info)
 
@@ -0,0 +1,137 @@
+"""
+API routes streaming ingestion progress events (server-sent events)
+"""
+import json
+import logging
+import time
+from celery.result import AsyncResult
+from fastapi import APIRouter, Header, HTTPException, Request
+from fastapi.responses import StreamingResponse
+from starlette.concurrency import run_in_threadpool
+
+from config import settings
+from core.progress_events import TERMINAL_EVENTS, channel_name, get_async_events_redis, history_key
+from tasks.celery_app import celery_app
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter()
+
+# Seconds to wait for a pub/sub message before checking for disconnects / heartbeats
+POLL_SECONDS = 1.0
+
+
+def format_sse(event: dict) -> str:
+    """Encode an event as an SSE message (id = seq, so browsers resume with Last-Event-ID)."""
+    lines = []
+    if event.get("seq") is not None:
+        lines.append(f"id: {event['seq']}")
+    lines.append(f"event: {event['type']}")
+    lines.append(f"data: {json.dumps(event, default=str)}")
+    return "\n".join(lines) + "\n\n"
+
+
+def _final_status_event(task_id: str, task_result: AsyncResult) -> dict:
+    """Terminal event for a task that finished without one on its stream (e.g. history expired)."""
+    return {
+        "type": "completed" if task_result.successful() else "failed",
+        "task_id": task_id,
+        "status": task_result.status,
+        "ts": round(time.time(), 3),
+    }
+
+
+def _idle_timeout_event(task_id: str, task_result: AsyncResult) -> dict:
+    """Last event of a stream that saw no events for PROGRESS_EVENTS_IDLE_TIMEOUT_SECONDS."""
+    return {
+        "type": "idle_timeout",
+        "task_id": task_id,
+        "status": task_result.status,
+        "ts": round(time.time(), 3),
+    }
+
+
+async def _event_stream(request: Request, task_id: str, last_seq: int):
+    """
+    Replay the task's stored events after last_seq, then follow its channel
+    until a terminal event, the task finishing, the client disconnecting, or
+    no event arriving for PROGRESS_EVENTS_IDLE_TIMEOUT_SECONDS (a task id that
+    was never submitted stays PENDING forever).
+    """
+    client = get_async_events_redis()
+    pubsub = client.pubsub()
+    # Subscribe before reading the history so no event falls between the two
+    await pubsub.subscribe(channel_name(task_id))
+    try:
+        for payload in await client.lrange(history_key(task_id), 0, -1):
+            event = json.loads(payload)
+            if event["seq"] <= last_seq:
+                continue
+            last_seq = event["seq"]
+            yield format_sse(event)
+            if event["type"] in TERMINAL_EVENTS:
+                return
+
+        task_result = AsyncResult(task_id, app=celery_app)
+        if await run_in_threadpool(task_result.ready):
+            yield format_sse(_final_status_event(task_id, task_result))
+            return
+
+        last_heartbeat = last_event = time.monotonic()
+        while not await request.is_disconnected():
+            message = await pubsub.get_message(ignore_subscribe_messages=True, timeout=POLL_SECONDS)
+            if message:
+                event = json.loads(message["data"])
+                if event["seq"] <= last_seq:
+                    continue
+                last_seq = event["seq"]
+                last_event = time.monotonic()
+                yield format_sse(event)
+                if event["type"] in TERMINAL_EVENTS:
+                    return
+                continue
+
+            if time.monotonic() - last_heartbeat >= settings.PROGRESS_EVENTS_HEARTBEAT_SECONDS:
+                last_heartbeat = time.monotonic()
+                # Comment line: keeps proxies from closing an idle stream
+                yield ": heartbeat\n\n"
+                if await run_in_threadpool(task_result.ready):
+                    yield format_sse(_final_status_event(task_id, task_result))
+                    return
+                if time.monotonic() - last_event >= settings.PROGRESS_EVENTS_IDLE_TIMEOUT_SECONDS:
+                    yield format_sse(_idle_timeout_event(task_id, task_result))
+                    return
+    finally:
+        await pubsub.unsubscribe(channel_name(task_id))
+        await pubsub.aclose()
+
+
+@router.get("/task-events/{task_id}")
+async def stream_task_events(request: Request, task_id: str, last_event_id: int = Header(0)):
+    """
+    Stream a pipeline task's progress as server-sent events.
+
+    Events (SSE "event:" field = type; "data:" = JSON with seq, task_id,
+    company_id, ts and type-specific fields):
+        queued, started, retrying, stage_started, stage_finished,
+        tables_scanned, batches_dispatched, batch_described, rows_embedded,
+        teams_assigned, completed, failed
+
+    Events already published are replayed first, so the stream can be opened
+    at any time; a reconnecting client (Last-Event-ID header) only receives
+    the events it missed. The stream ends after "completed" or "failed", or
+    with an "idle_timeout" event once no event was published for
+    PROGRESS_EVENTS_IDLE_TIMEOUT_SECONDS (unknown task ids end there too).
+
+    Args:
+        task_id: The Celery task ID returned by /start-pipeline
+        last_event_id: seq of the last event the client received
+    """
+    if not settings.PROGRESS_EVENTS_ENABLED:
+        raise HTTPException(status_code=404, detail="Progress events are disabled (PROGRESS_EVENTS_ENABLED)")
+
+    return StreamingResponse(
+        _event_stream(request, task_id, last_event_id),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
@@ -0,0 +1,188 @@
+"""
+Benchmark for the embedding backends (torch / onnx / onnx-int8).
+
+Encodes a company's stored table descriptions with every backend and reports,
+against the PyTorch baseline:
+  - throughput (texts/s) and model load time
+  - mean cosine similarity between the two embeddings of each text
+  - recall@k of nearest-neighbour table search (descriptions as queries)
+  - team-assignment agreement (same team set per table as the baseline)
+
+A backend "passes" when its team-assignment agreement reaches --min-agreement;
+the fastest passing backend is the one to put in EMBEDDING_BACKEND.
+
+Without --company-id, synthetic descriptions from bench_save_embeddings are used.
+
+Usage:
+    python -m benchmarks.bench_embedding_backends --company-id <uuid>
+    python -m benchmarks.bench_embedding_backends --teams Sales Finance HR --tables 2000
+"""
+import argparse
+import os
+import sys
+import time
+import uuid
+
+import numpy as np
+import psycopg2
+
+# Add parent directory to path
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.dirname(current_dir)
+if parent_dir not in sys.path:
+    sys.path.insert(0, parent_dir)
+
+from benchmarks.bench_save_embeddings import build_synthetic_rows
+from clients.teams_client import fetch_company_teams
+from config import settings
+from core.services.embedding_backends import EMBEDDING_BACKENDS, load_sentence_transformer
+from core.teams.description_generator import TeamDescriptionGenerator
+from core.teams.similarity_calculator import SimilarityCalculator
+
+
+def load_table_descriptions(company_id: str) -> list:
+    """Read (table_name, description) pairs stored for a company."""
+    conn = psycopg2.connect(
+        host=settings.VECTOR_DB_HOST,
+        database=settings.VECTOR_DB_NAME,
+        user=settings.VECTOR_DB_USER,
+        password=settings.VECTOR_DB_PASSWORD
+    )
+    try:
+        cur = conn.cursor()
+        cur.execute(
+            "SELECT table_name, table_description FROM client_schema_vectors "
+            "WHERE company_id = %s ORDER BY table_name",
+            (company_id,)
+        )
+        rows = cur.fetchall()
+        cur.close()
+        return rows
+    finally:
+        conn.close()
+
+
+def recall_at_k(baseline: np.ndarray, candidate: np.ndarray, k: int, max_queries: int = 1000) -> float:
+    """
+    Share of each query's k nearest tables (baseline) that the candidate also returns.
+    The first max_queries descriptions are used as queries against all tables.
+    """
+    k = min(k, len(baseline) - 1)
+    if k < 1:
+        return 1.0
+    n_queries = min(max_queries, len(baseline))
+
+    def top_k(matrix):
+        scores = matrix[:n_queries] @ matrix.T
+        scores[np.arange(n_queries), np.arange(n_queries)] = -np.inf
+        return np.argpartition(-scores, k - 1, axis=1)[:, :k]
+
+    expected, found = top_k(baseline), top_k(candidate)
+    hits = sum(len(set(e) & set(f)) for e, f in zip(expected, found))
+    return hits / (k * n_queries)
+
+
+def assignment_agreement(baseline: dict, candidate: dict) -> tuple:
+    """(exact team-set agreement, top-1 agreement) between two assignment results."""
+    exact = top1 = 0
+    for table_name, teams in baseline.items():
+        other = candidate.get(table_name, {})
+        exact += set(teams) == set(other)
+        top1 += next(iter(teams), None) == next(iter(other), None)
+    return exact / len(baseline), top1 / len(baseline)
+
+
+def encode(model, texts: list, batch_size: int) -> tuple:
+    """Encode texts and return (float32 matrix, seconds)."""
+    start = time.perf_counter()
+    matrix = model.encode(texts, batch_size=batch_size, normalize_embeddings=True, convert_to_numpy=True)
+    return np.asarray(matrix, dtype=np.float32), time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark embedding backends")
+    parser.add_argument("--company-id", help="Use this company's stored table descriptions and teams")
+    parser.add_argument("--teams", nargs="+", help="Team names (default: fetched for --company-id)")
+    parser.add_argument("--tables", type=int, default=2000, help="Synthetic tables when no --company-id")
+    parser.add_argument(
+        "--backends", nargs="+", default=list(EMBEDDING_BACKENDS),
+        choices=EMBEDDING_BACKENDS, help="Backends to compare (torch is always the baseline)"
+    )
+    parser.add_argument("--batch-size", type=int, default=settings.EMBEDDING_BATCH_SIZE)
+    parser.add_argument("--k", type=int, default=10, help="Neighbours for recall@k")
+    parser.add_argument("--min-agreement", type=float, default=0.95, help="Required team-assignment agreement")
+    args = parser.parse_args()
+
+    if args.company_id:
+        rows = load_table_descriptions(args.company_id)
+        if not rows:
+            sys.exit(f"No stored tables for company {args.company_id}")
+    else:
+        rows = [(name, desc) for _, name, desc, _ in build_synthetic_rows(f"benchmark-{uuid.uuid4()}", args.tables)]
+    table_names = [name for name, _ in rows]
+    descriptions = [desc for _, desc in rows]
+
+    teams = args.teams or (fetch_company_teams(args.company_id) if args.company_id else None)
+    if not teams:
+        sys.exit("Pass --teams (or --company-id) to measure team-assignment agreement")
+    team_descriptions = TeamDescriptionGenerator().generate_batch(teams)
+    team_texts = [team_descriptions[team] for team in teams]
+
+    calculator = SimilarityCalculator()
+    backends = ["torch"] + [backend for backend in args.backends if backend != "torch"]
+    results = {}
+
+    print(f"Benchmarking {len(backends)} backends on {len(descriptions)} descriptions and {len(teams)} teams")
+    for backend in backends:
+        start = time.perf_counter()
+        model = load_sentence_transformer(backend=backend)
+        load_seconds = time.perf_counter() - start
+
+        model.encode(descriptions[:args.batch_size], batch_size=args.batch_size)  # warm-up
+        table_matrix, seconds = encode(model, descriptions, args.batch_size)
+        team_matrix, _ = encode(model, team_texts, args.batch_size)
+
+        assignments = calculator.calculate_matrix(
+            table_names,
+            table_matrix,
+            dict(zip(teams, team_matrix)),
+            threshold=settings.TEAM_ASSIGNMENT_THRESHOLD,
+            top_k=settings.MAX_TEAMS_PER_TABLE
+        )
+        results[backend] = {
+            "load_s": load_seconds,
+            "texts_per_s": len(descriptions) / seconds,
+            "matrix": table_matrix,
+            "assignments": assignments,
+        }
+        del model
+
+    baseline = results["torch"]
+    print(
+        f"{'backend':<12}{'load s':>8}{'texts/s':>10}{'speedup':>9}{'cosine':>9}"
+        f"{f'recall@{args.k}':>11}{'teams=':>8}{'top1=':>8}  pass"
+    )
+    passing = []
+    for backend in backends:
+        result = results[backend]
+        cosine = float(np.mean(np.sum(baseline["matrix"] * result["matrix"], axis=1)))
+        recall = recall_at_k(baseline["matrix"], result["matrix"], args.k)
+        exact, top1 = assignment_agreement(baseline["assignments"], result["assignments"])
+        passed = exact >= args.min_agreement
+        if passed:
+            passing.append((result["texts_per_s"], backend))
+        print(
+            f"{backend:<12}{result['load_s']:>8.1f}{result['texts_per_s']:>10.1f}"
+            f"{result['texts_per_s'] / baseline['texts_per_s']:>8.2f}x{cosine:>9.4f}"
+            f"{recall:>11.3f}{exact:>8.3f}{top1:>8.3f}  {'yes' if passed else 'no'}"
+        )
+
+    if not passing:
+        print(f"\nNo backend reached team-assignment agreement {args.min_agreement}")
+        return
+    best = max(passing)[1]
+    print(f"\nFastest backend with team-assignment agreement >= {args.min_agreement}: EMBEDDING_BACKEND={best}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,231 @@
+"""
+Offline benchmark of the complete ingestion pipeline.
+
+Runs run_ingestion_pipeline end to end against a synthetic SQL Server
+catalog (benchmarks/fakes.py) instead of the backend API, SQL Server and
+OpenRouter:
+  - DatabaseScanner reads a fake pyodbc connection (optional per round trip latency)
+  - the LLM is a deterministic stub with configurable latency
+  - tables are stored in memory (default) or in the real pgvector database
+and prints the per-stage metrics (wall time, items/s, LLM calls and tokens)
+the pipeline records. The first run is a full ingestion; every further run
+changes --change-fraction of the tables first and runs incrementally.
+
+Save the report with --output and compare the JSON of two branches to show
+before/after numbers for an optimization.
+
+No SQL Server, ODBC driver (libodbc) or pyodbc install is needed: the
+scanner and the column profiler only import pyodbc when they open a real
+connection, and the benchmark never does.
+
+Usage:
+    python -m benchmarks.bench_ingestion --schemas 5 --tables-per-schema 200
+    python -m benchmarks.bench_ingestion --runs 3 --change-fraction 0.05 --output after.json
+    python -m benchmarks.bench_ingestion --llm-latency 2 --llm-rps 4 --db-latency-ms 20
+    python -m benchmarks.bench_ingestion --store pgvector --embedding model
+"""
+import argparse
+import contextlib
+import json
+import logging
+import os
+import sys
+import tempfile
+import time
+import uuid
+from types import SimpleNamespace
+from unittest import mock
+
+# Add parent directory to path
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.dirname(current_dir)
+if parent_dir not in sys.path:
+    sys.path.insert(0, parent_dir)
+
+from config import settings
+from core import ingestion_pipeline
+from benchmarks.fakes import (
+    TEAMS,
+    CatalogScanner,
+    HashEmbeddingService,
+    InMemoryCheckpoints,
+    InMemoryJoinGraphs,
+    InMemoryVectorStore,
+    NoopIndexManager,
+    StubLLMService,
+    SyntheticCatalog,
+)
+
+
+def build_store(args):
+    """Vector store and index manager for --store / --embedding."""
+    if args.embedding == "model":
+        from core.services.embedding_service import EmbeddingService
+        embedding_service = EmbeddingService()
+    else:
+        embedding_service = HashEmbeddingService()
+
+    if args.store == "pgvector":
+        from core.repositories.vector_repository import VectorRepository
+        from core.vector_index_manager import VectorIndexManager
+        return VectorRepository(embedding_service=embedding_service), VectorIndexManager
+    return InMemoryVectorStore(embedding_service), NoopIndexManager
+
+
+def settings_overrides(args, cache_dir: str) -> dict:
+    """Settings the benchmark pins so runs do not need Redis, the API or a real rate limit."""
+    return {
+        "INGESTION_SCHEDULER_ENABLED": False,
+        "COLUMN_PROFILING_ENABLED": False,
+        "INCREMENTAL_INGESTION": True,
+        "LLM_REQUESTS_PER_SECOND": args.llm_rps,
+        "LLM_RATE_LIMIT_BURST": max(1, int(args.llm_rps)),
+        "LLM_MAX_CONCURRENCY": args.llm_concurrency or settings.LLM_MAX_CONCURRENCY,
+        "LLM_BACKOFF_SECONDS": 0.1,
+        "DESCRIPTION_CACHE_BACKEND": args.cache,
+        "DESCRIPTION_CACHE_DIR": cache_dir,
+        "METRICS_PORT": 0,
+    }
+
+
+def run_benchmark(args) -> dict:
+    """Run the pipeline args.runs times and return the report."""
+    catalog = SyntheticCatalog(
+        n_schemas=args.schemas,
+        tables_per_schema=args.tables_per_schema,
+        columns_per_table=args.columns,
+        fk_density=args.fk_density,
+        seed=args.seed
+    )
+    scan_stats = {}
+    llm_service = StubLLMService(
+        latency=args.llm_latency,
+        per_item_latency=args.llm_per_table_latency,
+        omit_rate=args.llm_omit_rate,
+        rate_limit_rate=args.llm_429_rate,
+        seed=args.seed
+    )
+    store, index_manager = build_store(args)
+    company_id = f"benchmark-{uuid.uuid4()}"
+    teams = TEAMS[:args.teams]
+    source_settings = {
+        "company_id": company_id, "server": "fake", "database": "fake", "username": "fake", "password": "fake"
+    }
+    fake_database_client = SimpleNamespace(
+        fetch_source_db_settings=lambda company: dict(source_settings),
+        save_settings_to_db=lambda db_settings: None,
+    )
+    fake_teams_client = SimpleNamespace(fetch_company_teams=lambda company: list(teams))
+
+    report = {
+        "config": vars(args),
+        "catalog": {"tables": len(catalog.tables), "foreign_keys": len(catalog.foreign_key_rows())},
+        "runs": [],
+    }
+
+    with tempfile.TemporaryDirectory() as cache_dir, \
+            mock.patch.multiple(settings, **settings_overrides(args, cache_dir)), \
+            mock.patch.multiple(
+                ingestion_pipeline,
+                DatabaseScanner=CatalogScanner.bind(catalog, args.db_latency_ms / 1000.0, scan_stats),
+                LLMService=lambda: llm_service,
+                VectorRepository=lambda: store,
+                CheckpointRepository=InMemoryCheckpoints,
+                JoinGraphRepository=InMemoryJoinGraphs,
+                VectorIndexManager=index_manager,
+                database_client=fake_database_client,
+                teams_client=fake_teams_client,
+            ):
+        try:
+            for run in range(args.runs):
+                changed = []
+                if run:
+                    changed = catalog.mutate(args.change_fraction, seed=args.seed + run)
+                scan_stats.clear()
+                started = time.perf_counter()
+                result = ingestion_pipeline.run_ingestion_pipeline(company_id, full_refresh=(run == 0))
+                report["runs"].append({
+                    "run": run + 1,
+                    "mode": "full" if run == 0 else "incremental",
+                    "mutated_tables": len(changed),
+                    "wall_seconds": round(time.perf_counter() - started, 3),
+                    "source_round_trips": scan_stats.get("round_trips", 0),
+                    "changes": result["changes"],
+                    "stages": result["metrics"]["stages"],
+                })
+        finally:
+            if args.store == "pgvector":
+                store.clear_company_data(company_id)
+
+    return report
+
+
+def print_report(report: dict):
+    catalog = report["catalog"]
+    print(f"\nSynthetic catalog: {catalog['tables']} tables, {catalog['foreign_keys']} foreign keys")
+    for run in report["runs"]:
+        print(
+            f"\nRun {run['run']} ({run['mode']}, {run['mutated_tables']} tables changed): "
+            f"{run['wall_seconds']:.2f}s, {run['source_round_trips']} source DB round trips, changes={run['changes']}"
+        )
+        print(f"{'step':<5}{'stage':<18}{'status':<10}{'seconds':>9}{'items':>8}{'items/s':>10}"
+              f"{'llm calls':>11}{'tokens in':>11}{'tokens out':>11}")
+        for stage in run["stages"]:
+            rate = stage["items_per_second"]
+            print(
+                f"{stage['step']:<5}{stage['stage']:<18}{stage['status']:<10}{stage['wall_seconds']:>9.3f}"
+                f"{stage['items']:>8}{(f'{rate:.1f}' if rate else '-'):>10}{stage['llm_calls']:>11}"
+                f"{stage['llm_input_tokens']:>11}{stage['llm_output_tokens']:>11}"
+            )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Offline benchmark of the ingestion pipeline")
+    catalog = parser.add_argument_group("synthetic catalog")
+    catalog.add_argument("--schemas", type=int, default=5, help="Number of schemas")
+    catalog.add_argument("--tables-per-schema", type=int, default=100, help="Tables per schema")
+    catalog.add_argument("--columns", type=int, default=12, help="Columns per table (before FK columns)")
+    catalog.add_argument("--fk-density", type=float, default=1.5, help="Average foreign keys per table")
+    catalog.add_argument("--teams", type=int, default=len(TEAMS), choices=range(0, len(TEAMS) + 1),
+                         metavar=f"0-{len(TEAMS)}", help="Teams returned by the fake teams API")
+    catalog.add_argument("--seed", type=int, default=42)
+
+    source = parser.add_argument_group("source database")
+    source.add_argument("--db-latency-ms", type=float, default=0.0, help="Latency per source DB round trip")
+
+    llm = parser.add_argument_group("stub LLM")
+    llm.add_argument("--llm-latency", type=float, default=0.5, help="Seconds per LLM call")
+    llm.add_argument("--llm-per-table-latency", type=float, default=0.05, help="Extra seconds per table in a call")
+    llm.add_argument("--llm-omit-rate", type=float, default=0.0, help="Share of tables left out of batch answers")
+    llm.add_argument("--llm-429-rate", type=float, default=0.0, help="Share of calls answered with HTTP 429")
+    llm.add_argument("--llm-rps", type=float, default=50.0, help="LLM_REQUESTS_PER_SECOND for the run")
+    llm.add_argument("--llm-concurrency", type=int, default=None, help="LLM_MAX_CONCURRENCY for the run")
+
+    run = parser.add_argument_group("runs")
+    run.add_argument("--runs", type=int, default=2, help="First run is full, later runs are incremental")
+    run.add_argument("--change-fraction", type=float, default=0.1, help="Share of tables changed before each later run")
+    run.add_argument("--cache", choices=["none", "disk"], default="none", help="Description cache backend")
+    run.add_argument("--store", choices=["memory", "pgvector"], default="memory",
+                     help="Vector store (pgvector needs the VECTOR_DB_* settings)")
+    run.add_argument("--embedding", choices=["hash", "model"], default="hash",
+                     help="Hashed bag-of-words vectors or the configured embedding model")
+    run.add_argument("--output", help="Write the JSON report to this file")
+    run.add_argument("--verbose", action="store_true", help="Show pipeline output and logs")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO if args.verbose else logging.ERROR)
+    if args.verbose:
+        report = run_benchmark(args)
+    else:
+        with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+            report = run_benchmark(args)
+
+    print_report(report)
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"\nReport written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+"""
+Benchmark for VectorRepository.save_embeddings write paths.
+
+Compares the legacy per-row loop (one encode + one INSERT per table) with the
+bulk paths (micro-batched encode_batch + COPY / execute_values) on a synthetic
+schema. Requires the VECTOR_DB_* settings to point at a PostgreSQL database
+with pgvector and the client_schema_vectors table.
+
+Usage:
+    python -m benchmarks.bench_save_embeddings --tables 5000
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import time
+import uuid
+
+# Add parent directory to path
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.dirname(current_dir)
+if parent_dir not in sys.path:
+    sys.path.insert(0, parent_dir)
+
+from clients.db_pool import release_connection
+from core.repositories.vector_repository import VectorRepository
+
+DOMAINS = ["Sales", "Person", "Production", "Purchasing", "HumanResources", "Finance", "Inventory"]
+ENTITIES = ["Order", "Customer", "Product", "Invoice", "Employee", "Vendor", "Shipment", "Payment"]
+
+
+def build_synthetic_rows(company_id: str, n_tables: int, seed: int = 42) -> list:
+    """Build (company_id, table_name, description, relations_json) tuples for n_tables tables."""
+    rng = random.Random(seed)
+    rows = []
+    for i in range(n_tables):
+        domain = rng.choice(DOMAINS)
+        entity = rng.choice(ENTITIES)
+        table_name = f"{domain}.{entity}{i}"
+        description = (
+            f"Stores {entity.lower()} records for the {domain} domain, including identifiers, "
+            f"status flags, amounts and audit timestamps used for {domain.lower()} reporting."
+        )
+        relations = {
+            "pk": f"{entity}{i}ID",
+            "fks": [{"from_column": "ParentID", "to_table": f"{domain}.{entity}{max(i - 1, 0)}", "to_column": "ID"}]
+        }
+        rows.append((company_id, table_name, description, json.dumps(relations)))
+    return rows
+
+
+def cleanup(repo: VectorRepository, company_id: str):
+    """Delete the synthetic rows written by the benchmark."""
+    conn = repo._get_connection()
+    try:
+        repo.clear_company_data(company_id, conn)
+        conn.commit()
+    finally:
+        release_connection(conn)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark save_embeddings write paths")
+    parser.add_argument("--tables", type=int, default=5000, help="Number of synthetic tables")
+    parser.add_argument(
+        "--methods", nargs="+", default=list(VectorRepository.WRITE_METHODS),
+        choices=VectorRepository.WRITE_METHODS, help="Write methods to compare"
+    )
+    args = parser.parse_args()
+
+    repo = VectorRepository()
+    company_id = f"benchmark-{uuid.uuid4()}"
+    rows = build_synthetic_rows(company_id, args.tables)
+
+    # Warm up the model so the first method is not charged for lazy init
+    repo.embedding_service.encode_batch([rows[0][2]])
+
+    print(f"Benchmarking save_embeddings on {args.tables} synthetic tables")
+    print(f"{'method':<16}{'seconds':>10}{'rows/s':>12}")
+    try:
+        for method in args.methods:
+            start = time.perf_counter()
+            inserted = repo.save_embeddings(rows, write_method=method)
+            elapsed = time.perf_counter() - start
+            print(f"{method:<16}{elapsed:>10.2f}{inserted / elapsed:>12.1f}")
+    finally:
+        cleanup(repo, company_id)
+
+
+if __name__ == "__main__":
+    main()
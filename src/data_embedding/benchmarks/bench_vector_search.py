@@ -0,0 +1,151 @@
+"""
+Benchmark for per-company vector search latency with and without ANN indexes.
+
+Loads --tenants synthetic companies of --tables random unit vectors each into
+client_schema_vectors, then measures the latency of the search the copilot /
+reporting services run (company filter + ORDER BY embedding <-> q LIMIT 12):
+  - before indexing (exact scan)
+  - after VectorIndexManager.maintain() for every tenant
+and reports p50 / p95 / p99 plus recall@12 of the indexed search against the
+exact result. Requires the VECTOR_DB_* settings to point at a PostgreSQL
+database with pgvector and the client_schema_vectors table.
+
+Usage:
+    python -m benchmarks.bench_vector_search --tenants 50 --tables 3000
+    python -m benchmarks.bench_vector_search --index-type ivfflat --probes 10
+"""
+import argparse
+import os
+import sys
+import time
+import uuid
+
+import numpy as np
+import psycopg2
+
+# Add parent directory to path
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.dirname(current_dir)
+if parent_dir not in sys.path:
+    sys.path.insert(0, parent_dir)
+
+from core.repositories.vector_repository import VectorRepository
+from core.vector_index_manager import INDEX_TYPES, VectorIndexManager
+
+SEARCH_QUERY = """
+    SELECT table_name FROM client_schema_vectors
+    WHERE company_id = %s
+    ORDER BY embedding <-> %s
+    LIMIT 12
+"""
+
+
+def connect(manager: VectorIndexManager):
+    """Plain (transactional) connection; SET LOCAL needs a transaction."""
+    return psycopg2.connect(**manager.conn_details)
+
+
+def load_tenants(manager: VectorIndexManager, company_ids: list, n_tables: int, dim: int, seed: int = 7):
+    """COPY n_tables random unit vectors per company."""
+    rng = np.random.default_rng(seed)
+    conn = connect(manager)
+    try:
+        cur = conn.cursor()
+        for company_id in company_ids:
+            vectors = rng.standard_normal((n_tables, dim)).astype(np.float32)
+            vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+            rows = [
+                (company_id, f"dbo.Table{i}", f"Synthetic table {i}", "{}", VectorRepository._format_vector(vector), None)
+                for i, vector in enumerate(vectors)
+            ]
+            VectorRepository._copy_rows(cur, "client_schema_vectors", VectorRepository.VECTOR_COLUMNS, rows)
+        conn.commit()
+        cur.close()
+    finally:
+        conn.close()
+
+
+def run_searches(manager: VectorIndexManager, queries: list, ef_search: int, probes: int) -> tuple:
+    """Run (company_id, vector) queries; return (latencies in ms, result lists)."""
+    latencies, results = [], []
+    conn = connect(manager)
+    try:
+        cur = conn.cursor()
+        for company_id, vector in queries:
+            start = time.perf_counter()
+            cur.execute("SET LOCAL hnsw.ef_search = %s", (ef_search,))
+            cur.execute("SET LOCAL ivfflat.probes = %s", (probes,))
+            cur.execute(SEARCH_QUERY, (company_id, vector))
+            results.append([row[0] for row in cur.fetchall()])
+            conn.commit()
+            latencies.append((time.perf_counter() - start) * 1000)
+        cur.close()
+    finally:
+        conn.close()
+    return np.array(latencies), results
+
+
+def report(label: str, latencies: np.ndarray, recall: float = None):
+    p50, p95, p99 = np.percentile(latencies, [50, 95, 99])
+    recall_text = f"{recall:>10.3f}" if recall is not None else f"{'-':>10}"
+    print(f"{label:<18}{p50:>9.2f}{p95:>9.2f}{p99:>9.2f}{recall_text}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark per-company vector search latency")
+    parser.add_argument("--tenants", type=int, default=20, help="Synthetic companies")
+    parser.add_argument("--tables", type=int, default=3000, help="Tables per company")
+    parser.add_argument("--dim", type=int, default=384, help="Embedding dimension of client_schema_vectors")
+    parser.add_argument("--queries", type=int, default=500, help="Searches per measurement")
+    parser.add_argument("--index-type", default="hnsw", choices=[t for t in INDEX_TYPES if t != "none"])
+    parser.add_argument("--ef-search", type=int, default=100)
+    parser.add_argument("--probes", type=int, default=10)
+    args = parser.parse_args()
+
+    manager = VectorIndexManager(index_type=args.index_type)
+    run_tag = uuid.uuid4()
+    company_ids = [f"benchmark-{run_tag}-{i}" for i in range(args.tenants)]
+
+    rng = np.random.default_rng(11)
+    queries = []
+    for _ in range(args.queries):
+        vector = rng.standard_normal(args.dim).astype(np.float32)
+        vector /= np.linalg.norm(vector)
+        queries.append((company_ids[rng.integers(len(company_ids))], VectorRepository._format_vector(vector)))
+
+    print(f"Loading {args.tenants} tenants x {args.tables} tables ({args.dim} dims)...")
+    try:
+        load_tenants(manager, company_ids, args.tables, args.dim)
+
+        exact_latencies, exact_results = run_searches(manager, queries, args.ef_search, args.probes)
+
+        start = time.perf_counter()
+        for company_id in company_ids:
+            manager.maintain(company_id)
+        build_seconds = time.perf_counter() - start
+        print(f"Built {args.tenants} {args.index_type} indexes in {build_seconds:.1f}s")
+
+        indexed_latencies, indexed_results = run_searches(manager, queries, args.ef_search, args.probes)
+        recall = float(np.mean([
+            len(set(exact) & set(found)) / max(1, len(exact))
+            for exact, found in zip(exact_results, indexed_results)
+        ]))
+
+        print(f"{'search':<18}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}{'recall@12':>10}")
+        report("exact scan", exact_latencies)
+        report(f"{args.index_type} index", indexed_latencies, recall)
+    finally:
+        for company_id in company_ids:
+            manager.drop_company_index(company_id)
+        conn = connect(manager)
+        try:
+            cur = conn.cursor()
+            cur.execute("DELETE FROM client_schema_vectors WHERE company_id = ANY(%s)", (company_ids,))
+            conn.commit()
+            cur.close()
+        finally:
+            conn.close()
+
+
+if __name__ == "__main__":
+    main()
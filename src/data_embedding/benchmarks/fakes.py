@@ -0,0 +1,460 @@
+"""
+Offline stand-ins for the ingestion pipeline's external systems.
+
+    SyntheticCatalog       N schemas x M tables with columns, primary keys and
+                           a foreign key graph of configurable density
+    FakeConnection         pyodbc-like connection answering DatabaseScanner's
+                           catalog queries from a SyntheticCatalog
+    CatalogScanner         DatabaseScanner reading a SyntheticCatalog
+    StubLLMService         deterministic LLMService with configurable latency
+    HashEmbeddingService   deterministic hashed bag-of-words embeddings
+    InMemoryVectorStore    VectorRepository replacement kept in process memory
+    InMemoryCheckpoints    CheckpointRepository replacement
+    InMemoryJoinGraphs     JoinGraphRepository replacement
+
+Used by benchmarks/bench_ingestion.py; nothing here is imported by the
+application itself.
+"""
+import hashlib
+import json
+import random
+import re
+import threading
+import time
+from collections import namedtuple
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from config import settings
+from core.database_scanner import DatabaseScanner
+from core.services.llm_service import LLMRateLimitError
+
+DOMAINS = ["Sales", "Person", "Production", "Purchasing", "HumanResources", "Finance", "Inventory", "Support"]
+ENTITIES = ["Order", "Customer", "Product", "Invoice", "Employee", "Vendor", "Shipment", "Payment", "Ticket", "Contract"]
+COLUMN_TYPES = ["int", "bigint", "nvarchar", "varchar", "datetime2", "date", "decimal", "bit", "uniqueidentifier"]
+TEAMS = ["Sales", "Finance", "Human Resources", "Operations", "Marketing", "Customer Support", "Procurement", "IT"]
+
+PrimaryKeyRow = namedtuple("PrimaryKeyRow", "schema_name table_name column_name")
+ForeignKeyRow = namedtuple(
+    "ForeignKeyRow", "constraint_name from_schema from_table from_column to_schema to_table to_column"
+)
+ColumnRow = namedtuple("ColumnRow", "TABLE_SCHEMA TABLE_NAME COLUMN_NAME DATA_TYPE IS_NULLABLE")
+
+
+class SyntheticCatalog:
+    """
+    Deterministic SQL Server catalog.
+
+    Every table has an integer primary key "<Entity>ID" followed by random
+    columns. Each table gets on average fk_density foreign keys to earlier
+    tables (same schema with 80% probability), so the join graph is acyclic
+    and connected within schemas.
+    """
+
+    def __init__(
+        self,
+        n_schemas: int = 5,
+        tables_per_schema: int = 100,
+        columns_per_table: int = 12,
+        fk_density: float = 1.5,
+        seed: int = 42
+    ):
+        self.seed = seed
+        self.columns_per_table = columns_per_table
+        self.fk_density = fk_density
+        self.schemas = [
+            f"{DOMAINS[i % len(DOMAINS)]}{i // len(DOMAINS) or ''}" for i in range(n_schemas)
+        ]
+        self.tables: Dict[str, dict] = {}
+        rng = random.Random(seed)
+        for schema in self.schemas:
+            for i in range(tables_per_schema):
+                name = f"{rng.choice(ENTITIES)}{i}"
+                self.tables[f"{schema}.{name}"] = {
+                    "schema": schema,
+                    "name": name,
+                    "pk": f"{name}ID",
+                    "columns": self._columns(rng, name, columns_per_table),
+                    "fks": [],
+                }
+        self._add_foreign_keys(rng)
+
+    @staticmethod
+    def _columns(rng: random.Random, name: str, count: int) -> List[Tuple[str, str, str]]:
+        columns = [(f"{name}ID", "int", "NO")]
+        for j in range(count - 1):
+            data_type = rng.choice(COLUMN_TYPES)
+            columns.append((f"{rng.choice(ENTITIES)}Attr{j}", data_type, rng.choice(["YES", "NO"])))
+        return columns
+
+    def _add_foreign_keys(self, rng: random.Random):
+        earlier = []
+        earlier_by_schema = {schema: [] for schema in self.schemas}
+        for full_name, table in self.tables.items():
+            count = int(self.fk_density) + (1 if rng.random() < self.fk_density % 1 else 0)
+            same_schema = earlier_by_schema[table["schema"]]
+            for k in range(count):
+                candidates = same_schema if same_schema and rng.random() < 0.8 else earlier
+                if not candidates:
+                    break
+                target = self.tables[rng.choice(candidates)]
+                column = f"{target['pk'][:-2]}Ref{k}ID"
+                table["columns"].append((column, "int", "YES"))
+                table["fks"].append((column, target["schema"], target["name"], target["pk"]))
+            earlier.append(full_name)
+            same_schema.append(full_name)
+
+    def mutate(self, fraction: float, seed: int = None) -> List[str]:
+        """
+        Change the schema of a fraction of the tables (one added column each),
+        as an incremental run would see it.
+
+        Returns:
+            Names of the changed tables
+        """
+        rng = random.Random(self.seed + 1 if seed is None else seed)
+        names = list(self.tables)
+        changed = rng.sample(names, int(len(names) * fraction))
+        for full_name in changed:
+            table = self.tables[full_name]
+            table["columns"].append((f"Added{len(table['columns'])}", rng.choice(COLUMN_TYPES), "YES"))
+        return changed
+
+    def primary_key_rows(self) -> List[PrimaryKeyRow]:
+        return [PrimaryKeyRow(t["schema"], t["name"], t["pk"]) for t in self.tables.values()]
+
+    def foreign_key_rows(self) -> List[ForeignKeyRow]:
+        return [
+            ForeignKeyRow(f"FK_{t['name']}_{column}", t["schema"], t["name"], column, to_schema, to_table, to_column)
+            for t in self.tables.values()
+            for column, to_schema, to_table, to_column in t["fks"]
+        ]
+
+    def column_rows(self) -> List[ColumnRow]:
+        """INFORMATION_SCHEMA.COLUMNS rows in the scanner's ORDER BY (schema, table, ordinal)."""
+        return [
+            ColumnRow(t["schema"], t["name"], column, data_type, nullable)
+            for t in sorted(self.tables.values(), key=lambda t: (t["schema"], t["name"]))
+            for column, data_type, nullable in t["columns"]
+        ]
+
+
+class FakeCursor:
+    """Answers the catalog queries DatabaseScanner issues; every round trip costs `latency` seconds."""
+
+    def __init__(self, catalog: SyntheticCatalog, latency: float = 0.0, stats: dict = None):
+        self.catalog = catalog
+        self.latency = latency
+        self.stats = stats if stats is not None else {}
+        self._rows = []
+
+    def _round_trip(self):
+        self.stats["round_trips"] = self.stats.get("round_trips", 0) + 1
+        if self.latency:
+            time.sleep(self.latency)
+
+    def execute(self, query: str, *params):
+        self._round_trip()
+        if "is_primary_key" in query:
+            self._rows = self.catalog.primary_key_rows()
+        elif "sys.foreign_keys" in query:
+            self._rows = self.catalog.foreign_key_rows()
+        elif "INFORMATION_SCHEMA.COLUMNS" in query:
+            self._rows = self.catalog.column_rows()
+        else:
+            raise NotImplementedError(f"FakeCursor cannot answer query: {query.strip()[:80]}")
+        return self
+
+    def fetchall(self) -> list:
+        self._round_trip()
+        rows, self._rows = self._rows, []
+        return rows
+
+    def fetchmany(self, size: int) -> list:
+        self._round_trip()
+        rows, self._rows = self._rows[:size], self._rows[size:]
+        return rows
+
+    def fetchone(self):
+        return self.fetchmany(1)[0] if self._rows else None
+
+    def close(self):
+        pass
+
+
+class FakeConnection:
+    """Minimal pyodbc.Connection replacement backed by a SyntheticCatalog."""
+
+    def __init__(self, catalog: SyntheticCatalog, latency: float = 0.0, stats: dict = None):
+        self.catalog = catalog
+        self.latency = latency
+        self.stats = stats if stats is not None else {}
+
+    def cursor(self) -> FakeCursor:
+        return FakeCursor(self.catalog, self.latency, self.stats)
+
+    def execute(self, query: str, *params) -> FakeCursor:
+        return self.cursor().execute(query, *params)
+
+    def close(self):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class CatalogScanner(DatabaseScanner):
+    """DatabaseScanner whose connections are FakeConnections over a SyntheticCatalog."""
+
+    catalog: SyntheticCatalog = None
+    latency: float = 0.0
+    stats: dict = {}
+
+    @classmethod
+    def bind(cls, catalog: SyntheticCatalog, latency: float = 0.0, stats: dict = None):
+        """Return a subclass bound to the catalog (drop-in for the DatabaseScanner class)."""
+        return type(cls.__name__, (cls,), {
+            "catalog": catalog,
+            "latency": latency,
+            "stats": stats if stats is not None else {},
+        })
+
+    def _connect(self):
+        return FakeConnection(self.catalog, self.latency, self.stats)
+
+
+class StubLLMService:
+    """
+    Deterministic LLMService replacement.
+
+    Each call sleeps latency + per_item_latency * items (+/- jitter) and
+    counts roughly 4 characters per token. omit_rate leaves that share of
+    tables out of batch answers and rate_limit_rate raises LLMRateLimitError
+    for that share of calls, to exercise the retry paths.
+    """
+
+    TABLE_PATTERN = re.compile(r"^--- Table: (.+?) ---$", re.MULTILINE)
+
+    def __init__(
+        self,
+        latency: float = 0.5,
+        per_item_latency: float = 0.05,
+        jitter: float = 0.1,
+        omit_rate: float = 0.0,
+        rate_limit_rate: float = 0.0,
+        seed: int = 42
+    ):
+        self.latency = latency
+        self.per_item_latency = per_item_latency
+        self.jitter = jitter
+        self.omit_rate = omit_rate
+        self.rate_limit_rate = rate_limit_rate
+        self._rng = random.Random(seed)
+        self._usage = {"calls": 0, "input_tokens": 0, "output_tokens": 0}
+        self._lock = threading.Lock()
+
+    def _call(self, prompt: str, items: int, output: str):
+        with self._lock:
+            draw = self._rng.random()
+            jitter = self._rng.uniform(-self.jitter, self.jitter)
+        time.sleep(max(0.0, (self.latency + self.per_item_latency * items) * (1 + jitter)))
+        with self._lock:
+            self._usage["calls"] += 1
+            self._usage["input_tokens"] += len(prompt) // 4
+            self._usage["output_tokens"] += len(output) // 4
+        if draw < self.rate_limit_rate:
+            raise LLMRateLimitError("429 Too Many Requests (simulated)")
+
+    def _keep(self, name: str) -> bool:
+        digest = int(hashlib.md5(name.encode("utf-8")).hexdigest()[:8], 16)
+        return digest / 0xFFFFFFFF >= self.omit_rate
+
+    @staticmethod
+    def describe(name: str) -> str:
+        schema, _, table = name.rpartition(".")
+        entity = re.sub(r"\d+$", "", table)
+        return (
+            f"{table} stores {entity.lower()} records for the {schema or 'default'} domain, "
+            f"including identifiers, status flags, amounts and audit timestamps used for reporting."
+        )
+
+    def usage_snapshot(self) -> dict:
+        with self._lock:
+            return dict(self._usage)
+
+    def generate_batch_descriptions(self, table_schemas_text: str) -> dict:
+        names = self.TABLE_PATTERN.findall(table_schemas_text)
+        answer = {"descriptions": [
+            {"table_name": name, "description": self.describe(name)} for name in names if self._keep(name)
+        ]}
+        self._call(table_schemas_text, len(names), json.dumps(answer))
+        return answer
+
+    def generate_batch_team_descriptions(self, team_names: list) -> dict:
+        answer = {name: f"{name} team working with {name.lower()} data and reports." for name in team_names}
+        self._call("\n".join(team_names), len(team_names), json.dumps(answer))
+        return answer
+
+    def generate_team_description(self, team_name: str, raise_on_error: bool = False) -> str:
+        description = f"{team_name} team working with {team_name.lower()} data and reports."
+        self._call(team_name, 1, description)
+        return description
+
+
+class HashEmbeddingService:
+    """
+    Deterministic embeddings without a model: hashed bag of words, L2-normalized.
+    Similar descriptions share words and so get similar vectors.
+    """
+
+    def __init__(self, dim: int = 384):
+        self.client = None
+        self.model = None
+        self.dim = dim
+
+    def _vector(self, text: str) -> np.ndarray:
+        vector = np.zeros(self.dim, dtype=np.float32)
+        for word in re.findall(r"\w+", text.lower()):
+            vector[int(hashlib.md5(word.encode("utf-8")).hexdigest()[:8], 16) % self.dim] += 1.0
+        return vector
+
+    def encode(self, text: str, normalize: bool = True) -> np.ndarray:
+        return self.encode_batch([text], normalize)[0]
+
+    def encode_batch(self, texts: List[str], normalize: bool = True, batch_size: int = None) -> np.ndarray:
+        vectors = np.vstack([self._vector(str(text)) for text in texts]) if texts else np.empty((0, self.dim), np.float32)
+        if normalize and len(vectors):
+            vectors /= np.maximum(np.linalg.norm(vectors, axis=1, keepdims=True), 1e-12)
+        return vectors
+
+
+class InMemoryVectorStore:
+    """The parts of VectorRepository the pipeline uses, kept in process memory."""
+
+    def __init__(self, embedding_service=None):
+        self.embedding_service = embedding_service or HashEmbeddingService()
+        self.rows: Dict[str, Dict[str, dict]] = {}
+        self.writes = 0
+
+    def get_schema_fingerprints(self, company_id: str) -> Dict[str, Optional[str]]:
+        return {name: row["fingerprint"] for name, row in self.rows.get(company_id, {}).items()}
+
+    def delete_tables(self, company_id: str, table_names: List[str], conn=None) -> int:
+        company = self.rows.get(company_id, {})
+        return sum(1 for name in table_names if company.pop(name, None) is not None)
+
+    def save_embeddings(
+        self,
+        data_to_ingest: List[Tuple],
+        write_method: str = None,
+        fingerprints: Dict[str, str] = None,
+        replace_all: bool = True,
+        progress_callback=None
+    ) -> int:
+        if not data_to_ingest:
+            return 0
+        fingerprints = fingerprints or {}
+        company_id = data_to_ingest[0][0]
+        if replace_all:
+            self.rows[company_id] = {}
+        company = self.rows.setdefault(company_id, {})
+        batch_size = settings.EMBEDDING_BATCH_SIZE
+        for start in range(0, len(data_to_ingest), batch_size):
+            batch = data_to_ingest[start:start + batch_size]
+            embeddings = self.embedding_service.encode_batch([row[2] for row in batch], normalize=True)
+            for (_, table_name, description, relations_json), embedding in zip(batch, embeddings):
+                company[table_name] = {
+                    "description": description,
+                    "relations": relations_json,
+                    "embedding": np.asarray(embedding, dtype=np.float32),
+                    "fingerprint": fingerprints.get(table_name),
+                    "teams": [],
+                }
+            if progress_callback:
+                progress_callback(min(start + batch_size, len(data_to_ingest)), len(data_to_ingest))
+        self.writes += len(data_to_ingest)
+        return len(data_to_ingest)
+
+    def get_embedding_matrix(self, company_id: str) -> Tuple[np.ndarray, np.ndarray]:
+        company = self.rows.get(company_id, {})
+        names = np.array(list(company), dtype=object)
+        if not company:
+            return names, np.empty((0, 0), dtype=np.float32)
+        return names, np.vstack([row["embedding"] for row in company.values()])
+
+    def update_team_assignments(
+        self,
+        company_id: str,
+        table_assignments: Dict[str, List[str]],
+        confidence_scores: Dict[str, Dict[str, float]] = None
+    ) -> int:
+        company = self.rows.get(company_id, {})
+        for table_name, teams in table_assignments.items():
+            if table_name in company:
+                company[table_name]["teams"] = teams
+        return len(table_assignments)
+
+
+class InMemoryCheckpoints:
+    """CheckpointRepository replacement (payloads round-trip through JSON like the real one)."""
+
+    def __init__(self):
+        self.payloads: Dict[Tuple[str, str], str] = {}
+
+    def save(self, run_id: str, company_id: str, stage: str, payload: dict):
+        self.payloads[(run_id, stage)] = json.dumps(payload)
+
+    def load(self, run_id: str, stage: str) -> Optional[dict]:
+        payload = self.payloads.get((run_id, stage))
+        return json.loads(payload) if payload is not None else None
+
+    def load_prefix(self, run_id: str, prefix: str) -> Dict[str, dict]:
+        return {
+            stage: json.loads(payload)
+            for (stored_run, stage), payload in self.payloads.items()
+            if stored_run == run_id and stage.startswith(prefix)
+        }
+
+    def mark_completed(self, run_id: str, company_id: str):
+        pass
+
+    def clear(self, run_id: str) -> int:
+        keys = [key for key in self.payloads if key[0] == run_id]
+        for key in keys:
+            del self.payloads[key]
+        return len(keys)
+
+    def purge_expired(self) -> int:
+        return 0
+
+
+class InMemoryJoinGraphs:
+    """JoinGraphRepository replacement; still materializes every stored path."""
+
+    # Class-level: the pipeline creates a new repository instance per run
+    graphs: Dict[str, Tuple[str, list]] = {}
+
+    def save_graph(self, company_id: str, graph) -> dict:
+        fingerprint = graph.fingerprint()
+        stored = self.graphs.get(company_id)
+        if stored and stored[0] == fingerprint:
+            return {"action": "unchanged", "paths": 0, **graph.summary()}
+        graph.path_hops = graph.path_hops_within(settings.JOIN_GRAPH_MAX_PATH_ROWS)
+        summary = graph.summary()
+        paths = list(graph.iter_path_rows(graph.path_hops))
+        self.graphs[company_id] = (fingerprint, paths)
+        return {"action": "saved", "paths": len(paths), **summary}
+
+
+class NoopIndexManager:
+    """VectorIndexManager replacement for the in-memory store (exact search, no index)."""
+
+    def __init__(self, index_type: str = None):
+        pass
+
+    def maintain(self, company_id: str, changed_fraction: float = 1.0) -> dict:
+        return {"index": None, "type": "none", "action": "none", "rows": 0}
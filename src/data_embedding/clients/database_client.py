@@ -1,9 +1,11 @@
 """
 Client for fetching database connection settings from the backend API
 """
-import requests
+import httpx
 import psycopg2
 from config import settings
+from clients import http_client
+from clients.db_pool import vector_db_connection
 
 
 def fetch_source_db_settings(company_id: str):
@@ -26,10 +28,7 @@ def fetch_source_db_settings(company_id: str):
     
     try:
         # No authentication needed based on test results
-        response = requests.get(api_url, timeout=30)
-        response.raise_for_status()
-        
-        api_data = response.json()
+        api_data = http_client.get_json(api_url)
         
         # API returns an array with one object
         if isinstance(api_data, list) and len(api_data) > 0:
@@ -48,7 +47,7 @@ def fetch_source_db_settings(company_id: str):
             "company_id": data.get("companyId")
         }
 
-    except requests.exceptions.HTTPError as http_err:
+    except httpx.HTTPStatusError as http_err:
         print(f"✖ HTTP error occurred while fetching settings: {http_err}")
         try:
             print(f"✖ Server Response Body: {http_err.response.text}")
@@ -68,51 +67,44 @@ def save_settings_to_db(settings_dict):
         print("Destination DB connection details are missing. Cannot save settings.")
         return
     
-    conn = None
-    try:
-        conn = psycopg2.connect(
-            host=settings.VECTOR_DB_HOST, 
-            dbname=settings.VECTOR_DB_NAME, 
-            user=settings.VECTOR_DB_USER, 
-            password=settings.VECTOR_DB_PASSWORD
-        )
-        cur = conn.cursor()
+    with vector_db_connection() as conn:
+        cur = None
+        try:
+            cur = conn.cursor()
         
-        company_id = settings_dict.get("company_id")
+            company_id = settings_dict.get("company_id")
         
-        if not company_id:
-              print("✖ Error: 'company_id' is missing from settings dictionary. Cannot proceed with save/update.")
-              return
+            if not company_id:
+                  print("✖ Error: 'company_id' is missing from settings dictionary. Cannot proceed with save/update.")
+                  return
 
-        # DELETE existing entry for this company_id
-        delete_query = "DELETE FROM source_connections WHERE company_id = %s;"
-        cur.execute(delete_query, (company_id,))
+            # DELETE existing entry for this company_id
+            delete_query = "DELETE FROM source_connections WHERE company_id = %s;"
+            cur.execute(delete_query, (company_id,))
         
-        if cur.rowcount > 0:
-              print(f"✔ Successfully deleted {cur.rowcount} old connection settings for company ID: {company_id}.")
-        else:
-              print(f"ℹ No existing connection settings found for company ID: {company_id}. Proceeding to insert.")
+            if cur.rowcount > 0:
+                  print(f"✔ Successfully deleted {cur.rowcount} old connection settings for company ID: {company_id}.")
+            else:
+                  print(f"ℹ No existing connection settings found for company ID: {company_id}. Proceeding to insert.")
 
 
-        # INSERT the new settings
-        insert_query = "INSERT INTO source_connections (server, database, username, password, company_id) VALUES (%s, %s, %s, %s, %s);"
-        data_tuple = (
-            settings_dict["server"], settings_dict["database"],
-            settings_dict["username"], settings_dict["password"],
-            company_id 
-        )
-        cur.execute(insert_query, data_tuple)
+            # INSERT the new settings
+            insert_query = "INSERT INTO source_connections (server, database, username, password, company_id) VALUES (%s, %s, %s, %s, %s);"
+            data_tuple = (
+                settings_dict["server"], settings_dict["database"],
+                settings_dict["username"], settings_dict["password"],
+                company_id 
+            )
+            cur.execute(insert_query, data_tuple)
         
-        conn.commit()
-        print("✔ New connection settings have been successfully saved to the database.")
+            conn.commit()
+            print("✔ New connection settings have been successfully saved to the database.")
         
-    except (Exception, psycopg2.Error) as error:
-        print(f"✖ Error while saving settings to PostgreSQL: {error}")
-        if conn:
+        except (Exception, psycopg2.Error) as error:
+            print(f"✖ Error while saving settings to PostgreSQL: {error}")
             conn.rollback()
             print("ℹ Transaction rolled back due to error.")
-        raise 
-    finally:
-        if conn:
-            cur.close()
-            conn.close()
+            raise 
+        finally:
+            if cur is not None:
+                cur.close()
@@ -0,0 +1,143 @@
+"""
+Shared PostgreSQL connection pool for the vector database
+"""
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+import psycopg2
+from psycopg2 import extensions
+from psycopg2.pool import PoolError, ThreadedConnectionPool
+from config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class BlockingConnectionPool:
+    """
+    ThreadedConnectionPool that waits for a free connection instead of
+    raising when all maxconn connections are in use.
+
+    Returned connections are rolled back and reset to autocommit off;
+    broken ones are discarded, and connections idle for longer than
+    VECTOR_DB_POOL_PING_AFTER_SECONDS are checked before reuse.
+    """
+
+    def __init__(self, minconn: int, maxconn: int, **conn_details):
+        self._pool = ThreadedConnectionPool(minconn, maxconn, **conn_details)
+        self._slots = threading.BoundedSemaphore(maxconn)
+        self._last_used = {}
+
+    def _is_alive(self, conn) -> bool:
+        if conn.closed:
+            return False
+        last_used = self._last_used.get(id(conn))
+        if last_used is None or time.monotonic() - last_used < settings.VECTOR_DB_POOL_PING_AFTER_SECONDS:
+            return True
+        try:
+            with conn.cursor() as cur:
+                cur.execute("SELECT 1")
+            conn.rollback()
+            return True
+        except psycopg2.Error:
+            return False
+
+    def getconn(self, timeout: float = None):
+        """
+        Borrow a connection, waiting up to timeout seconds for one to be returned.
+
+        Raises:
+            PoolError: If no connection became available in time
+        """
+        timeout = settings.VECTOR_DB_POOL_TIMEOUT_SECONDS if timeout is None else timeout
+        if not self._slots.acquire(timeout=timeout):
+            raise PoolError(f"No vector DB connection available after {timeout}s")
+        try:
+            conn = self._pool.getconn()
+            if not self._is_alive(conn):
+                logger.info("Discarding stale vector DB connection")
+                self._pool.putconn(conn, close=True)
+                conn = self._pool.getconn()
+            return conn
+        except Exception:
+            self._slots.release()
+            raise
+
+    def putconn(self, conn):
+        """Return a borrowed connection."""
+        broken = bool(conn.closed)
+        if not broken:
+            try:
+                if conn.get_transaction_status() != extensions.TRANSACTION_STATUS_IDLE:
+                    conn.rollback()
+                if conn.autocommit:
+                    conn.autocommit = False
+            except psycopg2.Error:
+                broken = True
+        try:
+            self._pool.putconn(conn, close=broken)
+            if broken:
+                self._last_used.pop(id(conn), None)
+            else:
+                self._last_used[id(conn)] = time.monotonic()
+        finally:
+            self._slots.release()
+
+    def closeall(self):
+        self._pool.closeall()
+
+
+_pool = None
+_pool_pid = None
+_pool_lock = threading.Lock()
+
+
+def get_vector_db_pool() -> BlockingConnectionPool:
+    """
+    Process-wide vector DB pool (VECTOR_DB_POOL_MIN..VECTOR_DB_POOL_MAX connections).
+    Re-created after a fork so children never share sockets with the parent.
+    """
+    global _pool, _pool_pid
+
+    if _pool is None or _pool_pid != os.getpid():
+        with _pool_lock:
+            if _pool is None or _pool_pid != os.getpid():
+                _pool = BlockingConnectionPool(
+                    settings.VECTOR_DB_POOL_MIN,
+                    settings.VECTOR_DB_POOL_MAX,
+                    host=settings.VECTOR_DB_HOST,
+                    database=settings.VECTOR_DB_NAME,
+                    user=settings.VECTOR_DB_USER,
+                    password=settings.VECTOR_DB_PASSWORD
+                )
+                _pool_pid = os.getpid()
+    return _pool
+
+
+def get_connection():
+    """Borrow a vector DB connection; hand it back with release_connection()."""
+    return get_vector_db_pool().getconn()
+
+
+def release_connection(conn):
+    """Return a connection obtained from get_connection() (uncommitted work is rolled back)."""
+    get_vector_db_pool().putconn(conn)
+
+
+@contextmanager
+def vector_db_connection():
+    """
+    Borrow a pooled vector DB connection for the duration of a with-block.
+
+    Usage:
+        with vector_db_connection() as conn:
+            cur = conn.cursor()
+            ...
+            conn.commit()
+    """
+    conn = get_connection()
+    try:
+        yield conn
+    finally:
+        release_connection(conn)
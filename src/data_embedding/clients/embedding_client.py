@@ -0,0 +1,61 @@
+"""
+Client for the shared embedding server
+"""
+import base64
+import logging
+import numpy as np
+from typing import List
+from clients import http_client
+
+logger = logging.getLogger(__name__)
+
+# Texts sent per /embed request (the server rejects very large requests)
+MAX_TEXTS_PER_REQUEST = 1024
+
+
+class EmbeddingServiceClient:
+    """
+    Thin HTTP client for the embedding server's POST /embed endpoint.
+    Embeddings are transferred as base64 float32 to keep payloads small.
+    Requests go through the shared pooled client (clients.http_client) and
+    are retried on transport errors and 429/5xx responses.
+    """
+
+    def __init__(self, base_url: str, timeout: float = 60):
+        """
+        Initialize the client.
+
+        Args:
+            base_url: Embedding server URL, e.g. http://recomind-embedding-server:8010
+            timeout: Seconds to wait for each request
+        """
+        self.embed_url = base_url.rstrip("/") + "/embed"
+        self.timeout = timeout
+
+    def encode(self, texts: List[str], normalize: bool = True) -> np.ndarray:
+        """
+        Embed texts on the server.
+
+        Args:
+            texts: Input texts
+            normalize: Whether to normalize the embeddings
+
+        Returns:
+            Numpy float32 array of shape (len(texts), dim)
+        """
+        matrices = []
+        for start in range(0, len(texts), MAX_TEXTS_PER_REQUEST):
+            chunk = texts[start:start + MAX_TEXTS_PER_REQUEST]
+            response = http_client.request(
+                "POST",
+                self.embed_url,
+                json={"texts": chunk, "normalize": normalize, "encoding_format": "base64"},
+                timeout=self.timeout
+            )
+            payload = response.json()
+            matrix = np.frombuffer(base64.b64decode(payload["embeddings_b64"]), dtype="<f4")
+            matrices.append(matrix.reshape(payload["count"], payload["dimension"]))
+
+        if not matrices:
+            return np.empty((0, 0), dtype=np.float32)
+        return np.vstack(matrices).astype(np.float32, copy=False)
@@ -0,0 +1,102 @@
+"""
+Shared, pooled HTTP client for backend API calls
+"""
+import logging
+import os
+import random
+import threading
+import time
+import httpx
+from config import settings
+
+logger = logging.getLogger(__name__)
+
+# Responses worth retrying (rate limited or temporarily unavailable)
+RETRY_STATUS_CODES = {429, 502, 503, 504}
+
+_client = None
+_client_pid = None
+_client_lock = threading.Lock()
+
+
+def get_http_client() -> httpx.Client:
+    """
+    Process-wide httpx client with keep-alive connection pooling.
+
+    A new client is created after a fork (Celery prefork children), so
+    pooled sockets are never shared between processes.
+    """
+    global _client, _client_pid
+
+    if _client is None or _client_pid != os.getpid():
+        with _client_lock:
+            if _client is None or _client_pid != os.getpid():
+                _client = httpx.Client(
+                    timeout=httpx.Timeout(settings.HTTP_TIMEOUT_SECONDS, connect=settings.HTTP_CONNECT_TIMEOUT_SECONDS),
+                    limits=httpx.Limits(
+                        max_connections=settings.HTTP_MAX_CONNECTIONS,
+                        max_keepalive_connections=settings.HTTP_MAX_CONNECTIONS,
+                        keepalive_expiry=settings.HTTP_KEEPALIVE_SECONDS
+                    )
+                )
+                _client_pid = os.getpid()
+    return _client
+
+
+def _retry_delay(attempt: int, response: httpx.Response = None) -> float:
+    """Retry-After when the server sends one, otherwise exponential backoff with jitter."""
+    retry_after = response.headers.get("Retry-After") if response is not None else None
+    if retry_after and retry_after.isdigit():
+        return float(retry_after)
+    return settings.HTTP_BACKOFF_SECONDS * (2 ** attempt) * (1 + random.random())
+
+
+def request(method: str, url: str, max_retries: int = None, **kwargs) -> httpx.Response:
+    """
+    Send a request on the shared client, retrying transport errors and
+    429/502/503/504 responses with exponential backoff.
+
+    Only use it for idempotent requests (it may send the request more than once).
+
+    Args:
+        method: HTTP method
+        url: Absolute URL
+        max_retries: Retries after the first attempt (default: HTTP_MAX_RETRIES)
+        **kwargs: Passed to httpx.Client.request (json, params, timeout, ...)
+
+    Returns:
+        The successful response
+
+    Raises:
+        httpx.HTTPStatusError: For error responses (after retries)
+        httpx.TransportError: For connection / timeout errors (after retries)
+    """
+    max_retries = settings.HTTP_MAX_RETRIES if max_retries is None else max_retries
+    client = get_http_client()
+
+    for attempt in range(max_retries + 1):
+        try:
+            response = client.request(method, url, **kwargs)
+        except httpx.TransportError as e:
+            if attempt == max_retries:
+                raise
+            delay = _retry_delay(attempt)
+            logger.warning(f"{method} {url} failed ({e!r}). Retrying in {delay:.1f}s ({attempt + 1}/{max_retries})")
+            time.sleep(delay)
+            continue
+
+        if response.status_code in RETRY_STATUS_CODES and attempt < max_retries:
+            delay = _retry_delay(attempt, response)
+            logger.warning(
+                f"{method} {url} returned {response.status_code}. Retrying in {delay:.1f}s ({attempt + 1}/{max_retries})"
+            )
+            time.sleep(delay)
+            continue
+
+        response.raise_for_status()
+        return response
+
+
+def get_json(url: str, **kwargs):
+    """GET a URL (with retries) and return the decoded JSON body."""
+    return request("GET", url, **kwargs).json()
@@ -1,8 +1,9 @@
 """
 Client for fetching team information from the backend API
 """
-import requests
+import httpx
 from config import settings
+from clients import http_client
 
 
 def fetch_company_teams(company_id: str) -> list:
@@ -29,10 +30,7 @@ def fetch_company_teams(company_id: str) -> list:
     
     try:
         # No authentication needed based on test results
-        response = requests.get(api_url, timeout=30)
-        response.raise_for_status()
-        
-        api_data = response.json()
+        api_data = http_client.get_json(api_url)
         
         # API returns an array of objects: [{"id": "...", "name": "Sales"}, ...]
         # Extract only the team names
@@ -43,7 +41,7 @@ def fetch_company_teams(company_id: str) -> list:
         else:
             raise ValueError(f"Unexpected API response format. Expected list, got: {type(api_data)}")
 
-    except requests.exceptions.HTTPError as http_err:
+    except httpx.HTTPStatusError as http_err:
         print(f"✖ HTTP error occurred while fetching teams: {http_err}")
         try:
             print(f"✖ Server Response Body: {http_err.response.text}")
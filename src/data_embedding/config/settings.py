@@ -22,6 +22,20 @@ LLM_MODEL_NAME = os.getenv("LLM_MODEL_NAME")
 # ============================================================================
 EMBEDDING_MODEL_NAME = 'BAAI/bge-small-en-v1.5'
 
+# Shared embedding server (src/embedding_server). When empty, the model is
+# loaded in-process instead (one instance shared by the whole worker).
+EMBEDDING_SERVICE_URL = os.getenv("EMBEDDING_SERVICE_URL", "")
+EMBEDDING_SERVICE_TIMEOUT = float(os.getenv("EMBEDDING_SERVICE_TIMEOUT", "120"))
+
+# Inference backend for the in-process model: "torch", "onnx" or "onnx-int8".
+# Compare them with benchmarks/bench_embedding_backends.py before switching.
+EMBEDDING_BACKEND = os.getenv("EMBEDDING_BACKEND", "torch")
+
+# Quantization target for "onnx-int8" ("avx2", "avx512", "avx512_vnni" or "arm64")
+# and where locally exported quantized models are kept
+EMBEDDING_ONNX_QUANTIZATION = os.getenv("EMBEDDING_ONNX_QUANTIZATION", "avx2")
+EMBEDDING_ONNX_CACHE_DIR = os.getenv("EMBEDDING_ONNX_CACHE_DIR", ".cache/onnx")
+
 
 # ============================================================================
 # Pipeline Processing Configuration
@@ -29,12 +43,149 @@ EMBEDDING_MODEL_NAME = 'BAAI/bge-small-en-v1.5'
 # Number of tables to process in a single batch for LLM description generation
 INGESTION_CHUNK_SIZE = 10
 
+# Maximum number of description batches in flight against the LLM at once
+LLM_MAX_CONCURRENCY = int(os.getenv("LLM_MAX_CONCURRENCY", "4"))
+
+# Token-bucket rate limit for LLM requests (requests per second, burst size)
+LLM_REQUESTS_PER_SECOND = float(os.getenv("LLM_REQUESTS_PER_SECOND", "2"))
+LLM_RATE_LIMIT_BURST = int(os.getenv("LLM_RATE_LIMIT_BURST", "4"))
+
+# Attempts per table batch (rate-limited, failed or partially answered batches are re-queued)
+LLM_MAX_BATCH_ATTEMPTS = int(os.getenv("LLM_MAX_BATCH_ATTEMPTS", "3"))
+
+# Teams described per LLM call during team assignment
+TEAM_DESCRIPTION_BATCH_SIZE = int(os.getenv("TEAM_DESCRIPTION_BATCH_SIZE", "10"))
+
+# Base delay for exponential backoff after a 429 response
+LLM_BACKOFF_SECONDS = float(os.getenv("LLM_BACKOFF_SECONDS", "2"))
+
+# Number of descriptions encoded per embedding model forward pass
+EMBEDDING_BATCH_SIZE = int(os.getenv("EMBEDDING_BATCH_SIZE", "256"))
+
+# How table vectors are written to PostgreSQL: "copy", "execute_values" or "row"
+VECTOR_WRITE_METHOD = os.getenv("VECTOR_WRITE_METHOD", "copy")
+
+# Rows per INSERT statement when VECTOR_WRITE_METHOD is "execute_values"
+VECTOR_INSERT_PAGE_SIZE = int(os.getenv("VECTOR_INSERT_PAGE_SIZE", "500"))
+
+# Per-company partial ANN index on client_schema_vectors: "hnsw", "ivfflat" or "none".
+# Maintained after every ingestion run (created, rebuilt after bulk changes, ANALYZE).
+VECTOR_INDEX_TYPE = os.getenv("VECTOR_INDEX_TYPE", "hnsw")
+
+# Companies with fewer tables are searched exactly through the company_id btree
+VECTOR_INDEX_MIN_ROWS = int(os.getenv("VECTOR_INDEX_MIN_ROWS", "1000"))
+
+# Rebuild the index when at least this share of a company's tables changed in one run
+VECTOR_INDEX_REBUILD_FRACTION = float(os.getenv("VECTOR_INDEX_REBUILD_FRACTION", "0.5"))
+
+# HNSW build parameters (pgvector defaults)
+HNSW_M = int(os.getenv("HNSW_M", "16"))
+HNSW_EF_CONSTRUCTION = int(os.getenv("HNSW_EF_CONSTRUCTION", "64"))
+
+# maintenance_work_mem for index builds (empty keeps the server default)
+VECTOR_INDEX_MAINTENANCE_WORK_MEM = os.getenv("VECTOR_INDEX_MAINTENANCE_WORK_MEM", "256MB")
+
+# Only re-describe and re-embed tables whose schema fingerprint changed since
+# the last run (set to "false" to always delete and reload the whole company)
+INCREMENTAL_INGESTION = os.getenv("INCREMENTAL_INGESTION", "true").lower() == "true"
+
+# Tables per checkpointed description batch. Each batch is saved as soon as it
+# is described, so a retried run only re-describes unfinished batches.
+DESCRIBE_CHECKPOINT_BATCH_SIZE = int(os.getenv("DESCRIBE_CHECKPOINT_BATCH_SIZE", "200"))
+
+# "inline": describe batches run inside the pipeline task.
+# "chord": each batch is its own Celery task (spread over workers) and a chord
+# callback finishes the run (embed/store and team assignment).
+INGESTION_DISPATCH_MODE = os.getenv("INGESTION_DISPATCH_MODE", "inline")
+
+# Automatic retries of a failed pipeline task; each retry resumes at the failed stage
+INGESTION_MAX_RETRIES = int(os.getenv("INGESTION_MAX_RETRIES", "2"))
+INGESTION_RETRY_DELAY_SECONDS = int(os.getenv("INGESTION_RETRY_DELAY_SECONDS", "30"))
+
+# Checkpoints of unfinished runs older than this are ignored and purged
+CHECKPOINT_TTL_HOURS = int(os.getenv("CHECKPOINT_TTL_HOURS", "48"))
+
+# Multi-tenant scheduler (Redis, CELERY_BROKER_URL): duplicate requests for a
+# company are merged into the run already queued or running (requests with
+# other full_refresh / resume_run_id options get 409), and runs wait for a
+# free slot in request order.
+INGESTION_SCHEDULER_ENABLED = os.getenv("INGESTION_SCHEDULER_ENABLED", "true").lower() == "true"
+INGESTION_MAX_CONCURRENT_RUNS = int(os.getenv("INGESTION_MAX_CONCURRENT_RUNS", "4"))
+INGESTION_MAX_RUNS_PER_COMPANY = int(os.getenv("INGESTION_MAX_RUNS_PER_COMPANY", "1"))
+
+# Description-batch tasks of one company running at once in chord mode
+INGESTION_MAX_TASKS_PER_COMPANY = int(os.getenv("INGESTION_MAX_TASKS_PER_COMPANY", "2"))
+
+# How often a waiting task re-checks for a free slot
+INGESTION_SCHEDULER_POLL_SECONDS = int(os.getenv("INGESTION_SCHEDULER_POLL_SECONDS", "15"))
+
+# A waiting request keeps its place in the queue while its task polls; one
+# that stops polling this long (lost or revoked message) is dropped, so it
+# cannot hold back later runs. Must exceed the poll interval plus the time a
+# message can wait in the broker for a free worker.
+INGESTION_WAITING_LEASE_SECONDS = int(os.getenv("INGESTION_WAITING_LEASE_SECONDS", "900"))
+
+# Slot lease (frees slots of crashed workers). Running pipelines renew it on
+# every stage change, from description-batch tasks and every
+# INGESTION_SLOT_RENEW_SECONDS while the pipeline task is working.
+INGESTION_SLOT_LEASE_SECONDS = int(os.getenv("INGESTION_SLOT_LEASE_SECONDS", "7200"))
+INGESTION_SLOT_RENEW_SECONDS = int(os.getenv("INGESTION_SLOT_RENEW_SECONDS", "300"))
+
+# Lifetime of the per-company "run in flight" marker used to merge duplicate requests
+INGESTION_DEDUP_TTL_SECONDS = int(os.getenv("INGESTION_DEDUP_TTL_SECONDS", "21600"))
+
+# LLM_REQUESTS_PER_SECOND is split evenly between running companies; the share is re-read this often
+INGESTION_FAIR_SHARE_REFRESH_SECONDS = float(os.getenv("INGESTION_FAIR_SHARE_REFRESH_SECONDS", "10"))
+
+# Optional profiling pass: sampled column statistics (row estimate, null ratio,
+# distinct count, min/max, top values) added to the description prompts.
+# Profiles are cached per schema fingerprint for PROFILE_CACHE_TTL_DAYS.
+COLUMN_PROFILING_ENABLED = os.getenv("COLUMN_PROFILING_ENABLED", "false").lower() == "true"
+PROFILE_MAX_WORKERS = int(os.getenv("PROFILE_MAX_WORKERS", "4"))
+PROFILE_SAMPLE_ROWS = int(os.getenv("PROFILE_SAMPLE_ROWS", "10000"))
+PROFILE_FULL_SCAN_ROWS = int(os.getenv("PROFILE_FULL_SCAN_ROWS", "20000"))
+PROFILE_MAX_COLUMNS = int(os.getenv("PROFILE_MAX_COLUMNS", "40"))
+PROFILE_TOP_K = int(os.getenv("PROFILE_TOP_K", "5"))
+PROFILE_TOP_K_MAX_DISTINCT = int(os.getenv("PROFILE_TOP_K_MAX_DISTINCT", "50"))
+PROFILE_MAX_TOP_K_COLUMNS = int(os.getenv("PROFILE_MAX_TOP_K_COLUMNS", "8"))
+PROFILE_QUERY_TIMEOUT_SECONDS = int(os.getenv("PROFILE_QUERY_TIMEOUT_SECONDS", "30"))
+PROFILE_CACHE_TTL_DAYS = int(os.getenv("PROFILE_CACHE_TTL_DAYS", "7"))
+
+# Company join graph built from foreign keys on every scan (company_join_graphs /
+# company_join_paths). Shortest join paths are precomputed for table pairs at
+# most JOIN_GRAPH_MAX_HOPS joins apart.
+JOIN_GRAPH_ENABLED = os.getenv("JOIN_GRAPH_ENABLED", "true").lower() == "true"
+JOIN_GRAPH_MAX_HOPS = int(os.getenv("JOIN_GRAPH_MAX_HOPS", "3"))
+
+# Cap on stored join path rows per company. Hub tables can put almost every
+# pair within a few joins; above the cap only shorter paths are stored and
+# longer lookups are searched in memory.
+JOIN_GRAPH_MAX_PATH_ROWS = int(os.getenv("JOIN_GRAPH_MAX_PATH_ROWS", "200000"))
+
+# Seconds the join graph API keeps a loaded graph in memory
+JOIN_GRAPH_CACHE_SECONDS = int(os.getenv("JOIN_GRAPH_CACHE_SECONDS", "300"))
+
+# Persistent cache for LLM table/team descriptions: "postgres", "disk" or "none"
+DESCRIPTION_CACHE_BACKEND = os.getenv("DESCRIPTION_CACHE_BACKEND", "postgres")
+DESCRIPTION_CACHE_DIR = os.getenv("DESCRIPTION_CACHE_DIR", ".cache/descriptions")
+DESCRIPTION_CACHE_TTL_DAYS = int(os.getenv("DESCRIPTION_CACHE_TTL_DAYS", "30"))
+DESCRIPTION_CACHE_MAX_ENTRIES = int(os.getenv("DESCRIPTION_CACHE_MAX_ENTRIES", "100000"))
+
+# Ignore cached descriptions (results are still written back to the cache)
+DESCRIPTION_CACHE_BYPASS = os.getenv("DESCRIPTION_CACHE_BYPASS", "false").lower() == "true"
+
 # Team assignment similarity threshold (0.0 - 1.0)
 TEAM_ASSIGNMENT_THRESHOLD = 0.6
 
 # Maximum number of teams to assign per table
 MAX_TEAMS_PER_TABLE = 3
 
+# Rows per round trip when reading stored embeddings back for team assignment
+EMBEDDING_FETCH_SIZE = int(os.getenv("EMBEDDING_FETCH_SIZE", "2000"))
+
+# Table rows scored per matrix product during team assignment (bounds memory)
+SIMILARITY_CHUNK_SIZE = int(os.getenv("SIMILARITY_CHUNK_SIZE", "4096"))
+
 
 # ============================================================================
 # External API Configuration
@@ -51,6 +202,16 @@ API_TEAMS_TEMPLATE = os.getenv(
     "https://api.recomind.site/api/Team/company/{company_id}/for-ai-model"
 )
 
+# Shared pooled HTTP client (clients/http_client.py)
+HTTP_TIMEOUT_SECONDS = float(os.getenv("HTTP_TIMEOUT_SECONDS", "30"))
+HTTP_CONNECT_TIMEOUT_SECONDS = float(os.getenv("HTTP_CONNECT_TIMEOUT_SECONDS", "10"))
+HTTP_MAX_CONNECTIONS = int(os.getenv("HTTP_MAX_CONNECTIONS", "20"))
+HTTP_KEEPALIVE_SECONDS = float(os.getenv("HTTP_KEEPALIVE_SECONDS", "60"))
+
+# Retries for transport errors and 429/502/503/504 responses (exponential backoff)
+HTTP_MAX_RETRIES = int(os.getenv("HTTP_MAX_RETRIES", "3"))
+HTTP_BACKOFF_SECONDS = float(os.getenv("HTTP_BACKOFF_SECONDS", "0.5"))
+
 
 # ============================================================================
 # Vector Database Configuration (PostgreSQL with pgvector)
@@ -60,8 +221,40 @@ VECTOR_DB_NAME = os.getenv("VECTOR_DB_NAME")
 VECTOR_DB_USER = os.getenv("VECTOR_DB_USER")
 VECTOR_DB_PASSWORD = os.getenv("VECTOR_DB_PASSWORD")
 
+# Process-wide connection pool shared by the repositories and clients (clients/db_pool.py).
+# Callers wait up to VECTOR_DB_POOL_TIMEOUT_SECONDS for a free connection; connections
+# idle longer than VECTOR_DB_POOL_PING_AFTER_SECONDS are checked before reuse.
+VECTOR_DB_POOL_MIN = int(os.getenv("VECTOR_DB_POOL_MIN", "1"))
+VECTOR_DB_POOL_MAX = int(os.getenv("VECTOR_DB_POOL_MAX", "10"))
+VECTOR_DB_POOL_TIMEOUT_SECONDS = float(os.getenv("VECTOR_DB_POOL_TIMEOUT_SECONDS", "30"))
+VECTOR_DB_POOL_PING_AFTER_SECONDS = float(os.getenv("VECTOR_DB_POOL_PING_AFTER_SECONDS", "60"))
+
+
+# ============================================================================
+# Observability
+# ============================================================================
+# Port of the Prometheus /metrics endpoint started in the Celery worker (0 disables)
+METRICS_PORT = int(os.getenv("METRICS_PORT", "9100"))
+
 
 # ============================================================================
 # Celery Configuration
 # ============================================================================
 CELERY_BROKER_URL = os.getenv("CELERY_BROKER_URL", "redis://recomind-ingestion-redis:6379/0")
+
+# ============================================================================
+# Progress Events (Redis pub/sub, streamed by /task-events/{task_id})
+# ============================================================================
+PROGRESS_EVENTS_ENABLED = os.getenv("PROGRESS_EVENTS_ENABLED", "true").lower() == "true"
+PROGRESS_EVENTS_REDIS_URL = os.getenv("PROGRESS_EVENTS_REDIS_URL", CELERY_BROKER_URL)
+
+# Events kept per task for late subscribers / reconnects, and how long they are kept
+PROGRESS_EVENTS_HISTORY = int(os.getenv("PROGRESS_EVENTS_HISTORY", "500"))
+PROGRESS_EVENTS_TTL_SECONDS = int(os.getenv("PROGRESS_EVENTS_TTL_SECONDS", "86400"))
+
+# Keep-alive comment interval of the SSE stream (the task state is re-checked as well)
+PROGRESS_EVENTS_HEARTBEAT_SECONDS = int(os.getenv("PROGRESS_EVENTS_HEARTBEAT_SECONDS", "15"))
+
+# The SSE stream ends (with an "idle_timeout" event) after this long without an
+# event while the task is unfinished, e.g. for an unknown or lost task id
+PROGRESS_EVENTS_IDLE_TIMEOUT_SECONDS = int(os.getenv("PROGRESS_EVENTS_IDLE_TIMEOUT_SECONDS", "900"))
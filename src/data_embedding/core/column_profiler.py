@@ -0,0 +1,269 @@
+"""
+Sampled column statistics for scanned tables
+
+Profiles give the LLM more than column names and types: approximate row
+counts (sys.partitions), null ratios, distinct counts, min/max of numeric
+and date columns and the most frequent values of low-cardinality text
+columns. Large tables are read through TABLESAMPLE, so a profile costs a
+few small queries per table regardless of table size.
+"""
+import logging
+import queue
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import Dict, List, Optional
+from config import settings
+
+logger = logging.getLogger(__name__)
+
+# Types that support MIN/MAX and give meaningful ranges
+RANGE_TYPES = {
+    "tinyint", "smallint", "int", "bigint", "decimal", "numeric", "money", "smallmoney",
+    "float", "real", "date", "datetime", "datetime2", "smalldatetime", "datetimeoffset", "time"
+}
+# Types whose most frequent values are reported when the column has few distinct values
+CATEGORY_TYPES = {"char", "varchar", "nchar", "nvarchar", "bit", "tinyint"}
+# Types that do not support COUNT(DISTINCT)/MIN/MAX; only their null ratio is profiled
+NULL_ONLY_TYPES = {
+    "text", "ntext", "image", "xml", "geography", "geometry", "hierarchyid",
+    "sql_variant", "timestamp", "rowversion", "binary", "varbinary"
+}
+
+ROW_ESTIMATES_QUERY = """
+SELECT s.name AS schema_name, t.name AS table_name, SUM(p.rows) AS row_count
+FROM sys.tables t
+INNER JOIN sys.schemas s ON t.schema_id = s.schema_id
+INNER JOIN sys.partitions p ON p.object_id = t.object_id AND p.index_id IN (0, 1)
+GROUP BY s.name, t.name;
+"""
+
+
+def quote_identifier(name: str) -> str:
+    """Bracket-quote a SQL Server identifier."""
+    return "[" + name.replace("]", "]]") + "]"
+
+
+def quote_table(full_name: str) -> str:
+    """Quote a 'schema.table' name."""
+    schema, _, table = full_name.partition(".")
+    return f"{quote_identifier(schema)}.{quote_identifier(table)}"
+
+
+class ConnectionPool:
+    """Bounded pool of pyodbc connections, created on demand (one per worker at most)."""
+
+    def __init__(self, conn_string: str, size: int, query_timeout: int = None):
+        # Imported here: the pipeline imports this module even with profiling off
+        import pyodbc
+        self._pyodbc = pyodbc
+        self.conn_string = conn_string
+        self.query_timeout = query_timeout
+        self._idle = queue.LifoQueue()
+        self._slots = queue.Queue()
+        for _ in range(size):
+            self._slots.put(None)
+
+    def _connect(self):
+        cnxn = self._pyodbc.connect(self.conn_string)
+        if self.query_timeout:
+            cnxn.timeout = self.query_timeout
+        # Statistics do not need consistent reads; never block the source workload
+        cnxn.execute("SET TRANSACTION ISOLATION LEVEL READ UNCOMMITTED")
+        return cnxn
+
+    @contextmanager
+    def connection(self):
+        """Borrow a connection; blocks while `size` connections are in use."""
+        self._slots.get()
+        try:
+            try:
+                cnxn = self._idle.get_nowait()
+            except queue.Empty:
+                cnxn = self._connect()
+        except Exception:
+            self._slots.put(None)
+            raise
+        try:
+            yield cnxn
+        except self._pyodbc.Error:
+            # The connection may be broken; do not hand it out again
+            cnxn.close()
+            cnxn = None
+            raise
+        finally:
+            if cnxn is not None:
+                self._idle.put(cnxn)
+            self._slots.put(None)
+
+    def close(self):
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                return
+            except self._pyodbc.Error:
+                pass
+
+
+class ColumnProfiler:
+    """
+    Computes per-column statistics for scanned tables in parallel.
+
+    Profiles are JSON-serializable dicts:
+        {"row_estimate", "sampled_rows", "sample_percent",
+         "columns": {name: {"null_ratio", "distinct", "min", "max", "top"}}}
+    """
+
+    def __init__(self, conn_string: str, max_workers: int = None):
+        """
+        Initialize the profiler.
+
+        Args:
+            conn_string: ODBC connection string of the source database
+            max_workers: Tables profiled (and connections open) at once
+                (default: PROFILE_MAX_WORKERS)
+        """
+        self.conn_string = conn_string
+        self.max_workers = max_workers or settings.PROFILE_MAX_WORKERS
+
+    def fetch_row_estimates(self, cursor) -> Dict[str, int]:
+        """Approximate row count of every table from sys.partitions (no table scans)."""
+        cursor.execute(ROW_ESTIMATES_QUERY)
+        return {f"{row.schema_name}.{row.table_name}": int(row.row_count or 0) for row in cursor.fetchall()}
+
+    @staticmethod
+    def sample_clause(row_estimate: int) -> tuple:
+        """(FROM-clause suffix, sample percent) targeting PROFILE_SAMPLE_ROWS rows."""
+        if row_estimate <= settings.PROFILE_FULL_SCAN_ROWS:
+            return "", 100.0
+        percent = min(100.0, max(0.01, settings.PROFILE_SAMPLE_ROWS * 100.0 / row_estimate))
+        # REPEATABLE keeps the sample (and so the prompt and its cache key) stable between runs
+        return f" TABLESAMPLE SYSTEM ({percent:.4f} PERCENT) REPEATABLE (42)", percent
+
+    def profile_table(self, cursor, table: dict, row_estimate: int) -> dict:
+        """
+        Profile one table.
+
+        Args:
+            cursor: Source database cursor
+            table: Scanned table dict ('full_name', 'columns': [[name, data_type], ...])
+            row_estimate: Approximate row count
+
+        Returns:
+            Profile dict
+        """
+        columns = [(name, data_type.lower()) for name, data_type in table.get("columns", [])]
+        columns = columns[:settings.PROFILE_MAX_COLUMNS]
+        sample, percent = self.sample_clause(row_estimate)
+        source = f"{quote_table(table['full_name'])}{sample}"
+        profile = {"row_estimate": row_estimate, "sampled_rows": 0, "sample_percent": round(percent, 4), "columns": {}}
+        if not columns or row_estimate == 0:
+            return profile
+
+        select_parts = ["COUNT_BIG(*)"]
+        for name, data_type in columns:
+            column = quote_identifier(name)
+            select_parts.append(f"SUM(CASE WHEN {column} IS NULL THEN 1 ELSE 0 END)")
+            if data_type not in NULL_ONLY_TYPES:
+                select_parts.append(f"COUNT(DISTINCT {column})")
+            if data_type in RANGE_TYPES:
+                select_parts.append(f"CONVERT(NVARCHAR(64), MIN({column}))")
+                select_parts.append(f"CONVERT(NVARCHAR(64), MAX({column}))")
+
+        cursor.execute(f"SELECT {', '.join(select_parts)} FROM {source}")
+        values = iter(cursor.fetchone())
+        sampled = int(next(values) or 0)
+        profile["sampled_rows"] = sampled
+        if not sampled:
+            return profile
+
+        category_columns = []
+        for name, data_type in columns:
+            stats = {"null_ratio": round(int(next(values) or 0) / sampled, 3)}
+            if data_type not in NULL_ONLY_TYPES:
+                stats["distinct"] = int(next(values) or 0)
+                if data_type in CATEGORY_TYPES and 0 < stats["distinct"] <= settings.PROFILE_TOP_K_MAX_DISTINCT:
+                    category_columns.append(name)
+            if data_type in RANGE_TYPES:
+                stats["min"], stats["max"] = next(values), next(values)
+            profile["columns"][name] = stats
+
+        for name in category_columns[:settings.PROFILE_MAX_TOP_K_COLUMNS]:
+            column = quote_identifier(name)
+            cursor.execute(
+                f"SELECT TOP ({settings.PROFILE_TOP_K}) CONVERT(NVARCHAR(64), {column}), COUNT_BIG(*) "
+                f"FROM {source} WHERE {column} IS NOT NULL GROUP BY {column} ORDER BY COUNT_BIG(*) DESC"
+            )
+            profile["columns"][name]["top"] = [[value, int(count)] for value, count in cursor.fetchall()]
+
+        return profile
+
+    def profile_tables(self, tables: List[dict]) -> Dict[str, dict]:
+        """
+        Profile tables in parallel over a bounded connection pool.
+
+        Tables that fail (timeouts, permissions, unsupported types) are
+        logged and left without a profile.
+
+        Returns:
+            Dictionary of {full_name: profile}
+        """
+        if not tables:
+            return {}
+
+        pool = ConnectionPool(self.conn_string, self.max_workers, settings.PROFILE_QUERY_TIMEOUT_SECONDS)
+        try:
+            with pool.connection() as cnxn:
+                row_estimates = self.fetch_row_estimates(cnxn.cursor())
+
+            def profile(table: dict) -> Optional[dict]:
+                try:
+                    with pool.connection() as cnxn:
+                        return self.profile_table(cnxn.cursor(), table, row_estimates.get(table["full_name"], 0))
+                except Exception as e:
+                    logger.warning(f"Could not profile {table['full_name']}: {e}")
+                    return None
+
+            with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+                results = executor.map(profile, tables)
+                return {
+                    table["full_name"]: result
+                    for table, result in zip(tables, results)
+                    if result is not None
+                }
+        finally:
+            pool.close()
+
+
+def _format_value(value) -> str:
+    text = str(value)
+    return text if len(text) <= 40 else text[:37] + "..."
+
+
+def format_profile(profile: dict) -> str:
+    """
+    Render a profile as prompt text, e.g.
+
+        Rows (approx.): 1,204,331
+        Column statistics (sampled):
+        Status: 0% null, 4 distinct, top: 'Shipped', 'Open', 'Cancelled'
+        OrderDate: 0% null, range 2011-05-31 .. 2014-06-30
+    """
+    lines = [f"Rows (approx.): {profile.get('row_estimate', 0):,}"]
+    column_lines = []
+    for name, stats in (profile.get("columns") or {}).items():
+        parts = [f"{stats['null_ratio']:.0%} null"]
+        distinct = stats.get("distinct")
+        if distinct is not None:
+            non_null = profile["sampled_rows"] * (1 - stats["null_ratio"])
+            parts.append("unique" if distinct > 1 and distinct >= non_null - 0.5 else f"{distinct} distinct")
+        if stats.get("min") is not None:
+            parts.append(f"range {_format_value(stats['min'])} .. {_format_value(stats['max'])}")
+        if stats.get("top"):
+            parts.append("top: " + ", ".join(f"'{_format_value(value)}'" for value, _ in stats["top"]))
+        column_lines.append(f"{name}: {', '.join(parts)}")
+    if column_lines:
+        label = "sampled" if profile.get("sample_percent", 100) < 100 else "full table"
+        lines.append(f"Column statistics ({label}):")
+        lines.extend(column_lines)
+    return "\n".join(lines)
@@ -1,7 +1,7 @@
 # src/recomind/data_embedding/core/database_scanner.py
 
-import pyodbc
 from collections import defaultdict
+from core.column_profiler import ColumnProfiler
 # We no longer need to import the global config file here
 
 class DatabaseScanner:
@@ -9,6 +9,20 @@ class DatabaseScanner:
     Connects to the source SQL Server database to fetch schemas,
     primary keys, and foreign key relationships for all tables.
     """
+
+    # Columns of every base table in one set-based query, grouped client-side
+    COLUMNS_QUERY = """
+    SELECT c.TABLE_SCHEMA, c.TABLE_NAME, c.COLUMN_NAME, c.DATA_TYPE, c.IS_NULLABLE
+    FROM INFORMATION_SCHEMA.COLUMNS c
+    INNER JOIN INFORMATION_SCHEMA.TABLES t
+        ON t.TABLE_SCHEMA = c.TABLE_SCHEMA AND t.TABLE_NAME = c.TABLE_NAME
+    WHERE t.TABLE_TYPE = 'BASE TABLE'
+    ORDER BY c.TABLE_SCHEMA, c.TABLE_NAME, c.ORDINAL_POSITION;
+    """
+
+    # Rows pulled per round trip while streaming the columns query
+    COLUMN_FETCH_SIZE = 5000
+
     def __init__(self, db_settings: dict):
         """Initializes the database connection string from the passed settings dictionary."""
         if not all(k in db_settings for k in ['server', 'database', 'username', 'password']):
@@ -23,14 +37,24 @@ class DatabaseScanner:
         except Exception as e:
             raise ValueError(f"Error building connection string: {e}")
 
-    # ... The rest of the file (_execute_query, _fetch_primary_keys, etc.) remains exactly the same ...
+    def _connect(self):
+        """Open a connection to the source database."""
+        # Imported here so the pipeline (and the offline benchmark) import without an ODBC driver
+        import pyodbc
+        return pyodbc.connect(self.conn_string)
+
     def _execute_query(self, cursor, query: str) -> list:
-        # ... (no change)
         cursor.execute(query)
         return cursor.fetchall()
 
     def _fetch_primary_keys(self, cursor) -> dict:
-        # ... (no change)
+        """
+        Fetch primary key columns for all tables in one query.
+
+        Returns:
+            {schema.table: column} for single-column keys and
+            {schema.table: [col1, col2, ...]} (in key order) for composite keys
+        """
         query = """
         SELECT s.name AS schema_name, t.name AS table_name, c.name AS column_name
         FROM sys.tables t
@@ -38,17 +62,23 @@ class DatabaseScanner:
         INNER JOIN sys.indexes i ON t.object_id = i.object_id
         INNER JOIN sys.index_columns ic ON i.object_id = ic.object_id AND i.index_id = ic.index_id
         INNER JOIN sys.columns c ON ic.object_id = c.object_id AND c.column_id = ic.column_id
-        WHERE i.is_primary_key = 1;
+        WHERE i.is_primary_key = 1
+        ORDER BY s.name, t.name, ic.key_ordinal;
         """
-        primary_keys = {}
+        key_columns = defaultdict(list)
         for row in self._execute_query(cursor, query):
             full_table_name = f"{row.schema_name}.{row.table_name}"
-            primary_keys[full_table_name] = row.column_name
-        print(f"Successfully fetched {len(primary_keys)} primary keys.")
+            key_columns[full_table_name].append(row.column_name)
+
+        primary_keys = {
+            table: columns[0] if len(columns) == 1 else columns
+            for table, columns in key_columns.items()
+        }
+        composite_count = sum(1 for columns in key_columns.values() if len(columns) > 1)
+        print(f"Successfully fetched {len(primary_keys)} primary keys ({composite_count} composite).")
         return primary_keys
 
     def _fetch_foreign_key_relationships(self, cursor) -> dict:
-        # ... (no change)
         query = """
         SELECT
             fk.name AS constraint_name,
@@ -68,6 +98,7 @@ class DatabaseScanner:
             from_table_full = f"{row.from_schema}.{row.from_table}"
             to_table_full = f"{row.to_schema}.{row.to_table}"
             relationships[from_table_full].append({
+                "constraint_name": row.constraint_name,
                 "from_column": row.from_column,
                 "to_table": to_table_full,
                 "to_column": row.to_column
@@ -75,43 +106,103 @@ class DatabaseScanner:
         print(f"Successfully fetched {sum(len(v) for v in relationships.values())} foreign key relationships.")
         return dict(relationships)
 
-    def scan_tables(self) -> list:
-        # ... (no change)
-        table_schema_details = []
-        try:
-            with pyodbc.connect(self.conn_string) as cnxn:
-                cursor = cnxn.cursor()
-                
-                all_pks = self._fetch_primary_keys(cursor)
-                all_fks = self._fetch_foreign_key_relationships(cursor)
-                
-                table_list_query = "SELECT TABLE_SCHEMA, TABLE_NAME FROM INFORMATION_SCHEMA.TABLES WHERE TABLE_TYPE = 'BASE TABLE'"
-                all_tables_meta = self._execute_query(cursor, table_list_query)
-                print(f"Found {len(all_tables_meta)} tables to process.")
-                
-                for table_schema, table_name in all_tables_meta:
-                    full_table_name = f"{table_schema}.{table_name}"
-                    
-                    schema_query = "SELECT COLUMN_NAME, DATA_TYPE, IS_NULLABLE FROM INFORMATION_SCHEMA.COLUMNS WHERE TABLE_SCHEMA = ? AND TABLE_NAME = ?"
-                    cursor.execute(schema_query, table_schema, table_name)
-                    
-                    schema_details_text = "\n".join([f"{col[0]} ({col[1]}, Nullable: {col[2]})" for col in cursor.fetchall()])
-                    
-                    key_info = {
+    def iter_schema_batches(self):
+        """
+        Stream scanned tables grouped by schema.
+
+        Primary and foreign keys are fetched up front; columns for every table
+        come from a single catalog query ordered by schema, so each schema's
+        tables can be yielded (and described) while later schemas are still
+        being read.
+
+        Yields:
+            Lists of table dicts ('full_name', 'schema_text', 'key_info',
+            'columns' as [name, data_type] pairs), one list per schema
+        """
+        with self._connect() as cnxn:
+            cursor = cnxn.cursor()
+
+            all_pks = self._fetch_primary_keys(cursor)
+            all_fks = self._fetch_foreign_key_relationships(cursor)
+
+            cursor.execute(self.COLUMNS_QUERY)
+
+            current_schema = None
+            current_table = None
+            current_columns = []
+            current_column_types = []
+            schema_batch = []
+
+            def build_table(full_table_name: str, columns: list, column_types: list) -> dict:
+                return {
+                    'full_name': full_table_name,
+                    'schema_text': "\n".join(columns),
+                    'key_info': {
                         "pk": all_pks.get(full_table_name),
                         "fks": all_fks.get(full_table_name, [])
-                    }
-                    
-                    table_schema_details.append({
-                        'full_name': full_table_name,
-                        'schema_text': schema_details_text,
-                        'key_info': key_info 
-                    })
-            
+                    },
+                    'columns': column_types
+                }
+
+            while True:
+                rows = cursor.fetchmany(self.COLUMN_FETCH_SIZE)
+                if not rows:
+                    break
+
+                for table_schema, table_name, column_name, data_type, is_nullable in rows:
+                    full_table_name = f"{table_schema}.{table_name}"
+
+                    if full_table_name != current_table:
+                        if current_table is not None:
+                            schema_batch.append(build_table(current_table, current_columns, current_column_types))
+                        if table_schema != current_schema and schema_batch:
+                            yield schema_batch
+                            schema_batch = []
+                        current_schema = table_schema
+                        current_table = full_table_name
+                        current_columns = []
+                        current_column_types = []
+
+                    current_columns.append(f"{column_name} ({data_type}, Nullable: {is_nullable})")
+                    current_column_types.append([column_name, data_type])
+
+            if current_table is not None:
+                schema_batch.append(build_table(current_table, current_columns, current_column_types))
+            if schema_batch:
+                yield schema_batch
+
+    def scan_tables(self, on_batch=None) -> list:
+        """
+        Scan every base table of the source database.
+
+        Args:
+            on_batch: Optional callback(schema_batch, tables_so_far) called after each schema
+
+        Returns:
+            List of table dicts ('full_name', 'schema_text', 'key_info', 'columns'),
+            or an empty list if the scan failed
+        """
+        table_schema_details = []
+        try:
+            for schema_batch in self.iter_schema_batches():
+                table_schema_details.extend(schema_batch)
+                if on_batch:
+                    on_batch(schema_batch, len(table_schema_details))
+
+            print(f"Found {len(table_schema_details)} tables to process.")
             return table_schema_details
 
         except Exception as e:
             print(f"\nFATAL ERROR: Could not connect or fetch from source DB: {e}")
             import traceback
             traceback.print_exc()
-            return []
\ No newline at end of file
+            return []
+
+    def profile_tables(self, tables_data: list) -> dict:
+        """
+        Optional profiling pass: sampled column statistics for the given tables.
+
+        Returns:
+            Dictionary of {full_name: profile} (see ColumnProfiler)
+        """
+        return ColumnProfiler(self.conn_string).profile_tables(tables_data)
@@ -2,133 +2,569 @@
 
 """
 Main ingestion pipeline orchestrating all steps
+
+The run is split into checkpointed stages:
+    scan          steps 1-3  settings, schema scan, join graph, change detection
+    describe      step 4     LLM descriptions (checkpointed per batch of tables)
+    embed_store   step 5     embeddings written to the vector store
+    assign_teams  steps 6-7  team assignment
+
+Each completed stage stores its output in ingestion_checkpoints under the
+run id, so a retry of the same run starts at the stage that failed.
 """
+import logging
+import uuid
+from typing import Callable, List, Optional, Tuple
+from config import settings
+from core.column_profiler import format_profile
 from core.database_scanner import DatabaseScanner
+from core.join_graph import JoinGraph
+from core.metrics import PipelineMetrics
+from core.scheduler import get_llm_rate_limiter
+from core.services.change_detector import SchemaChangeDetector, compute_schema_fingerprint
 from core.services.description_generator import DescriptionGenerator
+from core.services.llm_service import LLMService
+from core.repositories.checkpoint_repository import CheckpointRepository
+from core.repositories.join_graph_repository import JoinGraphRepository
+from core.repositories.profile_repository import ColumnProfileRepository
 from core.repositories.vector_repository import VectorRepository
+from core.teams.description_generator import TeamDescriptionGenerator
+from core.teams.embedding_creator import TeamEmbeddingCreator
 from core.teams.manager import TeamAssignmentManager
+from core.vector_index_manager import VectorIndexManager
 from clients import database_client
-from clients import teams_client 
+from clients import teams_client
+
+logger = logging.getLogger(__name__)
+
+CHECKPOINT_SCAN = "scan"
+CHECKPOINT_DESCRIBE = "describe"
+CHECKPOINT_EMBED = "embed_store"
+DESCRIBE_BATCH_PREFIX = "describe_batch:"
+
 
+class TeamAssignmentError(RuntimeError):
+    """Raised for team assignment failures when strict_team_assignment is set."""
 
-def run_ingestion_pipeline(company_id: str):
+
+def run_ingestion_pipeline(
+    company_id: str,
+    full_refresh: bool = False,
+    progress_callback: Optional[Callable[[dict], None]] = None,
+    run_id: str = None,
+    strict_team_assignment: bool = False,
+    event_callback: Optional[Callable[..., None]] = None
+):
     """
     Orchestrates the entire ingestion process from data scanning to vector saving,
     including team assignment.
-    
+
+    Unless full_refresh is set (or INCREMENTAL_INGESTION is disabled), only
+    tables whose schema fingerprint changed since the last run are described
+    and embedded again; dropped tables are removed from the vector store.
+
+    Every step is timed (wall time, items, LLM calls/tokens, DB rows); the
+    measurements are exported to Prometheus and returned under "metrics".
+
+    Stages already checkpointed under run_id are not executed again. The
+    checkpoints are deleted once the run succeeds.
+
     Args:
         company_id: The company UUID to process
+        full_refresh: Re-process every table regardless of stored fingerprints
+        progress_callback: Called with the metrics snapshot whenever a step starts or ends
+        run_id: Run identifier for checkpoints (pass the id of a failed run to resume it)
+        strict_team_assignment: Raise TeamAssignmentError instead of finishing
+            without team assignment when steps 6-7 fail (used while retries remain)
+        event_callback: Called as event_callback(event_type, **data) for fine-grained
+            progress (schemas scanned, batches described, rows embedded, teams assigned)
     """
+    run_id = run_id or uuid.uuid4().hex
+    metrics = PipelineMetrics(company_id, on_update=progress_callback, on_event=event_callback)
+    checkpoints = CheckpointRepository()
+
+    try:
+        checkpoints.purge_expired()
+    except Exception as e:
+        logger.warning(f"Failed to purge expired checkpoints: {e}")
+
+    try:
+        result = _run_stages(company_id, full_refresh, run_id, metrics, checkpoints, strict_team_assignment)
+    except Exception:
+        metrics.finish(status="failed")
+        print(f"ℹ Completed stages are checkpointed. Resume with run id {run_id}.")
+        raise
+
+    try:
+        checkpoints.mark_completed(run_id, company_id)
+    except Exception as e:
+        logger.warning(f"Failed to record completion of run {run_id}: {e}")
+
+    try:
+        checkpoints.clear(run_id)
+    except Exception as e:
+        logger.warning(f"Failed to clear checkpoints of run {run_id}: {e}")
+
+    result["run_id"] = run_id
+    result["metrics"] = metrics.finish(status="success")
+    return result
+
+
+def _run_stages(
+    company_id: str,
+    full_refresh: bool,
+    run_id: str,
+    metrics: PipelineMetrics,
+    checkpoints: CheckpointRepository,
+    strict_team_assignment: bool
+) -> dict:
+    """Run (or resume) the four stages of run_ingestion_pipeline."""
     print("=" * 70)
     print("--- Starting Complete Ingestion Pipeline ---")
     print(f"Company ID: {company_id}")
+    print(f"Run ID: {run_id}")
     print("=" * 70)
-    
+
     # ========================================================================
     # PHASE 1: DATABASE SCHEMA EMBEDDING (Existing Pipeline)
     # ========================================================================
-    
+    vector_repo = VectorRepository()
+    scan = run_scan_stage(company_id, run_id, full_refresh, metrics, checkpoints, vector_repo)
+
+    llm_service = None
+    if scan["tables_data"]:
+        llm_service = LLMService()
+        data_with_descriptions = run_describe_stage(company_id, run_id, scan, metrics, checkpoints, llm_service)
+        run_embed_stage(company_id, run_id, scan, data_with_descriptions, metrics, checkpoints, vector_repo)
+    else:
+        print("\n[Step 4/7] No new or changed tables. Skipping description generation.")
+        with metrics.stage(4, "describe_tables") as stage:
+            stage.skip("no new or changed tables")
+        print("\n[Step 5/7] No new or changed tables. Skipping embedding.")
+        with metrics.stage(5, "embed_and_store") as stage:
+            stage.skip("no new or changed tables")
+
+    maintain_vector_index(company_id, scan)
+
+    # ========================================================================
+    # PHASE 2: TEAM ASSIGNMENT (New Feature)
+    # ========================================================================
+    team_assignment = run_assign_stage(company_id, metrics, vector_repo, llm_service, strict_team_assignment)
+
+    if team_assignment == "no_teams":
+        print("\n--- Ingestion Pipeline Completed (without team assignment)! ---")
+        return {
+            "status": "success",
+            "message": "Pipeline completed successfully without team assignment.",
+            "company_id": company_id,
+            "changes": scan["changes"],
+            "team_assignment": team_assignment,
+        }
+
+    # ========================================================================
+    print("\n" + "=" * 70)
+    print("✓✓✓ Complete Ingestion Pipeline Finished Successfully! ✓✓✓")
+    print("=" * 70)
+
+    return {
+        "status": "success",
+        "message": f"Pipeline completed successfully for company {company_id}",
+        "company_id": company_id,
+        "changes": scan["changes"],
+        "team_assignment": team_assignment,
+    }
+
+
+def run_scan_stage(
+    company_id: str,
+    run_id: str,
+    full_refresh: bool,
+    metrics: PipelineMetrics,
+    checkpoints: CheckpointRepository,
+    vector_repo: VectorRepository
+) -> dict:
+    """
+    Steps 1-3: fetch and save connection settings, scan the schema, detect changes.
+
+    Returns:
+        Scan checkpoint: {"settings_company_id", "incremental", "tables_data"
+        (tables to describe), "fingerprints", "changes"}
+    """
+    scan = checkpoints.load(run_id, CHECKPOINT_SCAN)
+    if scan is not None:
+        print(f"\n[Steps 1-3/7] Resuming from scan checkpoint ({len(scan['tables_data'])} tables to process).")
+        with metrics.stage(3, "scan_schema") as stage:
+            stage.resume(changes=scan["changes"])
+        return scan
+
     # Step 1: Fetch database connection settings
     print("\n[Step 1/7] Fetching database connection settings...")
-    source_settings = database_client.fetch_source_db_settings(company_id)
+    with metrics.stage(1, "fetch_settings"):
+        source_settings = database_client.fetch_source_db_settings(company_id)
 
     if not source_settings:
         raise RuntimeError("Pipeline aborted: Failed to fetch database connection settings.")
-    
+
     # Step 2: Save the fetched settings for auditing
     print("\n[Step 2/7] Saving connection settings for audit...")
-    database_client.save_settings_to_db(source_settings)
+    with metrics.stage(2, "save_settings") as stage:
+        database_client.save_settings_to_db(source_settings)
+        stage.add(db_rows=1)
     print(f"✓ Company ID {source_settings['company_id']} settings loaded.")
-    
+
     # Step 3: Scan tables
     print("\n[Step 3/7] Scanning database schema...")
-    scanner = DatabaseScanner(db_settings=source_settings)
-    tables_data = scanner.scan_tables()
+    with metrics.stage(3, "scan_schema") as stage:
+        scanner = DatabaseScanner(db_settings=source_settings)
+        tables_data = scanner.scan_tables(
+            on_batch=lambda batch, scanned: metrics.event(
+                "tables_scanned",
+                schema=batch[0]['full_name'].split('.')[0] if batch else None,
+                tables=len(batch),
+                scanned=scanned
+            )
+        )
+
+        if not tables_data:
+            raise RuntimeError("Pipeline aborted: No table data was found by the scanner.")
+        stage.add(items=len(tables_data))
+        print(f"✓ Found {len(tables_data)} tables to process.")
+
+        # The join graph covers every table, so build it before filtering to changed tables
+        if settings.JOIN_GRAPH_ENABLED:
+            join_graph = update_join_graph(company_id, tables_data)
+            if join_graph:
+                stage.add(join_graph=join_graph)
+
+        # Detect which tables changed since the last run
+        fingerprints = {table['full_name']: compute_schema_fingerprint(table) for table in tables_data}
+        incremental = settings.INCREMENTAL_INGESTION and not full_refresh
+
+        if incremental:
+            stored_fingerprints = vector_repo.get_schema_fingerprints(company_id)
+            changes = SchemaChangeDetector().detect(fingerprints, stored_fingerprints)
+            tables_to_process = set(changes["added"]) | set(changes["changed"])
+            tables_data = [table for table in tables_data if table['full_name'] in tables_to_process]
+            print(
+                f"✓ Incremental mode: {len(changes['added'])} added, {len(changes['changed'])} changed, "
+                f"{len(changes['unchanged'])} unchanged, {len(changes['dropped'])} dropped."
+            )
+            stage.add(db_rows=len(stored_fingerprints))
+
+            if changes["dropped"]:
+                stage.add(db_rows=vector_repo.delete_tables(company_id, changes["dropped"]))
+        else:
+            changes = {"added": list(fingerprints), "changed": [], "unchanged": [], "dropped": []}
+            print("✓ Full refresh mode: all tables will be re-processed.")
+
+        change_summary = {key: len(value) for key, value in changes.items()}
+        stage.add(changes=change_summary)
+
+        if settings.COLUMN_PROFILING_ENABLED and tables_data:
+            stage.add(profiles=attach_column_profiles(company_id, scanner, tables_data, fingerprints))
+
+    scan = {
+        "settings_company_id": source_settings['company_id'],
+        "incremental": incremental,
+        "tables_data": tables_data,
+        "fingerprints": fingerprints,
+        "changes": change_summary,
+    }
+    checkpoints.save(run_id, company_id, CHECKPOINT_SCAN, scan)
+    return scan
+
+
+def attach_column_profiles(
+    company_id: str,
+    scanner: DatabaseScanner,
+    tables_data: List[dict],
+    fingerprints: dict
+) -> dict:
+    """
+    Add sampled column statistics ('profile_text') to the tables to describe.
+
+    Profiles are cached per schema fingerprint; only tables without a valid
+    cached profile are sampled. Profiling failures never abort the run.
+
+    Returns:
+        {"cached": n, "profiled": n} counts
+    """
+    print("Profiling columns of tables to describe...")
+    repo = ColumnProfileRepository()
+    try:
+        table_fingerprints = {table['full_name']: fingerprints[table['full_name']] for table in tables_data}
+        profiles = repo.get_profiles(company_id, table_fingerprints)
+        missing = [table for table in tables_data if table['full_name'] not in profiles]
+        fresh = scanner.profile_tables(missing)
+        repo.save_profiles(company_id, [(name, table_fingerprints[name], profile) for name, profile in fresh.items()])
+        profiles.update(fresh)
+    except Exception as e:
+        print(f"⚠ Warning: Column profiling failed, describing tables without statistics: {e}")
+        logger.warning(f"Column profiling failed for company {company_id}: {e}", exc_info=True)
+        return {"cached": 0, "profiled": 0}
 
-    if not tables_data:
-        raise RuntimeError("Pipeline aborted: No table data was found by the scanner.")
-    print(f"✓ Found {len(tables_data)} tables to process.")
+    for table in tables_data:
+        if table['full_name'] in profiles:
+            table['profile_text'] = format_profile(profiles[table['full_name']])
+
+    print(f"✓ Column statistics: {len(profiles) - len(fresh)} cached, {len(fresh)} profiled.")
+    return {"cached": len(profiles) - len(fresh), "profiled": len(fresh)}
+
+
+def update_join_graph(company_id: str, tables_data: List[dict]) -> Optional[dict]:
+    """
+    Build the company's foreign key join graph from the full scan and store
+    it (with precomputed join paths) when it changed. Failures only affect
+    join lookups, so they are logged and the run continues.
+    """
+    try:
+        graph = JoinGraph.from_tables(tables_data)
+        result = JoinGraphRepository().save_graph(company_id, graph)
+    except Exception as e:
+        print(f"⚠ Warning: Join graph update failed: {e}")
+        logger.warning(f"Join graph update failed for company {company_id}: {e}", exc_info=True)
+        return None
+
+    print(
+        f"✓ Join graph {result['action']}: {result['edges']} joins, {result['components']} components"
+        + (f", {result['paths']} join paths stored." if result['action'] == "saved" else ".")
+    )
+    return result
+
+
+def _batch_stage(index: int) -> str:
+    """Checkpoint stage name of one description batch."""
+    return f"{DESCRIBE_BATCH_PREFIX}{index:05d}"
+
+
+def description_batches(scan: dict) -> List[List[dict]]:
+    """Split the scanned tables into the fixed, checkpointed description batches."""
+    tables_data = scan["tables_data"]
+    size = settings.DESCRIBE_CHECKPOINT_BATCH_SIZE
+    return [tables_data[i:i + size] for i in range(0, len(tables_data), size)]
+
+
+def pending_description_batches(run_id: str, scan: dict, checkpoints: CheckpointRepository) -> List[int]:
+    """Indexes of the description batches that have no checkpoint yet."""
+    done = checkpoints.load_prefix(run_id, DESCRIBE_BATCH_PREFIX)
+    return [index for index in range(len(description_batches(scan))) if _batch_stage(index) not in done]
+
+
+def describe_table_batch(
+    company_id: str,
+    run_id: str,
+    scan: dict,
+    index: int,
+    checkpoints: CheckpointRepository,
+    generator: DescriptionGenerator
+) -> int:
+    """
+    Describe one batch of tables and checkpoint the result.
+
+    Returns:
+        Number of tables described
+    """
+    tables = description_batches(scan)[index]
+    rows = generator.generate_for_tables(tables, {"company_id": scan["settings_company_id"]})
+    checkpoints.save(run_id, company_id, _batch_stage(index), {"rows": rows})
+    logger.info(f"Run {run_id}: description batch {index} done ({len(rows)}/{len(tables)} tables)")
+    return len(rows)
+
+
+def run_describe_stage(
+    company_id: str,
+    run_id: str,
+    scan: dict,
+    metrics: PipelineMetrics,
+    checkpoints: CheckpointRepository,
+    llm_service: LLMService
+) -> List[Tuple]:
+    """
+    Step 4: generate descriptions for the batches that are not checkpointed yet.
+
+    Returns:
+        List of (company_id, table_name, description, relations_json) tuples
+    """
+    described = checkpoints.load(run_id, CHECKPOINT_DESCRIBE)
+    if described is not None:
+        print(f"\n[Step 4/7] Resuming from description checkpoint ({len(described['rows'])} tables).")
+        with metrics.stage(4, "describe_tables") as stage:
+            stage.resume()
+        return [tuple(row) for row in described["rows"]]
 
-    # Step 4: Generate descriptions using LLM
     print("\n[Step 4/7] Generating table descriptions using LLM...")
-    generator = DescriptionGenerator()
-    data_with_descriptions = generator.generate_for_tables(tables_data, source_settings)
+    batches = description_batches(scan)
+    pending = pending_description_batches(run_id, scan, checkpoints)
+    if len(pending) < len(batches):
+        print(f"✓ {len(batches) - len(pending)}/{len(batches)} description batches restored from checkpoints.")
+
+    with metrics.stage(4, "describe_tables", llm_service=llm_service) as stage:
+        generator = DescriptionGenerator(llm_service=llm_service, rate_limiter=get_llm_rate_limiter())
+        for done, index in enumerate(pending, start=len(batches) - len(pending) + 1):
+            described_rows = describe_table_batch(company_id, run_id, scan, index, checkpoints, generator)
+            metrics.event(
+                "batch_described",
+                batch=index,
+                tables=described_rows,
+                described_batches=done,
+                total_batches=len(batches)
+            )
 
-    if not data_with_descriptions:
-        raise RuntimeError("Pipeline aborted: No descriptions were generated by the LLM.")
+        batch_rows = checkpoints.load_prefix(run_id, DESCRIBE_BATCH_PREFIX)
+        data_with_descriptions = [
+            tuple(row)
+            for index in range(len(batches))
+            for row in batch_rows.get(_batch_stage(index), {}).get("rows", [])
+        ]
+
+        if not data_with_descriptions:
+            raise RuntimeError("Pipeline aborted: No descriptions were generated by the LLM.")
+        stage.add(
+            items=len(data_with_descriptions),
+            batches=len(batches),
+            resumed_batches=len(batches) - len(pending),
+            cache=generator.cache.stats()
+        )
+
+    checkpoints.save(run_id, company_id, CHECKPOINT_DESCRIBE, {"rows": data_with_descriptions})
     print(f"✓ Generated descriptions for {len(data_with_descriptions)} tables.")
+    print(f"✓ Description cache: {generator.cache.stats()}")
+    return data_with_descriptions
+
+
+def run_embed_stage(
+    company_id: str,
+    run_id: str,
+    scan: dict,
+    data_with_descriptions: List[Tuple],
+    metrics: PipelineMetrics,
+    checkpoints: CheckpointRepository,
+    vector_repo: VectorRepository
+):
+    """Step 5: embed the descriptions and save them to the vector store."""
+    if checkpoints.load(run_id, CHECKPOINT_EMBED) is not None:
+        print("\n[Step 5/7] Resuming: table embeddings were already saved.")
+        with metrics.stage(5, "embed_and_store") as stage:
+            stage.resume()
+        return
 
-    # Step 5: Save vectors to the vector store
     print("\n[Step 5/7] Creating embeddings and saving to vector database...")
-    vector_repo = VectorRepository()
-    vector_repo.save_embeddings(data_with_descriptions)
+    with metrics.stage(5, "embed_and_store") as stage:
+        saved = vector_repo.save_embeddings(
+            data_with_descriptions,
+            fingerprints=scan["fingerprints"],
+            replace_all=not scan["incremental"],
+            progress_callback=lambda written, total: metrics.event("rows_embedded", rows=written, total_rows=total)
+        )
+        stage.add(items=len(data_with_descriptions), db_rows=saved)
+    checkpoints.save(run_id, company_id, CHECKPOINT_EMBED, {"saved": saved})
     print("✓ Table embeddings saved successfully.")
 
-    # ========================================================================
-    # PHASE 2: TEAM ASSIGNMENT (New Feature)
-    # ========================================================================
-    
+
+def maintain_vector_index(company_id: str, scan: dict) -> Optional[dict]:
+    """
+    Create / rebuild the company's ANN index and refresh planner statistics
+    after the vector store changed. Failures only cost search speed, so
+    they are logged and the run continues.
+    """
+    changes = scan["changes"]
+    total = sum(changes.values())
+    changed = changes.get("added", 0) + changes.get("changed", 0) + changes.get("dropped", 0)
+    # With nothing written this still creates a missing index (e.g. the first run after upgrading)
+    changed_fraction = changed / max(1, total) if scan["incremental"] else 1.0
+
+    try:
+        index = VectorIndexManager().maintain(company_id, changed_fraction=changed_fraction)
+    except Exception as e:
+        print(f"⚠ Warning: Vector index maintenance failed: {e}")
+        logger.warning(f"Vector index maintenance failed for company {company_id}: {e}", exc_info=True)
+        return None
+
+    if index["index"]:
+        print(f"✓ Vector index {index['action']}: {index['type']} on {index['rows']} rows.")
+    return index
+
+
+def run_assign_stage(
+    company_id: str,
+    metrics: PipelineMetrics,
+    vector_repo: VectorRepository,
+    llm_service: Optional[LLMService],
+    strict: bool = False
+) -> str:
+    """
+    Steps 6-7: fetch the company's teams and assign them to tables.
+
+    Returns:
+        "assigned", "no_teams" or "failed" (only when strict is not set)
+
+    Raises:
+        TeamAssignmentError: If assignment fails and strict is set
+    """
     try:
         # Step 6: Fetch teams from API
         print("\n[Step 6/7] Fetching teams for company...")
-        teams_list = teams_client.fetch_company_teams(company_id)
-        
+        with metrics.stage(6, "fetch_teams") as stage:
+            teams_list = teams_client.fetch_company_teams(company_id)
+            stage.add(items=len(teams_list or []))
+
         if not teams_list:
             print("⚠ No teams found for this company. Skipping team assignment.")
-            print("\n--- Ingestion Pipeline Completed (without team assignment)! ---")
-            return {
-                "status": "success",
-                "message": "Pipeline completed successfully without team assignment.",
-                "company_id": company_id,
-            }
-        
+            return "no_teams"
+
         print(f"✓ Found {len(teams_list)} teams: {teams_list}")
-        
+
         # Step 7: Run team assignment
         print("\n[Step 7/7] Running team assignment process...")
-        
-        # Get table embeddings from database
-        table_embeddings = vector_repo.get_table_embeddings(company_id)
-        
-        # Initialize team assignment manager
-        team_manager = TeamAssignmentManager()
-        
-        # Run the assignment pipeline
-        assignments, confidence_scores = team_manager.run_assignment_pipeline(
-            company_id=company_id,
-            teams_list=teams_list,
-            tables_with_embeddings=table_embeddings,
-            threshold=0.6  # Similarity threshold for team assignment
-        )
-        
-        # Update the database with team assignments
-        vector_repo.update_team_assignments(
-            company_id=company_id,
-            table_assignments=assignments,
-            confidence_scores=confidence_scores
-        )
-        
+        llm_service = llm_service or LLMService()
+
+        with metrics.stage(7, "assign_teams", llm_service=llm_service) as stage:
+            # Get table embeddings from database
+            table_matrix = vector_repo.get_embedding_matrix(company_id)
+            stage.add(db_rows=len(table_matrix[0]))
+
+            # Initialize team assignment manager
+            team_manager = TeamAssignmentManager(
+                embedding_creator=TeamEmbeddingCreator(
+                    embedding_service=vector_repo.embedding_service,
+                    description_generator=TeamDescriptionGenerator(
+                        llm_service=llm_service,
+                        rate_limiter=get_llm_rate_limiter()
+                    )
+                )
+            )
+
+            # Run the assignment pipeline
+            assignments, confidence_scores = team_manager.run_assignment_pipeline(
+                company_id=company_id,
+                teams_list=teams_list,
+                table_matrix=table_matrix,
+                threshold=0.6  # Similarity threshold for team assignment
+            )
+
+            # Update the database with team assignments
+            updated = vector_repo.update_team_assignments(
+                company_id=company_id,
+                table_assignments=assignments,
+                confidence_scores=confidence_scores
+            )
+            stage.add(items=len(assignments), db_rows=updated)
+            metrics.event("teams_assigned", tables=len(assignments), teams=len(teams_list), db_rows=updated)
+
         print("✓ Team assignment completed successfully!")
-        
+        return "assigned"
+
     except Exception as e:
+        if strict:
+            raise TeamAssignmentError(f"Team assignment failed: {e}") from e
         print(f"\n⚠ Warning: Team assignment failed: {e}")
         print("Pipeline will continue, but team_name column will remain empty.")
         import traceback
         traceback.print_exc()
-
-    # ========================================================================
-    print("\n" + "=" * 70)
-    print("✓✓✓ Complete Ingestion Pipeline Finished Successfully! ✓✓✓")
-    print("=" * 70)
-
-    return {
-        "status": "success",
-        "message": f"Pipeline completed successfully for company {company_id}",
-        "company_id": company_id,
-    }
+        return "failed"
 
 
 if __name__ == "__main__":
     # For testing - replace with actual company_id
     test_company_id = "fb140d33-7e96-474d-a06d-ab3a6c65d1a9"
-    run_ingestion_pipeline(test_company_id)
\ No newline at end of file
+    run_ingestion_pipeline(test_company_id)
@@ -0,0 +1,321 @@
+"""
+Company-level foreign key join graph
+
+Built from the scanned tables' foreign keys, the graph answers joinability
+questions deterministically: which tables are reachable from a table within
+k joins, the shortest join path between two tables (with the ON columns),
+the connected components, and the join edges needed to connect a set of
+tables. Shortest paths up to JOIN_GRAPH_MAX_HOPS joins are precomputed when
+the graph is stored (JoinGraphRepository), so API lookups are indexed row
+reads; in memory, paths are found with a breadth-first search bounded by
+max_hops.
+"""
+import hashlib
+import json
+import logging
+from collections import defaultdict, deque
+from typing import Dict, Iterable, List, Optional
+from config import settings
+
+logger = logging.getLogger(__name__)
+
+
+def _build_edges(tables_data: List[dict]) -> List[dict]:
+    """
+    Turn per-table foreign keys into join edges.
+
+    Columns of the same foreign key constraint form one (composite) join;
+    separate constraints to the same table (e.g. BillToAddressID and
+    ShipToAddressID -> Address.AddressID) are separate joins. Foreign keys
+    without a constraint_name are each treated as their own constraint.
+    """
+    edges = []
+    for table in tables_data:
+        by_constraint = defaultdict(list)
+        for index, fk in enumerate((table.get('key_info') or {}).get('fks', [])):
+            if fk.get('to_table') and fk.get('from_column') and fk.get('to_column'):
+                constraint = fk.get('constraint_name') or f"#{index}"
+                by_constraint[(fk['to_table'], constraint)].append([fk['from_column'], fk['to_column']])
+
+        for (to_table, _), pairs in sorted(by_constraint.items()):
+            edges.append({"from_table": table['full_name'], "to_table": to_table, "columns": sorted(pairs)})
+    return edges
+
+
+def _orient(edge: dict, from_table: str) -> dict:
+    """Return the edge as seen when walking from from_table to the other end."""
+    if edge["from_table"] == from_table:
+        return edge
+    return {
+        "from_table": edge["to_table"],
+        "to_table": edge["from_table"],
+        "columns": [[to_column, from_column] for from_column, to_column in edge["columns"]],
+    }
+
+
+def reverse_path(path: List[dict]) -> List[dict]:
+    """Reverse a join path (edges from the last table back to the first)."""
+    return [_orient(edge, edge["to_table"]) for edge in reversed(path)]
+
+
+class JoinGraph:
+    """
+    Undirected join graph of one company's tables.
+
+    Nodes are "Schema.Table" names, edges are foreign keys (stored in their
+    declared direction, walked in both). Self-referencing keys are kept as
+    edges but never appear in paths.
+    """
+
+    def __init__(self, tables: Iterable[str], edges: List[dict], max_hops: int = None):
+        """
+        Build the graph and its connected components.
+
+        Args:
+            tables: All table names (tables without foreign keys become isolated nodes)
+            edges: {"from_table", "to_table", "columns": [[from_column, to_column], ...]}
+            max_hops: Longest precomputed path in joins (default: JOIN_GRAPH_MAX_HOPS)
+        """
+        self.max_hops = settings.JOIN_GRAPH_MAX_HOPS if max_hops is None else max_hops
+        # Longest path actually stored (set by JoinGraphRepository; lower than
+        # max_hops when the path rows were capped)
+        self.path_hops = self.max_hops
+        self.tables = sorted(set(tables) | {e["from_table"] for e in edges} | {e["to_table"] for e in edges})
+        self.edges = edges
+        self.adjacency: Dict[str, Dict[str, int]] = {table: {} for table in self.tables}
+        for index, edge in enumerate(edges):
+            a, b = edge["from_table"], edge["to_table"]
+            if a == b:
+                continue
+            # The first declared edge between two tables is the one used for paths
+            self.adjacency[a].setdefault(b, index)
+            self.adjacency[b].setdefault(a, index)
+
+        self.components = self._find_components()
+        self._component_of = {
+            table: index for index, component in enumerate(self.components) for table in component
+        }
+
+    @classmethod
+    def from_tables(cls, tables_data: List[dict], max_hops: int = None) -> "JoinGraph":
+        """Build the graph from DatabaseScanner table dicts ('full_name', 'key_info')."""
+        return cls([table['full_name'] for table in tables_data], _build_edges(tables_data), max_hops)
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "JoinGraph":
+        """Rebuild a graph stored with to_dict()."""
+        return cls(data["tables"], data["edges"], data.get("max_hops"))
+
+    def to_dict(self) -> dict:
+        """JSON-serializable form (paths are stored separately)."""
+        return {"tables": self.tables, "edges": self.edges, "max_hops": self.max_hops}
+
+    def fingerprint(self) -> str:
+        """Hash of tables, edges and max_hops; unchanged graphs are not stored again."""
+        payload = json.dumps(self.to_dict(), sort_keys=True)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def _find_components(self) -> List[List[str]]:
+        seen = set()
+        components = []
+        for start in self.tables:
+            if start in seen:
+                continue
+            seen.add(start)
+            component = [start]
+            queue = deque([start])
+            while queue:
+                for neighbor in self.adjacency[queue.popleft()]:
+                    if neighbor not in seen:
+                        seen.add(neighbor)
+                        component.append(neighbor)
+                        queue.append(neighbor)
+            components.append(sorted(component))
+        components.sort(key=lambda component: (-len(component), component[0]))
+        return components
+
+    def _bfs(self, start: str, max_hops: int) -> Dict[str, Optional[str]]:
+        """Breadth-first search; returns {reached table: predecessor} (start maps to None)."""
+        parents = {start: None}
+        frontier = [start]
+        for _ in range(max_hops):
+            next_frontier = []
+            for table in frontier:
+                # Sorted neighbors make equal-length paths deterministic
+                for neighbor in sorted(self.adjacency[table]):
+                    if neighbor not in parents:
+                        parents[neighbor] = table
+                        next_frontier.append(neighbor)
+            if not next_frontier:
+                break
+            frontier = next_frontier
+        return parents
+
+    @staticmethod
+    def _path_to(parents: Dict[str, Optional[str]], target: str) -> List[str]:
+        """Table sequence from the search start to target."""
+        tables = [target]
+        while parents[tables[-1]] is not None:
+            tables.append(parents[tables[-1]])
+        return tables[::-1]
+
+    def path_hops_within(self, max_rows: int) -> int:
+        """
+        Longest path length (at most max_hops) whose table pairs fit in
+        max_rows stored rows. Hub tables (e.g. a users table referenced by
+        every table) put most pairs within 2 joins, so the pair count can
+        grow quadratically with the number of tables.
+        """
+        pairs_by_hops = defaultdict(int)
+        for start in self.tables:
+            for target, hops in self.joinable_tables(start).items():
+                if target > start:
+                    pairs_by_hops[hops] += 1
+
+        total = 0
+        for hops in range(1, self.max_hops + 1):
+            total += pairs_by_hops[hops]
+            if total > max_rows:
+                return hops - 1
+        return self.max_hops
+
+    def iter_path_rows(self, max_hops: int = None):
+        """
+        Yield the shortest path of every pair at most max_hops joins apart
+        (default: the graph's max_hops) as (from_table, to_table, hops, edges)
+        with from_table < to_table.
+        """
+        max_hops = self.max_hops if max_hops is None else max_hops
+        for start in self.tables:
+            if not self.adjacency[start]:
+                continue
+            parents = self._bfs(start, max_hops)
+            for target in parents:
+                if target > start:
+                    tables = self._path_to(parents, target)
+                    yield start, target, len(tables) - 1, self._path_edges(tables)
+
+    def _path_edges(self, tables: List[str]) -> List[dict]:
+        return [_orient(self.edges[self.adjacency[a][b]], a) for a, b in zip(tables, tables[1:])]
+
+    def neighbors(self, table: str) -> List[dict]:
+        """Tables joinable directly with table, as edges oriented away from it."""
+        return [_orient(self.edges[index], table) for _, index in sorted(self.adjacency.get(table, {}).items())]
+
+    def shortest_path(self, from_table: str, to_table: str, max_hops: int = None) -> Optional[List[dict]]:
+        """
+        Shortest join path between two tables (a search bounded by max_hops).
+
+        The search starts from the alphabetically first table, so the path is
+        the same one iter_path_rows stores for the pair.
+
+        Returns:
+            List of edges from from_table to to_table ([] for the same table),
+            or None if they are not joinable within max_hops
+        """
+        max_hops = self.max_hops if max_hops is None else max_hops
+        if from_table not in self.adjacency or to_table not in self.adjacency:
+            return None
+        if from_table == to_table:
+            return []
+        if not self.same_component([from_table, to_table]):
+            return None
+
+        a, b = sorted((from_table, to_table))
+        parents = self._bfs(a, max_hops)
+        if b not in parents:
+            return None
+        tables = self._path_to(parents, b)
+        if tables[0] != from_table:
+            tables = tables[::-1]
+        return self._path_edges(tables)
+
+    def joinable_tables(self, table: str, max_hops: int = None) -> Dict[str, int]:
+        """
+        Tables reachable from table within max_hops joins.
+
+        Returns:
+            Dictionary of {table: hops} (the table itself is not included)
+        """
+        max_hops = self.max_hops if max_hops is None else max_hops
+        if table not in self.adjacency:
+            return {}
+        distances = {table: 0}
+        frontier = [table]
+        for hops in range(1, max_hops + 1):
+            next_frontier = []
+            for current in frontier:
+                for neighbor in self.adjacency[current]:
+                    if neighbor not in distances:
+                        distances[neighbor] = hops
+                        next_frontier.append(neighbor)
+            frontier = next_frontier
+        del distances[table]
+        return distances
+
+    def component_of(self, table: str) -> List[str]:
+        """All tables connected to table by any chain of foreign keys."""
+        index = self._component_of.get(table)
+        return self.components[index] if index is not None else []
+
+    def same_component(self, tables: Iterable[str]) -> bool:
+        """Whether all the tables can be joined together at all."""
+        indexes = {self._component_of.get(table) for table in tables}
+        return len(indexes) <= 1 and None not in indexes
+
+    def connect(self, tables: List[str], max_hops: int = None) -> dict:
+        """
+        Join edges connecting a set of tables (greedy Steiner tree over
+        shortest paths: each table is attached to the closest table already
+        connected, through any intermediate tables needed).
+
+        Args:
+            tables: Tables to join
+            max_hops: Longest path used to attach one table
+
+        Returns:
+            {"tables": connected tables including intermediates,
+             "joins": edges in join order,
+             "unreachable": tables that could not be attached}
+        """
+        requested = list(dict.fromkeys(table for table in tables if table in self.adjacency))
+        unreachable = [table for table in dict.fromkeys(tables) if table not in self.adjacency]
+        if not requested:
+            return {"tables": [], "joins": [], "unreachable": unreachable}
+
+        connected = [requested[0]]
+        joins = []
+        remaining = requested[1:]
+        while remaining:
+            best = None
+            for table in remaining:
+                for anchor in connected:
+                    path = self.shortest_path(anchor, table, max_hops)
+                    if path is not None and (best is None or len(path) < len(best[1])):
+                        best = (table, path)
+                if best is not None and len(best[1]) == 1:
+                    break
+            if best is None:
+                unreachable.extend(remaining)
+                break
+            table, path = best
+            remaining.remove(table)
+            for edge in path:
+                if edge["to_table"] not in connected:
+                    connected.append(edge["to_table"])
+                    joins.append(edge)
+            remaining = [other for other in remaining if other not in connected]
+
+        return {"tables": connected, "joins": joins, "unreachable": unreachable}
+
+    def summary(self) -> dict:
+        """Counts for logs and API responses."""
+        return {
+            "tables": len(self.tables),
+            "edges": len(self.edges),
+            "components": len(self.components),
+            "largest_component": len(self.components[0]) if self.components else 0,
+            "isolated_tables": sum(1 for component in self.components if len(component) == 1),
+            "max_hops": self.max_hops,
+            "path_hops": self.path_hops,
+        }
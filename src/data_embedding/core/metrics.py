@@ -0,0 +1,216 @@
+"""
+Per-stage timing and throughput metrics for the ingestion pipeline
+"""
+import logging
+import time
+from contextlib import contextmanager
+from typing import Callable, List, Optional
+from prometheus_client import Counter, Histogram, start_http_server
+from config import settings
+
+logger = logging.getLogger(__name__)
+
+# Prometheus series are labelled by stage only; per-company detail lives in the
+# Celery task metadata to keep label cardinality bounded.
+STAGE_SECONDS = Histogram(
+    "ingestion_stage_duration_seconds",
+    "Wall time of one ingestion pipeline stage",
+    ["stage", "status"],
+    buckets=(0.1, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300, 600, 1800)
+)
+STAGE_ITEMS = Counter("ingestion_stage_items_total", "Items (tables, teams, ...) processed per stage", ["stage"])
+STAGE_DB_ROWS = Counter("ingestion_stage_db_rows_total", "Database rows read or written per stage", ["stage"])
+STAGE_LLM_CALLS = Counter("ingestion_stage_llm_calls_total", "LLM requests per stage", ["stage"])
+STAGE_LLM_TOKENS = Counter("ingestion_stage_llm_tokens_total", "LLM tokens per stage", ["stage", "kind"])
+PIPELINE_SECONDS = Histogram(
+    "ingestion_pipeline_duration_seconds",
+    "Wall time of a complete ingestion pipeline run",
+    ["status"],
+    buckets=(5, 15, 30, 60, 120, 300, 600, 1200, 1800, 3600)
+)
+
+_metrics_server_started = False
+
+
+def start_metrics_server(port: int = None):
+    """
+    Expose /metrics for Prometheus on METRICS_PORT (once per process; 0 disables).
+    """
+    global _metrics_server_started
+
+    port = settings.METRICS_PORT if port is None else port
+    if _metrics_server_started or not port:
+        return
+    start_http_server(port)
+    _metrics_server_started = True
+    logger.info(f"Prometheus metrics exposed on port {port}")
+
+
+class StageMetrics:
+    """Measurements for one pipeline stage."""
+
+    def __init__(self, step: int, name: str, llm_service=None):
+        self.step = step
+        self.name = name
+        self.status = "running"
+        self.wall_seconds = 0.0
+        self.items = 0
+        self.db_rows = 0
+        self.llm_calls = 0
+        self.llm_input_tokens = 0
+        self.llm_output_tokens = 0
+        self.details = {}
+        self._llm_service = llm_service
+        self._llm_usage_start = llm_service.usage_snapshot() if llm_service else None
+
+    def add(self, items: int = 0, db_rows: int = 0, **details):
+        """Count processed items / database rows and attach extra details."""
+        self.items += items or 0
+        self.db_rows += db_rows or 0
+        self.details.update(details)
+
+    def skip(self, reason: str):
+        """Mark the stage as skipped (nothing to do)."""
+        self.status = "skipped"
+        self.details["reason"] = reason
+
+    def resume(self, **details):
+        """Mark the stage as restored from a checkpoint of an earlier attempt."""
+        self.status = "resumed"
+        self.details.update(details)
+
+    def _collect_llm_usage(self):
+        """Attribute the LLM usage accrued since the stage started."""
+        if not self._llm_service:
+            return
+        usage = self._llm_service.usage_snapshot()
+        self.llm_calls = usage["calls"] - self._llm_usage_start["calls"]
+        self.llm_input_tokens = usage["input_tokens"] - self._llm_usage_start["input_tokens"]
+        self.llm_output_tokens = usage["output_tokens"] - self._llm_usage_start["output_tokens"]
+
+    def as_dict(self) -> dict:
+        """JSON-serializable view (used in Celery task metadata)."""
+        return {
+            "step": self.step,
+            "stage": self.name,
+            "status": self.status,
+            "wall_seconds": round(self.wall_seconds, 3),
+            "items": self.items,
+            "items_per_second": round(self.items / self.wall_seconds, 2) if self.wall_seconds else None,
+            "db_rows": self.db_rows,
+            "llm_calls": self.llm_calls,
+            "llm_input_tokens": self.llm_input_tokens,
+            "llm_output_tokens": self.llm_output_tokens,
+            **({"details": self.details} if self.details else {}),
+        }
+
+
+class PipelineMetrics:
+    """
+    Collects StageMetrics for one pipeline run.
+
+    Each stage is recorded to Prometheus when it ends, and on_update (if
+    given) receives the full as_dict() snapshot so callers can publish
+    progress, e.g. as Celery task metadata. on_event (if given) receives
+    fine-grained progress events: stage_started / stage_finished plus the
+    ones the pipeline reports through event().
+    """
+
+    def __init__(
+        self,
+        company_id: str,
+        on_update: Optional[Callable[[dict], None]] = None,
+        on_event: Optional[Callable[..., None]] = None
+    ):
+        self.company_id = company_id
+        self.on_update = on_update
+        self.on_event = on_event
+        self.stages: List[StageMetrics] = []
+        self.started_at = time.time()
+        self._started = time.perf_counter()
+        self.total_seconds = None
+
+    @contextmanager
+    def stage(self, step: int, name: str, llm_service=None):
+        """
+        Time a pipeline stage.
+
+        Args:
+            step: Step number (1-7)
+            name: Stage name used as the Prometheus label
+            llm_service: LLMService whose token usage should be attributed to this stage
+
+        Yields:
+            StageMetrics to record items / rows on
+        """
+        record = StageMetrics(step, name, llm_service)
+        self.stages.append(record)
+        self._publish()
+        self.event("stage_started", step=step, stage=name)
+        start = time.perf_counter()
+        try:
+            yield record
+        except BaseException:
+            record.status = "failed"
+            raise
+        finally:
+            record.wall_seconds = time.perf_counter() - start
+            if record.status == "running":
+                record.status = "success"
+            record._collect_llm_usage()
+            self._observe(record)
+            self._publish()
+            self.event("stage_finished", step=step, stage=name, metrics=record.as_dict())
+
+    def finish(self, status: str = "success") -> dict:
+        """Record the total run time and return the final snapshot."""
+        self.total_seconds = time.perf_counter() - self._started
+        try:
+            PIPELINE_SECONDS.labels(status=status).observe(self.total_seconds)
+        except Exception as e:
+            logger.warning(f"Failed to record pipeline metrics: {e}")
+        snapshot = self.as_dict()
+        logger.info(f"Pipeline stage metrics for company {self.company_id}: {snapshot}")
+        return snapshot
+
+    def as_dict(self) -> dict:
+        return {
+            "company_id": self.company_id,
+            "started_at": self.started_at,
+            "total_seconds": round(self.total_seconds, 3) if self.total_seconds is not None else None,
+            "stages": [record.as_dict() for record in self.stages],
+        }
+
+    @staticmethod
+    def _observe(record: StageMetrics):
+        """Push one finished stage to the Prometheus collectors."""
+        try:
+            STAGE_SECONDS.labels(stage=record.name, status=record.status).observe(record.wall_seconds)
+            STAGE_ITEMS.labels(stage=record.name).inc(record.items)
+            STAGE_DB_ROWS.labels(stage=record.name).inc(record.db_rows)
+            STAGE_LLM_CALLS.labels(stage=record.name).inc(record.llm_calls)
+            STAGE_LLM_TOKENS.labels(stage=record.name, kind="input").inc(record.llm_input_tokens)
+            STAGE_LLM_TOKENS.labels(stage=record.name, kind="output").inc(record.llm_output_tokens)
+        except Exception as e:
+            logger.warning(f"Failed to record stage metrics for {record.name}: {e}")
+
+    def event(self, event_type: str, **data):
+        """
+        Report a progress event (e.g. "batch_described") to on_event.
+        Failures never break the pipeline.
+        """
+        if not self.on_event:
+            return
+        try:
+            self.on_event(event_type, **data)
+        except Exception as e:
+            logger.warning(f"Failed to publish progress event '{event_type}': {e}")
+
+    def _publish(self):
+        """Send the current snapshot to on_update; failures never break the pipeline."""
+        if not self.on_update:
+            return
+        try:
+            self.on_update(self.as_dict())
+        except Exception as e:
+            logger.warning(f"Failed to publish pipeline progress: {e}")
@@ -0,0 +1,140 @@
+"""
+Fine-grained ingestion progress events (Redis pub/sub)
+
+The pipeline publishes one JSON event per step of progress (stage started /
+finished, schema scanned, description batch done, embedding batch written,
+teams assigned, run completed / failed) to the channel of its Celery task.
+The last PROGRESS_EVENTS_HISTORY events are also kept in a Redis list, so a
+client that connects late (or reconnects) first replays what it missed and
+then follows the live channel. /task-events/{task_id} streams them as SSE.
+
+Event format:
+    {"seq": 12, "type": "batch_described", "task_id": "...", "company_id": "...",
+     "ts": 1718000000.123, ...type-specific fields}
+"""
+import json
+import logging
+import threading
+import time
+from typing import List, Optional
+import redis
+import redis.asyncio
+from config import settings
+
+logger = logging.getLogger(__name__)
+
+KEY_PREFIX = "ingestion:events"
+
+# Event types after which no further events are published for a task
+TERMINAL_EVENTS = {"completed", "failed"}
+
+
+def channel_name(task_id: str) -> str:
+    """Pub/sub channel of a task's events."""
+    return f"{KEY_PREFIX}:{task_id}"
+
+
+def history_key(task_id: str) -> str:
+    """Redis list holding the task's recent events."""
+    return f"{KEY_PREFIX}:{task_id}:history"
+
+
+def _seq_key(task_id: str) -> str:
+    return f"{KEY_PREFIX}:{task_id}:seq"
+
+
+class ProgressEventPublisher:
+    """
+    Publishes the progress events of one task.
+
+    Publishing never raises: a Redis outage only costs the live stream, the
+    pipeline (and /task-status) keep working.
+    """
+
+    def __init__(self, task_id: str, company_id: str, redis_client: redis.Redis = None):
+        """
+        Args:
+            task_id: Celery task id the client subscribes to
+            company_id: Company UUID (added to every event)
+            redis_client: Optional Redis client (default: shared PROGRESS_EVENTS_REDIS_URL client)
+        """
+        self.task_id = task_id
+        self.company_id = company_id
+        self.redis = redis_client or get_events_redis()
+
+    def publish(self, event_type: str, **data) -> Optional[dict]:
+        """
+        Publish one event.
+
+        Args:
+            event_type: e.g. "stage_started", "batch_described", "completed"
+            **data: JSON-serializable event fields
+
+        Returns:
+            The published event, or None if Redis was unavailable
+        """
+        try:
+            seq = self.redis.incr(_seq_key(self.task_id))
+            event = {
+                "seq": seq,
+                "type": event_type,
+                "task_id": self.task_id,
+                "company_id": self.company_id,
+                "ts": round(time.time(), 3),
+                **data,
+            }
+            payload = json.dumps(event, default=str)
+            ttl = settings.PROGRESS_EVENTS_TTL_SECONDS
+            pipe = self.redis.pipeline(transaction=False)
+            pipe.rpush(history_key(self.task_id), payload)
+            pipe.ltrim(history_key(self.task_id), -settings.PROGRESS_EVENTS_HISTORY, -1)
+            pipe.expire(history_key(self.task_id), ttl)
+            pipe.expire(_seq_key(self.task_id), ttl)
+            pipe.publish(channel_name(self.task_id), payload)
+            pipe.execute()
+            return event
+        except Exception as e:
+            logger.warning(f"Failed to publish progress event '{event_type}' for task {self.task_id}: {e}")
+            return None
+
+    def __call__(self, event_type: str, **data) -> Optional[dict]:
+        return self.publish(event_type, **data)
+
+
+def load_history(redis_client: redis.Redis, task_id: str) -> List[dict]:
+    """Events of a task still kept in its history list, oldest first."""
+    return [json.loads(payload) for payload in redis_client.lrange(history_key(task_id), 0, -1)]
+
+
+_redis = None
+_redis_lock = threading.Lock()
+
+
+def get_events_redis() -> redis.Redis:
+    """Process-wide Redis client for progress events."""
+    global _redis
+
+    if _redis is None:
+        with _redis_lock:
+            if _redis is None:
+                _redis = redis.Redis.from_url(settings.PROGRESS_EVENTS_REDIS_URL, decode_responses=True)
+    return _redis
+
+
+_async_redis = None
+
+
+def get_async_events_redis() -> redis.asyncio.Redis:
+    """Process-wide asyncio Redis client for the streaming endpoint."""
+    global _async_redis
+
+    if _async_redis is None:
+        _async_redis = redis.asyncio.Redis.from_url(settings.PROGRESS_EVENTS_REDIS_URL, decode_responses=True)
+    return _async_redis
+
+
+def get_event_publisher(task_id: str, company_id: str) -> Optional[ProgressEventPublisher]:
+    """Publisher for a task, or None when PROGRESS_EVENTS_ENABLED is off."""
+    if not settings.PROGRESS_EVENTS_ENABLED or not task_id:
+        return None
+    return ProgressEventPublisher(task_id, company_id)
@@ -0,0 +1,187 @@
+"""
+Checkpoint repository for resumable ingestion runs
+"""
+import logging
+from psycopg2.extras import Json
+from typing import Dict, Optional
+from config import settings
+from clients.db_pool import get_connection, release_connection
+
+logger = logging.getLogger(__name__)
+
+
+class CheckpointRepository:
+    """
+    Stores the output of completed pipeline stages (ingestion_checkpoints table).
+
+    Checkpoints are keyed by (run_id, stage). A retry of the same run - or a
+    new request that passes the run id as resume_run_id - loads them and
+    starts at the first stage without a checkpoint. They are removed when the
+    run completes and expire after CHECKPOINT_TTL_HOURS.
+
+    The last completed run of every company is kept in ingestion_completions;
+    the copilot's caches use it as their invalidation token.
+    """
+
+    def __init__(self):
+        """Initialize repository (connections come from the shared vector DB pool)."""
+        self._table_ready = False
+
+    def _get_connection(self):
+        """Borrow a connection from the shared vector DB pool (return it with release_connection)"""
+        return get_connection()
+
+    def _ensure_table(self, cur):
+        """Create the checkpoint and completion tables on first use."""
+        if self._table_ready:
+            return
+        cur.execute("""
+            CREATE TABLE IF NOT EXISTS ingestion_checkpoints (
+                run_id TEXT NOT NULL,
+                stage TEXT NOT NULL,
+                company_id TEXT NOT NULL,
+                payload JSONB NOT NULL,
+                created_at TIMESTAMPTZ NOT NULL DEFAULT CURRENT_TIMESTAMP,
+                PRIMARY KEY (run_id, stage)
+            )
+        """)
+        cur.execute("""
+            CREATE TABLE IF NOT EXISTS ingestion_completions (
+                company_id TEXT PRIMARY KEY,
+                run_id TEXT NOT NULL,
+                completed_at TIMESTAMPTZ NOT NULL DEFAULT CURRENT_TIMESTAMP
+            )
+        """)
+        self._table_ready = True
+
+    def save(self, run_id: str, company_id: str, stage: str, payload: dict):
+        """
+        Store (or replace) the checkpoint of one stage.
+
+        Args:
+            run_id: Pipeline run identifier
+            company_id: Company UUID
+            stage: Stage name, e.g. "scan" or "describe_batch:00003"
+            payload: JSON-serializable stage output
+        """
+        conn = self._get_connection()
+        try:
+            cur = conn.cursor()
+            self._ensure_table(cur)
+            cur.execute(
+                """
+                INSERT INTO ingestion_checkpoints (run_id, stage, company_id, payload)
+                VALUES (%s, %s, %s, %s)
+                ON CONFLICT (run_id, stage) DO UPDATE
+                SET payload = EXCLUDED.payload, created_at = CURRENT_TIMESTAMP
+                """,
+                (run_id, stage, company_id, Json(payload))
+            )
+            conn.commit()
+            cur.close()
+        finally:
+            release_connection(conn)
+
+    def _select(self, run_id: str, stage_condition: str, stage_value: str) -> Dict[str, dict]:
+        """Return {stage: payload} for unexpired checkpoints of a run matching the stage condition."""
+        conn = self._get_connection()
+        try:
+            cur = conn.cursor()
+            self._ensure_table(cur)
+            cur.execute(
+                f"""
+                SELECT stage, payload FROM ingestion_checkpoints
+                WHERE run_id = %s AND stage {stage_condition} %s
+                AND created_at > CURRENT_TIMESTAMP - make_interval(hours => %s)
+                """,
+                (run_id, stage_value, settings.CHECKPOINT_TTL_HOURS)
+            )
+            found = dict(cur.fetchall())
+            conn.commit()
+            cur.close()
+            return found
+        finally:
+            release_connection(conn)
+
+    def load(self, run_id: str, stage: str) -> Optional[dict]:
+        """
+        Load the checkpoint of one stage.
+
+        Returns:
+            The stored payload, or None if the stage has not completed
+        """
+        return self._select(run_id, "=", stage).get(stage)
+
+    def load_prefix(self, run_id: str, prefix: str) -> Dict[str, dict]:
+        """
+        Load every checkpoint of a run whose stage name starts with prefix.
+
+        Args:
+            run_id: Pipeline run identifier
+            prefix: Stage name prefix, e.g. "describe_batch:"
+
+        Returns:
+            Dictionary of {stage: payload}
+        """
+        pattern = prefix.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") + "%"
+        return self._select(run_id, "LIKE", pattern)
+
+    def mark_completed(self, run_id: str, company_id: str):
+        """
+        Record that a run of the company completed, whatever its team
+        assignment outcome (caches built on the company's data key on it).
+
+        Args:
+            run_id: Pipeline run identifier
+            company_id: Company UUID
+        """
+        conn = self._get_connection()
+        try:
+            cur = conn.cursor()
+            self._ensure_table(cur)
+            cur.execute(
+                """
+                INSERT INTO ingestion_completions (company_id, run_id)
+                VALUES (%s, %s)
+                ON CONFLICT (company_id) DO UPDATE
+                SET run_id = EXCLUDED.run_id, completed_at = CURRENT_TIMESTAMP
+                """,
+                (company_id, run_id)
+            )
+            conn.commit()
+            cur.close()
+        finally:
+            release_connection(conn)
+
+    def clear(self, run_id: str) -> int:
+        """Delete all checkpoints of a run. Returns the number of rows removed."""
+        conn = self._get_connection()
+        try:
+            cur = conn.cursor()
+            self._ensure_table(cur)
+            cur.execute("DELETE FROM ingestion_checkpoints WHERE run_id = %s", (run_id,))
+            removed = cur.rowcount
+            conn.commit()
+            cur.close()
+            return removed
+        finally:
+            release_connection(conn)
+
+    def purge_expired(self) -> int:
+        """Delete checkpoints older than CHECKPOINT_TTL_HOURS."""
+        conn = self._get_connection()
+        try:
+            cur = conn.cursor()
+            self._ensure_table(cur)
+            cur.execute(
+                "DELETE FROM ingestion_checkpoints WHERE created_at <= CURRENT_TIMESTAMP - make_interval(hours => %s)",
+                (settings.CHECKPOINT_TTL_HOURS,)
+            )
+            removed = cur.rowcount
+            conn.commit()
+            cur.close()
+            if removed:
+                logger.info(f"Purged {removed} expired ingestion checkpoints")
+            return removed
+        finally:
+            release_connection(conn)
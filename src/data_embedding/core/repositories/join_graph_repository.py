@@ -0,0 +1,239 @@
+"""
+Join graph repository (per-company foreign key graph and precomputed join paths)
+"""
+import logging
+from psycopg2.extras import Json, execute_values
+from typing import Dict, List, Optional
+from clients.db_pool import get_connection, release_connection
+from config import settings
+from core.join_graph import JoinGraph, reverse_path
+
+logger = logging.getLogger(__name__)
+
+# Rows per INSERT statement when writing join paths
+PATH_INSERT_PAGE_SIZE = 1000
+
+
+class JoinGraphRepository:
+    """
+    Stores JoinGraph objects in two tables:
+
+        company_join_graphs   one row per company: tables, edges, components
+        company_join_paths    one row per table pair (from_table < to_table)
+                              joinable within the graph's path_hops
+
+    Path rows are capped at JOIN_GRAPH_MAX_PATH_ROWS: when the pairs within
+    max_hops do not fit, only shorter paths are stored (path_hops) and
+    longer lookups are searched in memory. A graph whose fingerprint did not
+    change since the last run is not written again.
+    """
+
+    def __init__(self):
+        """Initialize repository (connections come from the shared vector DB pool)."""
+        self._tables_ready = False
+
+    def _get_connection(self):
+        """Borrow a connection from the shared vector DB pool (return it with release_connection)"""
+        return get_connection()
+
+    def _ensure_tables(self, cur):
+        """Create the join graph tables on first use."""
+        if self._tables_ready:
+            return
+        cur.execute("""
+            CREATE TABLE IF NOT EXISTS company_join_graphs (
+                company_id TEXT PRIMARY KEY,
+                graph_fingerprint TEXT NOT NULL,
+                graph JSONB NOT NULL,
+                components JSONB NOT NULL,
+                summary JSONB NOT NULL,
+                built_at TIMESTAMPTZ NOT NULL DEFAULT CURRENT_TIMESTAMP
+            )
+        """)
+        cur.execute("""
+            CREATE TABLE IF NOT EXISTS company_join_paths (
+                company_id TEXT NOT NULL,
+                from_table TEXT NOT NULL,
+                to_table TEXT NOT NULL,
+                hops SMALLINT NOT NULL,
+                path JSONB NOT NULL,
+                PRIMARY KEY (company_id, from_table, to_table)
+            )
+        """)
+        # Lookups by either end of the pair (get_joinable)
+        cur.execute(
+            "CREATE INDEX IF NOT EXISTS company_join_paths_to_table_idx ON company_join_paths (company_id, to_table)"
+        )
+        self._tables_ready = True
+
+    def get_fingerprint(self, company_id: str) -> Optional[str]:
+        """Fingerprint of the stored graph, or None if the company has none."""
+        conn = self._get_connection()
+        try:
+            cur = conn.cursor()
+            self._ensure_tables(cur)
+            cur.execute("SELECT graph_fingerprint FROM company_join_graphs WHERE company_id = %s", (company_id,))
+            row = cur.fetchone()
+            conn.commit()
+            cur.close()
+            return row[0] if row else None
+        finally:
+            release_connection(conn)
+
+    def save_graph(self, company_id: str, graph: JoinGraph) -> dict:
+        """
+        Store a company's graph and its precomputed paths (replacing the old ones).
+
+        Args:
+            company_id: Company UUID
+            graph: Graph built from the current scan
+
+        Returns:
+            {"action": "unchanged" | "saved", "paths": rows written, **graph.summary()}
+        """
+        fingerprint = graph.fingerprint()
+        if self.get_fingerprint(company_id) == fingerprint:
+            return {"action": "unchanged", "paths": 0, **graph.summary()}
+
+        graph.path_hops = graph.path_hops_within(settings.JOIN_GRAPH_MAX_PATH_ROWS)
+        if graph.path_hops < graph.max_hops:
+            logger.warning(
+                f"Join paths of company {company_id} exceed JOIN_GRAPH_MAX_PATH_ROWS="
+                f"{settings.JOIN_GRAPH_MAX_PATH_ROWS} within {graph.max_hops} joins; "
+                f"storing paths up to {graph.path_hops} joins"
+            )
+        summary = graph.summary()
+
+        conn = self._get_connection()
+        try:
+            cur = conn.cursor()
+            self._ensure_tables(cur)
+            cur.execute("DELETE FROM company_join_paths WHERE company_id = %s", (company_id,))
+            rows = [
+                (company_id, from_table, to_table, hops, Json(path))
+                for from_table, to_table, hops, path in graph.iter_path_rows(graph.path_hops)
+            ]
+            execute_values(
+                cur,
+                "INSERT INTO company_join_paths (company_id, from_table, to_table, hops, path) VALUES %s",
+                rows,
+                page_size=PATH_INSERT_PAGE_SIZE
+            )
+            cur.execute(
+                """
+                INSERT INTO company_join_graphs (company_id, graph_fingerprint, graph, components, summary)
+                VALUES (%s, %s, %s, %s, %s)
+                ON CONFLICT (company_id) DO UPDATE
+                SET graph_fingerprint = EXCLUDED.graph_fingerprint,
+                    graph = EXCLUDED.graph,
+                    components = EXCLUDED.components,
+                    summary = EXCLUDED.summary,
+                    built_at = CURRENT_TIMESTAMP
+                """,
+                (company_id, fingerprint, Json(graph.to_dict()), Json(graph.components), Json(summary))
+            )
+            conn.commit()
+            cur.close()
+            logger.info(f"Saved join graph for company {company_id}: {summary}, {len(rows)} paths")
+            return {"action": "saved", "paths": len(rows), **summary}
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            release_connection(conn)
+
+    def load_graph(self, company_id: str) -> Optional[JoinGraph]:
+        """Load a company's graph (without its paths), or None if it has none."""
+        conn = self._get_connection()
+        try:
+            cur = conn.cursor()
+            self._ensure_tables(cur)
+            cur.execute("SELECT graph, summary FROM company_join_graphs WHERE company_id = %s", (company_id,))
+            row = cur.fetchone()
+            conn.commit()
+            cur.close()
+        finally:
+            release_connection(conn)
+
+        if not row:
+            return None
+        graph = JoinGraph.from_dict(row[0])
+        graph.path_hops = row[1].get("path_hops", graph.max_hops)
+        return graph
+
+    def get_summary(self, company_id: str) -> Optional[dict]:
+        """Stored summary, fingerprint and build time of a company's graph."""
+        conn = self._get_connection()
+        try:
+            cur = conn.cursor()
+            self._ensure_tables(cur)
+            cur.execute(
+                "SELECT summary, graph_fingerprint, built_at FROM company_join_graphs WHERE company_id = %s",
+                (company_id,)
+            )
+            row = cur.fetchone()
+            conn.commit()
+            cur.close()
+            if not row:
+                return None
+            summary, fingerprint, built_at = row
+            return {**summary, "fingerprint": fingerprint, "built_at": built_at.isoformat()}
+        finally:
+            release_connection(conn)
+
+    def get_path(self, company_id: str, from_table: str, to_table: str) -> Optional[List[dict]]:
+        """
+        Precomputed shortest join path between two tables (one indexed row read).
+
+        Returns:
+            Edges from from_table to to_table, or None if they are not
+            joinable within the graph's max_hops
+        """
+        if from_table == to_table:
+            return []
+        a, b = sorted((from_table, to_table))
+        conn = self._get_connection()
+        try:
+            cur = conn.cursor()
+            self._ensure_tables(cur)
+            cur.execute(
+                "SELECT path FROM company_join_paths WHERE company_id = %s AND from_table = %s AND to_table = %s",
+                (company_id, a, b)
+            )
+            row = cur.fetchone()
+            conn.commit()
+            cur.close()
+        finally:
+            release_connection(conn)
+
+        if not row:
+            return None
+        path = row[0]
+        return path if from_table == a else reverse_path(path)
+
+    def get_joinable(self, company_id: str, table: str, max_hops: int = None) -> Dict[str, int]:
+        """
+        Tables joinable with table within max_hops (up to the graph's max_hops).
+
+        Returns:
+            Dictionary of {table: hops}
+        """
+        conn = self._get_connection()
+        try:
+            cur = conn.cursor()
+            self._ensure_tables(cur)
+            cur.execute(
+                """
+                SELECT CASE WHEN from_table = %s THEN to_table ELSE from_table END, hops
+                FROM company_join_paths
+                WHERE company_id = %s AND (from_table = %s OR to_table = %s)
+                AND (%s::int IS NULL OR hops <= %s::int)
+                """,
+                (table, company_id, table, table, max_hops, max_hops)
+            )
+            joinable = {other: hops for other, hops in cur.fetchall()}
+            conn.commit()
+            cur.close()
+            return joinable
+        finally:
+            release_connection(conn)
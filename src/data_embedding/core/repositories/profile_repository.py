@@ -0,0 +1,115 @@
+"""
+Column profile repository (cache of sampled column statistics)
+"""
+import logging
+from psycopg2.extras import Json, execute_values
+from typing import Dict, List, Tuple
+from config import settings
+from clients.db_pool import get_connection, release_connection
+
+logger = logging.getLogger(__name__)
+
+
+class ColumnProfileRepository:
+    """
+    Stores ColumnProfiler results in the column_profiles table.
+
+    A profile is reused while the table's schema fingerprint is unchanged and
+    it is younger than PROFILE_CACHE_TTL_DAYS, so unchanged tables are not
+    sampled again on every run.
+    """
+
+    def __init__(self):
+        """Initialize repository (connections come from the shared vector DB pool)."""
+        self._table_ready = False
+
+    def _get_connection(self):
+        """Borrow a connection from the shared vector DB pool (return it with release_connection)"""
+        return get_connection()
+
+    def _ensure_table(self, cur):
+        """Create the profile table on first use."""
+        if self._table_ready:
+            return
+        cur.execute("""
+            CREATE TABLE IF NOT EXISTS column_profiles (
+                company_id TEXT NOT NULL,
+                table_name TEXT NOT NULL,
+                schema_fingerprint TEXT NOT NULL,
+                profile JSONB NOT NULL,
+                profiled_at TIMESTAMPTZ NOT NULL DEFAULT CURRENT_TIMESTAMP,
+                PRIMARY KEY (company_id, table_name)
+            )
+        """)
+        self._table_ready = True
+
+    def get_profiles(self, company_id: str, fingerprints: Dict[str, str]) -> Dict[str, dict]:
+        """
+        Load cached profiles whose schema fingerprint still matches.
+
+        Args:
+            company_id: Company UUID
+            fingerprints: {table_name: current schema fingerprint}
+
+        Returns:
+            Dictionary of {table_name: profile}
+        """
+        if not fingerprints:
+            return {}
+        conn = self._get_connection()
+        try:
+            cur = conn.cursor()
+            self._ensure_table(cur)
+            cur.execute(
+                """
+                SELECT table_name, schema_fingerprint, profile FROM column_profiles
+                WHERE company_id = %s AND table_name = ANY(%s)
+                AND profiled_at > CURRENT_TIMESTAMP - make_interval(days => %s)
+                """,
+                (company_id, list(fingerprints), settings.PROFILE_CACHE_TTL_DAYS)
+            )
+            found = {
+                table_name: profile
+                for table_name, fingerprint, profile in cur.fetchall()
+                if fingerprints.get(table_name) == fingerprint
+            }
+            conn.commit()
+            cur.close()
+            return found
+        finally:
+            release_connection(conn)
+
+    def save_profiles(self, company_id: str, profiles: List[Tuple[str, str, dict]]) -> int:
+        """
+        Store (or replace) profiles.
+
+        Args:
+            company_id: Company UUID
+            profiles: (table_name, schema_fingerprint, profile) tuples
+
+        Returns:
+            Number of rows written
+        """
+        if not profiles:
+            return 0
+        conn = self._get_connection()
+        try:
+            cur = conn.cursor()
+            self._ensure_table(cur)
+            execute_values(
+                cur,
+                """
+                INSERT INTO column_profiles (company_id, table_name, schema_fingerprint, profile)
+                VALUES %s
+                ON CONFLICT (company_id, table_name) DO UPDATE
+                SET schema_fingerprint = EXCLUDED.schema_fingerprint,
+                    profile = EXCLUDED.profile,
+                    profiled_at = CURRENT_TIMESTAMP
+                """,
+                [(company_id, table_name, fingerprint, Json(profile)) for table_name, fingerprint, profile in profiles]
+            )
+            conn.commit()
+            cur.close()
+            return len(profiles)
+        finally:
+            release_connection(conn)
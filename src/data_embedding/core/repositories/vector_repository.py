@@ -1,12 +1,15 @@
 """
 Vector database repository for managing embeddings
 """
+import csv
+import io
 import logging
-import psycopg2
 import json
 import numpy as np
-from typing import List, Tuple, Dict
+from psycopg2.extras import execute_values
+from typing import Callable, Dict, List, Optional, Tuple
 from config import settings
+from clients.db_pool import get_connection, release_connection
 from core.services.embedding_service import EmbeddingService
 
 logger = logging.getLogger(__name__)
@@ -17,6 +20,12 @@ class VectorRepository:
     Handles all database operations for the vector store.
     Responsible for CRUD operations on embeddings.
     """
+
+    VECTOR_COLUMNS = [
+        "company_id", "table_name", "table_description",
+        "table_relations", "embedding", "schema_fingerprint"
+    ]
+    WRITE_METHODS = ("copy", "execute_values", "row")
     
     def __init__(self, embedding_service: EmbeddingService = None):
         """
@@ -26,16 +35,11 @@ class VectorRepository:
             embedding_service: Optional embedding service instance
         """
         self.embedding_service = embedding_service or EmbeddingService()
-        self.conn_details = {
-            "host": settings.VECTOR_DB_HOST,
-            "database": settings.VECTOR_DB_NAME,
-            "user": settings.VECTOR_DB_USER,
-            "password": settings.VECTOR_DB_PASSWORD
-        }
+        self._fingerprint_column_checked = False
     
     def _get_connection(self):
-        """Create and return a database connection"""
-        return psycopg2.connect(**self.conn_details)
+        """Borrow a connection from the shared vector DB pool (return it with release_connection)"""
+        return get_connection()
     
     def clear_company_data(self, company_id: str, conn=None):
         """
@@ -57,59 +61,219 @@ class VectorRepository:
             logger.info("Clearing complete.")
         finally:
             if should_close:
-                conn.close()
+                release_connection(conn)
     
-    def save_embeddings(self, data_to_ingest: List[Tuple]) -> int:
+    def delete_tables(self, company_id: str, table_names: List[str], conn=None) -> int:
+        """
+        Remove the rows of specific tables for a company.
+
+        Args:
+            company_id: Company UUID
+            table_names: Tables to remove
+            conn: Optional existing connection (caller commits)
+
+        Returns:
+            Number of rows deleted
+        """
+        if not table_names:
+            return 0
+
+        should_close = conn is None
+        if conn is None:
+            conn = self._get_connection()
+
+        try:
+            cur = conn.cursor()
+            cur.execute(
+                "DELETE FROM client_schema_vectors WHERE company_id = %s AND table_name = ANY(%s)",
+                (company_id, list(table_names))
+            )
+            deleted = cur.rowcount
+            cur.close()
+            if should_close:
+                conn.commit()
+            logger.info(f"Removed {deleted} rows for {len(table_names)} tables of Company ID {company_id}.")
+            return deleted
+        finally:
+            if should_close:
+                release_connection(conn)
+
+    def _ensure_fingerprint_column(self, cur):
+        """Add the schema_fingerprint column to client_schema_vectors if it does not exist yet."""
+        if self._fingerprint_column_checked:
+            return
+
+        cur.execute("""
+            SELECT 1 FROM information_schema.columns
+            WHERE table_name = 'client_schema_vectors' AND column_name = 'schema_fingerprint'
+        """)
+        if cur.fetchone() is None:
+            logger.info("Adding schema_fingerprint column to client_schema_vectors...")
+            cur.execute("ALTER TABLE client_schema_vectors ADD COLUMN IF NOT EXISTS schema_fingerprint TEXT")
+        self._fingerprint_column_checked = True
+
+    def get_schema_fingerprints(self, company_id: str) -> Dict[str, Optional[str]]:
+        """
+        Retrieve the stored schema fingerprint of every table of a company.
+
+        Args:
+            company_id: Company UUID
+
+        Returns:
+            Dictionary of {table_name: fingerprint}; fingerprint is None for
+            rows ingested before change detection existed
+        """
+        conn = None
+
+        try:
+            conn = self._get_connection()
+            cur = conn.cursor()
+            self._ensure_fingerprint_column(cur)
+            conn.commit()
+
+            cur.execute(
+                "SELECT table_name, schema_fingerprint FROM client_schema_vectors WHERE company_id = %s",
+                (company_id,)
+            )
+            fingerprints = dict(cur.fetchall())
+            cur.close()
+            logger.info(f"Retrieved {len(fingerprints)} stored fingerprints for company {company_id}")
+            return fingerprints
+
+        except Exception as error:
+            logger.error(f"Error retrieving schema fingerprints: {error}")
+            raise
+        finally:
+            if conn:
+                release_connection(conn)
+
+    @staticmethod
+    def _format_vector(embedding) -> str:
+        """Render an embedding as a pgvector text literal: '[x1,x2,...]'"""
+        return '[' + ','.join(map('{:.8g}'.format, np.asarray(embedding).tolist())) + ']'
+
+    @staticmethod
+    def _copy_rows(cur, table: str, columns: List[str], rows: List[Tuple]) -> int:
+        """
+        Stream rows into a table with a single COPY ... FROM STDIN (CSV format).
+
+        Args:
+            cur: Open cursor
+            table: Target table name
+            columns: Target column names, in row order
+            rows: Row tuples (None is written as NULL)
+
+        Returns:
+            Number of rows copied
+        """
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerows(rows)
+        buffer.seek(0)
+        cur.copy_expert(
+            f"COPY {table} ({', '.join(columns)}) FROM STDIN WITH (FORMAT csv)",
+            buffer
+        )
+        return len(rows)
+
+    def _iter_embedded_batches(self, data_to_ingest: List[Tuple], batch_size: int, fingerprints: Dict[str, str]):
+        """
+        Encode descriptions in micro-batches.
+
+        Yields:
+            Lists of row tuples matching VECTOR_COLUMNS
+        """
+        for start in range(0, len(data_to_ingest), batch_size):
+            batch = data_to_ingest[start:start + batch_size]
+            embeddings = self.embedding_service.encode_batch(
+                [description for _, _, description, _ in batch],
+                normalize=True,
+                batch_size=batch_size
+            )
+            yield [
+                (
+                    company_id, table_name, description, relations_json,
+                    self._format_vector(embedding), fingerprints.get(table_name)
+                )
+                for (company_id, table_name, description, relations_json), embedding in zip(batch, embeddings)
+            ]
+
+    def save_embeddings(
+        self,
+        data_to_ingest: List[Tuple],
+        write_method: str = None,
+        fingerprints: Dict[str, str] = None,
+        replace_all: bool = True,
+        progress_callback: Callable[[int, int], None] = None
+    ) -> int:
         """
         Save table descriptions and their embeddings to database.
-        
+
+        Descriptions are encoded in micro-batches of EMBEDDING_BATCH_SIZE and
+        written in bulk, either with COPY (default) or multi-row INSERTs.
+        The legacy "row" method (one encode and one INSERT per table) is kept
+        for benchmarking.
+
         Args:
             data_to_ingest: List of (company_id, table_name, description, relations_json)
-        
+            write_method: "copy", "execute_values" or "row" (default: VECTOR_WRITE_METHOD)
+            fingerprints: Optional {table_name: schema_fingerprint} stored with each row
+            replace_all: Clear all company rows first (True) or only replace the
+                rows of the tables being saved (False, incremental mode)
+            progress_callback: Optional callback(rows_written, total_rows) after each micro-batch
+
         Returns:
             Number of records inserted
         """
         if not data_to_ingest:
             logger.warning("No data provided to save. Skipping ingestion.")
             return 0
-        
+
+        write_method = write_method or settings.VECTOR_WRITE_METHOD
+        if write_method not in self.WRITE_METHODS:
+            raise ValueError(f"Unknown write method '{write_method}'. Expected one of {self.WRITE_METHODS}")
+
+        fingerprints = fingerprints or {}
         company_id = data_to_ingest[0][0]
         conn = None
         inserted_count = 0
-        
+
         try:
             conn = self._get_connection()
             cur = conn.cursor()
-            
-            # Clear existing data
-            self.clear_company_data(company_id, conn)
-            
-            # Prepare insertion
-            insert_sql = """
-            INSERT INTO client_schema_vectors 
-            (company_id, table_name, table_description, table_relations, embedding) 
-            VALUES (%s, %s, %s, %s::jsonb, %s::vector)
-            """
-            
-            logger.info(f"Starting ingestion of {len(data_to_ingest)} records...")
-            
-            for company_id, table_name, description, relations_json in data_to_ingest:
-                # Generate embedding
-                embedding = self.embedding_service.encode(description, normalize=True)
-                embedding_str = '[' + ','.join(map(str, embedding)) + ']'
-                
-                # Insert record
-                cur.execute(insert_sql, (
-                    company_id, table_name, description,
-                    relations_json, embedding_str
-                ))
-                inserted_count += 1
-                logger.info(f"  -> Ingested: {table_name}")
-            
+            self._ensure_fingerprint_column(cur)
+
+            if replace_all:
+                self.clear_company_data(company_id, conn)
+            else:
+                self.delete_tables(company_id, [row[1] for row in data_to_ingest], conn)
+
+            logger.info(f"Starting ingestion of {len(data_to_ingest)} records (method={write_method})...")
+
+            if write_method == "row":
+                inserted_count = self._insert_rows_individually(cur, data_to_ingest, fingerprints)
+            else:
+                batch_size = settings.EMBEDDING_BATCH_SIZE
+                for rows in self._iter_embedded_batches(data_to_ingest, batch_size, fingerprints):
+                    if write_method == "copy":
+                        self._copy_rows(cur, "client_schema_vectors", self.VECTOR_COLUMNS, rows)
+                    else:
+                        execute_values(
+                            cur,
+                            f"INSERT INTO client_schema_vectors ({', '.join(self.VECTOR_COLUMNS)}) VALUES %s",
+                            rows,
+                            template="(%s, %s, %s, %s::jsonb, %s::vector, %s)",
+                            page_size=settings.VECTOR_INSERT_PAGE_SIZE
+                        )
+                    inserted_count += len(rows)
+                    logger.info(f"  -> Ingested {inserted_count}/{len(data_to_ingest)} records")
+                    if progress_callback:
+                        progress_callback(inserted_count, len(data_to_ingest))
+
             conn.commit()
             cur.close()
             logger.info(f"Data ingestion complete! Inserted {inserted_count} records.")
-            
+
         except Exception as error:
             logger.error(f"Error during ingestion: {error}")
             if conn:
@@ -117,53 +281,135 @@ class VectorRepository:
             raise
         finally:
             if conn:
-                conn.close()
-        
+                release_connection(conn)
+
+        return inserted_count
+
+    def _insert_rows_individually(self, cur, data_to_ingest: List[Tuple], fingerprints: Dict[str, str]) -> int:
+        """Legacy write path: one encode and one INSERT round trip per table."""
+        insert_sql = """
+        INSERT INTO client_schema_vectors 
+        (company_id, table_name, table_description, table_relations, embedding, schema_fingerprint) 
+        VALUES (%s, %s, %s, %s::jsonb, %s::vector, %s)
+        """
+
+        inserted_count = 0
+        for company_id, table_name, description, relations_json in data_to_ingest:
+            embedding = self.embedding_service.encode(description, normalize=True)
+            cur.execute(insert_sql, (
+                company_id, table_name, description,
+                relations_json, self._format_vector(embedding),
+                fingerprints.get(table_name)
+            ))
+            inserted_count += 1
+            logger.info(f"  -> Ingested: {table_name}")
+
         return inserted_count
     
-    def get_table_embeddings(self, company_id: str) -> List[Tuple[str, np.ndarray]]:
+    @staticmethod
+    def _decode_vectors(payloads: List[bytes]) -> np.ndarray:
         """
-        Retrieve table embeddings for a company.
-        
+        Decode pgvector binary payloads (vector_send output) into one matrix.
+
+        Each payload is a big-endian int16 dimension, an unused int16, then
+        `dim` big-endian float4 values. The 4-byte header occupies exactly one
+        float slot, so all payloads are concatenated, viewed as a
+        (n, dim + 1) big-endian float32 array, and the header column dropped.
+
+        Args:
+            payloads: Binary vectors of equal dimension
+
+        Returns:
+            Contiguous native float32 array of shape (n, dim)
+        """
+        if not payloads:
+            return np.empty((0, 0), dtype=np.float32)
+
+        dim = int.from_bytes(bytes(payloads[0][:2]), "big")
+        raw = np.frombuffer(b"".join(payloads), dtype=">f4").reshape(len(payloads), dim + 1)
+        return np.ascontiguousarray(raw[:, 1:], dtype=np.float32)
+
+    def get_embedding_matrix(self, company_id: str) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Retrieve all table embeddings for a company as one float32 matrix.
+
+        Vectors are read in pgvector's binary format (vector_send) through a
+        server-side cursor in batches of EMBEDDING_FETCH_SIZE rows, so no
+        text parsing happens in Python.
+
         Args:
             company_id: Company UUID
-        
+
         Returns:
-            List of (table_name, embedding_array) tuples
+            Tuple of (table_names, embeddings): an object array of n names and
+            a float32 array of shape (n, dim) with matching rows
         """
         conn = None
-        
+
         try:
             conn = self._get_connection()
-            cur = conn.cursor()
-            
-            query = """
-            SELECT table_name, embedding
-            FROM client_schema_vectors
-            WHERE company_id = %s
-            """
-            
-            cur.execute(query, (company_id,))
-            results = cur.fetchall()
-            
-            # Parse embeddings
-            table_embeddings = []
-            for table_name, embedding_str in results:
-                embedding_values = embedding_str.strip('[]').split(',')
-                embedding_array = np.array([float(v) for v in embedding_values])
-                table_embeddings.append((table_name, embedding_array))
-            
-            logger.info(f"Retrieved {len(table_embeddings)} table embeddings for company {company_id}")
+            cur = conn.cursor(name=f"embeddings_{company_id}".replace("-", "_"))
+            cur.itersize = settings.EMBEDDING_FETCH_SIZE
+
+            cur.execute(
+                """
+                SELECT table_name, vector_send(embedding)
+                FROM client_schema_vectors
+                WHERE company_id = %s AND embedding IS NOT NULL
+                ORDER BY table_name
+                """,
+                (company_id,)
+            )
+
+            table_names = []
+            payloads = []
+            while True:
+                rows = cur.fetchmany(settings.EMBEDDING_FETCH_SIZE)
+                if not rows:
+                    break
+                for table_name, payload in rows:
+                    table_names.append(table_name)
+                    payloads.append(bytes(payload))
+
             cur.close()
-            return table_embeddings
-            
+            conn.commit()
+
+            embeddings = self._decode_vectors(payloads)
+            logger.info(f"Retrieved {len(table_names)} table embeddings for company {company_id}")
+            return np.array(table_names, dtype=object), embeddings
+
         except Exception as error:
             logger.error(f"Error retrieving table embeddings: {error}")
             raise
         finally:
             if conn:
-                conn.close()
+                release_connection(conn)
+
+    def get_table_embeddings(self, company_id: str) -> List[Tuple[str, np.ndarray]]:
+        """
+        Retrieve table embeddings for a company.
+
+        Backed by get_embedding_matrix(); each embedding is a row view of the
+        shared float32 matrix.
+        
+        Args:
+            company_id: Company UUID
+        
+        Returns:
+            List of (table_name, embedding_array) tuples
+        """
+        table_names, embeddings = self.get_embedding_matrix(company_id)
+        return list(zip(table_names.tolist(), embeddings))
     
+    @staticmethod
+    def _format_text_array(values: List[str]) -> str:
+        """Render a list of strings as a PostgreSQL text[] literal: {"a","b"}"""
+        escaped = (
+            '"' + str(value).replace('\\', '\\\\').replace('"', '\\"') + '"'
+            for value in values
+        )
+        return '{' + ','.join(escaped) + '}'
+
     def update_team_assignments(
         self,
         company_id: str,
@@ -172,6 +418,10 @@ class VectorRepository:
     ) -> int:
         """
         Update team assignments for tables.
+
+        All assignments are staged into a temporary table with COPY and
+        applied with a single UPDATE ... FROM; audit rows are written with
+        one multi-row INSERT.
         
         Args:
             company_id: Company UUID
@@ -194,38 +444,52 @@ class VectorRepository:
             
             logger.info(f"Updating team assignments for {len(table_assignments)} tables...")
             
-            # Update team_name column
-            update_sql = """
-            UPDATE client_schema_vectors
-            SET team_name = %s
-            WHERE company_id = %s AND table_name = %s
-            """
+            # Stage assignments and apply them in one statement
+            cur.execute("""
+            CREATE TEMP TABLE tmp_team_assignments (
+                table_name TEXT PRIMARY KEY,
+                team_name TEXT[]
+            ) ON COMMIT DROP
+            """)
+            self._copy_rows(
+                cur,
+                "tmp_team_assignments",
+                ["table_name", "team_name"],
+                [(table_name, self._format_text_array(teams)) for table_name, teams in table_assignments.items()]
+            )
+            cur.execute("""
+            UPDATE client_schema_vectors AS v
+            SET team_name = t.team_name
+            FROM tmp_team_assignments AS t
+            WHERE v.company_id = %s AND v.table_name = t.table_name
+            """, (company_id,))
+            updated_count = cur.rowcount
             
             # Audit insertion
-            audit_sql = """
-            INSERT INTO team_assignment_audit 
-            (company_id, table_name, assigned_teams, confidence_scores, assignment_method, created_at)
-            VALUES (%s, %s, %s, %s, %s, CURRENT_TIMESTAMP)
-            """
-            
-            for table_name, teams in table_assignments.items():
-                # Update main table
-                cur.execute(update_sql, (teams, company_id, table_name))
-                if cur.rowcount > 0:
-                    updated_count += 1
-                    logger.info(f"  ✓ Updated: {table_name} → {teams}")
-                
-                # Insert audit record
-                if confidence_scores and table_name in confidence_scores:
-                    cur.execute(audit_sql, (
-                        company_id, table_name, teams,
-                        json.dumps(confidence_scores[table_name]),
-                        'embedding'
-                    ))
+            audit_rows = [
+                (company_id, table_name, teams, json.dumps(confidence_scores[table_name]), 'embedding')
+                for table_name, teams in table_assignments.items()
+                if confidence_scores and table_name in confidence_scores
+            ]
+            if audit_rows:
+                execute_values(
+                    cur,
+                    """
+                    INSERT INTO team_assignment_audit 
+                    (company_id, table_name, assigned_teams, confidence_scores, assignment_method, created_at)
+                    VALUES %s
+                    """,
+                    audit_rows,
+                    template="(%s, %s, %s, %s, %s, CURRENT_TIMESTAMP)",
+                    page_size=len(audit_rows)
+                )
             
             conn.commit()
             cur.close()
-            logger.info(f"Team assignment update complete! Updated {updated_count} tables.")
+            logger.info(
+                f"Team assignment update complete! Updated {updated_count} tables, "
+                f"wrote {len(audit_rows)} audit rows."
+            )
             
         except Exception as error:
             logger.error(f"Error during team assignment update: {error}")
@@ -234,6 +498,6 @@ class VectorRepository:
             raise
         finally:
             if conn:
-                conn.close()
+                release_connection(conn)
         
         return updated_count
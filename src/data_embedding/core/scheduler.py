@@ -0,0 +1,476 @@
+"""
+Multi-tenant ingestion scheduler (Redis-backed)
+
+Coordinates pipeline runs across API processes and Celery workers:
+  - coalesces identical /start-pipeline requests per company (a request
+    with other options than the run in flight is a conflict)
+  - caps concurrent runs globally and per company, admitting waiting runs
+    in request order
+  - caps concurrent description-batch tasks per company (chord mode) so
+    one large tenant cannot fill the embedding_queue
+  - splits the LLM request rate evenly between the companies running
+  - reports queue position and an estimated start time for waiting runs
+"""
+import json
+import logging
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Callable, Optional, Tuple
+import redis
+from config import settings
+from core.services.rate_limiter import TokenBucketRateLimiter
+
+logger = logging.getLogger(__name__)
+
+KEY_PREFIX = "ingestion:scheduler"
+RUN_SLOTS_KEY = f"{KEY_PREFIX}:run_slots"
+TASK_SLOTS_KEY = f"{KEY_PREFIX}:task_slots"
+WAITING_KEY = f"{KEY_PREFIX}:waiting"
+WAITING_LEASES_KEY = f"{KEY_PREFIX}:waiting_leases"
+RUN_STARTED_KEY = f"{KEY_PREFIX}:run_started"
+AVG_RUN_SECONDS_KEY = f"{KEY_PREFIX}:avg_run_seconds"
+
+# Fallback run duration for ETAs until real runs have been measured
+DEFAULT_RUN_SECONDS = 240.0
+
+# Atomically acquire a slot in a lease zset (member -> lease expiry).
+# KEYS[1] slots zset, KEYS[2] waiting zset (task -> request time),
+# KEYS[3] waiting leases zset (task -> lease expiry)
+# ARGV: now, lease_expiry, member, company_prefix, waiting_member, global_cap, company_cap,
+#       waiting_lease_expiry
+ACQUIRE_SLOT_SCRIPT = """
+local expired = redis.call('ZRANGEBYSCORE', KEYS[3], '-inf', ARGV[1])
+for _, waiting in ipairs(expired) do
+    redis.call('ZREM', KEYS[2], waiting)
+    redis.call('ZREM', KEYS[3], waiting)
+end
+redis.call('ZREMRANGEBYSCORE', KEYS[1], '-inf', ARGV[1])
+if redis.call('ZSCORE', KEYS[1], ARGV[3]) then
+    redis.call('ZADD', KEYS[1], ARGV[2], ARGV[3])
+    return 1
+end
+if ARGV[5] ~= '' then
+    -- The waiting task is alive: extend its lease (it rejoins at the back if it was dropped)
+    if not redis.call('ZSCORE', KEYS[2], ARGV[5]) then
+        redis.call('ZADD', KEYS[2], ARGV[1], ARGV[5])
+    end
+    redis.call('ZADD', KEYS[3], ARGV[8], ARGV[5])
+end
+local held = redis.call('ZRANGE', KEYS[1], 0, -1)
+local total = #held
+local company = 0
+for _, member in ipairs(held) do
+    if string.sub(member, 1, string.len(ARGV[4])) == ARGV[4] then
+        company = company + 1
+    end
+end
+if total >= tonumber(ARGV[6]) or company >= tonumber(ARGV[7]) then
+    return 0
+end
+if ARGV[5] ~= '' then
+    local rank = redis.call('ZRANK', KEYS[2], ARGV[5])
+    if rank and rank >= tonumber(ARGV[6]) - total then
+        return 0
+    end
+    redis.call('ZREM', KEYS[2], ARGV[5])
+    redis.call('ZREM', KEYS[3], ARGV[5])
+end
+redis.call('ZADD', KEYS[1], ARGV[2], ARGV[3])
+return 1
+"""
+
+# Delete a key only if it still holds the expected value
+RELEASE_IF_OWNER_SCRIPT = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+    return redis.call('DEL', KEYS[1])
+end
+return 0
+"""
+
+
+def _dedup_key(company_id: str) -> str:
+    return f"{KEY_PREFIX}:company:{company_id}"
+
+
+def _request_key(company_id: str) -> str:
+    return f"{KEY_PREFIX}:company:{company_id}:request"
+
+
+class RunConflictError(Exception):
+    """A run with different options is already queued or running for the company."""
+
+    def __init__(self, company_id: str, task_id: str, request: dict):
+        self.company_id = company_id
+        self.task_id = task_id
+        self.request = request
+        super().__init__(
+            f"An ingestion run with different options ({request}) is already queued or running "
+            f"for company {company_id} (task {task_id})"
+        )
+
+
+class IngestionScheduler:
+    """
+    Admission control for ingestion runs, shared through Redis.
+
+    Slots are leases (sorted-set members scored by expiry), so a crashed
+    worker's slot frees itself after INGESTION_SLOT_LEASE_SECONDS. Running
+    pipelines renew their lease on every stage change, from every
+    description-batch task and every INGESTION_SLOT_RENEW_SECONDS
+    (RunLeaseKeeper); a lease that expired anyway is re-acquired under the
+    usual caps.
+
+    Waiting requests hold a lease too (INGESTION_WAITING_LEASE_SECONDS),
+    extended each time their task polls for a slot; a request whose task
+    stopped polling is dropped from the queue instead of blocking it.
+    """
+
+    def __init__(self, redis_client: redis.Redis = None):
+        """
+        Initialize the scheduler.
+
+        Args:
+            redis_client: Optional Redis client (default: CELERY_BROKER_URL)
+        """
+        self.redis = redis_client or redis.Redis.from_url(settings.CELERY_BROKER_URL, decode_responses=True)
+        self._acquire = self.redis.register_script(ACQUIRE_SLOT_SCRIPT)
+        self._release_if_owner = self.redis.register_script(RELEASE_IF_OWNER_SCRIPT)
+
+    # ------------------------------------------------------------------
+    # Request coalescing
+    # ------------------------------------------------------------------
+    def submit(
+        self,
+        company_id: str,
+        enqueue: Callable[[str], None],
+        task_id: str,
+        request: dict = None
+    ) -> Tuple[str, bool]:
+        """
+        Enqueue a run for a company unless one is already queued or running.
+
+        Args:
+            company_id: Company UUID
+            enqueue: Called with task_id to actually send the Celery task
+            task_id: Task id to use for the new run
+            request: Run options (e.g. full_refresh, resume_run_id); only a
+                request with the same options is merged into a run in flight
+
+        Returns:
+            (task_id, coalesced): the existing task id and True if the request
+            was merged into a run already in flight
+
+        Raises:
+            RunConflictError: A run with different options is in flight
+        """
+        request = request or {}
+        key = _dedup_key(company_id)
+        if not self.redis.set(key, task_id, nx=True, ex=settings.INGESTION_DEDUP_TTL_SECONDS):
+            existing = self.redis.get(key)
+            if existing:
+                existing_request = self._active_request(company_id, existing)
+                if existing_request is not None and existing_request != request:
+                    raise RunConflictError(company_id, existing, existing_request)
+                return existing, True
+            # Key expired between SET and GET
+            self.redis.set(key, task_id, ex=settings.INGESTION_DEDUP_TTL_SECONDS)
+        self.redis.set(
+            _request_key(company_id),
+            json.dumps({"task_id": task_id, "request": request}),
+            ex=settings.INGESTION_DEDUP_TTL_SECONDS
+        )
+
+        now = time.time()
+        self._prune_waiting(now)
+        pipe = self.redis.pipeline()
+        pipe.zadd(WAITING_KEY, {task_id: now})
+        pipe.zadd(WAITING_LEASES_KEY, {task_id: now + settings.INGESTION_WAITING_LEASE_SECONDS})
+        pipe.execute()
+        try:
+            enqueue(task_id)
+        except Exception:
+            self._remove_waiting(task_id)
+            self._release_if_owner(keys=[key], args=[task_id])
+            raise
+        return task_id, False
+
+    def _active_request(self, company_id: str, task_id: str) -> Optional[dict]:
+        """Options of the in-flight run task_id, or None if they were not recorded."""
+        payload = self.redis.get(_request_key(company_id))
+        if not payload:
+            return None
+        stored = json.loads(payload)
+        return stored["request"] if stored.get("task_id") == task_id else None
+
+    def _prune_waiting(self, now: float):
+        """Drop waiting requests whose task stopped polling for a slot."""
+        for task_id in self.redis.zrangebyscore(WAITING_LEASES_KEY, "-inf", now):
+            self._remove_waiting(task_id)
+
+    def _remove_waiting(self, task_id: str):
+        pipe = self.redis.pipeline()
+        pipe.zrem(WAITING_KEY, task_id)
+        pipe.zrem(WAITING_LEASES_KEY, task_id)
+        pipe.execute()
+
+    def active_task_for(self, company_id: str) -> Optional[str]:
+        """Task id of the run currently queued or running for a company."""
+        return self.redis.get(_dedup_key(company_id))
+
+    def forget(self, company_id: str, task_id: str):
+        """Drop the company's in-flight marker if it belongs to task_id (e.g. stale, finished task)."""
+        self._release_if_owner(keys=[_dedup_key(company_id)], args=[task_id])
+        self._remove_waiting(task_id)
+
+    # ------------------------------------------------------------------
+    # Run and task slots
+    # ------------------------------------------------------------------
+    def acquire_run_slot(self, company_id: str, run_id: str, waiting_id: str = None) -> bool:
+        """
+        Try to start (or keep) a pipeline run.
+
+        Admitted when a global slot is free, the company is below its own cap,
+        and no earlier waiting request is ahead of waiting_id. A refused call
+        extends waiting_id's lease in the queue.
+
+        Args:
+            company_id: Company UUID
+            run_id: Run identifier (slot owner; stable across retries and the chord)
+            waiting_id: Task id registered in the waiting queue by submit()
+
+        Returns:
+            True if the run holds a slot
+        """
+        now = time.time()
+        member = f"{company_id}|{run_id}"
+        acquired = bool(self._acquire(
+            keys=[RUN_SLOTS_KEY, WAITING_KEY, WAITING_LEASES_KEY],
+            args=[
+                now, now + settings.INGESTION_SLOT_LEASE_SECONDS, member, f"{company_id}|",
+                waiting_id or "", settings.INGESTION_MAX_CONCURRENT_RUNS, settings.INGESTION_MAX_RUNS_PER_COMPANY,
+                now + settings.INGESTION_WAITING_LEASE_SECONDS
+            ]
+        ))
+        if acquired:
+            self.redis.hsetnx(RUN_STARTED_KEY, member, now)
+        return acquired
+
+    def renew_run_slot(self, company_id: str, run_id: str) -> bool:
+        """
+        Extend the lease of a running pipeline.
+
+        Goes through the acquire script: a live lease is extended, and a
+        lease that already expired (and may have been reclaimed) is taken
+        again only if the caps allow it, so the run never silently pushes
+        the slot count over INGESTION_MAX_CONCURRENT_RUNS.
+
+        Returns:
+            True if the run holds a slot
+        """
+        renewed = self.acquire_run_slot(company_id, run_id)
+        if not renewed:
+            logger.warning(
+                f"Run {run_id} of company {company_id} lost its scheduler slot and no slot is free; "
+                f"it keeps running outside the concurrency cap until a slot frees up"
+            )
+        return renewed
+
+    def finish_run(self, company_id: str, run_id: str, task_id: str):
+        """
+        Release a run's slot and its company's in-flight marker.
+
+        Args:
+            company_id: Company UUID
+            run_id: Run identifier that holds the slot
+            task_id: Task id stored by submit() for the company
+        """
+        member = f"{company_id}|{run_id}"
+        started = self.redis.hget(RUN_STARTED_KEY, member)
+        pipe = self.redis.pipeline()
+        pipe.zrem(RUN_SLOTS_KEY, member)
+        pipe.hdel(RUN_STARTED_KEY, member)
+        pipe.zrem(WAITING_KEY, task_id)
+        pipe.zrem(WAITING_LEASES_KEY, task_id)
+        pipe.execute()
+        self._release_if_owner(keys=[_dedup_key(company_id)], args=[task_id])
+
+        if started:
+            self._record_duration(time.time() - float(started))
+
+    def acquire_task_slot(self, company_id: str, task_id: str) -> bool:
+        """Try to start one description-batch task for a company (INGESTION_MAX_TASKS_PER_COMPANY)."""
+        now = time.time()
+        return bool(self._acquire(
+            keys=[TASK_SLOTS_KEY, WAITING_KEY, WAITING_LEASES_KEY],
+            args=[
+                now, now + settings.INGESTION_SLOT_LEASE_SECONDS, f"{company_id}|{task_id}", f"{company_id}|",
+                "", 2 ** 31, settings.INGESTION_MAX_TASKS_PER_COMPANY, now
+            ]
+        ))
+
+    def release_task_slot(self, company_id: str, task_id: str):
+        """Release a description-batch task slot."""
+        self.redis.zrem(TASK_SLOTS_KEY, f"{company_id}|{task_id}")
+
+    def active_companies(self) -> int:
+        """Number of companies with a running pipeline."""
+        self.redis.zremrangebyscore(RUN_SLOTS_KEY, "-inf", time.time())
+        return len({member.split("|", 1)[0] for member in self.redis.zrange(RUN_SLOTS_KEY, 0, -1)})
+
+    # ------------------------------------------------------------------
+    # Queue reporting
+    # ------------------------------------------------------------------
+    def _record_duration(self, seconds: float, alpha: float = 0.2):
+        """Fold a finished run's duration into the moving average used for ETAs."""
+        current = self.redis.get(AVG_RUN_SECONDS_KEY)
+        average = seconds if current is None else (1 - alpha) * float(current) + alpha * seconds
+        self.redis.set(AVG_RUN_SECONDS_KEY, average)
+
+    def queue_info(self, task_id: str) -> Optional[dict]:
+        """
+        Queue position and estimated start of a waiting run.
+
+        Returns:
+            None if the task is not waiting, otherwise {"queue_position",
+            "queue_depth", "running", "estimated_wait_seconds", "estimated_start"}
+        """
+        now = time.time()
+        self._prune_waiting(now)
+        rank = self.redis.zrank(WAITING_KEY, task_id)
+        if rank is None:
+            return None
+
+        self.redis.zremrangebyscore(RUN_SLOTS_KEY, "-inf", now)
+        running = self.redis.zrange(RUN_SLOTS_KEY, 0, -1)
+        started = self.redis.hmget(RUN_STARTED_KEY, running) if running else []
+        average = float(self.redis.get(AVG_RUN_SECONDS_KEY) or DEFAULT_RUN_SECONDS)
+        capacity = max(1, settings.INGESTION_MAX_CONCURRENT_RUNS)
+
+        # When does each slot free up? Running slots after their expected
+        # remaining time, free slots now; each run ahead of us then occupies
+        # the earliest free slot for one average run.
+        slot_free_at = sorted(
+            [max(0.0, average - (now - float(start))) if start else average for start in started]
+            + [0.0] * max(0, capacity - len(running))
+        )[:capacity]
+        for _ in range(rank):
+            slot_free_at[0] += average
+            slot_free_at.sort()
+        wait_seconds = slot_free_at[0]
+
+        return {
+            "queue_position": rank + 1,
+            "queue_depth": self.redis.zcard(WAITING_KEY),
+            "running": len(running),
+            "estimated_wait_seconds": round(wait_seconds),
+            "estimated_start": datetime.fromtimestamp(now + wait_seconds, tz=timezone.utc).isoformat(),
+        }
+
+
+class RunLeaseKeeper:
+    """
+    Context manager renewing a run's slot every INGESTION_SLOT_RENEW_SECONDS
+    (in a background thread) while a long stretch of work runs without
+    stage changes.
+    """
+
+    def __init__(self, scheduler: IngestionScheduler, company_id: str, run_id: str, interval: float = None):
+        self.scheduler = scheduler
+        self.company_id = company_id
+        self.run_id = run_id
+        self.interval = settings.INGESTION_SLOT_RENEW_SECONDS if interval is None else interval
+        self._stop = threading.Event()
+        self._thread = None
+
+    def _renew(self):
+        try:
+            self.scheduler.renew_run_slot(self.company_id, self.run_id)
+        except Exception as e:
+            logger.warning(f"Failed to renew scheduler slot of run {self.run_id}: {e}")
+
+    def _loop(self):
+        while not self._stop.wait(self.interval):
+            self._renew()
+
+    def __enter__(self):
+        self._renew()
+        self._thread = threading.Thread(target=self._loop, name=f"lease-{self.run_id}", daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join(timeout=5)
+        return False
+
+
+class FairShareRateLimiter(TokenBucketRateLimiter):
+    """
+    Token bucket whose ceiling is the LLM rate divided by the number of
+    companies currently running, re-read every INGESTION_FAIR_SHARE_REFRESH_SECONDS.
+    """
+
+    def __init__(self, scheduler: IngestionScheduler, total_rate: float, capacity: float = None):
+        super().__init__(rate=total_rate, capacity=capacity)
+        self.scheduler = scheduler
+        self.total_rate = total_rate
+        self._refreshed_at = 0.0
+        self._refresh_lock = threading.Lock()
+
+    def _refresh_share(self):
+        now = time.monotonic()
+        if now - self._refreshed_at < settings.INGESTION_FAIR_SHARE_REFRESH_SECONDS:
+            return
+        with self._refresh_lock:
+            if now - self._refreshed_at < settings.INGESTION_FAIR_SHARE_REFRESH_SECONDS:
+                return
+            self._refreshed_at = now
+            try:
+                share = self.total_rate / max(1, self.scheduler.active_companies())
+            except Exception as e:
+                logger.warning(f"Could not read active companies for LLM fair share: {e}")
+                return
+            if abs(share - self.max_rate) > 1e-9:
+                logger.info(f"LLM fair share updated: {share:.2f} requests/s")
+                self.set_rate(share)
+
+    def acquire(self):
+        self._refresh_share()
+        super().acquire()
+
+
+_scheduler = None
+_scheduler_lock = threading.Lock()
+
+
+def get_scheduler() -> Optional[IngestionScheduler]:
+    """Process-wide scheduler, or None when INGESTION_SCHEDULER_ENABLED is off."""
+    global _scheduler
+
+    if not settings.INGESTION_SCHEDULER_ENABLED:
+        return None
+    if _scheduler is None:
+        with _scheduler_lock:
+            if _scheduler is None:
+                _scheduler = IngestionScheduler()
+    return _scheduler
+
+
+def get_llm_rate_limiter(parallel_tasks: int = 1) -> Optional[TokenBucketRateLimiter]:
+    """
+    LLM rate limiter for one run: fair-shared across running companies when
+    the scheduler is enabled, otherwise None (DescriptionGenerator's default).
+
+    Args:
+        parallel_tasks: Tasks of the same run sharing the company's share
+            (INGESTION_MAX_TASKS_PER_COMPANY for chord batch tasks)
+    """
+    scheduler = get_scheduler()
+    if scheduler is None:
+        return None
+    return FairShareRateLimiter(
+        scheduler,
+        total_rate=settings.LLM_REQUESTS_PER_SECOND / max(1, parallel_tasks),
+        capacity=settings.LLM_RATE_LIMIT_BURST
+    )
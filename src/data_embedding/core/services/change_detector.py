@@ -0,0 +1,81 @@
+"""
+Schema change detection for incremental re-ingestion
+"""
+import hashlib
+import json
+import logging
+from typing import Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+def compute_schema_fingerprint(table_data: dict) -> str:
+    """
+    Compute a stable fingerprint for a scanned table.
+
+    The hash covers the column listing (schema_text) and the key information
+    (primary key and foreign keys). Foreign keys are sorted first so that the
+    catalog's row order does not produce spurious changes, and constraint
+    names are left out (renaming a constraint does not change the table).
+
+    Args:
+        table_data: Table metadata from DatabaseScanner ('schema_text', 'key_info')
+
+    Returns:
+        Hex SHA-256 digest
+    """
+    key_info = dict(table_data.get('key_info') or {})
+    key_info['fks'] = sorted(
+        ({k: v for k, v in fk.items() if k != 'constraint_name'} for fk in key_info.get('fks', [])),
+        key=lambda fk: (fk.get('from_column') or '', fk.get('to_table') or '', fk.get('to_column') or '')
+    )
+    payload = json.dumps(
+        {"schema_text": table_data.get('schema_text', ''), "key_info": key_info},
+        sort_keys=True
+    )
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+class SchemaChangeDetector:
+    """
+    Compares freshly scanned fingerprints with the ones stored in
+    client_schema_vectors to find which tables need re-processing.
+    """
+
+    def detect(
+        self,
+        current_fingerprints: Dict[str, str],
+        stored_fingerprints: Dict[str, Optional[str]]
+    ) -> Dict[str, List[str]]:
+        """
+        Classify tables as added, changed, unchanged or dropped.
+
+        Rows stored before fingerprints existed (NULL fingerprint) count as changed.
+
+        Args:
+            current_fingerprints: {table_name: fingerprint} from the current scan
+            stored_fingerprints: {table_name: fingerprint or None} from the vector store
+
+        Returns:
+            Dictionary with 'added', 'changed', 'unchanged' and 'dropped' table name lists
+        """
+        changes = {"added": [], "changed": [], "unchanged": [], "dropped": []}
+
+        for table_name, fingerprint in current_fingerprints.items():
+            if table_name not in stored_fingerprints:
+                changes["added"].append(table_name)
+            elif stored_fingerprints[table_name] != fingerprint:
+                changes["changed"].append(table_name)
+            else:
+                changes["unchanged"].append(table_name)
+
+        changes["dropped"] = [
+            table_name for table_name in stored_fingerprints
+            if table_name not in current_fingerprints
+        ]
+
+        logger.info(
+            f"Schema changes: {len(changes['added'])} added, {len(changes['changed'])} changed, "
+            f"{len(changes['unchanged'])} unchanged, {len(changes['dropped'])} dropped"
+        )
+        return changes
@@ -0,0 +1,343 @@
+"""
+Content-addressed cache for LLM-generated table and team descriptions
+"""
+import hashlib
+import logging
+from abc import ABC, abstractmethod
+import os
+import re
+import sqlite3
+import threading
+import time
+from psycopg2.extras import execute_values
+from typing import Dict, Iterable, List, Optional, Tuple
+from config import settings
+from clients.db_pool import get_connection, release_connection
+from core.services.llm_service import TABLE_DESCRIPTION_PROMPT_VERSION, TEAM_DESCRIPTION_PROMPT_VERSION
+
+logger = logging.getLogger(__name__)
+
+
+def normalize_text(text: str) -> str:
+    """Collapse whitespace so formatting differences do not change the cache key."""
+    return re.sub(r"\s+", " ", text or "").strip()
+
+
+def make_cache_key(kind: str, content: str, model_name: str, prompt_version: str) -> str:
+    """
+    Build a content-addressed cache key.
+
+    Args:
+        kind: "table" or "team"
+        content: The text the LLM is asked to describe
+        model_name: LLM model identifier
+        prompt_version: Version of the prompt template
+
+    Returns:
+        Hex SHA-256 digest
+    """
+    payload = "\n".join([kind, prompt_version, model_name or "", normalize_text(content)])
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class DescriptionCache(ABC):
+    """
+    Base description cache: key building, TTL and hit/miss counters.
+    Subclasses implement the storage (_get_many / _set_many).
+    """
+
+    def __init__(self, ttl_seconds: int, bypass: bool = False, model_name: str = None):
+        """
+        Initialize the cache.
+
+        Args:
+            ttl_seconds: Entries older than this are treated as missing
+            bypass: Skip lookups (every call is a miss) while still storing results
+            model_name: LLM model name mixed into the keys (default: LLM_MODEL_NAME)
+        """
+        self.ttl_seconds = ttl_seconds
+        self.bypass = bypass
+        self.model_name = model_name or settings.LLM_MODEL_NAME
+        self.hits = 0
+        self.misses = 0
+        self.writes = 0
+        self._lock = threading.Lock()
+
+    def table_key(self, table_data: dict) -> str:
+        """Cache key for a scanned table (name + normalized column listing + column statistics, if profiled)."""
+        content = f"{table_data['full_name']}\n{table_data.get('schema_text', '')}"
+        if table_data.get('profile_text'):
+            content += f"\n{table_data['profile_text']}"
+        return make_cache_key("table", content, self.model_name, TABLE_DESCRIPTION_PROMPT_VERSION)
+
+    def team_key(self, team_name: str) -> str:
+        """Cache key for a team name (case-insensitive)."""
+        return make_cache_key("team", team_name.lower(), self.model_name, TEAM_DESCRIPTION_PROMPT_VERSION)
+
+    def get(self, key: str) -> Optional[str]:
+        """Return the cached description for a key, or None."""
+        return self.get_many([key]).get(key)
+
+    def get_many(self, keys: Iterable[str]) -> Dict[str, str]:
+        """
+        Look up several keys at once.
+
+        Args:
+            keys: Cache keys
+
+        Returns:
+            Dictionary of {key: description} for the keys that were found
+        """
+        keys = list(dict.fromkeys(keys))
+        if not keys:
+            return {}
+
+        found = {}
+        if not self.bypass:
+            try:
+                found = self._get_many(keys)
+            except Exception as e:
+                logger.warning(f"Description cache lookup failed, treating as miss: {e}")
+
+        with self._lock:
+            self.hits += len(found)
+            self.misses += len(keys) - len(found)
+        return found
+
+    def set(self, key: str, kind: str, description: str):
+        """Store one description."""
+        self.set_many([(key, kind, description)])
+
+    def set_many(self, entries: List[Tuple[str, str, str]]):
+        """
+        Store several descriptions.
+
+        Args:
+            entries: List of (key, kind, description)
+        """
+        if not entries:
+            return
+        try:
+            self._set_many(entries)
+            with self._lock:
+                self.writes += len(entries)
+        except Exception as e:
+            logger.warning(f"Failed to write {len(entries)} entries to description cache: {e}")
+
+    def stats(self) -> dict:
+        """Hit/miss counters for this cache instance."""
+        lookups = self.hits + self.misses
+        return {
+            "backend": type(self).__name__,
+            "hits": self.hits,
+            "misses": self.misses,
+            "writes": self.writes,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+            "bypass": self.bypass,
+        }
+
+    @abstractmethod
+    def _get_many(self, keys: List[str]) -> Dict[str, str]:
+        """Fetch the stored, unexpired descriptions of the given keys."""
+
+    @abstractmethod
+    def _set_many(self, entries: List[Tuple[str, str, str]]):
+        """Store (key, kind, description) entries."""
+
+
+class NullDescriptionCache(DescriptionCache):
+    """Cache that stores nothing (DESCRIPTION_CACHE_BACKEND=none)."""
+
+    def _get_many(self, keys: List[str]) -> Dict[str, str]:
+        return {}
+
+    def _set_many(self, entries: List[Tuple[str, str, str]]):
+        pass
+
+
+class PostgresDescriptionCache(DescriptionCache):
+    """
+    Description cache stored in the vector database (llm_description_cache table),
+    shared by every worker and tenant.
+    """
+
+    def __init__(self, ttl_seconds: int, bypass: bool = False, model_name: str = None):
+        super().__init__(ttl_seconds, bypass, model_name)
+        self._table_ready = False
+
+    def _get_connection(self):
+        """Borrow a connection from the shared vector DB pool (return it with release_connection)"""
+        return get_connection()
+
+    def _ensure_table(self, cur):
+        """Create the cache table on first use."""
+        if self._table_ready:
+            return
+        cur.execute("""
+            CREATE TABLE IF NOT EXISTS llm_description_cache (
+                cache_key TEXT PRIMARY KEY,
+                kind TEXT NOT NULL,
+                model_name TEXT,
+                description TEXT NOT NULL,
+                created_at TIMESTAMPTZ NOT NULL DEFAULT CURRENT_TIMESTAMP
+            )
+        """)
+        self._table_ready = True
+
+    def _get_many(self, keys: List[str]) -> Dict[str, str]:
+        conn = self._get_connection()
+        try:
+            cur = conn.cursor()
+            self._ensure_table(cur)
+            cur.execute(
+                """
+                SELECT cache_key, description FROM llm_description_cache
+                WHERE cache_key = ANY(%s)
+                AND created_at > CURRENT_TIMESTAMP - make_interval(secs => %s)
+                """,
+                (keys, self.ttl_seconds)
+            )
+            found = dict(cur.fetchall())
+            conn.commit()
+            cur.close()
+            return found
+        finally:
+            release_connection(conn)
+
+    def _set_many(self, entries: List[Tuple[str, str, str]]):
+        conn = self._get_connection()
+        try:
+            cur = conn.cursor()
+            self._ensure_table(cur)
+            execute_values(
+                cur,
+                """
+                INSERT INTO llm_description_cache (cache_key, kind, model_name, description)
+                VALUES %s
+                ON CONFLICT (cache_key) DO UPDATE
+                SET description = EXCLUDED.description, created_at = CURRENT_TIMESTAMP
+                """,
+                [(key, kind, self.model_name, description) for key, kind, description in entries]
+            )
+            conn.commit()
+            cur.close()
+        finally:
+            release_connection(conn)
+
+    def purge_expired(self) -> int:
+        """Delete entries older than the TTL. Returns the number of rows removed."""
+        conn = self._get_connection()
+        try:
+            cur = conn.cursor()
+            self._ensure_table(cur)
+            cur.execute(
+                "DELETE FROM llm_description_cache WHERE created_at <= CURRENT_TIMESTAMP - make_interval(secs => %s)",
+                (self.ttl_seconds,)
+            )
+            removed = cur.rowcount
+            conn.commit()
+            cur.close()
+            return removed
+        finally:
+            release_connection(conn)
+
+
+class DiskDescriptionCache(DescriptionCache):
+    """
+    Description cache stored in a local SQLite file. Useful for development
+    and single-worker deployments; least recently used entries are evicted
+    beyond max_entries.
+    """
+
+    def __init__(
+        self,
+        ttl_seconds: int,
+        cache_dir: str,
+        max_entries: int,
+        bypass: bool = False,
+        model_name: str = None
+    ):
+        super().__init__(ttl_seconds, bypass, model_name)
+        self.max_entries = max_entries
+        os.makedirs(cache_dir, exist_ok=True)
+        self.path = os.path.join(cache_dir, "descriptions.sqlite3")
+        with self._connect() as conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS description_cache (
+                    cache_key TEXT PRIMARY KEY,
+                    kind TEXT NOT NULL,
+                    description TEXT NOT NULL,
+                    created_at REAL NOT NULL,
+                    last_used_at REAL NOT NULL
+                )
+            """)
+
+    def _connect(self):
+        return sqlite3.connect(self.path, timeout=30)
+
+    def _get_many(self, keys: List[str]) -> Dict[str, str]:
+        now = time.time()
+        placeholders = ",".join("?" * len(keys))
+        with self._connect() as conn:
+            rows = conn.execute(
+                f"SELECT cache_key, description FROM description_cache "
+                f"WHERE cache_key IN ({placeholders}) AND created_at > ?",
+                [*keys, now - self.ttl_seconds]
+            ).fetchall()
+            if rows:
+                conn.executemany(
+                    "UPDATE description_cache SET last_used_at = ? WHERE cache_key = ?",
+                    [(now, key) for key, _ in rows]
+                )
+        return dict(rows)
+
+    def _set_many(self, entries: List[Tuple[str, str, str]]):
+        now = time.time()
+        with self._connect() as conn:
+            conn.executemany(
+                "INSERT OR REPLACE INTO description_cache VALUES (?, ?, ?, ?, ?)",
+                [(key, kind, description, now, now) for key, kind, description in entries]
+            )
+            self._evict(conn, now)
+
+    def _evict(self, conn, now: float):
+        """Drop expired entries, then the least recently used beyond max_entries."""
+        conn.execute("DELETE FROM description_cache WHERE created_at <= ?", (now - self.ttl_seconds,))
+        conn.execute(
+            """
+            DELETE FROM description_cache WHERE cache_key IN (
+                SELECT cache_key FROM description_cache
+                ORDER BY last_used_at DESC LIMIT -1 OFFSET ?
+            )
+            """,
+            (self.max_entries,)
+        )
+
+
+def get_description_cache(bypass: bool = None) -> DescriptionCache:
+    """
+    Build the description cache selected by DESCRIPTION_CACHE_BACKEND.
+
+    Args:
+        bypass: Override DESCRIPTION_CACHE_BYPASS
+
+    Returns:
+        DescriptionCache instance ("postgres", "disk" or "none")
+    """
+    backend = settings.DESCRIPTION_CACHE_BACKEND
+    ttl_seconds = settings.DESCRIPTION_CACHE_TTL_DAYS * 24 * 3600
+    bypass = settings.DESCRIPTION_CACHE_BYPASS if bypass is None else bypass
+
+    if backend == "postgres":
+        return PostgresDescriptionCache(ttl_seconds, bypass=bypass)
+    if backend == "disk":
+        return DiskDescriptionCache(
+            ttl_seconds,
+            cache_dir=settings.DESCRIPTION_CACHE_DIR,
+            max_entries=settings.DESCRIPTION_CACHE_MAX_ENTRIES,
+            bypass=bypass
+        )
+    if backend == "none":
+        return NullDescriptionCache(ttl_seconds, bypass=True)
+
+    raise ValueError(f"Unknown DESCRIPTION_CACHE_BACKEND '{backend}'. Expected postgres, disk or none")
@@ -3,10 +3,14 @@ Description generator using LLM service
 """
 import logging
 import json
+import random
 import time
-from typing import List, Tuple
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from typing import List, Tuple, Dict
 from config import settings
-from core.services.llm_service import LLMService
+from core.services.description_cache import DescriptionCache, get_description_cache
+from core.services.llm_service import LLMService, LLMRateLimitError
+from core.services.rate_limiter import TokenBucketRateLimiter
 
 logger = logging.getLogger(__name__)
 
@@ -14,89 +18,195 @@ logger = logging.getLogger(__name__)
 class DescriptionGenerator:
     """
     Generates business-focused descriptions for table schemas using LLM.
+
+    Batches are sent concurrently (up to LLM_MAX_CONCURRENCY in flight) through
+    a shared token-bucket rate limiter. Batches hit by a 429 are retried with
+    exponential backoff, and tables the LLM left out of its answer are
+    re-queued as a smaller batch instead of being dropped. Tables whose schema
+    was already described (by any tenant) are served from the description
+    cache and never reach the LLM.
     """
-    
-    def __init__(self, llm_service: LLMService = None):
+
+    def __init__(
+        self,
+        llm_service: LLMService = None,
+        rate_limiter: TokenBucketRateLimiter = None,
+        max_concurrency: int = None,
+        cache: DescriptionCache = None
+    ):
         """
         Initialize with an LLM service.
-        
+
         Args:
             llm_service: Optional LLM service instance (creates new one if not provided)
+            rate_limiter: Optional rate limiter shared by all batches
+            max_concurrency: Maximum batches in flight (default: LLM_MAX_CONCURRENCY)
+            cache: Optional description cache (default: DESCRIPTION_CACHE_BACKEND)
         """
         self.llm_service = llm_service or LLMService()
-    
+        self.cache = cache or get_description_cache()
+        self.rate_limiter = rate_limiter or TokenBucketRateLimiter(
+            rate=settings.LLM_REQUESTS_PER_SECOND,
+            capacity=settings.LLM_RATE_LIMIT_BURST
+        )
+        self.max_concurrency = max(1, max_concurrency or settings.LLM_MAX_CONCURRENCY)
+
     def _chunk_list(self, input_list: list, chunk_size: int):
         """Split a list into chunks of specified size"""
         for i in range(0, len(input_list), chunk_size):
             yield input_list[i:i + chunk_size]
-    
+
+    def _describe_chunk(self, chunk: list, delay: float) -> Dict[str, str]:
+        """
+        Request descriptions for one batch of tables.
+
+        Args:
+            chunk: Table metadata dicts
+            delay: Seconds to wait first (backoff before a retry)
+
+        Returns:
+            Dictionary of {table_name: description} as returned by the LLM
+        """
+        if delay:
+            time.sleep(delay)
+        self.rate_limiter.acquire()
+
+        batch_schema_text = "\n".join([
+            f"--- Table: {item['full_name']} ---\n{item['schema_text']}\n"
+            + (f"{item['profile_text']}\n" if item.get('profile_text') else "")
+            for item in chunk
+        ])
+        llm_response = self.llm_service.generate_batch_descriptions(batch_schema_text)
+
+        if not llm_response or 'descriptions' not in llm_response:
+            return {}
+
+        return {
+            item.get('table_name'): item.get('description')
+            for item in llm_response.get('descriptions', [])
+            if isinstance(item, dict)
+        }
+
+    def _backoff_delay(self, attempt: int) -> float:
+        """Exponential backoff with jitter for the given attempt number."""
+        return settings.LLM_BACKOFF_SECONDS * (2 ** attempt) + random.uniform(0, 1)
+
+    @staticmethod
+    def _normalize_description(table_name: str, description) -> str:
+        """Coerce a description returned by the LLM into a string."""
+        if isinstance(description, (dict, list)):
+            logger.warning(
+                f"LLM returned non-string description for {table_name} "
+                f"(type={type(description).__name__}), serializing to JSON"
+            )
+            return json.dumps(description)
+        if not isinstance(description, str):
+            return str(description)
+        return description
+
     def generate_for_tables(self, tables_data: list, source_settings: dict) -> list:
         """
-        Generate descriptions for all tables in batches.
-        
+        Generate descriptions for all tables in concurrent batches.
+
         Args:
             tables_data: List of table metadata from DatabaseScanner
             source_settings: Dictionary containing company_id
-        
+
         Returns:
             List of tuples ready for ingestion: (company_id, table_name, description, relations_json)
         """
-        data_to_ingest = []
         company_id = source_settings['company_id']
-        
-        logger.info(f"Starting batch description generation for {len(tables_data)} tables...")
-        
-        for i, chunk in enumerate(self._chunk_list(tables_data, settings.INGESTION_CHUNK_SIZE)):
-            logger.info(f"Processing Batch {i+1} ({len(chunk)} tables)")
-            
-            # Prepare batch schema text
-            batch_schema_text = "\n".join([
-                f"--- Table: {item['full_name']} ---\n{item['schema_text']}\n"
-                for item in chunk
-            ])
-            
-            # Generate descriptions via LLM
-            llm_response = self.llm_service.generate_batch_descriptions(batch_schema_text)
-            
-            if not llm_response or 'descriptions' not in llm_response:
-                logger.warning(f"Failed to get valid JSON for Batch {i+1}. Skipping batch.")
-                time.sleep(1)
-                continue
-            
-            # Map descriptions back to tables
-            description_map = {
-                item.get('table_name'): item.get('description')
-                for item in llm_response.get('descriptions', [])
-            }
-            
-            # Prepare data for ingestion
-            for table_data in chunk:
-                table_name = table_data['full_name']
-                description = description_map.get(table_name)
-                key_info_obj = table_data['key_info']
-
-                if table_name and description:
-                    if isinstance(description, (dict, list)):
+        descriptions = {}
+        max_attempts = settings.LLM_MAX_BATCH_ATTEMPTS
+
+        cache_keys = {table_data['full_name']: self.cache.table_key(table_data) for table_data in tables_data}
+        cached = self.cache.get_many(cache_keys.values())
+        for table_name, key in cache_keys.items():
+            if key in cached:
+                descriptions[table_name] = cached[key]
+        pending_tables = [table_data for table_data in tables_data if table_data['full_name'] not in descriptions]
+
+        logger.info(
+            f"Starting batch description generation for {len(pending_tables)} tables "
+            f"({len(descriptions)} served from cache, concurrency={self.max_concurrency})..."
+        )
+
+        with ThreadPoolExecutor(max_workers=self.max_concurrency) as executor:
+            in_flight = {}
+
+            def submit(chunk: list, attempt: int, delay: float = 0.0):
+                future = executor.submit(self._describe_chunk, chunk, delay)
+                in_flight[future] = (chunk, attempt)
+
+            for chunk in self._chunk_list(pending_tables, settings.INGESTION_CHUNK_SIZE):
+                submit(chunk, attempt=1)
+
+            while in_flight:
+                done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+
+                for future in done:
+                    chunk, attempt = in_flight.pop(future)
+
+                    try:
+                        description_map = future.result()
+                    except LLMRateLimitError:
+                        self.rate_limiter.penalize()
+                        if attempt < max_attempts:
+                            delay = self._backoff_delay(attempt)
+                            logger.warning(
+                                f"Batch of {len(chunk)} tables rate limited "
+                                f"(attempt {attempt}/{max_attempts}). Retrying in {delay:.1f}s"
+                            )
+                            submit(chunk, attempt + 1, delay)
+                        else:
+                            logger.warning(f"Giving up on {len(chunk)} tables after {attempt} rate-limited attempts")
+                        continue
+                    except Exception:
+                        for pending in in_flight:
+                            pending.cancel()
+                        raise
+
+                    self.rate_limiter.reward()
+
+                    missing = []
+                    new_entries = []
+                    for table_data in chunk:
+                        table_name = table_data['full_name']
+                        description = description_map.get(table_name)
+                        if description:
+                            descriptions[table_name] = self._normalize_description(table_name, description)
+                            new_entries.append((cache_keys[table_name], "table", descriptions[table_name]))
+                        else:
+                            missing.append(table_data)
+                    self.cache.set_many(new_entries)
+
+                    if not missing:
+                        continue
+
+                    if attempt < max_attempts:
                         logger.warning(
-                            f"LLM returned non-string description for {table_name} "
-                            f"(type={type(description).__name__}), serializing to JSON"
+                            f"LLM omitted {len(missing)}/{len(chunk)} tables "
+                            f"(attempt {attempt}/{max_attempts}). Re-queuing them."
                         )
-                        description = json.dumps(description)
-                    elif not isinstance(description, str):
-                        description = str(description)
-
-                    data_to_ingest.append((
-                        company_id,
-                        table_name,
-                        description,
-                        json.dumps(key_info_obj)
-                    ))
-                    logger.info(f"SUCCESS: Mapped description for {table_name}")
-                else:
-                    logger.warning(f"Could not find description for {table_name}")
-            
-            # Rate limiting
-            time.sleep(1)
-        
-        logger.info(f"Description generation complete. Generated {len(data_to_ingest)} descriptions.")
+                        submit(missing, attempt + 1, self._backoff_delay(attempt - 1) if not description_map else 0.0)
+                    else:
+                        for table_data in missing:
+                            logger.warning(f"Could not find description for {table_data['full_name']}")
+
+        # Prepare data for ingestion, keeping the scanner's table order
+        data_to_ingest = [
+            (
+                company_id,
+                table_data['full_name'],
+                descriptions[table_data['full_name']],
+                json.dumps(table_data['key_info'])
+            )
+            for table_data in tables_data
+            if table_data['full_name'] in descriptions
+        ]
+
+        logger.info(
+            f"Description generation complete. Generated {len(data_to_ingest)} descriptions. "
+            f"Cache: {self.cache.stats()}"
+        )
         return data_to_ingest
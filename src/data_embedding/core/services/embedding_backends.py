@@ -0,0 +1,68 @@
+"""
+Embedding model backends: PyTorch, ONNX Runtime and int8-quantized ONNX
+"""
+import logging
+import os
+from config import settings
+
+logger = logging.getLogger(__name__)
+
+EMBEDDING_BACKENDS = ("torch", "onnx", "onnx-int8")
+
+
+def _load_int8(model_name: str, quantization: str, cache_dir: str):
+    """
+    Load the int8-quantized ONNX model, exporting it on first use.
+
+    The quantized file (onnx/model_qint8_<quantization>.onnx) is looked up in
+    the model repository first; if it is not published there it is produced
+    once from the ONNX export and stored under cache_dir.
+
+    Kept identical in data_embedding/core/services/embedding_backends.py and
+    embedding_server/core/model.py (tests/test_embedding_backends.py checks
+    it): both services must serve the same quantized model, and each is built
+    from its own Docker context, so neither can import the other.
+    """
+    from sentence_transformers import SentenceTransformer, export_dynamic_quantized_onnx_model
+
+    file_name = f"onnx/model_qint8_{quantization}.onnx"
+    try:
+        return SentenceTransformer(model_name, backend="onnx", model_kwargs={"file_name": file_name})
+    except Exception as e:
+        logger.info(f"No published {file_name} for {model_name} ({e}). Exporting a local copy...")
+
+    export_dir = os.path.join(cache_dir, model_name.replace("/", "__"))
+    if not os.path.exists(os.path.join(export_dir, file_name)):
+        onnx_model = SentenceTransformer(model_name, backend="onnx")
+        onnx_model.save(export_dir)
+        export_dynamic_quantized_onnx_model(onnx_model, quantization, export_dir)
+    return SentenceTransformer(export_dir, backend="onnx", model_kwargs={"file_name": file_name})
+
+
+def load_sentence_transformer(model_name: str = None, backend: str = None):
+    """
+    Load a SentenceTransformer on the requested backend.
+
+    Args:
+        model_name: Hugging Face model id (default: EMBEDDING_MODEL_NAME)
+        backend: "torch", "onnx" or "onnx-int8" (default: EMBEDDING_BACKEND)
+
+    Returns:
+        SentenceTransformer instance; encode() behaves the same on every backend
+    """
+    from sentence_transformers import SentenceTransformer
+
+    model_name = model_name or settings.EMBEDDING_MODEL_NAME
+    backend = backend or settings.EMBEDDING_BACKEND
+
+    logger.info(f"Loading embedding model: {model_name} (backend={backend})...")
+    if backend == "torch":
+        model = SentenceTransformer(model_name)
+    elif backend == "onnx":
+        model = SentenceTransformer(model_name, backend="onnx")
+    elif backend == "onnx-int8":
+        model = _load_int8(model_name, settings.EMBEDDING_ONNX_QUANTIZATION, settings.EMBEDDING_ONNX_CACHE_DIR)
+    else:
+        raise ValueError(f"Unknown EMBEDDING_BACKEND '{backend}'. Expected one of {', '.join(EMBEDDING_BACKENDS)}")
+    logger.info("Embedding model loaded successfully.")
+    return model
@@ -2,24 +2,57 @@
 Embedding service for creating vector embeddings
 """
 import logging
+import threading
 import numpy as np
-from sentence_transformers import SentenceTransformer
 from typing import List, Dict
+from clients.embedding_client import EmbeddingServiceClient
 from config import settings
+from core.services.embedding_backends import load_sentence_transformer
 
 logger = logging.getLogger(__name__)
 
+# Process-wide model used when no embedding server is configured
+_local_model = None
+_local_model_lock = threading.Lock()
+
+
+def get_local_model():
+    """
+    Return the in-process SentenceTransformer, loading it on first use.
+
+    Every EmbeddingService in the process shares this instance, built on the
+    EMBEDDING_BACKEND backend.
+    """
+    global _local_model
+
+    if _local_model is None:
+        with _local_model_lock:
+            if _local_model is None:
+                _local_model = load_sentence_transformer()
+    return _local_model
+
 
 class EmbeddingService:
     """
-    Service for generating embeddings using SentenceTransformer model.
+    Service for generating embeddings.
+
+    Uses the shared embedding server when EMBEDDING_SERVICE_URL is set,
+    otherwise a SentenceTransformer model loaded once per process
+    (PyTorch, ONNX or int8 ONNX, see EMBEDDING_BACKEND).
     """
     
     def __init__(self):
-        """Initialize the embedding model"""
-        logger.info(f"Loading embedding model: {settings.EMBEDDING_MODEL_NAME}...")
-        self.model = SentenceTransformer(settings.EMBEDDING_MODEL_NAME)
-        logger.info("Embedding model loaded successfully.")
+        """Connect to the embedding server or load the in-process model"""
+        if settings.EMBEDDING_SERVICE_URL:
+            logger.info(f"Using embedding server at {settings.EMBEDDING_SERVICE_URL}")
+            self.client = EmbeddingServiceClient(
+                settings.EMBEDDING_SERVICE_URL,
+                timeout=settings.EMBEDDING_SERVICE_TIMEOUT
+            )
+            self.model = None
+        else:
+            self.client = None
+            self.model = get_local_model()
     
     def encode(self, text: str, normalize: bool = True) -> np.ndarray:
         """
@@ -35,20 +68,37 @@ class EmbeddingService:
         if not isinstance(text, str):
             logger.warning(f"Non-string input to encode (type={type(text).__name__}), coercing to str")
             text = str(text)
+        if self.client:
+            return self.client.encode([text], normalize)[0]
         return self.model.encode(text, normalize_embeddings=normalize)
     
-    def encode_batch(self, texts: List[str], normalize: bool = True) -> List[np.ndarray]:
+    def encode_batch(
+        self,
+        texts: List[str],
+        normalize: bool = True,
+        batch_size: int = None
+    ) -> np.ndarray:
         """
         Generate embeddings for multiple texts.
-        
+
         Args:
             texts: List of input texts
             normalize: Whether to normalize the embeddings
-        
+            batch_size: Texts per model forward pass (default: EMBEDDING_BATCH_SIZE;
+                the embedding server uses its own batch size)
+
         Returns:
-            List of numpy arrays
+            Numpy array of shape (len(texts), dim)
         """
-        return self.model.encode(texts, normalize_embeddings=normalize)
+        texts = [text if isinstance(text, str) else str(text) for text in texts]
+        if self.client:
+            return self.client.encode(texts, normalize)
+        return self.model.encode(
+            texts,
+            batch_size=batch_size or settings.EMBEDDING_BATCH_SIZE,
+            normalize_embeddings=normalize,
+            convert_to_numpy=True
+        )
     
     def encode_dict(self, text_dict: Dict[str, str], normalize: bool = True) -> Dict[str, np.ndarray]:
         """
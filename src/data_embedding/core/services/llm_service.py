@@ -3,11 +3,29 @@ LLM service for generating descriptions and team information
 """
 import logging
 import os
+import threading
 from langchain_openai import ChatOpenAI
 from config import settings
 
 logger = logging.getLogger(__name__)
 
+# Bump these whenever the corresponding prompt below changes, so cached
+# descriptions produced by the previous prompt are no longer served.
+TABLE_DESCRIPTION_PROMPT_VERSION = "1"
+TEAM_DESCRIPTION_PROMPT_VERSION = "2"
+
+
+class LLMRateLimitError(RuntimeError):
+    """Raised when the LLM provider rejects a request with HTTP 429."""
+
+
+def _is_rate_limit_error(error: Exception) -> bool:
+    """Check whether an LLM client exception is a 429 / rate-limit response."""
+    if type(error).__name__ == "RateLimitError" or getattr(error, "status_code", None) == 429:
+        return True
+    error_text = str(error).lower()
+    return "429" in error_text or "rate limit" in error_text or "too many requests" in error_text
+
 
 class LLMService:
     """
@@ -30,13 +48,36 @@ class LLMService:
             max_tokens=max_tokens
         )
         logger.info(f"LLM Service initialized with model: {settings.LLM_MODEL_NAME} (max_tokens={max_tokens})")
+
+        # Cumulative request/token counters for this instance (read via usage_snapshot)
+        self._usage = {"calls": 0, "input_tokens": 0, "output_tokens": 0}
+        self._usage_lock = threading.Lock()
+
+    def _record_usage(self, response):
+        """Add the token usage reported on an LLM response to this instance's counters."""
+        usage = getattr(response, "usage_metadata", None) or {}
+        with self._usage_lock:
+            self._usage["calls"] += 1
+            self._usage["input_tokens"] += usage.get("input_tokens", 0) or 0
+            self._usage["output_tokens"] += usage.get("output_tokens", 0) or 0
+
+    def usage_snapshot(self) -> dict:
+        """
+        Return the cumulative LLM usage of this instance.
+
+        Returns:
+            Dictionary with 'calls', 'input_tokens' and 'output_tokens'
+        """
+        with self._usage_lock:
+            return dict(self._usage)
     
-    def generate_team_description(self, team_name: str) -> str:
+    def generate_team_description(self, team_name: str, raise_on_error: bool = False) -> str:
         """
         Generate a business-focused description for a team.
         
         Args:
             team_name: Name of the team
+            raise_on_error: Re-raise LLM errors instead of returning a generic fallback
         
         Returns:
             Description string suitable for embedding
@@ -56,13 +97,70 @@ class LLMService:
         
         try:
             response = self.llm.invoke(prompt)
+            self._record_usage(response)
             description = response.content.strip()
             logger.info(f"Generated description for team '{team_name}': {description[:100]}...")
             return description
         except Exception as e:
             logger.error(f"Failed to generate description for team '{team_name}': {e}")
+            if raise_on_error:
+                raise
             return f"{team_name} Team: Manages data and operations related to {team_name.lower()} activities."
-    
+
+    def generate_batch_team_descriptions(self, team_names: list) -> dict:
+        """
+        Generate descriptions for several teams in one JSON-mode call.
+
+        Args:
+            team_names: Names of the teams to describe
+
+        Returns:
+            Dictionary of {team_name: description} (teams the LLM left out are missing)
+
+        Raises:
+            LLMRateLimitError: If the provider answered with HTTP 429
+            Exception: Any other LLM or JSON decoding error
+        """
+        team_list = "\n".join(f"- {team_name}" for team_name in team_names)
+        prompt = f"""
+        Generate a concise, business-focused description for each of the teams listed below.
+
+        For each team, focus on:
+        - What type of data this team typically works with
+        - What database tables or information they would need access to
+        - Their primary business functions
+
+        Keep each description to 2-3 sentences. Be specific about data and tables.
+
+        Return the output as a JSON object with a single top-level key 'descriptions',
+        which contains an array of objects. Each object in the array MUST have two keys:
+        'team_name' (the exact team name as listed) and 'description'.
+
+        Teams:
+        ---
+        {team_list}
+        ---
+        """
+
+        try:
+            response = self.llm.invoke(
+                prompt,
+                response_format={"type": "json_object"}
+            )
+        except Exception as e:
+            if _is_rate_limit_error(e):
+                raise LLMRateLimitError(str(e)) from e
+            raise
+        self._record_usage(response)
+
+        import json
+        items = json.loads(response.content.strip()).get("descriptions", [])
+        return {
+            item["team_name"]: str(item["description"]).strip()
+            for item in items
+            if isinstance(item, dict) and item.get("team_name") and item.get("description")
+        }
+
     def generate_batch_descriptions(self, table_schemas_text: str) -> dict:
         """
         Generate descriptions for multiple table schemas in one batch.
@@ -72,6 +170,10 @@ class LLMService:
         
         Returns:
             Dictionary with 'descriptions' key containing list of table descriptions
+
+        Raises:
+            LLMRateLimitError: If the provider answered with HTTP 429
+            RuntimeError: If the provider reports exhausted credits (HTTP 402)
         """
         prompt = f"""
         Analyze the following SQL table schemas. For each table, generate a single,
@@ -93,6 +195,7 @@ class LLMService:
                 prompt,
                 response_format={"type": "json_object"}
             )
+            self._record_usage(response)
             import json
             return json.loads(response.content.strip())
         except Exception as e:
@@ -106,5 +209,8 @@ class LLMService:
                     "Please recharge OpenRouter credits or reduce request token usage."
                 ) from e
 
+            if _is_rate_limit_error(e):
+                raise LLMRateLimitError(error_text) from e
+
             logger.error(f"LLM batch generation error: {error_text}")
             return {}
@@ -0,0 +1,79 @@
+"""
+Token-bucket rate limiter for outbound LLM requests
+"""
+import logging
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+
+class TokenBucketRateLimiter:
+    """
+    Thread-safe token bucket with adaptive rate.
+
+    Each request consumes one token; tokens refill at `rate` per second up to
+    `capacity`. On 429 responses the rate is cut multiplicatively (penalize)
+    and it recovers additively on success (reward), never exceeding the
+    configured ceiling.
+    """
+
+    def __init__(self, rate: float, capacity: float = None, min_rate_fraction: float = 0.1):
+        """
+        Initialize the bucket.
+
+        Args:
+            rate: Requests per second
+            capacity: Maximum burst size (default: max(1, rate))
+            min_rate_fraction: Lowest rate penalize() may reach, as a fraction of `rate`
+        """
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+
+        self.max_rate = rate
+        self.min_rate = rate * min_rate_fraction
+        self.rate = rate
+        self.capacity = capacity or max(1.0, rate)
+        self._tokens = self.capacity
+        self._updated_at = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self):
+        """Add the tokens accrued since the last update (lock must be held)."""
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated_at) * self.rate)
+        self._updated_at = now
+
+    def acquire(self):
+        """Block until a token is available, then consume it."""
+        while True:
+            with self._lock:
+                self._refill()
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait_seconds = (1 - self._tokens) / self.rate
+            time.sleep(wait_seconds)
+
+    def set_rate(self, rate: float):
+        """Change the rate ceiling (e.g. when the limit is shared with other runs)."""
+        with self._lock:
+            self._refill()
+            ratio = self.min_rate / self.max_rate
+            self.max_rate = rate
+            self.min_rate = rate * ratio
+            self.rate = min(self.rate, rate)
+
+    def penalize(self, factor: float = 0.5):
+        """Slow down after a rate-limit response."""
+        with self._lock:
+            self._refill()
+            self.rate = max(self.min_rate, self.rate * factor)
+            self._tokens = 0
+        logger.warning(f"Rate limited by LLM provider. Lowering request rate to {self.rate:.2f}/s")
+
+    def reward(self, step_fraction: float = 0.1):
+        """Recover part of the configured rate after a successful request."""
+        with self._lock:
+            self._refill()
+            self.rate = min(self.max_rate, self.rate + self.max_rate * step_fraction)
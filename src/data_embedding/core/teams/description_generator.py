@@ -2,9 +2,14 @@
 Team description generator
 """
 import logging
+import random
 import time
+from concurrent.futures import ThreadPoolExecutor
 from typing import List, Dict
-from core.services.llm_service import LLMService
+from config import settings
+from core.services.description_cache import DescriptionCache, get_description_cache
+from core.services.llm_service import LLMService, LLMRateLimitError
+from core.services.rate_limiter import TokenBucketRateLimiter
 
 logger = logging.getLogger(__name__)
 
@@ -12,16 +17,33 @@ logger = logging.getLogger(__name__)
 class TeamDescriptionGenerator:
     """
     Generates business-focused descriptions for teams using LLM.
+    Common team names ("Sales", "HR", ...) are served from the description cache,
+    the rest are described several teams per LLM call.
     """
     
-    def __init__(self, llm_service: LLMService = None):
+    def __init__(
+        self,
+        llm_service: LLMService = None,
+        cache: DescriptionCache = None,
+        rate_limiter: TokenBucketRateLimiter = None,
+        max_concurrency: int = None
+    ):
         """
         Initialize with an LLM service.
         
         Args:
             llm_service: Optional LLM service instance
+            cache: Optional description cache (default: DESCRIPTION_CACHE_BACKEND)
+            rate_limiter: Optional rate limiter shared by all LLM calls
+            max_concurrency: Maximum batches in flight (default: LLM_MAX_CONCURRENCY)
         """
         self.llm_service = llm_service or LLMService()
+        self.cache = cache or get_description_cache()
+        self.rate_limiter = rate_limiter or TokenBucketRateLimiter(
+            rate=settings.LLM_REQUESTS_PER_SECOND,
+            capacity=settings.LLM_RATE_LIMIT_BURST
+        )
+        self.max_concurrency = max(1, max_concurrency or settings.LLM_MAX_CONCURRENCY)
     
     def generate(self, team_name: str) -> str:
         """
@@ -32,31 +54,105 @@ class TeamDescriptionGenerator:
         
         Returns:
             Description string
+
+        Raises:
+            Exception: If the LLM call fails (nothing is cached in that case)
         """
-        return self.llm_service.generate_team_description(team_name)
+        key = self.cache.team_key(team_name)
+        cached = self.cache.get(key)
+        if cached:
+            return cached
+
+        description = self.llm_service.generate_team_description(team_name, raise_on_error=True)
+        self.cache.set(key, "team", description)
+        return description
     
+    def _describe_chunk(self, chunk: List[str]) -> Dict[str, str]:
+        """
+        Describe one batch of teams with a single LLM call, retrying on 429.
+
+        Args:
+            chunk: Team names
+
+        Returns:
+            Dictionary of {team_name: description}; teams the LLM left out are missing
+        """
+        max_attempts = settings.LLM_MAX_BATCH_ATTEMPTS
+        for attempt in range(1, max_attempts + 1):
+            self.rate_limiter.acquire()
+            try:
+                answer = self.llm_service.generate_batch_team_descriptions(chunk)
+            except LLMRateLimitError:
+                self.rate_limiter.penalize()
+                if attempt == max_attempts:
+                    raise
+                delay = settings.LLM_BACKOFF_SECONDS * (2 ** attempt) + random.uniform(0, 1)
+                logger.warning(
+                    f"Batch of {len(chunk)} teams rate limited "
+                    f"(attempt {attempt}/{max_attempts}). Retrying in {delay:.1f}s"
+                )
+                time.sleep(delay)
+                continue
+            self.rate_limiter.reward()
+            # Match the names the LLM echoed back case-insensitively
+            by_name = {name.strip().lower(): description for name, description in answer.items()}
+            return {team: by_name[team.lower()] for team in chunk if team.lower() in by_name}
+        return {}
+
     def generate_batch(self, teams: List[str]) -> Dict[str, str]:
         """
         Generate descriptions for multiple teams.
-        
+
+        Cached teams are served directly; the rest are described
+        TEAM_DESCRIPTION_BATCH_SIZE teams per LLM call, with up to
+        max_concurrency calls in flight. Teams missing from a batch answer
+        (or from a failed batch) are retried one by one, and get a generic
+        description if that fails too.
+
         Args:
             teams: List of team names
-        
+
         Returns:
             Dictionary of {team_name: description}
         """
         logger.info(f"Generating descriptions for {len(teams)} teams...")
-        
-        descriptions = {}
-        for team in teams:
+
+        cache_keys = {team: self.cache.team_key(team) for team in teams}
+        cached = self.cache.get_many(cache_keys.values())
+        descriptions = {team: cached[key] for team, key in cache_keys.items() if key in cached}
+        pending = list(dict.fromkeys(team for team in teams if team not in descriptions))
+        logger.info(f"  {len(descriptions)} teams served from cache, {len(pending)} to describe")
+
+        batch_size = max(1, settings.TEAM_DESCRIPTION_BATCH_SIZE)
+        chunks = [pending[i:i + batch_size] for i in range(0, len(pending), batch_size)]
+        missing = []
+        if chunks:
+            with ThreadPoolExecutor(max_workers=min(self.max_concurrency, len(chunks))) as executor:
+                futures = {executor.submit(self._describe_chunk, chunk): chunk for chunk in chunks}
+                for future, chunk in futures.items():
+                    try:
+                        answer = future.result()
+                    except Exception as e:
+                        logger.error(f"  ✖ Batch of {len(chunk)} teams failed: {e}")
+                        answer = {}
+                    new_entries = []
+                    for team in chunk:
+                        if answer.get(team):
+                            descriptions[team] = answer[team]
+                            new_entries.append((cache_keys[team], "team", answer[team]))
+                            logger.info(f"  ✓ Generated: {team}")
+                        else:
+                            missing.append(team)
+                    self.cache.set_many(new_entries)
+
+        for team in missing:
             try:
-                description = self.generate(team)
-                descriptions[team] = description
-                logger.info(f"  ✓ Generated: {team}")
-                time.sleep(0.5)  # Rate limiting
+                self.rate_limiter.acquire()
+                descriptions[team] = self.generate(team)
+                logger.info(f"  ✓ Generated individually: {team}")
             except Exception as e:
                 logger.error(f"  ✖ Failed for {team}: {e}")
                 # Provide fallback
                 descriptions[team] = f"{team} Team: Manages {team.lower()} operations."
-        
+
         return descriptions
@@ -45,15 +45,25 @@ class TeamEmbeddingCreator:
         # Generate descriptions
         descriptions = self.description_generator.generate_batch(teams)
         
-        # Create embeddings
+        # Create embeddings (one batched encode for all teams; if the batch
+        # fails, each team is encoded on its own so one bad description
+        # only loses that team)
         team_embeddings = {}
-        for team, description in descriptions.items():
+        if descriptions:
+            team_names = list(descriptions)
             try:
-                embedding = self.embedding_service.encode(description, normalize=True)
-                team_embeddings[team] = embedding
-                logger.info(f"  ✓ Embedded: {team}")
+                vectors = self.embedding_service.encode_batch(
+                    [descriptions[team] for team in team_names], normalize=True
+                )
+                team_embeddings = dict(zip(team_names, vectors))
             except Exception as e:
-                logger.error(f"  ✖ Failed to embed {team}: {e}")
+                logger.warning(f"Batch embedding of {len(team_names)} teams failed ({e}); embedding one by one")
+                for team in team_names:
+                    try:
+                        team_embeddings[team] = self.embedding_service.encode(descriptions[team], normalize=True)
+                        logger.info(f"  ✓ Embedded: {team}")
+                    except Exception as team_error:
+                        logger.error(f"  ✖ Failed to embed {team}: {team_error}")
         
         logger.info(f"Created {len(team_embeddings)} team embeddings")
         return team_embeddings
@@ -40,9 +40,10 @@ class TeamAssignmentManager:
         self,
         company_id: str,
         teams_list: List[str],
-        tables_with_embeddings: List[Tuple[str, np.ndarray]],
+        tables_with_embeddings: List[Tuple[str, np.ndarray]] = None,
         threshold: float = 0.6,
-        max_teams: int = 3
+        max_teams: int = 3,
+        table_matrix: Tuple[np.ndarray, np.ndarray] = None
     ) -> Tuple[Dict[str, List[str]], Dict[str, Dict[str, float]]]:
         """
         Complete team assignment pipeline.
@@ -53,6 +54,8 @@ class TeamAssignmentManager:
             tables_with_embeddings: List of (table_name, embedding) tuples
             threshold: Similarity threshold (default: 0.6)
             max_teams: Maximum teams per table (default: 3)
+            table_matrix: Alternative to tables_with_embeddings: (table_names, embeddings)
+                as returned by VectorRepository.get_embedding_matrix
         
         Returns:
             Tuple of (assignments, confidence_scores):
@@ -61,7 +64,14 @@ class TeamAssignmentManager:
         """
         logger.info(f"Starting team assignment pipeline for company {company_id}")
         logger.info(f"Teams: {teams_list}")
-        logger.info(f"Tables: {len(tables_with_embeddings)}")
+        if table_matrix is None:
+            table_matrix = (
+                [table_name for table_name, _ in tables_with_embeddings],
+                np.vstack([embedding for _, embedding in tables_with_embeddings])
+                if tables_with_embeddings else np.empty((0, 0), dtype=np.float32)
+            )
+        table_names, embeddings = table_matrix
+        logger.info(f"Tables: {len(table_names)}")
         logger.info(f"Threshold: {threshold}")
         
         try:
@@ -71,9 +81,11 @@ class TeamAssignmentManager:
             if not team_embeddings:
                 raise Exception("Failed to create any team embeddings")
             
-            # Step 2: Calculate similarities
-            similarities = self.similarity_calculator.calculate(
-                tables_with_embeddings,
+            # Step 2: Calculate similarities (all teams above threshold are
+            # kept: they are also stored as the audit's confidence_scores)
+            similarities = self.similarity_calculator.calculate_matrix(
+                table_names,
+                embeddings,
                 team_embeddings,
                 threshold
             )
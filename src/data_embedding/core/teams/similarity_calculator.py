@@ -4,6 +4,7 @@ Similarity calculator for team assignment
 import logging
 import numpy as np
 from typing import List, Dict, Tuple
+from config import settings
 
 logger = logging.getLogger(__name__)
 
@@ -11,61 +12,118 @@ logger = logging.getLogger(__name__)
 class SimilarityCalculator:
     """
     Calculates cosine similarity between table and team embeddings.
+
+    Scores are computed as one matrix product per chunk of tables
+    (tables x dim @ dim x teams) instead of a Python loop over pairs;
+    embeddings are expected to be L2-normalized.
     """
-    
+
+    def __init__(self, chunk_size: int = None):
+        """
+        Initialize the calculator.
+
+        Args:
+            chunk_size: Table rows scored per matrix product, bounding the
+                temporary score matrix (default: SIMILARITY_CHUNK_SIZE)
+        """
+        self.chunk_size = chunk_size or settings.SIMILARITY_CHUNK_SIZE
+
     def calculate(
         self,
         table_embeddings: List[Tuple[str, np.ndarray]],
         team_embeddings: Dict[str, np.ndarray],
-        threshold: float = 0.6
+        threshold: float = 0.6,
+        top_k: int = None
     ) -> Dict[str, Dict[str, float]]:
         """
         Calculate similarity scores between tables and teams.
-        
+
         Args:
             table_embeddings: List of (table_name, embedding) tuples
             team_embeddings: Dictionary of {team_name: embedding}
             threshold: Minimum similarity score (0.0 - 1.0)
-        
+            top_k: Keep only the k best teams per table (default: all above threshold)
+
         Returns:
-            Dictionary: {table_name: {team: score}}
+            Dictionary: {table_name: {team: score}}, teams sorted by score (highest first)
         """
-        logger.info(f"Calculating similarities for {len(table_embeddings)} tables (threshold={threshold})...")
-        
+        if not table_embeddings:
+            return {}
+
+        table_names = [table_name for table_name, _ in table_embeddings]
+        table_matrix = np.vstack([embedding for _, embedding in table_embeddings])
+        return self.calculate_matrix(table_names, table_matrix, team_embeddings, threshold, top_k)
+
+    def calculate_matrix(
+        self,
+        table_names: List[str],
+        table_matrix: np.ndarray,
+        team_embeddings: Dict[str, np.ndarray],
+        threshold: float = 0.6,
+        top_k: int = None
+    ) -> Dict[str, Dict[str, float]]:
+        """
+        Calculate similarity scores from a stacked (n_tables, dim) embedding matrix.
+
+        Args:
+            table_names: Table names, one per matrix row
+            table_matrix: Array of shape (n_tables, dim)
+            team_embeddings: Dictionary of {team_name: embedding}
+            threshold: Minimum similarity score (0.0 - 1.0)
+            top_k: Keep only the k best teams per table (default: all above threshold)
+
+        Returns:
+            Dictionary: {table_name: {team: score}}, teams sorted by score (highest first)
+        """
+        logger.info(f"Calculating similarities for {len(table_names)} tables (threshold={threshold})...")
+
+        team_names = list(team_embeddings.keys())
+        if not team_names:
+            return {table_name: {} for table_name in table_names}
+
+        team_matrix = np.vstack([team_embeddings[team] for team in team_names]).astype(np.float32, copy=False)
+        table_matrix = np.asarray(table_matrix, dtype=np.float32)
+        n_teams = len(team_names)
+        k = n_teams if top_k is None else max(1, min(top_k, n_teams))
+
+        fallback = self._assign_fallback_team(team_embeddings)
         results = {}
-        
-        for table_name, table_emb in table_embeddings:
-            similarities = {}
-            
-            # Calculate similarity with each team
-            for team_name, team_emb in team_embeddings.items():
-                similarity = float(np.dot(table_emb, team_emb))
-                
-                if similarity >= threshold:
-                    similarities[team_name] = similarity
-            
-            if similarities:
-                # Sort by score (highest first)
-                sorted_teams = dict(sorted(
-                    similarities.items(),
-                    key=lambda x: x[1],
-                    reverse=True
-                ))
-                results[table_name] = sorted_teams
+
+        for start in range(0, len(table_names), self.chunk_size):
+            scores = table_matrix[start:start + self.chunk_size] @ team_matrix.T
+
+            # Candidate teams per row: the k highest scores (unordered), then ordered
+            if k < n_teams:
+                candidates = np.argpartition(-scores, k - 1, axis=1)[:, :k]
             else:
-                # No teams passed threshold
-                results[table_name] = self._assign_fallback_team(team_embeddings)
-        
+                candidates = np.broadcast_to(np.arange(n_teams), scores.shape)
+            candidate_scores = np.take_along_axis(scores, candidates, axis=1)
+            order = np.argsort(-candidate_scores, axis=1, kind="stable")
+            ranked = np.take_along_axis(candidates, order, axis=1)
+            ranked_scores = np.take_along_axis(candidate_scores, order, axis=1)
+            passed = ranked_scores >= threshold
+
+            for row, table_name in enumerate(table_names[start:start + self.chunk_size]):
+                row_mask = passed[row]
+                if row_mask.any():
+                    results[table_name] = {
+                        team_names[team_idx]: float(score)
+                        for team_idx, score in zip(ranked[row][row_mask], ranked_scores[row][row_mask])
+                    }
+                else:
+                    # No teams passed threshold
+                    results[table_name] = dict(fallback)
+
         logger.info(f"Similarity calculation complete for {len(results)} tables")
         return results
-    
+
     def _assign_fallback_team(self, team_embeddings: Dict[str, np.ndarray]) -> Dict[str, float]:
         """
         Assign a fallback team when no similarities pass threshold.
-        
+
         Args:
             team_embeddings: Available team embeddings
-        
+
         Returns:
             Dictionary with fallback team assignment
         """
@@ -73,6 +131,6 @@ class SimilarityCalculator:
         for fallback_name in ["Shared/General", "Shared", "General"]:
             if fallback_name in team_embeddings:
                 return {fallback_name: 0.0}
-        
+
         # No fallback team available
         return {}
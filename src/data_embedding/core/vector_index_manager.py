@@ -0,0 +1,198 @@
+"""
+ANN index management for client_schema_vectors
+
+Every search filters by company_id and orders by `embedding <-> query`, so
+each company gets its own partial pgvector index
+(`... USING hnsw (embedding vector_l2_ops) WHERE company_id = '<id>'`).
+A tenant's searches then walk a graph of its own tables only, and search
+cost does not grow with the number of tenants. Small companies are served
+by the (company_id, table_name) btree and an exact sort instead.
+
+Searching services tune recall/latency with hnsw.ef_search or
+ivfflat.probes (VECTOR_SEARCH_EF_SEARCH / VECTOR_SEARCH_IVFFLAT_PROBES).
+Searches restricted to some of the company's tables (RBAC, team) scan the
+index iteratively or exactly (VECTOR_SEARCH_ITERATIVE_SCAN), since a filter
+applied after an ANN scan can discard every candidate.
+"""
+import hashlib
+import logging
+import math
+from typing import Optional, Tuple
+import psycopg2
+from config import settings
+
+logger = logging.getLogger(__name__)
+
+VECTOR_TABLE = "client_schema_vectors"
+INDEX_TYPES = ("hnsw", "ivfflat", "none")
+COMPANY_BTREE_INDEX = "client_schema_vectors_company_table_idx"
+
+
+def company_index_name(company_id: str, index_type: str) -> str:
+    """Name of a company's partial ANN index (stable, within the 63-character limit)."""
+    digest = hashlib.md5(company_id.encode("utf-8")).hexdigest()[:16]
+    return f"{VECTOR_TABLE}_{index_type}_{digest}"
+
+
+class VectorIndexManager:
+    """
+    Creates, rebuilds and drops the per-company ANN indexes.
+
+    Indexes are built with CREATE INDEX CONCURRENTLY / REINDEX CONCURRENTLY,
+    so searches and other companies' ingestion are not blocked.
+    """
+
+    def __init__(self, index_type: str = None):
+        """
+        Initialize with database connection details.
+
+        Args:
+            index_type: "hnsw", "ivfflat" or "none" (default: VECTOR_INDEX_TYPE)
+        """
+        self.index_type = (index_type or settings.VECTOR_INDEX_TYPE).lower()
+        if self.index_type not in INDEX_TYPES:
+            raise ValueError(f"Unknown VECTOR_INDEX_TYPE '{self.index_type}'. Expected one of {INDEX_TYPES}")
+
+        self.conn_details = {
+            "host": settings.VECTOR_DB_HOST,
+            "database": settings.VECTOR_DB_NAME,
+            "user": settings.VECTOR_DB_USER,
+            "password": settings.VECTOR_DB_PASSWORD
+        }
+        self._btree_checked = False
+
+    def _get_connection(self):
+        """Create an autocommit connection (CONCURRENTLY cannot run inside a transaction)."""
+        conn = psycopg2.connect(**self.conn_details)
+        conn.autocommit = True
+        return conn
+
+    def _ensure_company_btree(self, cur):
+        """Create the (company_id, table_name) btree used by filters, deletes and small tenants."""
+        if self._btree_checked:
+            return
+        cur.execute(
+            f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {COMPANY_BTREE_INDEX} "
+            f"ON {VECTOR_TABLE} (company_id, table_name)"
+        )
+        self._btree_checked = True
+
+    @staticmethod
+    def _company_rows(cur, company_id: str) -> int:
+        cur.execute(f"SELECT count(*) FROM {VECTOR_TABLE} WHERE company_id = %s", (company_id,))
+        return cur.fetchone()[0]
+
+    @staticmethod
+    def _existing_indexes(cur, company_id: str) -> dict:
+        """Return {index_name: is_valid} for the company's partial ANN indexes of any type."""
+        names = [company_index_name(company_id, index_type) for index_type in INDEX_TYPES if index_type != "none"]
+        cur.execute(
+            """
+            SELECT c.relname, i.indisvalid
+            FROM pg_index i JOIN pg_class c ON c.oid = i.indexrelid
+            WHERE c.relname = ANY(%s)
+            """,
+            (names,)
+        )
+        return dict(cur.fetchall())
+
+    @staticmethod
+    def ivfflat_lists(rows: int) -> int:
+        """pgvector's guideline: rows / 1000 up to 1M rows, sqrt(rows) above."""
+        return max(1, rows // 1000 if rows <= 1_000_000 else int(math.sqrt(rows)))
+
+    def _create_index(self, cur, company_id: str, name: str, rows: int):
+        """Build the company's partial index of self.index_type."""
+        if self.index_type == "hnsw":
+            method = "hnsw"
+            options = f"m = {settings.HNSW_M}, ef_construction = {settings.HNSW_EF_CONSTRUCTION}"
+        else:
+            method = "ivfflat"
+            options = f"lists = {self.ivfflat_lists(rows)}"
+
+        if settings.VECTOR_INDEX_MAINTENANCE_WORK_MEM:
+            cur.execute("SET maintenance_work_mem = %s", (settings.VECTOR_INDEX_MAINTENANCE_WORK_MEM,))
+        cur.execute(
+            f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {name} ON {VECTOR_TABLE} "
+            f"USING {method} (embedding vector_l2_ops) WITH ({options}) "
+            f"WHERE company_id = %s",
+            (company_id,)
+        )
+
+    def maintain(self, company_id: str, changed_fraction: float = 1.0) -> dict:
+        """
+        Bring a company's ANN index in line with its data, then ANALYZE.
+
+        - below VECTOR_INDEX_MIN_ROWS (or VECTOR_INDEX_TYPE=none): no ANN index
+        - no valid index yet: create it
+        - at least VECTOR_INDEX_REBUILD_FRACTION of the rows changed: REINDEX
+          (bulk rewrites leave HNSW graphs bloated and IVFFlat centroids stale)
+
+        Args:
+            company_id: Company UUID
+            changed_fraction: Share of the company's tables written or deleted by the run
+
+        Returns:
+            {"index", "type", "rows", "action"} where action is "created",
+            "rebuilt", "kept", "dropped" or "none"
+        """
+        conn = self._get_connection()
+        try:
+            cur = conn.cursor()
+            self._ensure_company_btree(cur)
+            rows = self._company_rows(cur, company_id)
+            existing = self._existing_indexes(cur, company_id)
+            wanted = None
+            if self.index_type != "none" and rows >= settings.VECTOR_INDEX_MIN_ROWS:
+                wanted = company_index_name(company_id, self.index_type)
+
+            # Drop indexes of another type, invalid leftovers of failed builds,
+            # and indexes of companies that became too small to need one
+            for name, valid in existing.items():
+                if name != wanted or not valid:
+                    cur.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {name}")
+
+            if wanted is None:
+                action = "dropped" if existing else "none"
+            elif existing.get(wanted) is not True:
+                self._create_index(cur, company_id, wanted, rows)
+                action = "created"
+            elif changed_fraction >= settings.VECTOR_INDEX_REBUILD_FRACTION:
+                if settings.VECTOR_INDEX_MAINTENANCE_WORK_MEM:
+                    cur.execute("SET maintenance_work_mem = %s", (settings.VECTOR_INDEX_MAINTENANCE_WORK_MEM,))
+                cur.execute(f"REINDEX INDEX CONCURRENTLY {wanted}")
+                action = "rebuilt"
+            else:
+                action = "kept"
+
+            cur.execute(f"ANALYZE {VECTOR_TABLE}")
+            cur.close()
+        finally:
+            conn.close()
+
+        logger.info(f"Vector index for company {company_id}: {action} ({wanted or 'exact scan'}, {rows} rows)")
+        return {"index": wanted, "type": self.index_type if wanted else None, "rows": rows, "action": action}
+
+    def drop_company_index(self, company_id: str) -> int:
+        """Drop every partial ANN index of a company (e.g. when the company is removed)."""
+        conn = self._get_connection()
+        try:
+            cur = conn.cursor()
+            existing = self._existing_indexes(cur, company_id)
+            for name in existing:
+                cur.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {name}")
+            cur.close()
+            return len(existing)
+        finally:
+            conn.close()
+
+    def get_company_index(self, company_id: str) -> Optional[Tuple[str, bool]]:
+        """Return (index_name, is_valid) of the company's ANN index, or None."""
+        conn = self._get_connection()
+        try:
+            cur = conn.cursor()
+            existing = self._existing_indexes(cur, company_id)
+            cur.close()
+            return next(iter(existing.items()), None)
+        finally:
+            conn.close()
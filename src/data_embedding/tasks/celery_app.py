@@ -3,6 +3,7 @@ Celery application configuration
 """
 import os
 from celery import Celery
+from celery.signals import worker_init
 from dotenv import load_dotenv
 
 # Load environment variables
@@ -31,5 +32,13 @@ celery_app.conf.update(
     task_default_queue='embedding_queue'
 )
 
+
+@worker_init.connect
+def start_metrics_endpoint(**kwargs):
+    """Expose Prometheus metrics from the worker (METRICS_PORT, 0 disables)."""
+    from core.metrics import start_metrics_server
+    start_metrics_server()
+
+
 if __name__ == "__main__":
     celery_app.start()
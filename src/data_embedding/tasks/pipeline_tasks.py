@@ -1,9 +1,12 @@
 """
 Celery tasks for the ingestion pipeline
 """
+import contextlib
 import logging
 import os
 import sys
+from celery import chord
+from celery.exceptions import Ignore, Retry
 from dotenv import load_dotenv
 
 from tasks.celery_app import celery_app
@@ -14,12 +17,18 @@ parent_dir = os.path.dirname(current_dir)
 if parent_dir not in sys.path:
     sys.path.insert(0, parent_dir)
 
+from config import settings
+from core.progress_events import get_event_publisher
+from core.scheduler import RunLeaseKeeper, get_llm_rate_limiter, get_scheduler
+
 # Import the ingestion pipeline
 try:
+    from core import ingestion_pipeline
     from core.ingestion_pipeline import run_ingestion_pipeline
 except ImportError as e:
     logging.error(f"FATAL: Could not import ingestion pipeline. Error: {e}")
-    def run_ingestion_pipeline(company_id: str):
+    ingestion_pipeline = None
+    def run_ingestion_pipeline(company_id: str, full_refresh: bool = False, progress_callback=None, **kwargs):
         raise Exception("Failed to import core.ingestion_pipeline.run_ingestion_pipeline")
 
 # Load environment variables
@@ -30,27 +39,113 @@ logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 
-@celery_app.task(bind=True, name="tasks.run_ingestion_pipeline")
-def run_ingestion_pipeline_task(self, company_id: str) -> dict:
+def _progress_publisher(task, company_id: str, run_id: str):
     """
-    Celery task wrapper for the data ingestion and team assignment pipeline.
-    
-    Args:
-        company_id: The company UUID to process
-    
-    Returns:
-        dict: Task result with status and message
+    Build a progress_callback that publishes stage metrics as PROGRESS metadata
+    and renews the run's scheduler slot.
     """
-    try:
-        self.update_state(
+    scheduler = get_scheduler()
+
+    def publish_progress(snapshot: dict):
+        if scheduler:
+            scheduler.renew_run_slot(company_id, run_id)
+        running = [stage for stage in snapshot["stages"] if stage["status"] == "running"]
+        status = (
+            f"Step {running[-1]['step']}/7 ({running[-1]['stage']}) running for company {company_id}..."
+            if running else f"Pipeline running for company {company_id}..."
+        )
+        task.update_state(
             state='PROGRESS',
-            meta={'status': f'Pipeline started for company {company_id}...'}
+            meta={'status': status, 'company_id': company_id, 'stages': snapshot["stages"]}
         )
-        
-        logger.info(f"Celery task started: Running ingestion pipeline for company {company_id}")
-        
+    return publish_progress
+
+
+def _keep_run_slot(company_id: str, run_id: str):
+    """Renew the run's scheduler slot on a timer for the duration of a with block."""
+    scheduler = get_scheduler()
+    if scheduler is None:
+        return contextlib.nullcontext()
+    return RunLeaseKeeper(scheduler, company_id, run_id)
+
+
+def _publish_event(task_id: str, company_id: str, event_type: str, **data):
+    """Publish a progress event on the task's stream (no-op when PROGRESS_EVENTS_ENABLED is off)."""
+    publisher = get_event_publisher(task_id, company_id)
+    if publisher:
+        publisher.publish(event_type, **data)
+
+
+def _wait_for_run_slot(task, company_id: str, run_id: str):
+    """
+    Return once the run holds a scheduler slot; otherwise re-queue the task
+    (the wait does not count against INGESTION_MAX_RETRIES).
+    """
+    scheduler = get_scheduler()
+    if scheduler is None or scheduler.acquire_run_slot(company_id, run_id, waiting_id=task.request.id):
+        return
+    queue = scheduler.queue_info(task.request.id) or {}
+    logger.info(
+        f"Run {run_id} for company {company_id} waiting for a slot "
+        f"(position {queue.get('queue_position', '?')}, estimated start {queue.get('estimated_start', '?')})"
+    )
+    _publish_event(task.request.id, company_id, "queued", run_id=run_id, **queue)
+    raise task.retry(countdown=settings.INGESTION_SCHEDULER_POLL_SECONDS, max_retries=None)
+
+
+def _finish_run(task, company_id: str, run_id: str):
+    """Release the run's scheduler slot and let new requests for the company start a run."""
+    scheduler = get_scheduler()
+    if scheduler is None:
+        return
+    try:
+        scheduler.finish_run(company_id, run_id, task.request.id)
+    except Exception as e:
+        logger.warning(f"Failed to release scheduler slot of run {run_id}: {e}")
+
+
+def _retry_failure(task, exc: Exception, failures: int, events=None):
+    """
+    Retry a failed attempt, counting it in the task's 'failures' kwarg.
+
+    Args:
+        events: Optional progress event publisher notified of the retry
+    """
+    if events:
+        events(
+            "retrying",
+            attempt=failures + 1,
+            error=str(exc),
+            retry_in_seconds=settings.INGESTION_RETRY_DELAY_SECONDS
+        )
+    kwargs = dict(task.request.kwargs or {}, failures=failures + 1)
+    return task.retry(exc=exc, countdown=settings.INGESTION_RETRY_DELAY_SECONDS, kwargs=kwargs, max_retries=None)
+
+
+def _run_with_retries(task, company_id: str, full_refresh: bool, run_id: str, failures: int) -> dict:
+    """
+    Run (or resume) the pipeline for run_id inside a task.
+
+    Failures are retried up to INGESTION_MAX_RETRIES times; checkpoints make
+    each retry start at the failed stage. While retries remain, team
+    assignment failures are retried too; on the last attempt the run
+    finishes without team assignment, as before.
+    """
+    retries_left = failures < settings.INGESTION_MAX_RETRIES
+    events = get_event_publisher(task.request.id, company_id)
+    try:
+        logger.info(f"Running ingestion pipeline for company {company_id} (run {run_id}, attempt {failures + 1})")
+
         # Execute the pipeline
-        result = run_ingestion_pipeline(company_id)
+        with _keep_run_slot(company_id, run_id):
+            result = run_ingestion_pipeline(
+                company_id,
+                full_refresh=full_refresh,
+                progress_callback=_progress_publisher(task, company_id, run_id),
+                run_id=run_id,
+                strict_team_assignment=retries_left,
+                event_callback=events
+            )
 
         if isinstance(result, dict) and result.get("status") != "success":
             error_message = result.get("message", f"Pipeline failed for company {company_id}")
@@ -60,17 +155,223 @@ def run_ingestion_pipeline_task(self, company_id: str) -> dict:
             raise RuntimeError(f"Pipeline returned no result for company {company_id}")
         
         logger.info(f"Celery task completed: Pipeline finished successfully for company {company_id}")
+        _finish_run(task, company_id, run_id)
         
-        return {
+        task_result = {
             "status": "success",
             "message": result.get("message", f"Pipeline completed successfully for company {company_id}") if isinstance(result, dict) else f"Pipeline completed successfully for company {company_id}",
-            "company_id": company_id
+            "company_id": company_id,
+            "run_id": run_id,
+            "changes": result.get("changes") if isinstance(result, dict) else None,
+            "team_assignment": result.get("team_assignment") if isinstance(result, dict) else None,
+            "metrics": result.get("metrics") if isinstance(result, dict) else None
         }
+        if events:
+            events("completed", **{key: value for key, value in task_result.items() if key != "company_id"})
+        return task_result
     
     except Exception as e:
-        self.update_state(
+        if retries_left:
+            logger.warning(
+                f"Pipeline attempt {failures + 1} failed for company {company_id}: {e}. "
+                f"Retrying from the failed stage in {settings.INGESTION_RETRY_DELAY_SECONDS}s (run {run_id})"
+            )
+            raise _retry_failure(task, e, failures, events)
+
+        _finish_run(task, company_id, run_id)
+        if events:
+            events("failed", run_id=run_id, error=str(e))
+        task.update_state(
             state='FAILURE',
-            meta={'status': str(e), 'company_id': company_id}
+            meta={'status': str(e), 'company_id': company_id, 'run_id': run_id}
         )
         logger.error(f"Pipeline task failed for company {company_id}: {e}", exc_info=True)
         raise
+
+
+@celery_app.task(bind=True, name="tasks.run_ingestion_pipeline", max_retries=None)
+def run_ingestion_pipeline_task(
+    self,
+    company_id: str,
+    full_refresh: bool = False,
+    resume_run_id: str = None,
+    failures: int = 0
+) -> dict:
+    """
+    Celery task wrapper for the data ingestion and team assignment pipeline.
+
+    The run id is this task's id (stable across retries) unless
+    resume_run_id names an earlier failed run whose checkpoints should be reused.
+
+    The run first waits for a scheduler slot (INGESTION_MAX_CONCURRENT_RUNS,
+    INGESTION_MAX_RUNS_PER_COMPANY); while waiting the task is re-queued
+    every INGESTION_SCHEDULER_POLL_SECONDS and /task-status reports its
+    queue position.
+
+    With INGESTION_DISPATCH_MODE="chord", the scan stage runs here and the
+    pending description batches are dispatched as a chord of
+    describe_table_batch tasks; this task is replaced by the chord, whose
+    callback (complete_ingestion_pipeline) produces the final result.
+    
+    Args:
+        company_id: The company UUID to process
+        full_refresh: Re-process every table instead of only changed ones
+        resume_run_id: Run id of a failed run to resume
+        failures: Failed attempts so far (set by retries)
+    
+    Returns:
+        dict: Task result with status, message and per-stage metrics
+
+    While running, the task state is PROGRESS with meta
+    {'status', 'company_id', 'stages'}, where 'stages' holds the timing,
+    item, LLM token and DB row counts of every step started so far.
+    Finer-grained progress (schemas scanned, batches described, rows
+    embedded, teams assigned) is streamed by /task-events/{task_id}.
+    """
+    run_id = resume_run_id or self.request.id
+    _wait_for_run_slot(self, company_id, run_id)
+    self.update_state(
+        state='PROGRESS',
+        meta={'status': f'Pipeline started for company {company_id}...', 'company_id': company_id, 'run_id': run_id}
+    )
+    _publish_event(self.request.id, company_id, "started", run_id=run_id, full_refresh=full_refresh, attempt=failures + 1)
+    logger.info(f"Celery task started: Running ingestion pipeline for company {company_id}")
+
+    if settings.INGESTION_DISPATCH_MODE == "chord" and ingestion_pipeline:
+        try:
+            with _keep_run_slot(company_id, run_id):
+                batches = _dispatch_description_chord(self, company_id, full_refresh, run_id)
+        except (Ignore, Retry):
+            raise
+        except Exception as e:
+            events = get_event_publisher(self.request.id, company_id)
+            if failures < settings.INGESTION_MAX_RETRIES:
+                raise _retry_failure(self, e, failures, events)
+            _finish_run(self, company_id, run_id)
+            if events:
+                events("failed", run_id=run_id, error=str(e))
+            self.update_state(state='FAILURE', meta={'status': str(e), 'company_id': company_id, 'run_id': run_id})
+            raise
+        logger.info(f"No pending description batches for run {run_id} ({batches} total). Continuing inline.")
+
+    return _run_with_retries(self, company_id, full_refresh, run_id, failures)
+
+
+def _dispatch_description_chord(task, company_id: str, full_refresh: bool, run_id: str) -> int:
+    """
+    Run the scan stage and replace the task with a chord over the pending
+    description batches. Returns only when no batch is pending.
+    """
+    checkpoints = ingestion_pipeline.CheckpointRepository()
+    metrics = ingestion_pipeline.PipelineMetrics(
+        company_id,
+        on_update=_progress_publisher(task, company_id, run_id),
+        on_event=get_event_publisher(task.request.id, company_id)
+    )
+    scan = ingestion_pipeline.run_scan_stage(
+        company_id, run_id, full_refresh, metrics, checkpoints, ingestion_pipeline.VectorRepository()
+    )
+    pending = ingestion_pipeline.pending_description_batches(run_id, scan, checkpoints)
+    if pending:
+        logger.info(f"Dispatching {len(pending)} description batches for run {run_id} as a chord")
+        total_batches = len(ingestion_pipeline.description_batches(scan))
+        metrics.event("batches_dispatched", batches=len(pending), total_batches=total_batches)
+        header = [
+            describe_table_batch_task.s(company_id, run_id, index, events_task_id=task.request.id)
+            for index in pending
+        ]
+        callback = complete_ingestion_pipeline_task.s(company_id, full_refresh, run_id)
+        callback.on_error(release_ingestion_run_task.s(company_id, run_id, task.request.id))
+        raise task.replace(chord(header, callback))
+    return len(ingestion_pipeline.description_batches(scan))
+
+
+@celery_app.task(bind=True, name="tasks.describe_table_batch", max_retries=None)
+def describe_table_batch_task(
+    self,
+    company_id: str,
+    run_id: str,
+    index: int,
+    failures: int = 0,
+    events_task_id: str = None
+) -> int:
+    """
+    Describe one checkpointed batch of tables (chord header task).
+
+    The batch is read from the run's scan checkpoint and its descriptions are
+    checkpointed, so the chord callback and any later retry reuse them.
+    A batch_described event is published on the stream of events_task_id
+    (the pipeline task the chord replaced).
+
+    At most INGESTION_MAX_TASKS_PER_COMPANY batches of one company run at
+    once; further batches are re-queued behind other companies' tasks. Every
+    attempt renews the run's scheduler slot, which no pipeline task holds
+    while the chord runs.
+
+    Returns:
+        Number of tables described
+    """
+    scheduler = get_scheduler()
+    if scheduler:
+        scheduler.renew_run_slot(company_id, run_id)
+        if not scheduler.acquire_task_slot(company_id, self.request.id):
+            raise self.retry(countdown=settings.INGESTION_SCHEDULER_POLL_SECONDS, max_retries=None)
+
+    try:
+        checkpoints = ingestion_pipeline.CheckpointRepository()
+        scan = checkpoints.load(run_id, ingestion_pipeline.CHECKPOINT_SCAN)
+        if scan is None:
+            raise RuntimeError(f"No scan checkpoint for run {run_id}")
+
+        if index not in ingestion_pipeline.pending_description_batches(run_id, scan, checkpoints):
+            logger.info(f"Description batch {index} of run {run_id} already checkpointed")
+            return 0
+
+        generator = ingestion_pipeline.DescriptionGenerator(
+            rate_limiter=get_llm_rate_limiter(parallel_tasks=settings.INGESTION_MAX_TASKS_PER_COMPANY)
+        )
+        with _keep_run_slot(company_id, run_id):
+            described = ingestion_pipeline.describe_table_batch(company_id, run_id, scan, index, checkpoints, generator)
+        _publish_event(
+            events_task_id,
+            company_id,
+            "batch_described",
+            batch=index,
+            tables=described,
+            total_batches=len(ingestion_pipeline.description_batches(scan))
+        )
+        return described
+    except Exception as e:
+        if failures < settings.INGESTION_MAX_RETRIES:
+            raise _retry_failure(self, e, failures)
+        raise
+    finally:
+        if scheduler:
+            scheduler.release_task_slot(company_id, self.request.id)
+
+
+@celery_app.task(bind=True, name="tasks.complete_ingestion_pipeline", max_retries=None)
+def complete_ingestion_pipeline_task(
+    self,
+    batch_counts: list,
+    company_id: str,
+    full_refresh: bool,
+    run_id: str,
+    failures: int = 0
+) -> dict:
+    """
+    Chord callback: finish a run whose description batches are checkpointed
+    (merges the batches, then embed/store and team assignment).
+    """
+    logger.info(f"All {len(batch_counts)} description batches of run {run_id} finished ({sum(batch_counts)} tables)")
+    return _run_with_retries(self, company_id, full_refresh, run_id, failures)
+
+
+@celery_app.task(name="tasks.release_ingestion_run")
+def release_ingestion_run_task(request, exc, traceback, company_id: str, run_id: str, task_id: str):
+    """Chord error callback: a description batch failed for good, so free the run's scheduler slot."""
+    logger.error(f"Description batches of run {run_id} failed for company {company_id}: {exc}")
+    _publish_event(task_id, company_id, "failed", run_id=run_id, error=str(exc))
+    scheduler = get_scheduler()
+    if scheduler:
+        scheduler.finish_run(company_id, run_id, task_id)
@@ -0,0 +1,11 @@
+"""
+Pytest configuration: make the service packages (config, core, app, tasks)
+importable when tests are run from the repository root.
+"""
+import os
+import sys
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.dirname(current_dir)
+if parent_dir not in sys.path:
+    sys.path.insert(0, parent_dir)
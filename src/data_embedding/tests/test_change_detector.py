@@ -0,0 +1,56 @@
+"""
+Tests for schema fingerprints and incremental change detection
+"""
+from core.services.change_detector import SchemaChangeDetector, compute_schema_fingerprint
+
+
+def _table(schema_text="id int, name varchar", fks=None, pk="id"):
+    return {"full_name": "dbo.Orders", "schema_text": schema_text, "key_info": {"pk": pk, "fks": fks or []}}
+
+
+FK_CUSTOMER = {"from_column": "customer_id", "to_table": "dbo.Customers", "to_column": "id", "constraint_name": "FK_A"}
+FK_PRODUCT = {"from_column": "product_id", "to_table": "dbo.Products", "to_column": "id", "constraint_name": "FK_B"}
+
+
+class TestSchemaFingerprint:
+    """Fingerprints change with the schema, not with catalog noise"""
+
+    def test_stable(self):
+        assert compute_schema_fingerprint(_table()) == compute_schema_fingerprint(_table())
+
+    def test_column_change(self):
+        assert compute_schema_fingerprint(_table()) != compute_schema_fingerprint(_table("id int, name nvarchar"))
+
+    def test_key_change(self):
+        assert compute_schema_fingerprint(_table()) != compute_schema_fingerprint(_table(pk=None))
+        assert compute_schema_fingerprint(_table()) != compute_schema_fingerprint(_table(fks=[FK_CUSTOMER]))
+
+    def test_fk_order_ignored(self):
+        assert (
+            compute_schema_fingerprint(_table(fks=[FK_CUSTOMER, FK_PRODUCT]))
+            == compute_schema_fingerprint(_table(fks=[FK_PRODUCT, FK_CUSTOMER]))
+        )
+
+    def test_constraint_rename_ignored(self):
+        renamed = {**FK_CUSTOMER, "constraint_name": "FK_Orders_Customers"}
+        assert compute_schema_fingerprint(_table(fks=[FK_CUSTOMER])) == compute_schema_fingerprint(_table(fks=[renamed]))
+
+
+class TestSchemaChangeDetector:
+    """Tables are classified against the stored fingerprints"""
+
+    def test_classification(self):
+        changes = SchemaChangeDetector().detect(
+            {"dbo.A": "1", "dbo.B": "2", "dbo.C": "3", "dbo.D": "4"},
+            {"dbo.A": "1", "dbo.B": "old", "dbo.C": None, "dbo.E": "5"}
+        )
+        assert changes == {
+            "added": ["dbo.D"],
+            "changed": ["dbo.B", "dbo.C"],
+            "unchanged": ["dbo.A"],
+            "dropped": ["dbo.E"],
+        }
+
+    def test_first_run_adds_everything(self):
+        changes = SchemaChangeDetector().detect({"dbo.A": "1"}, {})
+        assert changes["added"] == ["dbo.A"] and not changes["dropped"]
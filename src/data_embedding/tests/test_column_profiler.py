@@ -0,0 +1,39 @@
+"""
+Tests for sampled column profiling
+"""
+import importlib
+import sys
+
+import pytest
+
+from config import settings
+from core.column_profiler import ColumnProfiler, quote_table
+
+
+@pytest.fixture
+def without_pyodbc(monkeypatch):
+    """Import the profiler as on a host without an ODBC driver manager."""
+    monkeypatch.setitem(sys.modules, "pyodbc", None)
+    monkeypatch.delitem(sys.modules, "core.column_profiler")
+    return importlib.import_module("core.column_profiler")
+
+
+class TestColumnProfiler:
+    """Sampling, quoting and the optional pyodbc dependency"""
+
+    def test_imports_without_pyodbc(self, without_pyodbc):
+        assert without_pyodbc.ColumnProfiler("DRIVER=x").profile_tables([]) == {}
+
+    def test_pool_needs_pyodbc(self, without_pyodbc):
+        with pytest.raises(ImportError):
+            without_pyodbc.ConnectionPool("DRIVER=x", size=1)
+
+    def test_sample_clause(self, monkeypatch):
+        monkeypatch.setattr(settings, "PROFILE_FULL_SCAN_ROWS", 1000)
+        monkeypatch.setattr(settings, "PROFILE_SAMPLE_ROWS", 1000)
+        assert ColumnProfiler.sample_clause(500) == ("", 100.0)
+        clause, percent = ColumnProfiler.sample_clause(100_000)
+        assert percent == 1.0 and "TABLESAMPLE SYSTEM (1.0000 PERCENT) REPEATABLE" in clause
+
+    def test_quote_table(self):
+        assert quote_table("dbo.Order]Lines") == "[dbo].[Order]]Lines]"
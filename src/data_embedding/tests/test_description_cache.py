@@ -0,0 +1,95 @@
+"""
+Tests for the content-addressed LLM description cache
+"""
+import pytest
+
+from core.services.description_cache import (
+    DescriptionCache,
+    DiskDescriptionCache,
+    NullDescriptionCache,
+    make_cache_key,
+)
+
+
+def _disk(tmp_path, ttl_seconds=3600, max_entries=100, bypass=False):
+    return DiskDescriptionCache(ttl_seconds, cache_dir=str(tmp_path), max_entries=max_entries, bypass=bypass, model_name="m1")
+
+
+class TestKeys:
+    """Keys depend on content, model and prompt version, not on formatting"""
+
+    def test_whitespace_does_not_change_key(self):
+        assert make_cache_key("table", "a  b\n c", "m1", "v1") == make_cache_key("table", "a b c", "m1", "v1")
+
+    def test_model_and_prompt_version_change_key(self):
+        key = make_cache_key("table", "a b", "m1", "v1")
+        assert key != make_cache_key("table", "a b", "m2", "v1")
+        assert key != make_cache_key("table", "a b", "m1", "v2")
+
+    def test_table_key_includes_profile(self, tmp_path):
+        cache = _disk(tmp_path)
+        table = {"full_name": "dbo.Orders", "schema_text": "id int"}
+        assert cache.table_key(table) != cache.table_key({**table, "profile_text": "id: 10 distinct"})
+
+    def test_team_key_is_case_insensitive(self, tmp_path):
+        cache = _disk(tmp_path)
+        assert cache.team_key("Sales") == cache.team_key("sales")
+
+
+class TestDiskDescriptionCache:
+    """Storage, TTL, LRU eviction and counters"""
+
+    def test_round_trip_and_stats(self, tmp_path):
+        cache = _disk(tmp_path)
+        cache.set_many([("k1", "table", "Orders"), ("k2", "team", "Sales team")])
+        assert cache.get_many(["k1", "k2", "k3"]) == {"k1": "Orders", "k2": "Sales team"}
+        assert cache.stats()["hits"] == 2 and cache.stats()["misses"] == 1 and cache.stats()["writes"] == 2
+
+    def test_shared_between_instances(self, tmp_path):
+        _disk(tmp_path).set("k1", "table", "Orders")
+        assert _disk(tmp_path).get("k1") == "Orders"
+
+    def test_expired_entries_are_missing(self, tmp_path):
+        cache = _disk(tmp_path, ttl_seconds=0)
+        cache.set("k1", "table", "Orders")
+        assert cache.get("k1") is None
+
+    def test_least_recently_used_evicted(self, tmp_path):
+        cache = _disk(tmp_path, max_entries=2)
+        cache.set("k1", "table", "one")
+        cache.set("k2", "table", "two")
+        cache.get("k1")
+        cache.set("k3", "table", "three")
+        assert set(cache.get_many(["k1", "k2", "k3"])) == {"k1", "k3"}
+
+    def test_bypass_skips_lookups_but_stores(self, tmp_path):
+        _disk(tmp_path, bypass=True).set("k1", "table", "Orders")
+        assert _disk(tmp_path, bypass=True).get("k1") is None
+        assert _disk(tmp_path).get("k1") == "Orders"
+
+
+class FailingCache(DescriptionCache):
+    def _get_many(self, keys):
+        raise ConnectionError("cache down")
+
+    def _set_many(self, entries):
+        raise ConnectionError("cache down")
+
+
+class TestDescriptionCache:
+    """Backends implement the storage; failures never break generation"""
+
+    def test_base_class_is_abstract(self):
+        with pytest.raises(TypeError):
+            DescriptionCache(60)
+
+    def test_backend_failures_are_misses(self):
+        cache = FailingCache(60, model_name="m1")
+        cache.set("k1", "table", "Orders")
+        assert cache.get("k1") is None
+        assert cache.stats()["misses"] == 1 and cache.stats()["writes"] == 0
+
+    def test_null_cache_stores_nothing(self):
+        cache = NullDescriptionCache(60, model_name="m1")
+        cache.set("k1", "table", "Orders")
+        assert cache.get("k1") is None
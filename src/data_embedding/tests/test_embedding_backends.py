@@ -0,0 +1,64 @@
+"""
+Tests for the int8 ONNX embedding backend
+"""
+import ast
+import os
+import types
+
+import pytest
+
+from core.services import embedding_backends
+
+SERVER_MODEL = os.path.join(os.path.dirname(__file__), "..", "..", "embedding_server", "core", "model.py")
+
+
+def _function_source(path: str, name: str) -> str:
+    with open(path) as f:
+        tree = ast.parse(f.read())
+    return next(ast.dump(node) for node in tree.body if isinstance(node, ast.FunctionDef) and node.name == name)
+
+
+class FakeSentenceTransformer:
+    """Only the locally exported quantized file exists; the hub has none."""
+
+    loaded = []
+
+    def __init__(self, name_or_path, backend=None, model_kwargs=None):
+        file_name = (model_kwargs or {}).get("file_name")
+        if file_name and not os.path.exists(os.path.join(name_or_path, file_name)):
+            raise OSError(f"{file_name} not found")
+        self.name_or_path = name_or_path
+        self.loaded.append((name_or_path, file_name))
+
+    def save(self, path):
+        os.makedirs(os.path.join(path, "onnx"), exist_ok=True)
+
+
+def fake_export(model, quantization, path):
+    open(os.path.join(path, "onnx", f"model_qint8_{quantization}.onnx"), "w").close()
+
+
+@pytest.fixture
+def sentence_transformers(monkeypatch):
+    FakeSentenceTransformer.loaded = []
+    module = types.ModuleType("sentence_transformers")
+    module.SentenceTransformer = FakeSentenceTransformer
+    module.export_dynamic_quantized_onnx_model = fake_export
+    monkeypatch.setitem(__import__("sys").modules, "sentence_transformers", module)
+    return FakeSentenceTransformer
+
+
+class TestLoadInt8:
+    """One quantized model for the pipeline and the embedding server"""
+
+    def test_same_implementation_as_embedding_server(self):
+        assert _function_source(embedding_backends.__file__, "_load_int8") == _function_source(SERVER_MODEL, "_load_int8")
+
+    def test_exports_once_then_reuses(self, sentence_transformers, tmp_path):
+        model = embedding_backends._load_int8("org/model", "avx512_vnni", str(tmp_path))
+        assert model.name_or_path == str(tmp_path / "org__model")
+        assert os.path.exists(tmp_path / "org__model" / "onnx" / "model_qint8_avx512_vnni.onnx")
+
+        sentence_transformers.loaded = []
+        embedding_backends._load_int8("org/model", "avx512_vnni", str(tmp_path))
+        assert sentence_transformers.loaded == [(str(tmp_path / "org__model"), "onnx/model_qint8_avx512_vnni.onnx")]
@@ -0,0 +1,152 @@
+"""
+Tests for the company join graph and its API routes
+"""
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.routes import join_graph_routes
+from core.join_graph import JoinGraph, _build_edges
+
+
+def _table(name, fks=()):
+    return {"full_name": name, "key_info": {"pk": "id", "fks": list(fks)}}
+
+
+def _fk(to_table, from_column, to_column, constraint_name=None):
+    fk = {"from_column": from_column, "to_table": to_table, "to_column": to_column}
+    if constraint_name:
+        fk["constraint_name"] = constraint_name
+    return fk
+
+
+def _chain(length):
+    """T0 <- T1 <- ... <- T{length-1}, each joined to the previous one."""
+    return JoinGraph.from_tables(
+        [_table("dbo.T0")] + [_table(f"dbo.T{i}", [_fk(f"dbo.T{i - 1}", "prev_id", "id", f"FK_{i}")]) for i in range(1, length)],
+        max_hops=3
+    )
+
+
+class TestBuildEdges:
+    """Foreign keys are grouped into joins by constraint"""
+
+    def test_independent_fks_to_same_table_are_separate_joins(self):
+        edges = _build_edges([
+            _table("dbo.A", [_fk("dbo.B", "b_id", "id", "FK_A_B_id"), _fk("dbo.B", "b_code", "code", "FK_A_B_code")]),
+            _table("dbo.B"),
+        ])
+        assert sorted(edge["columns"] for edge in edges) == [[["b_code", "code"]], [["b_id", "id"]]]
+
+    def test_composite_constraint_is_one_join(self):
+        edges = _build_edges([
+            _table("dbo.Line", [
+                _fk("dbo.Order", "order_no", "order_no", "FK_Line_Order"),
+                _fk("dbo.Order", "region", "region", "FK_Line_Order"),
+            ]),
+        ])
+        assert edges == [{
+            "from_table": "dbo.Line",
+            "to_table": "dbo.Order",
+            "columns": [["order_no", "order_no"], ["region", "region"]],
+        }]
+
+    def test_fks_without_constraint_name_are_separate_joins(self):
+        edges = _build_edges([
+            _table("dbo.A", [_fk("dbo.B", "b_id", "id"), _fk("dbo.B", "b_code", "code")]),
+        ])
+        assert len(edges) == 2
+
+
+class TestJoinGraph:
+    """Path search, stored path rows and the row cap"""
+
+    def test_shortest_path_matches_stored_rows(self):
+        graph = _chain(5)
+        rows = {(a, b): path for a, b, _, path in graph.iter_path_rows()}
+        assert ("dbo.T0", "dbo.T3") in rows
+        assert ("dbo.T0", "dbo.T4") not in rows
+        assert graph.shortest_path("dbo.T0", "dbo.T3") == rows[("dbo.T0", "dbo.T3")]
+
+    def test_shortest_path_reversed_and_bounded(self):
+        graph = _chain(5)
+        path = graph.shortest_path("dbo.T3", "dbo.T1")
+        assert [edge["from_table"] for edge in path] == ["dbo.T3", "dbo.T2"]
+        assert path[0]["columns"] == [["prev_id", "id"]]
+        assert graph.shortest_path("dbo.T0", "dbo.T4") is None
+        assert len(graph.shortest_path("dbo.T0", "dbo.T4", max_hops=4)) == 4
+
+    def test_path_rows_capped_on_hub_tables(self):
+        # Every table references dbo.Users: all pairs are within 2 joins
+        tables = [_table("dbo.Users")] + [
+            _table(f"dbo.T{i}", [_fk("dbo.Users", "created_by", "id", f"FK_T{i}_Users")]) for i in range(20)
+        ]
+        graph = JoinGraph.from_tables(tables, max_hops=3)
+        assert graph.path_hops_within(10_000) == 3
+        assert graph.path_hops_within(20) == 1
+        assert len(list(graph.iter_path_rows(1))) == 20
+
+    def test_connect_through_intermediate_table(self):
+        result = _chain(4).connect(["dbo.T0", "dbo.T2", "dbo.Missing"])
+        assert result["tables"] == ["dbo.T0", "dbo.T1", "dbo.T2"]
+        assert len(result["joins"]) == 2
+        assert result["unreachable"] == ["dbo.Missing"]
+
+
+class FakeJoinGraphRepository:
+    """Serves stored rows of a graph; records which lookups were made."""
+
+    graph = None
+    calls = []
+
+    def load_graph(self, company_id):
+        return self.graph
+
+    def get_path(self, company_id, from_table, to_table):
+        self.calls.append("get_path")
+        return self.graph.shortest_path(from_table, to_table, self.graph.path_hops)
+
+    def get_joinable(self, company_id, table, max_hops=None):
+        self.calls.append("get_joinable")
+        return self.graph.joinable_tables(table, max_hops)
+
+
+@pytest.fixture
+def client(monkeypatch):
+    graph = _chain(6)
+    graph.path_hops = 2
+    FakeJoinGraphRepository.graph = graph
+    FakeJoinGraphRepository.calls = []
+    monkeypatch.setattr(join_graph_routes, "JoinGraphRepository", FakeJoinGraphRepository)
+    join_graph_routes._graphs.clear()
+
+    app = FastAPI()
+    app.include_router(join_graph_routes.router)
+    return TestClient(app)
+
+
+class TestJoinGraphRoutes:
+    """Lookups within path_hops read stored rows; longer ones search in memory"""
+
+    def test_path_within_stored_hops_reads_repository(self, client):
+        response = client.get("/join-graph/c1/path", params={"from_table": "dbo.T0", "to_table": "dbo.T2", "max_hops": 2})
+        assert response.json()["hops"] == 2
+        assert FakeJoinGraphRepository.calls == ["get_path"]
+
+    def test_path_beyond_stored_hops_searches_graph(self, client):
+        response = client.get("/join-graph/c1/path", params={"from_table": "dbo.T0", "to_table": "dbo.T3"})
+        assert response.json()["hops"] == 3
+        assert FakeJoinGraphRepository.calls == []
+
+    def test_stored_path_longer_than_max_hops_is_not_joinable(self, client):
+        response = client.get("/join-graph/c1/path", params={"from_table": "dbo.T0", "to_table": "dbo.T2", "max_hops": 1})
+        assert response.json()["joinable"] is False
+
+    def test_joinable_reads_repository(self, client):
+        response = client.get("/join-graph/c1/joinable", params={"table": "dbo.T0", "max_hops": 2})
+        assert response.json()["joinable"] == {"dbo.T1": 1, "dbo.T2": 2}
+        assert FakeJoinGraphRepository.calls == ["get_joinable"]
+
+    def test_unknown_table(self, client):
+        response = client.get("/join-graph/c1/path", params={"from_table": "dbo.T0", "to_table": "dbo.Nope"})
+        assert response.status_code == 404
@@ -0,0 +1,87 @@
+"""
+Tests for the progress event stream (/task-events/{task_id})
+"""
+import json
+
+import fakeredis
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.routes import progress_routes
+from config import settings
+from core.progress_events import ProgressEventPublisher
+
+
+class FakeAsyncResult:
+    """Celery result of a task that is still PENDING unless listed in `finished`."""
+
+    finished = {}
+
+    def __init__(self, task_id, app=None):
+        self.status = self.finished.get(task_id, "PENDING")
+
+    def ready(self):
+        return self.status != "PENDING"
+
+    def successful(self):
+        return self.status == "SUCCESS"
+
+
+@pytest.fixture
+def server(monkeypatch):
+    server = fakeredis.FakeServer()
+    monkeypatch.setattr(progress_routes, "get_async_events_redis", lambda: fakeredis.FakeAsyncRedis(server=server, decode_responses=True))
+    monkeypatch.setattr(progress_routes, "AsyncResult", FakeAsyncResult)
+    monkeypatch.setattr(progress_routes, "POLL_SECONDS", 0.01)
+    monkeypatch.setattr(settings, "PROGRESS_EVENTS_ENABLED", True)
+    monkeypatch.setattr(settings, "PROGRESS_EVENTS_HEARTBEAT_SECONDS", 0)
+    FakeAsyncResult.finished = {}
+    return server
+
+
+@pytest.fixture
+def client(server):
+    app = FastAPI()
+    app.include_router(progress_routes.router)
+    return TestClient(app)
+
+
+def _events(response):
+    """(type, data) of every SSE message, skipping heartbeat comments."""
+    events = []
+    for message in response.text.split("\n\n"):
+        lines = [line for line in message.splitlines() if not line.startswith(":")]
+        if lines:
+            fields = dict(line.split(": ", 1) for line in lines)
+            events.append((fields["event"], json.loads(fields["data"])))
+    return events
+
+
+class TestTaskEvents:
+    """Replay, resume and the end of the stream"""
+
+    def test_replays_history_until_terminal_event(self, client, server):
+        publisher = ProgressEventPublisher("t1", "c1", fakeredis.FakeRedis(server=server, decode_responses=True))
+        publisher("started")
+        publisher("stage_started", stage="scan")
+        publisher("completed")
+        response = client.get("/task-events/t1")
+        assert [event_type for event_type, _ in _events(response)] == ["started", "stage_started", "completed"]
+
+    def test_resumes_after_last_event_id(self, client, server):
+        publisher = ProgressEventPublisher("t1", "c1", fakeredis.FakeRedis(server=server, decode_responses=True))
+        publisher("started")
+        publisher("completed")
+        response = client.get("/task-events/t1", headers={"Last-Event-ID": "1"})
+        assert [data["seq"] for _, data in _events(response)] == [2]
+
+    def test_finished_task_without_history(self, client):
+        FakeAsyncResult.finished = {"t1": "FAILURE"}
+        response = client.get("/task-events/t1")
+        assert [(event_type, data["status"]) for event_type, data in _events(response)] == [("failed", "FAILURE")]
+
+    def test_unknown_task_ends_after_idle_timeout(self, client, monkeypatch):
+        monkeypatch.setattr(settings, "PROGRESS_EVENTS_IDLE_TIMEOUT_SECONDS", 0)
+        response = client.get("/task-events/never-submitted")
+        assert [(event_type, data["status"]) for event_type, data in _events(response)] == [("idle_timeout", "PENDING")]
@@ -0,0 +1,120 @@
+"""
+Tests for the multi-tenant ingestion scheduler (Lua slot scripts run on fakeredis)
+"""
+import time
+
+import fakeredis
+import pytest
+
+from config import settings
+from core.scheduler import (
+    RUN_SLOTS_KEY,
+    WAITING_KEY,
+    WAITING_LEASES_KEY,
+    IngestionScheduler,
+    RunConflictError,
+    RunLeaseKeeper,
+)
+
+
+@pytest.fixture
+def scheduler(monkeypatch):
+    monkeypatch.setattr(settings, "INGESTION_MAX_CONCURRENT_RUNS", 2)
+    monkeypatch.setattr(settings, "INGESTION_MAX_RUNS_PER_COMPANY", 1)
+    monkeypatch.setattr(settings, "INGESTION_SLOT_LEASE_SECONDS", 60)
+    monkeypatch.setattr(settings, "INGESTION_WAITING_LEASE_SECONDS", 60)
+    return IngestionScheduler(fakeredis.FakeRedis(decode_responses=True))
+
+
+def _expire(scheduler, company_id, run_id):
+    """Backdate a run's lease as if it had not been renewed in time."""
+    scheduler.redis.zadd(RUN_SLOTS_KEY, {f"{company_id}|{run_id}": time.time() - 1})
+
+
+class TestRunSlots:
+    """Global and per-company caps, lease renewal"""
+
+    def test_caps(self, scheduler):
+        assert scheduler.acquire_run_slot("a", "run1")
+        assert not scheduler.acquire_run_slot("a", "run2")
+        assert scheduler.acquire_run_slot("b", "run3")
+        assert not scheduler.acquire_run_slot("c", "run4")
+
+    def test_waiting_requests_admitted_in_order(self, scheduler):
+        scheduler.submit("a", lambda task_id: None, "task-a")
+        scheduler.submit("b", lambda task_id: None, "task-b")
+        scheduler.acquire_run_slot("x", "run-x")
+        assert not scheduler.acquire_run_slot("b", "task-b", waiting_id="task-b")
+        assert scheduler.acquire_run_slot("a", "task-a", waiting_id="task-a")
+
+    def test_dead_head_of_queue_is_dropped(self, scheduler):
+        # task-a's message was lost: it never polls, and its lease runs out
+        scheduler.submit("a", lambda task_id: None, "task-a")
+        scheduler.submit("b", lambda task_id: None, "task-b")
+        scheduler.acquire_run_slot("x", "run-x")
+        scheduler.redis.zadd(WAITING_LEASES_KEY, {"task-a": time.time() - 1})
+        assert scheduler.acquire_run_slot("b", "task-b", waiting_id="task-b")
+        assert scheduler.redis.zcard(WAITING_KEY) == 0
+        assert scheduler.queue_info("task-a") is None
+
+    def test_polling_keeps_place_in_queue(self, scheduler):
+        scheduler.submit("a", lambda task_id: None, "task-a")
+        scheduler.acquire_run_slot("x", "run-x")
+        scheduler.acquire_run_slot("y", "run-y")
+        scheduler.redis.zadd(WAITING_LEASES_KEY, {"task-a": time.time() + 1})
+        assert not scheduler.acquire_run_slot("a", "task-a", waiting_id="task-a")
+        assert scheduler.redis.zscore(WAITING_LEASES_KEY, "task-a") > time.time() + 30
+        assert scheduler.queue_info("task-a")["queue_position"] == 1
+
+    def test_renew_extends_live_lease(self, scheduler):
+        scheduler.acquire_run_slot("a", "run1")
+        before = scheduler.redis.zscore(RUN_SLOTS_KEY, "a|run1")
+        time.sleep(0.01)
+        assert scheduler.renew_run_slot("a", "run1")
+        assert scheduler.redis.zscore(RUN_SLOTS_KEY, "a|run1") > before
+
+    def test_renew_reacquires_expired_lease_when_free(self, scheduler):
+        scheduler.acquire_run_slot("a", "run1")
+        _expire(scheduler, "a", "run1")
+        assert scheduler.renew_run_slot("a", "run1")
+        assert scheduler.redis.zscore(RUN_SLOTS_KEY, "a|run1") > time.time()
+
+    def test_renew_never_exceeds_cap(self, scheduler):
+        scheduler.acquire_run_slot("a", "run1")
+        _expire(scheduler, "a", "run1")
+        # The expired slot is reclaimed by two other companies
+        assert scheduler.acquire_run_slot("b", "run2")
+        assert scheduler.acquire_run_slot("c", "run3")
+        assert not scheduler.renew_run_slot("a", "run1")
+        assert scheduler.redis.zcard(RUN_SLOTS_KEY) == 2
+
+    def test_lease_keeper_renews_on_a_timer(self, scheduler):
+        scheduler.acquire_run_slot("a", "run1")
+        _expire(scheduler, "a", "run1")
+        with RunLeaseKeeper(scheduler, "a", "run1", interval=0.01):
+            _expire(scheduler, "a", "run1")
+            time.sleep(0.1)
+            assert scheduler.redis.zscore(RUN_SLOTS_KEY, "a|run1") > time.time()
+
+
+class TestSubmit:
+    """Only identical requests are coalesced"""
+
+    def test_identical_request_is_coalesced(self, scheduler):
+        sent = []
+        request = {"full_refresh": False, "resume_run_id": None}
+        assert scheduler.submit("a", sent.append, "t1", request) == ("t1", False)
+        assert scheduler.submit("a", sent.append, "t2", dict(request)) == ("t1", True)
+        assert sent == ["t1"]
+
+    def test_different_request_conflicts(self, scheduler):
+        scheduler.submit("a", lambda task_id: None, "t1", {"full_refresh": False, "resume_run_id": None})
+        with pytest.raises(RunConflictError) as error:
+            scheduler.submit("a", lambda task_id: None, "t2", {"full_refresh": True, "resume_run_id": None})
+        assert error.value.task_id == "t1"
+
+    def test_new_run_after_finish(self, scheduler):
+        scheduler.submit("a", lambda task_id: None, "t1", {"full_refresh": False})
+        scheduler.acquire_run_slot("a", "t1", waiting_id="t1")
+        scheduler.finish_run("a", "t1", "t1")
+        assert scheduler.submit("a", lambda task_id: None, "t2", {"full_refresh": True}) == ("t2", False)
@@ -0,0 +1,109 @@
+"""
+Tests for team embeddings and team assignment scoring
+"""
+import numpy as np
+
+from core.teams.embedding_creator import TeamEmbeddingCreator
+from core.teams.manager import TeamAssignmentManager
+from core.teams.similarity_calculator import SimilarityCalculator
+
+
+class FakeDescriptions:
+    def generate_batch(self, teams):
+        return {team: f"{team} description" for team in teams}
+
+
+class FakeEmbeddingService:
+    """encode_batch fails; encode fails only for the 'Broken' team."""
+
+    def __init__(self, batch_fails: bool):
+        self.batch_fails = batch_fails
+
+    def encode_batch(self, texts, normalize=True):
+        if self.batch_fails:
+            raise ValueError("batch rejected")
+        return [np.ones(3) for _ in texts]
+
+    def encode(self, text, normalize=True):
+        if text.startswith("Broken"):
+            raise ValueError("bad description")
+        return np.ones(3)
+
+
+class TestTeamEmbeddingCreator:
+    """One batched encode, with a per-team fallback"""
+
+    def test_batch(self):
+        creator = TeamEmbeddingCreator(FakeEmbeddingService(batch_fails=False), FakeDescriptions())
+        assert set(creator.create(["Sales", "HR"])) == {"Sales", "HR"}
+
+    def test_batch_failure_falls_back_to_single_teams(self):
+        creator = TeamEmbeddingCreator(FakeEmbeddingService(batch_fails=True), FakeDescriptions())
+        assert set(creator.create(["Sales", "Broken", "HR"])) == {"Sales", "HR"}
+
+
+def _unit(*values):
+    vector = np.array(values, dtype=np.float32)
+    return vector / np.linalg.norm(vector)
+
+
+TEAMS = {
+    "Sales": _unit(1, 0, 0),
+    "Finance": _unit(1, 1, 0),
+    "HR": _unit(0, 1, 0),
+    "Shared": _unit(0, 0, 1),
+}
+
+
+def _pairwise(table_embeddings, team_embeddings, threshold):
+    """Reference scores: one dot product per (table, team) pair."""
+    results = {}
+    for table_name, embedding in table_embeddings:
+        scores = {team: float(np.dot(embedding, vector)) for team, vector in team_embeddings.items()}
+        results[table_name] = {
+            team: score for team, score in sorted(scores.items(), key=lambda item: -item[1]) if score >= threshold
+        }
+    return results
+
+
+class TestSimilarityCalculator:
+    """Chunked matrix scoring matches pairwise scoring"""
+
+    def test_matches_pairwise_scores_across_chunks(self):
+        rng = np.random.default_rng(0)
+        tables = [(f"dbo.T{i}", _unit(*rng.random(3))) for i in range(7)]
+        results = SimilarityCalculator(chunk_size=3).calculate(tables, TEAMS, threshold=0.5)
+        expected = _pairwise(tables, TEAMS, threshold=0.5)
+        assert list(results) == list(expected)
+        for table_name, scores in expected.items():
+            assert list(results[table_name]) == list(scores)
+            assert np.allclose(list(results[table_name].values()), list(scores.values()), atol=1e-6)
+
+    def test_top_k(self):
+        results = SimilarityCalculator().calculate([("dbo.Orders", _unit(1, 0.2, 0))], TEAMS, threshold=0.1, top_k=1)
+        assert list(results["dbo.Orders"]) == ["Sales"]
+
+    def test_fallback_team_below_threshold(self):
+        results = SimilarityCalculator().calculate([("dbo.Misc", _unit(0, 0, 1))], {"Sales": TEAMS["Sales"], "Shared": TEAMS["HR"]}, threshold=0.5)
+        assert results["dbo.Misc"] == {"Shared": 0.0}
+
+
+class FixedTeamEmbeddings:
+    def create(self, teams):
+        return {team: TEAMS[team] for team in teams}
+
+
+class TestTeamAssignmentManager:
+    """Assignments are capped at max_teams; audit scores are not"""
+
+    def test_confidence_scores_keep_all_teams_above_threshold(self):
+        manager = TeamAssignmentManager(embedding_creator=FixedTeamEmbeddings())
+        assignments, scores = manager.run_assignment_pipeline(
+            "c1",
+            ["Sales", "Finance", "HR", "Shared"],
+            [("dbo.Orders", _unit(1, 0.5, 0.1))],
+            threshold=0.1,
+            max_teams=2
+        )
+        assert assignments["dbo.Orders"] == ["Finance", "Sales"]
+        assert list(scores["dbo.Orders"]) == ["Finance", "Sales", "HR"]
@@ -0,0 +1,82 @@
+"""
+Tests for binary pgvector reads in VectorRepository
+"""
+import struct
+
+import numpy as np
+import pytest
+
+from core.repositories import vector_repository
+from core.repositories.vector_repository import VectorRepository
+
+
+def vector_send(values):
+    """pgvector's binary output: int16 dim, int16 unused, dim big-endian float4."""
+    return struct.pack(f">hh{len(values)}f", len(values), 0, *values)
+
+
+class FakeNamedCursor:
+    def __init__(self, rows):
+        self.rows = list(rows)
+        self.itersize = None
+        self.fetch_sizes = []
+
+    def execute(self, query, params):
+        self.query = query
+
+    def fetchmany(self, size):
+        self.fetch_sizes.append(size)
+        batch, self.rows = self.rows[:size], self.rows[size:]
+        return batch
+
+    def close(self):
+        pass
+
+
+class FakeConnection:
+    def __init__(self, cursor):
+        self._cursor = cursor
+
+    def cursor(self, name=None):
+        self.cursor_name = name
+        return self._cursor
+
+    def commit(self):
+        pass
+
+
+class TestDecodeVectors:
+    """Binary payloads decode to one native float32 matrix"""
+
+    def test_matches_values(self):
+        rows = [[0.5, -1.25, 3.0], [1e-3, 0.0, -2.5]]
+        matrix = VectorRepository._decode_vectors([vector_send(row) for row in rows])
+        assert matrix.dtype == np.float32 and matrix.flags["C_CONTIGUOUS"]
+        np.testing.assert_array_equal(matrix, np.array(rows, dtype=np.float32))
+
+    def test_empty(self):
+        assert VectorRepository._decode_vectors([]).shape == (0, 0)
+
+    def test_mixed_dimensions_rejected(self):
+        with pytest.raises(ValueError):
+            VectorRepository._decode_vectors([vector_send([1.0, 2.0]), vector_send([1.0, 2.0, 3.0])])
+
+
+class TestGetEmbeddingMatrix:
+    """Rows are streamed through a named cursor in EMBEDDING_FETCH_SIZE batches"""
+
+    def test_reads_in_batches(self, monkeypatch):
+        monkeypatch.setattr(vector_repository.settings, "EMBEDDING_FETCH_SIZE", 2)
+        monkeypatch.setattr(vector_repository, "release_connection", lambda conn: None)
+        rng = np.random.default_rng(0)
+        vectors = rng.random((5, 4), dtype=np.float32)
+        cursor = FakeNamedCursor((f"dbo.T{i}", memoryview(vector_send(vector))) for i, vector in enumerate(vectors))
+        connection = FakeConnection(cursor)
+        repo = VectorRepository(embedding_service=object())
+        monkeypatch.setattr(repo, "_get_connection", lambda: connection)
+
+        table_names, embeddings = repo.get_embedding_matrix("0000-1111")
+        assert table_names.tolist() == [f"dbo.T{i}" for i in range(5)]
+        np.testing.assert_array_equal(embeddings, vectors)
+        assert connection.cursor_name == "embeddings_0000_1111"
+        assert cursor.fetch_sizes == [2, 2, 2, 2]
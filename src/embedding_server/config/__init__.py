@@ -0,0 +1 @@
+"""Configuration package for the embedding server."""
@@ -0,0 +1,39 @@
+"""Environment configuration and settings for the embedding server."""
+
+import os
+from dotenv import load_dotenv
+
+load_dotenv()
+
+# =============================================================================
+# Embedding Model
+# =============================================================================
+# Must match the model the stored client_schema_vectors were built with
+EMBEDDING_MODEL_NAME = os.getenv("EMBEDDING_MODEL_NAME", "BAAI/bge-small-en-v1.5")
+EMBEDDING_DEVICE = os.getenv("EMBEDDING_DEVICE", "cpu")
+
+# Inference backend: "torch", "onnx" or "onnx-int8" (ONNX backends run on CPU)
+EMBEDDING_BACKEND = os.getenv("EMBEDDING_BACKEND", "torch")
+
+# Quantization target for "onnx-int8" ("avx2", "avx512", "avx512_vnni" or "arm64")
+# and where locally exported quantized models are kept
+EMBEDDING_ONNX_QUANTIZATION = os.getenv("EMBEDDING_ONNX_QUANTIZATION", "avx2")
+EMBEDDING_ONNX_CACHE_DIR = os.getenv("EMBEDDING_ONNX_CACHE_DIR", ".cache/onnx")
+
+# =============================================================================
+# Batching
+# =============================================================================
+# Texts encoded per model forward pass
+EMBED_MAX_BATCH_SIZE = int(os.getenv("EMBED_MAX_BATCH_SIZE", "64"))
+
+# How long the batcher waits for more requests before encoding a partial batch
+EMBED_MAX_WAIT_MS = float(os.getenv("EMBED_MAX_WAIT_MS", "5"))
+
+# Largest number of texts accepted in a single /embed request
+EMBED_MAX_TEXTS_PER_REQUEST = int(os.getenv("EMBED_MAX_TEXTS_PER_REQUEST", "2048"))
+
+# =============================================================================
+# Cache
+# =============================================================================
+# Recently computed embeddings kept in memory (0 disables the cache)
+EMBED_CACHE_SIZE = int(os.getenv("EMBED_CACHE_SIZE", "10000"))
@@ -0,0 +1 @@
+"""Core package for the embedding server (model loading and request batching)."""
@@ -0,0 +1,202 @@
+"""Micro-batching, request coalescing and LRU caching for embedding requests."""
+
+import asyncio
+import logging
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Hashable, List, Optional, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# (normalize, text)
+CacheKey = Tuple[bool, str]
+
+
+class LRUCache:
+    """Small least-recently-used map of embeddings. Only used from the event loop."""
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Hashable, np.ndarray]" = OrderedDict()
+
+    def get(self, key: Hashable) -> Optional[np.ndarray]:
+        vector = self._entries.get(key)
+        if vector is not None:
+            self._entries.move_to_end(key)
+        return vector
+
+    def put(self, key: Hashable, vector: np.ndarray):
+        if self.max_entries <= 0:
+            return
+        self._entries[key] = vector
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class EmbeddingBatcher:
+    """
+    Collects texts from concurrent requests into model-sized batches.
+
+    Texts already in the LRU cache are answered immediately. A text that is
+    already queued or being encoded for another request is not queued again;
+    both requests wait on the same future. Everything else is queued and
+    encoded in batches of up to `max_batch_size`, waiting at most
+    `max_wait_ms` for a batch to fill. Encoding runs on a single worker thread
+    so the event loop keeps accepting requests.
+    """
+
+    def __init__(
+        self,
+        encode_fn: Callable[[List[str], bool], np.ndarray],
+        max_batch_size: int,
+        max_wait_ms: float,
+        cache_size: int
+    ):
+        """
+        Args:
+            encode_fn: Function (texts, normalize) -> array of shape (len(texts), dim)
+            max_batch_size: Texts per encode_fn call
+            max_wait_ms: Longest time to hold a partial batch open
+            cache_size: Embeddings kept in the LRU cache
+        """
+        self._encode_fn = encode_fn
+        self.max_batch_size = max(1, max_batch_size)
+        self.max_wait = max_wait_ms / 1000
+        self.cache = LRUCache(cache_size)
+        self._pending: Dict[CacheKey, asyncio.Future] = {}
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker: Optional[asyncio.Task] = None
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="encode")
+        self.counters = {
+            "requests": 0,
+            "texts": 0,
+            "cache_hits": 0,
+            "coalesced": 0,
+            "encoded": 0,
+            "batches": 0,
+        }
+
+    async def start(self):
+        """Start the background batching loop (call from the running event loop)."""
+        self._queue = asyncio.Queue()
+        self._worker = asyncio.create_task(self._run())
+
+    async def stop(self):
+        """Stop the batching loop and release the encoder thread."""
+        if self._worker:
+            self._worker.cancel()
+            try:
+                await self._worker
+            except asyncio.CancelledError:
+                pass
+        self._executor.shutdown(wait=False)
+
+    async def embed(self, texts: List[str], normalize: bool = True) -> List[np.ndarray]:
+        """
+        Embed texts, sharing work with other in-flight requests.
+
+        Args:
+            texts: Input texts
+            normalize: Whether to L2-normalize the embeddings
+
+        Returns:
+            One embedding per input text, in input order
+        """
+        loop = asyncio.get_running_loop()
+        self.counters["requests"] += 1
+        self.counters["texts"] += len(texts)
+
+        vectors: List[Optional[np.ndarray]] = [None] * len(texts)
+        waiting: Dict[int, asyncio.Future] = {}
+
+        for index, text in enumerate(texts):
+            key = (normalize, text)
+            cached = self.cache.get(key)
+            if cached is not None:
+                self.counters["cache_hits"] += 1
+                vectors[index] = cached
+                continue
+
+            future = self._pending.get(key)
+            if future is None:
+                future = loop.create_future()
+                self._pending[key] = future
+                self._queue.put_nowait(key)
+            else:
+                self.counters["coalesced"] += 1
+            waiting[index] = future
+
+        if waiting:
+            # Shield the shared futures: a client disconnecting must not cancel
+            # work other requests are waiting on.
+            results = await asyncio.gather(*(asyncio.shield(future) for future in waiting.values()))
+            for index, vector in zip(waiting, results):
+                vectors[index] = vector
+
+        return vectors
+
+    def stats(self) -> dict:
+        """Request, cache and batching counters since startup."""
+        return {
+            **self.counters,
+            "cache_entries": len(self.cache),
+            "queued": self._queue.qsize() if self._queue else 0,
+        }
+
+    async def _run(self):
+        """Pull queued texts into batches and encode them."""
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._queue.get()]
+            deadline = loop.time() + self.max_wait
+
+            while len(batch) < self.max_batch_size:
+                if not self._queue.empty():
+                    batch.append(self._queue.get_nowait())
+                    continue
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+
+            await self._encode(batch)
+
+    async def _encode(self, batch: List[CacheKey]):
+        """Encode one batch and resolve the futures waiting on it."""
+        loop = asyncio.get_running_loop()
+
+        for normalize in (True, False):
+            keys = [key for key in batch if key[0] == normalize]
+            if not keys:
+                continue
+
+            try:
+                matrix = await loop.run_in_executor(
+                    self._executor, self._encode_fn, [text for _, text in keys], normalize
+                )
+            except Exception as e:
+                logger.error(f"Failed to encode batch of {len(keys)} texts: {e}")
+                for key in keys:
+                    future = self._pending.pop(key, None)
+                    if future and not future.done():
+                        future.set_exception(e)
+                continue
+
+            self.counters["batches"] += 1
+            self.counters["encoded"] += len(keys)
+            for key, vector in zip(keys, matrix):
+                # Copy so a cached row does not keep its whole batch matrix alive
+                vector = vector.copy()
+                self.cache.put(key, vector)
+                future = self._pending.pop(key, None)
+                if future and not future.done():
+                    future.set_result(vector)
@@ -0,0 +1,81 @@
+"""Embedding model loader."""
+
+import logging
+import os
+from typing import List
+
+import numpy as np
+from sentence_transformers import SentenceTransformer
+
+from config.settings import (
+    EMBEDDING_BACKEND,
+    EMBEDDING_DEVICE,
+    EMBEDDING_MODEL_NAME,
+    EMBEDDING_ONNX_CACHE_DIR,
+    EMBEDDING_ONNX_QUANTIZATION,
+    EMBED_MAX_BATCH_SIZE,
+)
+
+logger = logging.getLogger(__name__)
+
+
+def _load_int8(model_name: str, quantization: str, cache_dir: str):
+    """
+    Load the int8-quantized ONNX model, exporting it on first use.
+
+    The quantized file (onnx/model_qint8_<quantization>.onnx) is looked up in
+    the model repository first; if it is not published there it is produced
+    once from the ONNX export and stored under cache_dir.
+
+    Kept identical in data_embedding/core/services/embedding_backends.py and
+    embedding_server/core/model.py (tests/test_embedding_backends.py checks
+    it): both services must serve the same quantized model, and each is built
+    from its own Docker context, so neither can import the other.
+    """
+    from sentence_transformers import SentenceTransformer, export_dynamic_quantized_onnx_model
+
+    file_name = f"onnx/model_qint8_{quantization}.onnx"
+    try:
+        return SentenceTransformer(model_name, backend="onnx", model_kwargs={"file_name": file_name})
+    except Exception as e:
+        logger.info(f"No published {file_name} for {model_name} ({e}). Exporting a local copy...")
+
+    export_dir = os.path.join(cache_dir, model_name.replace("/", "__"))
+    if not os.path.exists(os.path.join(export_dir, file_name)):
+        onnx_model = SentenceTransformer(model_name, backend="onnx")
+        onnx_model.save(export_dir)
+        export_dynamic_quantized_onnx_model(onnx_model, quantization, export_dir)
+    return SentenceTransformer(export_dir, backend="onnx", model_kwargs={"file_name": file_name})
+
+
+class EmbeddingModel:
+    """The single SentenceTransformer instance served by this process."""
+
+    def __init__(
+        self,
+        model_name: str = EMBEDDING_MODEL_NAME,
+        device: str = EMBEDDING_DEVICE,
+        backend: str = EMBEDDING_BACKEND
+    ):
+        logger.info(f"Loading embedding model: {model_name} (backend={backend}, device={device})")
+        self.model_name = model_name
+        self.backend = backend
+        if backend == "torch":
+            self.model = SentenceTransformer(model_name, device=device)
+        elif backend == "onnx":
+            self.model = SentenceTransformer(model_name, backend="onnx")
+        elif backend == "onnx-int8":
+            self.model = _load_int8(model_name, EMBEDDING_ONNX_QUANTIZATION, EMBEDDING_ONNX_CACHE_DIR)
+        else:
+            raise ValueError(f"Unknown EMBEDDING_BACKEND '{backend}'. Expected torch, onnx or onnx-int8")
+        self.dimension = self.model.get_sentence_embedding_dimension()
+        logger.info(f"Embedding model loaded (dim={self.dimension})")
+
+    def encode(self, texts: List[str], normalize: bool = True) -> np.ndarray:
+        """Encode texts into a float32 array of shape (len(texts), dimension)."""
+        return self.model.encode(
+            texts,
+            batch_size=EMBED_MAX_BATCH_SIZE,
+            normalize_embeddings=normalize,
+            convert_to_numpy=True
+        ).astype(np.float32, copy=False)
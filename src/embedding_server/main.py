@@ -0,0 +1,120 @@
+"""
+Embedding server: one shared embedding model for every RecoMind service.
+
+The ingestion worker, copilot and reporting system call POST /embed instead
+of each loading their own copy of the model.
+"""
+import base64
+import logging
+from typing import List, Literal
+
+import numpy as np
+from fastapi import FastAPI, HTTPException
+from pydantic import BaseModel, Field
+
+from config.settings import (
+    EMBED_CACHE_SIZE,
+    EMBED_MAX_BATCH_SIZE,
+    EMBED_MAX_TEXTS_PER_REQUEST,
+    EMBED_MAX_WAIT_MS,
+)
+from core.batcher import EmbeddingBatcher
+from core.model import EmbeddingModel
+
+# Logging setup
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s - %(levelname)s - %(message)s"
+)
+logger = logging.getLogger(__name__)
+
+app = FastAPI(
+    title="RecoMind Embedding Server",
+    description="Shared sentence-embedding model with request batching and caching.",
+    version="1.0.0"
+)
+
+model: EmbeddingModel = None
+batcher: EmbeddingBatcher = None
+
+
+class EmbedRequest(BaseModel):
+    """Request body for /embed."""
+    texts: List[str] = Field(..., description="Texts to embed")
+    normalize: bool = Field(True, description="L2-normalize the embeddings")
+    encoding_format: Literal["float", "base64"] = Field(
+        "float",
+        description="'float' for JSON lists, 'base64' for little-endian float32 rows (smaller, faster to parse)"
+    )
+
+
+class EmbedResponse(BaseModel):
+    """Response body for /embed."""
+    model: str
+    dimension: int
+    count: int
+    embeddings: List[List[float]] | None = None
+    embeddings_b64: str | None = None
+
+
+@app.on_event("startup")
+async def startup_event():
+    global model, batcher
+    logger.info("RecoMind Embedding Server starting up...")
+    model = EmbeddingModel()
+    batcher = EmbeddingBatcher(
+        model.encode,
+        max_batch_size=EMBED_MAX_BATCH_SIZE,
+        max_wait_ms=EMBED_MAX_WAIT_MS,
+        cache_size=EMBED_CACHE_SIZE
+    )
+    await batcher.start()
+
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    logger.info("RecoMind Embedding Server shutting down...")
+    if batcher:
+        await batcher.stop()
+
+
+@app.post("/embed", response_model=EmbedResponse, response_model_exclude_none=True)
+async def embed(request: EmbedRequest):
+    """Embed a list of texts with the shared model."""
+    if len(request.texts) > EMBED_MAX_TEXTS_PER_REQUEST:
+        raise HTTPException(
+            status_code=413,
+            detail=f"At most {EMBED_MAX_TEXTS_PER_REQUEST} texts per request (got {len(request.texts)})"
+        )
+
+    try:
+        vectors = await batcher.embed(request.texts, normalize=request.normalize)
+    except Exception as e:
+        logger.error(f"Embedding failed: {e}", exc_info=True)
+        raise HTTPException(status_code=500, detail=f"Embedding failed: {e}")
+
+    response = EmbedResponse(model=model.model_name, dimension=model.dimension, count=len(vectors))
+    if request.encoding_format == "base64":
+        matrix = np.vstack(vectors) if vectors else np.empty((0, model.dimension), dtype=np.float32)
+        response.embeddings_b64 = base64.b64encode(matrix.astype("<f4").tobytes()).decode("ascii")
+    else:
+        response.embeddings = [vector.tolist() for vector in vectors]
+    return response
+
+
+@app.get("/health")
+async def health_check():
+    """Liveness check; also reports the loaded model."""
+    return {
+        "status": "healthy",
+        "service": "embedding-server",
+        "model": model.model_name if model else None,
+        "backend": model.backend if model else None,
+        "dimension": model.dimension if model else None,
+    }
+
+
+@app.get("/stats")
+async def stats():
+    """Batching and cache counters since startup."""
+    return batcher.stats() if batcher else {}
@@ -27,6 +27,21 @@ VECTOR_DB_PORT = int(os.getenv("VECTOR_DB_PORT", "5432"))
 # =============================================================================
 EMBEDDING_MODEL_NAME = "BAAI/bge-small-en-v1.5"
 
+# Shared embedding server (src/embedding_server). When empty, the model is
+# loaded in-process on first use instead.
+EMBEDDING_SERVICE_URL = os.getenv("EMBEDDING_SERVICE_URL", "")
+EMBEDDING_SERVICE_TIMEOUT = float(os.getenv("EMBEDDING_SERVICE_TIMEOUT", "10"))
+
+# pgvector search tuning, applied per query with SET LOCAL. Higher values raise
+# recall of the per-company HNSW / IVFFlat indexes at some latency cost.
+VECTOR_SEARCH_EF_SEARCH = int(os.getenv("VECTOR_SEARCH_EF_SEARCH", "100"))
+VECTOR_SEARCH_IVFFLAT_PROBES = int(os.getenv("VECTOR_SEARCH_IVFFLAT_PROBES", "10"))
+# Searches filtered to a subset of the company's tables (RBAC / team) would
+# lose matches if the filter ran after an ANN scan. With pgvector >= 0.8 set
+# this to "relaxed_order" or "strict_order" to scan the index iteratively;
+# with "off" (default) filtered searches use an exact scan.
+VECTOR_SEARCH_ITERATIVE_SCAN = os.getenv("VECTOR_SEARCH_ITERATIVE_SCAN", "off").lower()
+
 # =============================================================================
 # Celery & Queue Configuration
 # =============================================================================
@@ -4,6 +4,12 @@ from typing import Dict, Any, Optional
 from crewai.tools import BaseTool
 from pydantic import Field
 
+from config.settings import (
+    VECTOR_SEARCH_EF_SEARCH,
+    VECTOR_SEARCH_IVFFLAT_PROBES,
+    VECTOR_SEARCH_ITERATIVE_SCAN,
+)
+
 
 class BaseSQLTool(BaseTool):
     """Base class for SQL Server and Vector DB parameterized tools."""
@@ -44,3 +50,21 @@ class BaseSQLTool(BaseTool):
             "password": self.vector_db_password,
             "port": self.vector_db_port,
         }
+
+    def apply_vector_search_settings(self, cur, filtered: bool = False) -> None:
+        """
+        Sets pgvector ANN search parameters for the current transaction.
+
+        When `filtered` (the query keeps only some of the company's tables, e.g.
+        one team's), the index is scanned iteratively (VECTOR_SEARCH_ITERATIVE_SCAN)
+        or not used at all, so the filter cannot discard every ANN candidate.
+        """
+        cur.execute("SET LOCAL hnsw.ef_search = %s", (VECTOR_SEARCH_EF_SEARCH,))
+        cur.execute("SET LOCAL ivfflat.probes = %s", (VECTOR_SEARCH_IVFFLAT_PROBES,))
+        if not filtered:
+            return
+        if VECTOR_SEARCH_ITERATIVE_SCAN in ("relaxed_order", "strict_order"):
+            cur.execute("SET LOCAL hnsw.iterative_scan = %s", (VECTOR_SEARCH_ITERATIVE_SCAN,))
+            cur.execute("SET LOCAL ivfflat.iterative_scan = relaxed_order")
+        else:
+            cur.execute("SET LOCAL enable_indexscan = off")
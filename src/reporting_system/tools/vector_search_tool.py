@@ -1,24 +1,16 @@
-"""Vector DB table search tool using pgvector and fastembed."""
+"""Vector DB table search tool using pgvector and the shared embedding model."""
 
 import json
 import logging
 from typing import Type
 from pydantic import BaseModel, Field
 import psycopg2
-from fastembed import TextEmbedding
 
-from config.settings import EMBEDDING_MODEL_NAME
 from tools.base import BaseSQLTool
+from utils.embeddings import embed_query
 
 logger = logging.getLogger(__name__)
 
-# Initialize embedding model lazily or at module level
-try:
-    embedding_model = TextEmbedding(model_name=EMBEDDING_MODEL_NAME)
-except Exception as err:
-    logger.error(f"Failed to load embedding model '{EMBEDDING_MODEL_NAME}': {err}")
-    embedding_model = None
-
 
 class VectorSearchInput(BaseModel):
     """Input schema for vector search tool."""
@@ -39,18 +31,20 @@ class VectorDBTableSearchTool(BaseSQLTool):
     args_schema: Type[BaseModel] = VectorSearchInput
 
     def _run(self, query_key: str) -> str:
-        if not embedding_model:
-            logger.error("Embedding model is not initialized.")
+        try:
+            query_embedding = embed_query(query_key)
+        except Exception as err:
+            logger.error(f"Embedding model unavailable: {err}")
             return '{"error": "Embedding model unavailable."}'
 
         conn = None
         search_limit = 12
         try:
-            query_embedding = next(embedding_model.embed([query_key]))
             query_embedding_str = "[" + ",".join(map(str, query_embedding)) + "]"
 
             conn = psycopg2.connect(**self.get_vector_db_conn_params())
             with conn.cursor() as cur:
+                self.apply_vector_search_settings(cur, filtered=bool(self.team_name))
                 query_parts = [
                     "SELECT table_name, table_description, table_relations",
                     "FROM client_schema_vectors",
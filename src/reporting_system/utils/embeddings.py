@@ -0,0 +1,50 @@
+"""Query embedding helper: shared embedding server or lazily loaded local model."""
+
+import logging
+import threading
+
+import requests
+
+from config.settings import EMBEDDING_MODEL_NAME, EMBEDDING_SERVICE_TIMEOUT, EMBEDDING_SERVICE_URL
+
+logger = logging.getLogger(__name__)
+
+_local_model = None
+_local_model_lock = threading.Lock()
+_session = requests.Session()
+
+
+def _get_local_model():
+    """Load the fastembed model on first use (not at import time)."""
+    global _local_model
+
+    if _local_model is None:
+        with _local_model_lock:
+            if _local_model is None:
+                from fastembed import TextEmbedding
+
+                logger.info(f"Loading embedding model: {EMBEDDING_MODEL_NAME}")
+                _local_model = TextEmbedding(model_name=EMBEDDING_MODEL_NAME)
+    return _local_model
+
+
+def embed_query(text: str) -> list[float]:
+    """
+    Embed a single search query.
+
+    Uses the embedding server when EMBEDDING_SERVICE_URL is set, otherwise
+    the in-process fastembed model.
+
+    Raises:
+        Exception: If the server request or model load fails.
+    """
+    if EMBEDDING_SERVICE_URL:
+        response = _session.post(
+            EMBEDDING_SERVICE_URL.rstrip("/") + "/embed",
+            json={"texts": [text], "normalize": True},
+            timeout=EMBEDDING_SERVICE_TIMEOUT
+        )
+        response.raise_for_status()
+        return response.json()["embeddings"][0]
+
+    return list(next(_get_local_model().embed([text])))